@@ -28,6 +28,13 @@ def is_prime(n: int) -> bool:
     return True
 
 
+def split_range(start: int, end: int) -> list:
+    """Split a range in two halves (used to split oversized jobs)."""
+    middle = (start + end) // 2
+    return [(start, middle), (middle, end)]
+
+
+@pyasync.splittable(split=split_range, combine=sum)
 def count_primes(start: int, end: int) -> int:
     """Count primes in a range (CPU-intensive)."""
     return sum(1 for n in range(start, end) if is_prime(n))
@@ -140,6 +147,28 @@ def main():
     print(f"Results: {[f'{r:,}' for r in results]}")
     print(f"Time: {elapsed:.2f}s")
     
+    # Example 6: Longest job first with cost hints
+    print("\n\n6. Cost Hints (Longest Job First)")
+    print("-" * 40)
+    
+    # The biggest range comes last, so it would run alone at the end
+    calls = [partial(count_primes, s, e) for s, e in ranges]
+    
+    start = time.monotonic()
+    pyasync.cpu_parallel(*calls)
+    plain_time = time.monotonic() - start
+    
+    # The range width approximates the work; the big range is also split
+    start = time.monotonic()
+    hinted_results = pyasync.cpu_parallel(
+        *calls, cost=lambda call: call.args[1] - call.args[0]
+    )
+    hinted_time = time.monotonic() - start
+    
+    print(f"Results (same order): {hinted_results}")
+    print(f"Argument order: {plain_time:.2f}s")
+    print(f"Longest first:  {hinted_time:.2f}s")
+    
     print("\n" + "=" * 60)
     print("Done!")
 
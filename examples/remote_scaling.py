@@ -0,0 +1,105 @@
+"""
+Example: Scaling CpuExecutor work across worker daemons
+
+Benchmarks RemoteCpuExecutor against the single-node CpuExecutor. The
+worker daemons are started on localhost here; on a real cluster, run
+`pyasync-worker` on each host and pass their addresses instead:
+
+    PYASYNC_AUTHKEY=secret pyasync-worker --port 8765 --slots 8
+    python remote_scaling.py node1:8765 node2:8765
+
+On one machine the remote runs measure protocol overhead rather than
+speedup, since all daemons share the same cores.
+"""
+
+import multiprocessing
+import os
+import signal
+import sys
+import time
+
+import pyasync
+from pyasync.remote import WorkerServer
+
+
+AUTHKEY = os.environ.get("PYASYNC_AUTHKEY", "example-key")
+
+
+def count_primes(start: int, end: int) -> int:
+    """Count primes in a range (CPU-intensive)."""
+    count = 0
+    for n in range(max(start, 2), end):
+        if all(n % d for d in range(2, int(n ** 0.5) + 1)):
+            count += 1
+    return count
+
+
+def serve(addresses, slots: int) -> None:
+    server = WorkerServer(("127.0.0.1", 0), authkey=AUTHKEY, slots=slots)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    addresses.put(server.address)
+    server.serve_forever()
+
+
+def start_local_workers(count: int, slots: int):
+    context = multiprocessing.get_context("fork")
+    addresses = context.Queue()
+    processes = [context.Process(target=serve, args=(addresses, slots)) for _ in range(count)]
+    for process in processes:
+        process.start()
+    return processes, [addresses.get(timeout=30) for _ in processes]
+
+
+def timed(label: str, fn, baseline=None) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    speedup = f"  ({baseline / elapsed:.2f}x)" if baseline else ""
+    print(f"{label:<32} {elapsed:8.3f}s{speedup}")
+    return elapsed
+
+
+def main() -> None:
+    cores = os.cpu_count() or 1
+    ranges = [(i * 10_000, (i + 1) * 10_000) for i in range(64)]
+    starts, ends = zip(*ranges)
+
+    with pyasync.CpuExecutor(max_workers=cores) as executor:
+        baseline = timed(
+            f"CpuExecutor ({cores} workers)",
+            lambda: list(executor.map(count_primes, starts, ends))
+        )
+
+    if len(sys.argv) > 1:
+        with pyasync.RemoteCpuExecutor(sys.argv[1:], authkey=AUTHKEY) as executor:
+            slots = sum(worker["slots"] for worker in executor.workers)
+            timed(
+                f"Remote ({len(sys.argv) - 1} hosts, {slots} slots)",
+                lambda: list(executor.map(count_primes, starts, ends)),
+                baseline
+            )
+        return
+
+    for count in (1, 2, 4):
+        slots = max(1, cores // count)
+        processes, addresses = start_local_workers(count, slots)
+        try:
+            with pyasync.RemoteCpuExecutor(addresses, authkey=AUTHKEY) as executor:
+                timed(
+                    f"Remote ({count} x {slots} slots)",
+                    lambda: list(executor.map(count_primes, starts, ends)),
+                    baseline
+                )
+                timed(
+                    "Remote tiny tasks, chunksize=64",
+                    lambda: list(executor.map(abs, range(20_000), chunksize=64))
+                )
+        finally:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
+
+
+if __name__ == "__main__":
+    main()
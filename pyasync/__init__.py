@@ -28,29 +28,114 @@ Usage:
 from .runtime import (
     # Thread-based (I/O-bound)
     parallel,
+    parallel_map,
     background,
     run,
     Task,
+    submit_many,
+    TaskBatch,
     # Process-based (CPU-bound)
     cpu_parallel,
     cpu_background,
     cpu_run,
+    cpu_stream,
     CpuTask,
     CpuExecutor,
 )
+from .streaming import CpuStream
+from .limits import Limiter, RateLimiter, rate_limiter
+from .hedging import Hedge
+from .retry import Retry, CircuitBreaker, CircuitOpenError, circuit_breaker
+from .cache import ResultCache, cached, default_cache
+from .diskcache import DiskCache
+from .checkpoints import CheckpointStore, checkpoint, restore
+from .jobqueue import JobQueue
+from .batching import Batcher
+from .aio import aparallel, acpu_parallel, arun
+from .compose import all_of, any_of
+from .graph import Graph, GraphReport
+from .pipeline import Pipeline
+from .keyed import KeyedExecutor
+from .resources import ResourcePool
+from .remote import RemoteCpuExecutor
+from .costs import CostModel, splittable
+from .scheduling import schedule, every, cron, ScheduledJob
+from .metrics import stats, prometheus, enable_metrics
+from .tracing import add_hook, propagate, current_context, TaskInfo
+from .profiler import profiling, Profile
+from .contention import detect_cpu_bound, CpuBoundDetector
 
 __all__ = [
     # Thread-based (I/O-bound)
     'parallel',
+    'parallel_map',
     'background', 
     'run',
     'Task',
+    'submit_many',
+    'TaskBatch',
     # Process-based (CPU-bound)
     'cpu_parallel',
     'cpu_background',
     'cpu_run',
+    'cpu_stream',
+    'CpuStream',
     'CpuTask',
     'CpuExecutor',
+    'RemoteCpuExecutor',
+    # Concurrency control
+    'Limiter',
+    'RateLimiter',
+    'rate_limiter',
+    'KeyedExecutor',
+    'ResourcePool',
+    # Resilience policies
+    'Hedge',
+    'Retry',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'circuit_breaker',
+    'checkpoint',
+    'restore',
+    'CheckpointStore',
+    'JobQueue',
+    # Caching
+    'ResultCache',
+    'cached',
+    'default_cache',
+    'DiskCache',
+    # Batching
+    'Batcher',
+    # asyncio
+    'aparallel',
+    'acpu_parallel',
+    'arun',
+    # Combinators
+    'all_of',
+    'any_of',
+    # Dataflow
+    'Graph',
+    'GraphReport',
+    'Pipeline',
+    # Scheduling
+    'schedule',
+    'every',
+    'cron',
+    'ScheduledJob',
+    'CostModel',
+    'splittable',
+    # Observability
+    'stats',
+    'prometheus',
+    'enable_metrics',
+    'add_hook',
+    'propagate',
+    'current_context',
+    'TaskInfo',
+    'profiling',
+    'Profile',
+    'detect_cpu_bound',
+    'CpuBoundDetector',
 ]
 __version__ = '0.3.0'
 
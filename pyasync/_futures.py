@@ -0,0 +1,83 @@
+"""
+Internal helpers for wiring concurrent.futures.Future objects together.
+
+Several pyasync features hand out a Future before the real work has been
+dispatched (queued behind a limiter, delayed by a timer, ...). These helpers
+copy the outcome of the underlying Future onto the one the caller holds.
+"""
+
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Callable
+
+
+def set_result(future: Future, result: Any) -> None:
+    """Resolve a future, ignoring it if it was already cancelled or resolved."""
+    try:
+        future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+def set_exception(future: Future, exc: BaseException) -> None:
+    """Fail a future, ignoring it if it was already cancelled or resolved."""
+    try:
+        future.set_exception(exc)
+    except InvalidStateError:
+        pass
+
+
+def copy_outcome(source: Future, target: Future) -> None:
+    """Copy the outcome of a finished future onto another future."""
+    if source.cancelled():
+        target.cancel()
+        return
+    exc = source.exception()
+    if exc is not None:
+        set_exception(target, exc)
+    else:
+        set_result(target, source.result())
+
+
+def chain(source: Future, target: Future) -> None:
+    """
+    Resolve target with the outcome of source once it finishes.
+
+    Cancelling target also attempts to cancel source.
+    """
+    source.add_done_callback(lambda f: copy_outcome(f, target))
+    target.add_done_callback(lambda f: f.cancelled() and source.cancel())
+
+
+class DerivedFuture(Future):
+    """
+    Future resolved by transforming another future's outcome.
+
+    running() and cancel() defer to the source, so a task whose result
+    needs unwrapping (e.g. timings sent back by a worker) still behaves
+    like the original: it cannot be cancelled once it has started.
+    """
+
+    def __init__(self, source: Future, transform: Callable[[Future], Any]):
+        super().__init__()
+        self._source = source
+        self._transform = transform
+        source.add_done_callback(self._resolve)
+
+    def running(self) -> bool:
+        return not self.done() and self._source.running()
+
+    def cancel(self) -> bool:
+        if not self._source.cancel():
+            return False
+        return super().cancel()
+
+    def _resolve(self, source: Future) -> None:
+        if source.cancelled():
+            super().cancel()
+            return
+        try:
+            value = self._transform(source)
+        except BaseException as e:
+            set_exception(self, e)
+        else:
+            set_result(self, value)
@@ -0,0 +1,49 @@
+"""
+Internal event loop support for coroutine functions.
+
+Coroutine functions passed to the thread-based API run on one shared
+background event loop instead of each taking a pool thread. LoopExecutor
+adapts an event loop to the Executor interface so coroutines go through
+the same dispatch path (rate limits, retries, ...) as plain callables.
+"""
+
+from concurrent.futures import Executor, Future
+from typing import Callable, Any, Optional
+import asyncio
+import inspect
+import threading
+
+
+class LoopExecutor(Executor):
+    """Executor that runs coroutine functions on an event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Schedule fn(*args, **kwargs) on the loop (thread-safe)."""
+        return asyncio.run_coroutine_threadsafe(fn(*args, **kwargs), self._loop)
+
+
+_executor: Optional[LoopExecutor] = None
+_lock = threading.Lock()
+
+
+def get_executor() -> LoopExecutor:
+    """Get or create the executor of the shared background event loop."""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="pyasync-loop", daemon=True
+                )
+                thread.start()
+                _executor = LoopExecutor(loop)
+    return _executor
+
+
+def is_async(fn: Callable) -> bool:
+    """Return True if fn is a coroutine function (partials included)."""
+    return inspect.iscoroutinefunction(fn)
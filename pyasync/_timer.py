@@ -0,0 +1,192 @@
+"""
+Internal timer thread for delayed dispatch.
+
+A single daemon thread fires callbacks at their deadline. Callbacks run on
+the timer thread, so they must be quick: they typically just submit work
+to a pool.
+
+Timers live in a hierarchical timing wheel: level 0 has one slot per
+millisecond tick for the next 64 ticks, and each further level has slots
+64 times as wide. Scheduling and cancelling are O(1); a timer moves down
+a level when its slot comes around, and the thread sleeps until the next
+occupied slot instead of waking every tick.
+"""
+
+from typing import Callable, Any, List, Optional
+import logging
+import math
+import threading
+import time
+
+
+# Seconds per tick, and the shape of the wheel
+_TICK = 0.001
+_BITS = 6
+_SLOTS = 1 << _BITS
+_MASK = _SLOTS - 1
+_LEVELS = 4
+
+_logger = logging.getLogger(__name__)
+
+
+class TimerHandle:
+    """A scheduled callback that can be cancelled before it fires."""
+
+    __slots__ = ('when', 'tick', 'fn', 'args', 'cancelled')
+
+    def __init__(self, when: float, tick: int, fn: Callable[..., Any], args: tuple):
+        self.when = when
+        self.tick = tick
+        self.fn = fn
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """Prevent the callback from running."""
+        self.cancelled = True
+
+
+class _Wheel:
+    """Hierarchical timing wheel. Not thread-safe: guarded by _cond."""
+
+    def __init__(self, origin: float):
+        self.origin = origin
+        # Next tick to process; everything before it has fired
+        self.current = 0
+        self.levels: List[List[List[TimerHandle]]] = [
+            [[] for _ in range(_SLOTS)] for _ in range(_LEVELS)
+        ]
+        self.overflow: List[TimerHandle] = []
+        self.count = 0
+
+    def tick_of(self, when: float) -> int:
+        """Return the first tick at or after a monotonic time."""
+        return max(0, math.ceil((when - self.origin) / _TICK))
+
+    def time_of(self, tick: int) -> float:
+        return self.origin + tick * _TICK
+
+    def insert(self, handle: TimerHandle) -> None:
+        tick = max(handle.tick, self.current)
+        delta = tick - self.current
+        for level in range(_LEVELS):
+            if delta < 1 << (_BITS * (level + 1)):
+                self.levels[level][(tick >> (_BITS * level)) & _MASK].append(handle)
+                return
+        self.overflow.append(handle)
+
+    def add(self, handle: TimerHandle) -> None:
+        self.insert(handle)
+        self.count += 1
+
+    def next_due(self) -> Optional[int]:
+        """Return the next tick with timers to fire or cascade, if any."""
+        if not self.count:
+            return None
+
+        current = self.current
+        best = None
+        slots = self.levels[0]
+        for tick in range(current, current + _SLOTS):
+            if slots[tick & _MASK]:
+                best = tick
+                break
+
+        for level in range(1, _LEVELS):
+            shift = _BITS * level
+            slots = self.levels[level]
+            block = current >> shift
+            # The boundary at current itself has not been cascaded yet
+            first = 0 if current & ((1 << shift) - 1) == 0 else 1
+            for step in range(first, _SLOTS + 1):
+                if slots[(block + step) & _MASK]:
+                    tick = (block + step) << shift
+                    if best is None or tick < best:
+                        best = tick
+                    break
+
+        if self.overflow:
+            shift = _BITS * _LEVELS
+            tick = ((current >> shift) + 1) << shift
+            if best is None or tick < best:
+                best = tick
+        return best
+
+    def advance(self, tick: int) -> List[TimerHandle]:
+        """Move to tick (no timers may be due before it) and return those due."""
+        self.current = tick
+
+        if self.overflow and tick & ((1 << (_BITS * _LEVELS)) - 1) == 0:
+            pending, self.overflow = self.overflow, []
+            for handle in pending:
+                self.insert(handle)
+
+        # Cascade from the widest level down, so timers can fall several levels
+        for level in range(_LEVELS - 1, 0, -1):
+            shift = _BITS * level
+            if tick & ((1 << shift) - 1) == 0:
+                slots = self.levels[level]
+                index = (tick >> shift) & _MASK
+                pending, slots[index] = slots[index], []
+                for handle in pending:
+                    self.insert(handle)
+
+        index = tick & _MASK
+        due, self.levels[0][index] = self.levels[0][index], []
+        self.current = tick + 1
+        self.count -= len(due)
+        return due
+
+
+_wheel = _Wheel(time.monotonic())
+_cond = threading.Condition()
+_thread: Optional[threading.Thread] = None
+# Tick the timer thread is sleeping until (None while idle)
+_wake_tick: Optional[int] = None
+
+
+def _loop() -> None:
+    global _wake_tick
+    while True:
+        with _cond:
+            while True:
+                due = _wheel.next_due()
+                if due is None:
+                    _wake_tick = None
+                    _cond.wait()
+                    continue
+                delay = _wheel.time_of(due) - time.monotonic()
+                if delay <= 0:
+                    break
+                _wake_tick = due
+                _cond.wait(delay)
+            _wake_tick = due
+            handles = _wheel.advance(due)
+
+        for handle in handles:
+            if handle.cancelled:
+                continue
+            try:
+                handle.fn(*handle.args)
+            except Exception:
+                _logger.exception("Timer callback %r failed", handle.fn)
+
+
+def call_later(delay: float, fn: Callable[..., Any], *args: Any) -> TimerHandle:
+    """
+    Run fn(*args) on the timer thread after delay seconds.
+
+    Returns:
+        TimerHandle that can be used to cancel the call.
+    """
+    global _thread
+    when = time.monotonic() + max(0.0, delay)
+    with _cond:
+        handle = TimerHandle(when, _wheel.tick_of(when), fn, args)
+        if _thread is None:
+            _thread = threading.Thread(target=_loop, name="pyasync-timer", daemon=True)
+            _thread.start()
+        _wheel.add(handle)
+        if _wake_tick is None or handle.tick < _wake_tick:
+            _cond.notify()
+    return handle
@@ -0,0 +1,28 @@
+"""
+Internal helpers shared by several pyasync features.
+
+Kept out of the feature modules so that one feature does not import
+another's private names (cache keys, cost models and the CPU-bound
+detector all identify callables the same way; the disk cache and
+checkpoint stores load pickles the same way).
+"""
+
+from functools import partial
+from typing import Callable, Hashable, Tuple
+import pickle
+
+
+# Raised by pickle.loads() on a corrupt or outdated file
+LOAD_ERRORS = (EOFError, pickle.UnpicklingError, ValueError, AttributeError, ImportError, IndexError)
+
+
+def target(fn: Callable) -> Tuple[Hashable, str]:
+    """Return the identity (definition site) and qualified name of a callable."""
+    while isinstance(fn, partial):
+        fn = fn.func
+    code = getattr(fn, '__code__', None)
+    module = getattr(fn, '__module__', None) or type(fn).__module__
+    qualname = getattr(fn, '__qualname__', None) or type(fn).__qualname__
+    # Code objects tell lambdas apart; other callables go by type
+    key = code if code is not None else getattr(fn, '__func__', type(fn))
+    return key, f"{module}.{qualname}"
@@ -0,0 +1,191 @@
+"""
+PyAsync - asyncio integration.
+
+Coroutine counterparts of parallel(), cpu_parallel() and run() that use
+the same thread and process pools without blocking the event loop. Task
+and CpuTask are awaitable as well.
+"""
+
+from concurrent.futures import Executor, Future
+from functools import partial
+from typing import Callable, Any, Hashable, List, Optional
+import asyncio
+
+from . import _loop
+from .cache import ResultCache
+from .diskcache import DiskCache
+from .hedging import Hedge
+from .limits import RateLike
+from .retry import Retry, BreakerLike
+from .runtime import (
+    _get_executor, _get_cpu_executor, _rates, _submit, _submit_cached
+)
+
+
+def _caller_executor_for(fn: Callable) -> Executor:
+    """Run coroutine functions on the caller's loop, the rest in the thread pool."""
+    if _loop.is_async(fn):
+        return _loop.LoopExecutor(asyncio.get_running_loop())
+    return _get_executor()
+
+
+async def _gather(futures: List[Future], timeout: Optional[float] = None) -> List[Any]:
+    """Await futures in order, raising the first exception like parallel()."""
+    waiters = [asyncio.wrap_future(future) for future in futures]
+    try:
+        outcomes = await asyncio.wait_for(
+            asyncio.gather(*waiters, return_exceptions=True), timeout
+        )
+    except asyncio.TimeoutError:
+        for future in futures:
+            future.cancel()
+        # A distinct class before Python 3.11
+        raise TimeoutError() from None
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            for future in futures:
+                future.cancel()
+            raise outcome
+    return outcomes
+
+
+async def aparallel(
+    *callables: Callable[[], Any],
+    rate: RateLike = None,
+    hedge: Optional[Hedge] = None,
+    retry: Optional[Retry] = None,
+    breaker: BreakerLike = None
+) -> List[Any]:
+    """
+    Run multiple callables in parallel without blocking the event loop.
+
+    Plain callables run in the thread pool; coroutine functions run on the
+    calling event loop. Results are returned in the same order as the
+    input callables.
+
+    Example:
+        async def handler(request):
+            user, orders = await aparallel(
+                lambda: db.get_user(request.user_id),
+                partial(fetch_orders_async, request.user_id)
+            )
+
+    Args:
+        *callables: Functions or coroutine functions to run (no arguments).
+        rate: Rate limit for starting the callables (see parallel()).
+        hedge: Hedge policy launching a duplicate of slow callables.
+        retry: Retry policy for failed attempts.
+        breaker: Circuit breaker (or registered name) that fails fast
+            while the dependency is down.
+
+    Returns:
+        List of results in order
+    """
+    if not callables:
+        return []
+
+    rates = _rates(rate)
+    futures = [
+        _submit(
+            _caller_executor_for(fn), fn, rates=rates, hedge=hedge, retry=retry, breaker=breaker
+        )
+        for fn in callables
+    ]
+    return await _gather(futures)
+
+
+async def acpu_parallel(
+    *callables: Callable[[], Any],
+    timeout: Optional[float] = None,
+    rate: RateLike = None,
+    hedge: Optional[Hedge] = None,
+    retry: Optional[Retry] = None,
+    breaker: BreakerLike = None,
+    disk_cache: Optional[DiskCache] = None
+) -> List[Any]:
+    """
+    Run multiple callables in parallel processes without blocking the event loop.
+
+    Uses the shared process pool (the same one as cpu_background), so
+    there is no pool startup or shutdown to wait for.
+
+    Note: Callables must be picklable. Use functools.partial for
+    functions with arguments instead of lambdas.
+
+    Example:
+        results = await acpu_parallel(
+            partial(compute, 1000000),
+            partial(compute, 2000000),
+            timeout=10.0
+        )
+
+    Args:
+        *callables: Functions to run in parallel (no arguments).
+        timeout: Maximum seconds to wait. None means wait forever.
+        rate: Rate limit for starting the callables (see parallel()).
+        hedge: Hedge policy launching a duplicate of slow callables.
+        retry: Retry policy for failed attempts.
+        breaker: Circuit breaker (or registered name) that fails fast
+            while the dependency is down.
+        disk_cache: DiskCache memoizing results across runs.
+
+    Returns:
+        List of results in order.
+
+    Raises:
+        TimeoutError: If timeout expires before all tasks complete.
+    """
+    if not callables:
+        return []
+
+    executor = _get_cpu_executor()
+    rates = _rates(rate)
+    if disk_cache is not None:
+        callables = tuple(map(disk_cache.wrap, callables))
+
+    futures = [
+        _submit(executor, fn, rates=rates, hedge=hedge, retry=retry, breaker=breaker)
+        for fn in callables
+    ]
+    return await _gather(futures, timeout)
+
+
+async def arun(
+    fn: Callable[[], Any],
+    rate: RateLike = None,
+    hedge: Optional[Hedge] = None,
+    retry: Optional[Retry] = None,
+    breaker: BreakerLike = None,
+    key: Optional[Hashable] = None,
+    cache: Optional[ResultCache] = None
+) -> Any:
+    """
+    Run a blocking callable in the thread pool and await its result.
+
+    Example:
+        response = await arun(lambda: requests.get("https://api.com"))
+
+    Args:
+        fn: Function or coroutine function to run (no arguments).
+        rate: Rate limit to wait for before starting (see parallel()).
+        hedge: Hedge policy launching a duplicate if the call is slow.
+        retry: Retry policy for failed attempts.
+        breaker: Circuit breaker (or registered name) that fails fast
+            while the dependency is down.
+        key: Cache key. Concurrent calls with the same key share one
+            computation, and its result is cached (see ResultCache).
+        cache: ResultCache to use with key. Defaults to default_cache.
+
+    Returns:
+        Result of the callable
+    """
+    future = _submit_cached(key, cache, partial(
+        _submit, _caller_executor_for(fn), fn, rates=_rates(rate), hedge=hedge, retry=retry,
+        breaker=breaker
+    ), fn)
+    return await asyncio.wrap_future(future)
@@ -0,0 +1,177 @@
+"""
+PyAsync - Micro-batching.
+
+A Batcher coalesces many single-item submissions into one call of a batch
+function (the DataLoader pattern), then fans the results back out to each
+item's Task. Use it when a backend supports bulk operations, to cut
+per-call overhead and round-trips.
+"""
+
+from concurrent.futures import Future
+from typing import Callable, Any, Dict, List, Sequence, Tuple
+import threading
+
+from . import _futures, _timer
+from .runtime import Task, _get_executor, _get_cpu_executor, _submit
+
+
+class Batcher:
+    """
+    Coalesce single-item submissions into batched calls.
+
+    Items submitted within max_wait seconds of the first pending item (or
+    until max_batch items are pending) are passed together to batch_fn,
+    which runs on the thread pool or the process pool. batch_fn receives a
+    list of items and must return a sequence of results in the same order.
+    A result that is an exception instance fails only that item's Task.
+
+    Example:
+        def get_many(ids):
+            rows = db.bulk_get(ids)
+            return [rows.get(i, KeyError(i)) for i in ids]
+
+        users = Batcher(get_many, max_batch=200, max_wait=0.005)
+
+        tasks = [users.submit(user_id) for user_id in ids]
+        print([task.result() for task in tasks])
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], Sequence[Any]],
+        max_batch: int = 100,
+        max_wait: float = 0.005,
+        backend: str = "thread"
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            batch_fn: Function called with a list of items. Must be
+                picklable for the "process" backend.
+            max_batch: Maximum items per batch_fn call.
+            max_wait: Maximum seconds an item waits for its batch to fill.
+            backend: "thread" or "process".
+        """
+        if backend not in ("thread", "process"):
+            raise ValueError(f"Unknown backend: {backend!r}")
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+
+        self._batch_fn = batch_fn
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._backend = backend
+        self._pending: List[Tuple[Any, Future]] = []
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+
+    def __enter__(self) -> 'Batcher':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.flush()
+        return False
+
+    def stats(self) -> Dict[str, float]:
+        """Return the number of batches dispatched, items and mean batch size."""
+        with self._lock:
+            batches, items = self._batches, self._items
+        return {
+            "batches": batches,
+            "items": items,
+            "mean_batch_size": items / batches if batches else 0.0,
+        }
+
+    def submit(self, item: Any) -> Task:
+        """
+        Add an item to the current batch.
+
+        Args:
+            item: Item passed to batch_fn as part of a list.
+
+        Returns:
+            Task resolved with this item's result.
+        """
+        future: Future = Future()
+        with self._lock:
+            self._pending.append((item, future))
+            if len(self._pending) >= self._max_batch:
+                batch = self._take()
+            else:
+                batch = None
+                if len(self._pending) == 1:
+                    _timer.call_later(self._max_wait, self._flush_generation, self._generation)
+
+        if batch:
+            self._dispatch(batch)
+        return Task(future)
+
+    def flush(self) -> None:
+        """Dispatch the pending items now instead of waiting for max_wait."""
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._dispatch(batch)
+
+    def _take(self) -> List[Tuple[Any, Future]]:
+        """Detach the pending batch (lock held)."""
+        batch, self._pending = self._pending, []
+        self._generation += 1
+        if batch:
+            self._batches += 1
+            self._items += len(batch)
+        return batch
+
+    def _flush_generation(self, generation: int) -> None:
+        """Timer callback: flush the batch it was scheduled for, if still pending."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            batch = self._take()
+        if batch:
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[Any, Future]]) -> None:
+        items = [item for item, _ in batch]
+        futures = [future for _, future in batch]
+        executor = _get_executor() if self._backend == "thread" else _get_cpu_executor()
+        try:
+            batch_future = _submit(executor, self._batch_fn, (items,))
+        except Exception as e:
+            for future in futures:
+                _futures.set_exception(future, e)
+            return
+        batch_future.add_done_callback(lambda f: _fan_out(f, futures))
+
+
+def _fan_out(batch_future: Future, futures: List[Future]) -> None:
+    """Resolve each item's Future from the batch result."""
+    if batch_future.cancelled():
+        for future in futures:
+            future.cancel()
+        return
+
+    exc = batch_future.exception()
+    if exc is None:
+        results = batch_future.result()
+        try:
+            if len(results) != len(futures):
+                exc = ValueError(
+                    f"batch_fn returned {len(results)} results for {len(futures)} items"
+                )
+        except TypeError:
+            exc = TypeError("batch_fn must return a sequence of results")
+
+    if exc is not None:
+        for future in futures:
+            _futures.set_exception(future, exc)
+        return
+
+    for future, result in zip(futures, results):
+        if isinstance(result, BaseException):
+            _futures.set_exception(future, result)
+        else:
+            _futures.set_result(future, result)
@@ -0,0 +1,398 @@
+"""
+PyAsync - Benchmark suite.
+
+Measures per-task overhead, throughput and scaling of the thread and
+process APIs against raw concurrent.futures and a sequential loop:
+
+    python -m pyasync.bench                      # Quick run, table on stdout
+    python -m pyasync.bench --full -o 0.3.0.json  # Full matrix, JSON results
+    python -m pyasync.bench --compare 0.3.0.json  # Diff against saved results
+
+Each case runs with a given number of tasks, work per task (loop
+iterations), payload size (bytes sent to and returned from each task)
+and, for process pools, worker count. Results are keyed by benchmark,
+implementation and parameters, so runs from different versions or hosts
+can be compared case by case.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from . import __version__
+from .runtime import (
+    parallel, run, background, cpu_parallel, cpu_background, cpu_run, submit_many, CpuExecutor
+)
+
+
+def _work(iterations: int, payload: bytes) -> bytes:
+    """Benchmark task: spin for a number of iterations, echo the payload."""
+    total = 0
+    for i in range(iterations):
+        total += i
+    return payload
+
+
+def _work_item(args: Tuple[int, bytes]) -> bytes:
+    return _work(*args)
+
+
+def _noop(item: Any) -> Any:
+    return item
+
+
+# Long-lived concurrent.futures pools, the baseline for run() and cpu_run()
+_baseline_pools: Dict[str, Any] = {}
+
+
+def _baseline_pool(backend: str) -> Any:
+    pool = _baseline_pools.get(backend)
+    if pool is None:
+        if backend == "thread":
+            pool = ThreadPoolExecutor(max_workers=32)
+        else:
+            pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        _baseline_pools[backend] = pool
+    return pool
+
+
+class Case:
+    """One benchmark configuration: a workload and the implementation running it."""
+
+    def __init__(self, name: str, impl: str, params: Dict[str, Any], fn: Callable[[], Any]):
+        self.name = name
+        self.impl = impl
+        self.params = params
+        self.fn = fn
+
+    @property
+    def key(self) -> str:
+        """Stable identifier used to match results across runs."""
+        params = ",".join(f"{name}={value}" for name, value in sorted(self.params.items()))
+        return f"{self.name}/{self.impl}[{params}]"
+
+
+# Parameter matrices; process cases also run at 1, half and all cores
+_QUICK = {
+    "thread_tasks": 200,
+    "process_tasks": 32,
+    "work": (0, 10_000),
+    "payload": (0, 65_536),
+    "bulk_tasks": 10_000,
+}
+_FULL = {
+    "thread_tasks": 2_000,
+    "process_tasks": 256,
+    "work": (0, 10_000, 200_000),
+    "payload": (0, 4_096, 1_048_576),
+    "bulk_tasks": 200_000,
+}
+
+
+def _worker_counts() -> List[int]:
+    cores = os.cpu_count() or 1
+    return sorted({1, max(1, cores // 2), cores})
+
+
+def _thread_cases(tasks: int, work: int, payload_size: int) -> Iterator[Case]:
+    payload = b"x" * payload_size
+    params = {"tasks": tasks, "work": work, "payload": payload_size}
+    call = partial(_work, work, payload)
+    calls = [call] * tasks
+
+    yield Case("parallel", "pyasync", params, lambda: parallel(*calls))
+
+    def futures_parallel() -> None:
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            [future.result() for future in [executor.submit(call) for _ in range(tasks)]]
+    yield Case("parallel", "futures", params, futures_parallel)
+
+    yield Case("background", "pyasync", params,
+               lambda: [task.result() for task in [background(call) for _ in range(tasks)]])
+
+    yield Case("run", "pyasync", params, lambda: [run(call) for _ in range(tasks)])
+
+    def futures_run() -> None:
+        pool = _baseline_pool("thread")
+        [pool.submit(call).result() for _ in range(tasks)]
+    yield Case("run", "futures", params, futures_run)
+
+    yield Case("parallel", "sequential", params, lambda: [call() for _ in range(tasks)])
+
+
+def _process_cases(tasks: int, work: int, payload_size: int, workers: int) -> Iterator[Case]:
+    payload = b"x" * payload_size
+    params = {"tasks": tasks, "work": work, "payload": payload_size, "workers": workers}
+    call = partial(_work, work, payload)
+    items = [(work, payload)] * tasks
+
+    yield Case("cpu_parallel", "pyasync", params,
+               lambda: cpu_parallel(*[call] * tasks, max_workers=workers))
+
+    def futures_parallel() -> None:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            [future.result() for future in [executor.submit(call) for _ in range(tasks)]]
+    yield Case("cpu_parallel", "futures", params, futures_parallel)
+
+    def executor_map() -> None:
+        with CpuExecutor(max_workers=workers) as executor:
+            list(executor.map(_work_item, items))
+    yield Case("CpuExecutor.map", "pyasync", params, executor_map)
+
+    def futures_map() -> None:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_work_item, items))
+    yield Case("CpuExecutor.map", "futures", params, futures_map)
+
+    yield Case("cpu_parallel", "sequential", params, lambda: [call() for _ in range(tasks)])
+
+
+def _cpu_run_cases(tasks: int, work: int, payload_size: int) -> Iterator[Case]:
+    """cpu_run uses the shared pool, so its worker count is fixed."""
+    payload = b"x" * payload_size
+    params = {"tasks": tasks, "work": work, "payload": payload_size}
+    call = partial(_work, work, payload)
+    yield Case("cpu_run", "pyasync", params, lambda: [cpu_run(call) for _ in range(tasks)])
+
+    def futures_run() -> None:
+        pool = _baseline_pool("process")
+        [pool.submit(call).result() for _ in range(tasks)]
+    yield Case("cpu_run", "futures", params, futures_run)
+
+
+def _bulk_cases(tasks: int) -> Iterator[Case]:
+    """Many trivial tasks: per-task allocation and bookkeeping dominate."""
+    params = {"tasks": tasks}
+    items = range(tasks)
+
+    yield Case("bulk_thread", "submit_many", params,
+               lambda: submit_many(_noop, items).results())
+    yield Case("bulk_thread", "background", params,
+               lambda: [task.result() for task in [background(partial(_noop, i)) for i in items]])
+
+    def futures_thread() -> None:
+        pool = _baseline_pool("thread")
+        [future.result() for future in [pool.submit(_noop, i) for i in items]]
+    yield Case("bulk_thread", "futures", params, futures_thread)
+
+    yield Case("bulk_process", "submit_many", params,
+               lambda: submit_many(_noop, items, backend="process").results())
+    yield Case("bulk_process", "cpu_background", params,
+               lambda: [task.result() for task in [cpu_background(partial(_noop, i)) for i in items]])
+
+    def executor_submit() -> None:
+        with CpuExecutor(retain_tasks=False) as executor:
+            [task.result() for task in [executor.submit(_noop, i) for i in items]]
+    yield Case("bulk_process", "CpuExecutor.submit", params, executor_submit)
+
+    def executor_submit_many() -> None:
+        with CpuExecutor(retain_tasks=False) as executor:
+            executor.submit_many(_noop, items).results()
+    yield Case("bulk_process", "CpuExecutor.submit_many", params, executor_submit_many)
+
+    def futures_process() -> None:
+        pool = _baseline_pool("process")
+        [future.result() for future in [pool.submit(_noop, i) for i in items]]
+    yield Case("bulk_process", "futures", params, futures_process)
+
+
+def cases(full: bool = False) -> List[Case]:
+    """Return the benchmark cases of the quick (default) or full matrix."""
+    matrix = _FULL if full else _QUICK
+    result: List[Case] = []
+    for work in matrix["work"]:
+        for payload in matrix["payload"]:
+            result.extend(_thread_cases(matrix["thread_tasks"], work, payload))
+            result.extend(_cpu_run_cases(matrix["process_tasks"], work, payload))
+            for workers in _worker_counts():
+                result.extend(_process_cases(matrix["process_tasks"], work, payload, workers))
+    result.extend(_bulk_cases(matrix["bulk_tasks"]))
+    return result
+
+
+def _peak_memory(case: Case) -> int:
+    """Peak bytes allocated by the calling process during one run of a case."""
+    tracemalloc.start()
+    try:
+        case.fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(case: Case, repeat: int = 5, memory: bool = False) -> Dict[str, Any]:
+    """
+    Run a case (after one warmup run) and summarize its timings.
+
+    With memory, one extra untimed run is traced with tracemalloc to
+    record the peak bytes allocated in this process, per task.
+    """
+    case.fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case.fn()
+        timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    tasks = case.params["tasks"]
+    result = {
+        "key": case.key,
+        "name": case.name,
+        "impl": case.impl,
+        "params": case.params,
+        "repeat": repeat,
+        "median": median,
+        "min": min(timings),
+        "max": max(timings),
+        "per_task_us": median / tasks * 1e6,
+        "tasks_per_sec": tasks / median if median else 0.0,
+    }
+    if memory:
+        result["peak_bytes_per_task"] = _peak_memory(case) / tasks
+    return result
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the host and versions, stored alongside results."""
+    return {
+        "pyasync": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def run_benchmarks(
+    full: bool = False,
+    repeat: int = 5,
+    select: Sequence[str] = (),
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    memory: bool = False
+) -> Dict[str, Any]:
+    """
+    Run the benchmark suite.
+
+    Args:
+        full: Run the full parameter matrix instead of the quick one.
+        repeat: Timed runs per case (after one warmup).
+        select: Only run cases whose key contains one of these strings.
+        progress: Called with each result as it completes.
+        memory: Also record peak allocated bytes per task (slower).
+
+    Returns:
+        {"environment": {...}, "results": [...]}, JSON serializable.
+    """
+    results = []
+    try:
+        for case in cases(full):
+            if select and not any(pattern in case.key for pattern in select):
+                continue
+            result = measure(case, repeat, memory)
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    finally:
+        while _baseline_pools:
+            _baseline_pools.popitem()[1].shutdown()
+    return {"environment": environment(), "results": results}
+
+
+def compare(
+    old: Dict[str, Any],
+    new: Dict[str, Any],
+    threshold: float = 0.25
+) -> List[Dict[str, Any]]:
+    """
+    Compare two runs case by case.
+
+    Args:
+        old: Earlier results (as returned by run_benchmarks()).
+        new: Later results.
+        threshold: Relative slowdown of the median flagged as a
+            regression (0.25 = 25% slower).
+
+    Returns:
+        One entry per case present in both runs, with the old and new
+        medians, their ratio (new / old) and a regression flag.
+    """
+    before = {result["key"]: result for result in old["results"]}
+    diff = []
+    for result in new["results"]:
+        previous = before.get(result["key"])
+        if previous is None:
+            continue
+        ratio = result["median"] / previous["median"] if previous["median"] else float("inf")
+        diff.append({
+            "key": result["key"],
+            "old": previous["median"],
+            "new": result["median"],
+            "ratio": ratio,
+            "regression": ratio > 1.0 + threshold,
+        })
+    return diff
+
+
+def _format_result(result: Dict[str, Any]) -> str:
+    line = (f"{result['key']:<72} {result['median'] * 1e3:10.2f} ms"
+            f" {result['per_task_us']:10.1f} us/task {result['tasks_per_sec']:12.0f} tasks/s")
+    if "peak_bytes_per_task" in result:
+        line += f" {result['peak_bytes_per_task']:10.0f} B/task"
+    return line
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Entry point of python -m pyasync.bench."""
+    parser = argparse.ArgumentParser(
+        prog="python -m pyasync.bench",
+        description="Benchmark pyasync against concurrent.futures and sequential baselines."
+    )
+    parser.add_argument("--full", action="store_true", help="Run the full parameter matrix.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (default: 5).")
+    parser.add_argument("-k", "--select", action="append", default=[],
+                        help="Only run cases whose key contains this string (repeatable).")
+    parser.add_argument("-o", "--output", help="Write JSON results to this file.")
+    parser.add_argument("--compare", help="Compare against earlier JSON results.")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Slowdown flagged as a regression by --compare (default: 0.25).")
+    parser.add_argument("--memory", action="store_true",
+                        help="Also report peak allocated bytes per task (tracemalloc).")
+    parser.add_argument("--quiet", action="store_true", help="Do not print results as they complete.")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    progress = None if args.quiet else lambda result: print(_format_result(result), flush=True)
+    results = run_benchmarks(args.full, args.repeat, args.select, progress, args.memory)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        diff = compare(old, results, args.threshold)
+        print()
+        for entry in diff:
+            flag = "  REGRESSION" if entry["regression"] else ""
+            print(f"{entry['key']:<72} {entry['old'] * 1e3:10.2f} -> {entry['new'] * 1e3:10.2f} ms"
+                  f" ({entry['ratio']:.2f}x){flag}")
+        if any(entry["regression"] for entry in diff):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
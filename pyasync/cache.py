@@ -0,0 +1,269 @@
+"""
+PyAsync - Result caching and single-flight deduplication.
+
+A ResultCache makes concurrent calls with the same key share one in-flight
+computation (single-flight), and keeps completed results in a bounded LRU
+with an optional time-to-live.
+"""
+
+from concurrent.futures import Future
+from collections import OrderedDict
+from functools import partial, wraps
+from typing import Callable, Any, Dict, Hashable, Optional, Tuple
+import importlib
+import threading
+import time
+
+from . import _futures, _util
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of task results with single-flight deduplication.
+
+    While a key is being computed, further requests for it join the
+    in-flight computation instead of starting a new one. Successful results
+    are kept for ttl seconds (forever if None), evicting the least recently
+    used entry once maxsize is reached. Failures are not cached.
+
+    Cached values are shared between callers, so treat them as read-only.
+
+    Example:
+        cache = ResultCache(maxsize=256, ttl=60.0)
+
+        profile = run(lambda: load_profile(user_id), key=user_id, cache=cache)
+        print(cache.stats())
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of completed results kept.
+            ttl: Seconds a result stays valid. None means no expiry.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: 'OrderedDict[Hashable, Tuple[Optional[float], Any]]' = OrderedDict()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._joined = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return cache counters.
+
+        Returns:
+            Dict with hits (served from a stored result), joined (attached
+            to an in-flight computation), misses (started a computation),
+            evictions (dropped by LRU), expirations (dropped by TTL) and
+            size.
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "joined": self._joined,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "size": len(self._entries),
+            }
+
+    def clear(self) -> None:
+        """Drop all stored results. In-flight computations are unaffected."""
+        with self._lock:
+            self._entries.clear()
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop the stored result for key, if any."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get_or_submit(self, key: Hashable, submit: Callable[[], Future]) -> Future:
+        """
+        Return a Future for key, starting a computation only if needed.
+
+        Args:
+            key: Cache key.
+            submit: Starts the computation and returns its Future.
+
+        Returns:
+            Future owned by the caller; cancelling it does not affect other
+            callers waiting on the same key.
+        """
+        future: Future = Future()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    future.set_result(value)
+                    return future
+                del self._entries[key]
+                self._expirations += 1
+
+            source = self._in_flight.get(key)
+            if source is not None:
+                self._joined += 1
+            else:
+                self._misses += 1
+
+        if source is None:
+            try:
+                source = self._start(key, submit)
+            except Exception as e:
+                future.set_exception(e)
+                return future
+
+        source.add_done_callback(lambda f: _futures.copy_outcome(f, future))
+        return future
+
+    def _start(self, key: Hashable, submit: Callable[[], Future]) -> Future:
+        """Start a computation for key and register it as in flight."""
+        source: Future = Future()
+        with self._lock:
+            # Another caller may have started it between our two lock sections
+            existing = self._in_flight.get(key)
+            if existing is not None:
+                return existing
+            self._in_flight[key] = source
+
+        try:
+            inner = submit()
+        except BaseException:
+            with self._lock:
+                del self._in_flight[key]
+            raise
+        inner.add_done_callback(lambda f: self._store(key, f, source))
+        return source
+
+    def _store(self, key: Hashable, inner: Future, source: Future) -> None:
+        with self._lock:
+            self._in_flight.pop(key, None)
+            if not inner.cancelled() and inner.exception() is None:
+                expires_at = None if self._ttl is None else time.monotonic() + self._ttl
+                self._entries[key] = (expires_at, inner.result())
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._maxsize:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+        _futures.copy_outcome(inner, source)
+
+
+# Cache used by run(..., key=...) and friends when no cache= is given
+default_cache = ResultCache()
+
+
+def scoped_key(fn: Callable, key: Hashable) -> Hashable:
+    """
+    Key under which default_cache stores a key= given with fn.
+
+    The default cache is shared by every caller, so keys are scoped to
+    the function (its definition site and qualified name, looking through
+    partials): two functions passing the same key never share a result.
+    Pass an explicit cache= to share keys across functions.
+    """
+    return (_util.target(fn), key)
+
+
+def _make_key(args: tuple, kwargs: Dict[str, Any]) -> Hashable:
+    return (args, tuple(sorted(kwargs.items()))) if kwargs else args
+
+
+def _call_original(module: str, qualname: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+    """
+    Call a @cached function by reference inside a worker process.
+
+    When cached() was used as a decorator the module attribute is the
+    wrapper, so the undecorated function is taken from it.
+    """
+    target: Any = importlib.import_module(module)
+    for part in qualname.split('.'):
+        target = getattr(target, part)
+    target = getattr(target, '_cached_original', target)
+    return target(*args, **kwargs)
+
+
+def cached(
+    fn: Optional[Callable] = None,
+    *,
+    maxsize: int = 1024,
+    ttl: Optional[float] = None,
+    backend: str = "thread",
+    key: Optional[Callable[..., Hashable]] = None
+) -> Callable:
+    """
+    Cache a function's results and deduplicate concurrent calls.
+
+    Calls run in the thread pool ("thread") or process pool ("process") and
+    block until the result is available. Concurrent calls with the same
+    arguments share one computation. The wrapper exposes .cache (the
+    ResultCache) and .submit(...), which returns a Task instead of blocking.
+
+    Example:
+        @cached(maxsize=512, ttl=300.0, backend="process")
+        def render_report(day):
+            ...
+
+        render_report("2024-01-01")
+        print(render_report.cache.stats())
+
+    Args:
+        fn: Function to wrap (omit to use as a decorator factory).
+        maxsize: Maximum number of cached results.
+        ttl: Seconds a result stays valid. None means no expiry.
+        backend: "thread" or "process".
+        key: Function computing the cache key from the call arguments.
+            Defaults to the arguments themselves (must be hashable).
+
+    Returns:
+        The caching wrapper.
+    """
+    if backend not in ("thread", "process"):
+        raise ValueError(f"Unknown backend: {backend!r}")
+
+    def decorator(func: Callable) -> Callable:
+        from .runtime import Task, _get_executor, _get_cpu_executor
+
+        cache = ResultCache(maxsize, ttl)
+        by_reference = '<locals>' not in func.__qualname__ and func.__name__ != '<lambda>'
+
+        def start(args: tuple, kwargs: Dict[str, Any]) -> Future:
+            if backend == "thread":
+                return _get_executor().submit(func, *args, **kwargs)
+            if by_reference:
+                call = partial(_call_original, func.__module__, func.__qualname__, args, kwargs)
+            else:
+                call = partial(func, *args, **kwargs)
+            return _get_cpu_executor().submit(call)
+
+        def submit(*args: Any, **kwargs: Any) -> 'Task':
+            cache_key = key(*args, **kwargs) if key else _make_key(args, kwargs)
+            return Task(cache.get_or_submit(cache_key, partial(start, args, kwargs)))
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return submit(*args, **kwargs).result()
+
+        wrapper.cache = cache
+        wrapper.submit = submit
+        wrapper._cached_original = func
+        return wrapper
+
+    if fn is not None:
+        return decorator(fn)
+    return decorator
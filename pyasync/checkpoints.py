@@ -0,0 +1,280 @@
+"""
+PyAsync - Checkpoints for long-running process tasks.
+
+A task started with a task id can call checkpoint(state) to save its
+progress to local disk, and restore() to pick it up again. When the task
+is resubmitted with the same id (after a crash, a timeout or a restart
+of the whole program), restore() returns the last saved state instead
+of starting over. When a worker process dies, pyasync resubmits the task
+on a fresh pool automatically.
+
+State is pickled to a temporary file and renamed over the previous
+checkpoint, so a crash mid-write leaves the previous state intact. A
+task that completes successfully removes its checkpoint.
+"""
+
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Any, Optional
+import contextvars
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+
+from . import _futures, _util
+
+
+_SUFFIX = '.ckpt'
+
+# Temporary files older than this (seconds) were left by a crashed writer
+_STALE_TMP = 3600.0
+
+
+class CheckpointStore:
+    """
+    Directory of task checkpoints, one file per task id.
+
+    Example:
+        store = CheckpointStore("/var/lib/myapp/checkpoints")
+        task = pyasync.cpu_background(train, task_id="train-2024-06", checkpoints=store)
+    """
+
+    def __init__(self, directory: str, fsync: bool = False):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory holding the checkpoints (created if needed).
+            fsync: Flush every checkpoint to the disk before replacing the
+                previous one. Protects against power loss as well as
+                process crashes, at the cost of slower checkpoints.
+        """
+        self._directory = os.path.abspath(directory)
+        self._fsync = fsync
+        os.makedirs(self._directory, exist_ok=True)
+        self._remove_stale_tmp()
+
+    def _remove_stale_tmp(self) -> None:
+        """Delete temporary files of saves that crashed before the rename."""
+        # Recent ones may belong to a save still in progress in another process
+        cutoff = time.time() - _STALE_TMP
+        with os.scandir(self._directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.tmp'):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+
+    @property
+    def directory(self) -> str:
+        """Directory holding the checkpoints."""
+        return self._directory
+
+    def _path(self, task_id: str) -> str:
+        digest = hashlib.sha256(task_id.encode()).hexdigest()
+        return os.path.join(self._directory, digest + _SUFFIX)
+
+    def save(self, task_id: str, state: Any) -> None:
+        """Store the state of a task, replacing its previous checkpoint."""
+        data = pickle.dumps((task_id, state), protocol=pickle.HIGHEST_PROTOCOL)
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                if self._fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self._path(task_id))
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def load(self, task_id: str, default: Any = None) -> Any:
+        """Return the last saved state of a task, or default if there is none."""
+        try:
+            with open(self._path(task_id), 'rb') as f:
+                saved_id, state = pickle.loads(f.read())
+        except FileNotFoundError:
+            return default
+        except (TypeError, *_util.LOAD_ERRORS):
+            # Corrupt, truncated or refers to code that no longer exists
+            return default
+        return state if saved_id == task_id else default
+
+    def exists(self, task_id: str) -> bool:
+        """Check if a task has a checkpoint."""
+        return os.path.exists(self._path(task_id))
+
+    def clear(self, task_id: str) -> None:
+        """Remove the checkpoint of a task."""
+        try:
+            os.unlink(self._path(task_id))
+        except FileNotFoundError:
+            pass
+
+    def wrap(self, fn: Callable, task_id: str) -> 'CheckpointedCall':
+        """Return a picklable callable running fn as the task task_id."""
+        return CheckpointedCall(self, task_id, fn)
+
+
+_default_store: Optional[CheckpointStore] = None
+_default_store_lock = threading.Lock()
+
+
+def default_store() -> CheckpointStore:
+    """
+    Store used when a task id is given without a store.
+
+    Lives in $PYASYNC_CHECKPOINT_DIR, or ~/.cache/pyasync/checkpoints.
+    """
+    global _default_store
+    if _default_store is None:
+        with _default_store_lock:
+            if _default_store is None:
+                directory = os.environ.get("PYASYNC_CHECKPOINT_DIR") or os.path.join(
+                    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                    "pyasync", "checkpoints"
+                )
+                _default_store = CheckpointStore(directory)
+    return _default_store
+
+
+class _Session:
+    __slots__ = ('store', 'task_id')
+
+    def __init__(self, store: CheckpointStore, task_id: str):
+        self.store = store
+        self.task_id = task_id
+
+
+_session: contextvars.ContextVar[Optional[_Session]] = contextvars.ContextVar(
+    'pyasync_checkpoint', default=None
+)
+
+
+def _current(name: str) -> _Session:
+    session = _session.get()
+    if session is None:
+        raise RuntimeError(f"{name}() must be called inside a task started with a task_id")
+    return session
+
+
+class CheckpointedCall:
+    """Picklable wrapper running a callable as a checkpointed task."""
+
+    def __init__(self, store: CheckpointStore, task_id: str, fn: Callable):
+        self.store = store
+        self.task_id = task_id
+        self.fn = fn
+
+    @property
+    def __wrapped__(self) -> Callable:
+        return self.fn
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        token = _session.set(_Session(self.store, self.task_id))
+        try:
+            result = self.fn(*args, **kwargs)
+        finally:
+            _session.reset(token)
+        # Done: a later task with the same id starts over
+        self.store.clear(self.task_id)
+        return result
+
+
+def checkpoint(state: Any) -> None:
+    """
+    Save the progress of the running task.
+
+    Call it from inside a task started with a task_id, as often as the
+    work allows. If the task is resubmitted with the same id, restore()
+    returns the last state saved.
+
+    Example:
+        def train(epochs):
+            state = pyasync.restore(default={"epoch": 0, "weights": init()})
+            for epoch in range(state["epoch"], epochs):
+                state["weights"] = run_epoch(state["weights"])
+                state["epoch"] = epoch + 1
+                pyasync.checkpoint(state)
+            return state["weights"]
+
+        pyasync.cpu_run(partial(train, 100), task_id="train-v2")
+
+    Args:
+        state: Picklable state to save.
+
+    Raises:
+        RuntimeError: If called outside a checkpointed task.
+    """
+    session = _current("checkpoint")
+    session.store.save(session.task_id, state)
+
+
+def restore(default: Any = None) -> Any:
+    """
+    Return the last state saved by checkpoint() for the running task.
+
+    Args:
+        default: Returned when the task has no checkpoint yet.
+
+    Raises:
+        RuntimeError: If called outside a checkpointed task.
+    """
+    session = _current("restore")
+    return session.store.load(session.task_id, default)
+
+
+def restart_on_crash(
+    submit: Callable[[], Future],
+    max_restarts: int,
+    on_crash: Callable[[], None]
+) -> Future:
+    """
+    Resubmit a task whose worker process died, up to max_restarts times.
+
+    Args:
+        submit: Starts an attempt. Called again for every restart, so it
+            should look up the pool afresh.
+        max_restarts: Restarts allowed before the crash is reported.
+        on_crash: Called after a crash, before resubmitting (e.g. to
+            replace the broken pool).
+    """
+    target: Future = Future()
+    restarts = [0]
+
+    def attempt() -> None:
+        try:
+            inner = submit()
+        except Exception as e:
+            _futures.set_exception(target, e)
+            return
+        target.add_done_callback(lambda f: f.cancelled() and inner.cancel())
+        inner.add_done_callback(finished)
+
+    def finished(inner: Future) -> None:
+        if target.cancelled():
+            return
+        if (not inner.cancelled() and isinstance(inner.exception(), BrokenProcessPool)
+                and restarts[0] < max_restarts):
+            restarts[0] += 1
+            try:
+                on_crash()
+            except Exception as e:
+                _futures.set_exception(target, e)
+                return
+            attempt()
+            return
+        _futures.copy_outcome(inner, target)
+
+    attempt()
+    return target
@@ -0,0 +1,115 @@
+"""
+PyAsync - Task combinators.
+
+all_of() and any_of() combine Tasks and CpuTasks into a single Task,
+resolved from completion callbacks so no thread waits on the inputs.
+"""
+
+from concurrent.futures import Future, CancelledError
+from typing import Any, List, Union
+import threading
+
+from . import _futures
+from .runtime import Task, CpuTask
+
+
+TaskLike = Union[Task, CpuTask, Future]
+
+
+def _future_of(task: TaskLike) -> Future:
+    return task if isinstance(task, Future) else task._future
+
+
+def all_of(*tasks: TaskLike) -> Task:
+    """
+    Combine tasks into one that resolves with all of their results.
+
+    Results are in the same order as the input tasks. The combined task
+    fails as soon as any input fails or is cancelled.
+
+    Example:
+        user = background(load_user)
+        stats = cpu_background(partial(compute_stats, user_id))
+
+        all_of(user, stats).then(lambda results: render(*results))
+
+    Args:
+        *tasks: Tasks, CpuTasks or Futures.
+
+    Returns:
+        Task resolved with the list of results.
+    """
+    futures = [_future_of(task) for task in tasks]
+    combined: Future = Future()
+    if not futures:
+        combined.set_result([])
+        return Task(combined)
+
+    results: List[Any] = [None] * len(futures)
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def on_done(index: int, future: Future) -> None:
+        if future.cancelled():
+            _futures.set_exception(combined, CancelledError())
+            return
+        exc = future.exception()
+        if exc is not None:
+            _futures.set_exception(combined, exc)
+            return
+        results[index] = future.result()
+        with lock:
+            remaining[0] -= 1
+            finished = remaining[0] == 0
+        if finished:
+            _futures.set_result(combined, results)
+
+    for index, future in enumerate(futures):
+        future.add_done_callback(lambda f, i=index: on_done(i, f))
+    return Task(combined)
+
+
+def any_of(*tasks: TaskLike) -> Task:
+    """
+    Combine tasks into one that resolves with the first successful result.
+
+    If every input fails, the combined task fails with the exception of
+    the last one to finish. Remaining inputs are not cancelled.
+
+    Example:
+        fastest = any_of(
+            background(lambda: fetch(primary)),
+            background(lambda: fetch(replica))
+        )
+
+    Args:
+        *tasks: Tasks, CpuTasks or Futures.
+
+    Returns:
+        Task resolved with the first successful result.
+
+    Raises:
+        ValueError: If no tasks are given.
+    """
+    futures = [_future_of(task) for task in tasks]
+    if not futures:
+        raise ValueError("any_of() needs at least one task")
+
+    combined: Future = Future()
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def on_done(future: Future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            _futures.set_result(combined, future.result())
+            return
+        with lock:
+            remaining[0] -= 1
+            finished = remaining[0] == 0
+        if finished:
+            exc = CancelledError() if future.cancelled() else future.exception()
+            _futures.set_exception(combined, exc)
+
+    for future in futures:
+        future.add_done_callback(on_done)
+    return Task(combined)
@@ -0,0 +1,271 @@
+"""
+PyAsync - Detection of CPU-bound work on the thread pool.
+
+CPU-heavy callables in parallel() or background() hold the GIL and
+delay every I/O task sharing the pool. While a detector is running,
+each thread pool task records its thread CPU time (time.thread_time)
+and wall time. Callables that spend most of their wall time on the CPU
+are flagged by qualified name, and can be redirected to the process
+pool automatically.
+"""
+
+from typing import Callable, Any, Dict, Hashable, List, Optional, Set, Tuple
+import pickle
+import threading
+import time
+import warnings
+
+from . import _util
+
+
+class _Usage:
+    __slots__ = ('name', 'calls', 'cpu', 'wall', 'redirected', 'flagged')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.cpu = 0.0
+        self.wall = 0.0
+        self.redirected = 0
+        self.flagged = False
+
+
+class CpuBoundDetector:
+    """
+    Per-callable CPU accounting of thread pool tasks.
+
+    Created by detect_cpu_bound(). Use it as a context manager, or call
+    stop() when done.
+    """
+
+    def __init__(self, threshold: float, min_calls: int, min_cpu: float, redirect: bool, warn: bool):
+        self.threshold = threshold
+        self.min_calls = min_calls
+        self.min_cpu = min_cpu
+        self.redirect = redirect
+        self.warn = warn
+        self._lock = threading.Lock()
+        self._usage: Dict[Hashable, _Usage] = {}
+        # Flagged callables that could not be sent to a process
+        self._unpicklable: Set[Hashable] = set()
+
+    def __enter__(self) -> 'CpuBoundDetector':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+        return False
+
+    def stop(self) -> None:
+        """Stop measuring tasks (the collected report is kept)."""
+        global _detectors
+        with _detectors_lock:
+            _detectors = tuple(detector for detector in _detectors if detector is not self)
+
+    def _record(self, key: Hashable, name: str, cpu: float, wall: float) -> None:
+        with self._lock:
+            usage = self._usage.get(key)
+            if usage is None:
+                usage = self._usage[key] = _Usage(name)
+            usage.calls += 1
+            usage.cpu += cpu
+            usage.wall += wall
+            newly_flagged = not usage.flagged and self._crosses(usage)
+            if newly_flagged:
+                usage.flagged = True
+        if newly_flagged and self.warn:
+            action = "; redirecting it to the process pool" if self.redirect else ""
+            warnings.warn(
+                f"{name} is CPU-bound on the thread pool "
+                f"({usage.cpu / usage.wall:.0%} CPU over {usage.calls} calls){action}",
+                RuntimeWarning, stacklevel=2
+            )
+
+    def _crosses(self, usage: _Usage) -> bool:
+        return (
+            usage.calls >= self.min_calls
+            and usage.cpu >= self.min_cpu
+            and usage.wall > 0
+            and usage.cpu / usage.wall >= self.threshold
+        )
+
+    def _should_redirect(self, key: Hashable) -> bool:
+        if not self.redirect or key in self._unpicklable:
+            return False
+        usage = self._usage.get(key)
+        return usage is not None and usage.flagged
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        Return the flagged callables, most CPU time first.
+
+        Returns:
+            List of dicts with name (module.qualname), calls, cpu and wall
+            seconds (totals), cpu_share (cpu / wall) and redirected (calls
+            sent to the process pool instead).
+        """
+        return [entry for entry in self.usage() if entry["flagged"]]
+
+    def usage(self) -> List[Dict[str, Any]]:
+        """Return the accounting of every callable seen, most CPU time first."""
+        with self._lock:
+            usages = list(self._usage.values())
+            return [
+                {
+                    "name": usage.name,
+                    "calls": usage.calls,
+                    "cpu": usage.cpu,
+                    "wall": usage.wall,
+                    "cpu_share": usage.cpu / usage.wall if usage.wall else 0.0,
+                    "redirected": usage.redirected,
+                    "flagged": usage.flagged,
+                }
+                for usage in sorted(usages, key=lambda usage: usage.cpu, reverse=True)
+            ]
+
+
+_detectors: Tuple[CpuBoundDetector, ...] = ()
+_detectors_lock = threading.Lock()
+
+
+def detect_cpu_bound(
+    threshold: float = 0.5,
+    min_calls: int = 3,
+    min_cpu: float = 0.05,
+    redirect: bool = False,
+    warn: bool = True
+) -> CpuBoundDetector:
+    """
+    Start flagging CPU-bound callables submitted to the thread pool.
+
+    A callable is flagged once it has run at least min_calls times, used
+    at least min_cpu seconds of CPU in total, and spent at least
+    threshold of its wall time on the CPU. Work in C extensions that
+    release the GIL (hashing, compression, numpy) counts as CPU time too.
+
+    Example:
+        with pyasync.detect_cpu_bound(threshold=0.7) as detector:
+            serve_requests()
+
+        for entry in detector.report():
+            print(entry["name"], entry["cpu"], entry["cpu_share"])
+
+        # Or move offenders off the thread pool automatically
+        pyasync.detect_cpu_bound(redirect=True)
+
+    Args:
+        threshold: CPU share (CPU time / wall time, 0..1) that flags a callable.
+        min_calls: Calls measured before a callable can be flagged.
+        min_cpu: Total CPU seconds before a callable can be flagged.
+        redirect: Send later calls of flagged callables to the process
+            pool. Calls that cannot be pickled (lambdas, closures) keep
+            running on threads.
+        warn: Emit a RuntimeWarning when a callable is first flagged.
+
+    Returns:
+        CpuBoundDetector; measuring continues until stop() or the end of
+        its with block.
+    """
+    if not 0 < threshold <= 1:
+        raise ValueError("threshold must be between 0 and 1")
+    detector = CpuBoundDetector(threshold, min_calls, min_cpu, redirect, warn)
+    global _detectors
+    with _detectors_lock:
+        _detectors = _detectors + (detector,)
+    return detector
+
+
+def active() -> bool:
+    """Return True if any detector is running."""
+    return bool(_detectors)
+
+
+class _PickledCall:
+    """
+    A call redirected to the process pool, pickled once.
+
+    Pickling is how redirect() finds out whether the call can move at
+    all, so the bytes are kept and sent as they are instead of pickling
+    the call a second time on submit.
+    """
+
+    __slots__ = ('fn', 'payload')
+
+    def __init__(self, fn: Optional[Callable], payload: bytes):
+        self.fn = fn
+        self.payload = payload
+
+    @property
+    def __wrapped__(self) -> Optional[Callable]:
+        return self.fn
+
+    def __getstate__(self) -> bytes:
+        return self.payload
+
+    def __setstate__(self, payload: bytes) -> None:
+        self.fn = None
+        self.payload = payload
+
+    def __call__(self) -> Any:
+        fn, args, kwargs = pickle.loads(self.payload)
+        return fn(*args, **kwargs)
+
+
+def redirect(fn: Callable, args: tuple, kwargs: Dict[str, Any]) -> Optional[Callable[[], Any]]:
+    """
+    Check whether a thread pool call should go to the process pool instead.
+
+    Returns the call to submit to the process pool, or None to keep it on
+    the thread pool.
+    """
+    detectors = [detector for detector in _detectors if detector.redirect]
+    if not detectors:
+        return None
+    key, _ = _util.target(fn)
+    detectors = [detector for detector in detectors if detector._should_redirect(key)]
+    if not detectors:
+        return None
+    try:
+        payload = pickle.dumps((fn, args, kwargs), pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        for detector in detectors:
+            detector._unpicklable.add(key)
+        return None
+    for detector in detectors:
+        with detector._lock:
+            detector._usage[key].redirected += 1
+    return _PickledCall(fn, payload)
+
+
+class _MeasuredCall:
+    """Thread pool task recording its CPU and wall time."""
+
+    __slots__ = ('fn', 'args', 'kwargs', 'detectors')
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: Dict[str, Any],
+                 detectors: Tuple[CpuBoundDetector, ...]):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.detectors = detectors
+
+    @property
+    def __wrapped__(self) -> Callable:
+        return self.fn
+
+    def __call__(self) -> Any:
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            return self.fn(*self.args, **self.kwargs)
+        finally:
+            cpu = time.thread_time() - cpu
+            wall = time.perf_counter() - wall
+            key, name = _util.target(self.fn)
+            for detector in self.detectors:
+                detector._record(key, name, cpu, wall)
+
+
+def wrap(fn: Callable, args: tuple, kwargs: Dict[str, Any]) -> Callable[[], Any]:
+    """Wrap a thread pool call so the running detectors measure it."""
+    return _MeasuredCall(fn, args, kwargs, _detectors)
@@ -0,0 +1,331 @@
+"""
+PyAsync - Cost-hinted, longest-job-first dispatch.
+
+Process pools hand work to idle workers in submission order. When the
+largest job is submitted last, every other worker sits idle while it
+runs alone at the end. Given a cost for each call (a hint, or an
+estimate learned from earlier runs), calls are dispatched longest first
+(LPT scheduling), which keeps the makespan within 4/3 of optimal.
+Calls to functions marked with splittable() that cost more than an
+even share of the total are split into smaller calls first, and their
+partial results combined.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Any, Dict, Hashable, List, Optional, Sequence, Tuple, Union
+from functools import partial
+import threading
+import time
+
+from . import _futures, _util
+
+
+# A call as (function, args, kwargs)
+Call = Tuple[Callable, tuple, Dict[str, Any]]
+
+# How many times an oversized call may be split again
+_MAX_SPLIT_DEPTH = 4
+
+
+class CostModel:
+    """
+    Runtime estimates learned from completed calls.
+
+    Estimates are kept per function and per arguments (when hashable),
+    as an exponential moving average of the seconds each call took in
+    the worker. Calls with unseen arguments are estimated by the
+    function's average.
+
+    Example:
+        model = CostModel()
+
+        # The first run learns, later runs dispatch the slowest calls first
+        for batch in batches:
+            results = cpu_parallel(*batch, cost=model)
+    """
+
+    def __init__(self, smoothing: float = 0.3, max_entries: int = 10_000):
+        """
+        Initialize the model.
+
+        Args:
+            smoothing: Weight of each new measurement (0-1).
+            max_entries: Per-argument estimates kept (least recently
+                updated ones are dropped first).
+        """
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be between 0 and 1")
+        self._smoothing = smoothing
+        self._max_entries = max_entries
+        self._calls: 'OrderedDict[Hashable, float]' = OrderedDict()
+        # Function name -> (average seconds, calls)
+        self._functions: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _keys(fn: Callable, args: tuple, kwargs: Dict[str, Any]) -> Tuple[str, Optional[Hashable]]:
+        name = _util.target(fn)[1]
+        try:
+            key = (name, args, tuple(sorted(kwargs.items())))
+            hash(key)
+        except TypeError:
+            key = None
+        return name, key
+
+    def estimate(self, fn: Callable, args: tuple = (), kwargs: Optional[Dict[str, Any]] = None) -> Optional[float]:
+        """Return the estimated seconds of a call, or None if the function is unknown."""
+        name, key = self._keys(fn, args, kwargs or {})
+        with self._lock:
+            if key is not None and key in self._calls:
+                return self._calls[key]
+            average = self._functions.get(name)
+            return average[0] if average is not None else None
+
+    def record(self, fn: Callable, args: tuple, kwargs: Dict[str, Any], seconds: float) -> None:
+        """Feed the duration of a completed call into the estimates."""
+        name, key = self._keys(fn, args, kwargs)
+        with self._lock:
+            average, calls = self._functions.get(name, (seconds, 0))
+            calls += 1
+            self._functions[name] = (average + (seconds - average) / calls, calls)
+            if key is None:
+                return
+            previous = self._calls.pop(key, None)
+            if previous is not None:
+                seconds = previous + (seconds - previous) * self._smoothing
+            self._calls[key] = seconds
+            while len(self._calls) > self._max_entries:
+                self._calls.popitem(last=False)
+
+
+# Estimates shared by cost="learned"
+default_model = CostModel()
+
+CostLike = Union[Sequence[float], Callable[..., float], CostModel, str, None]
+
+
+def splittable(
+    split: Callable[..., Sequence[tuple]],
+    combine: Callable[[List[Any]], Any]
+) -> Callable[[Callable], Callable]:
+    """
+    Mark a function whose calls can be split into smaller calls.
+
+    When a call with a cost= hint costs more than an even share of the
+    batch, split(*args, **kwargs) is called to break it into argument
+    tuples for smaller calls of the same function, and combine() merges
+    their results, in order, into the result of the original call.
+
+    Example:
+        @pyasync.splittable(
+            split=lambda start, end: [(start, (start + end) // 2), ((start + end) // 2, end)],
+            combine=sum
+        )
+        def count_primes(start, end):
+            ...
+
+        results = cpu_parallel(*[partial(count_primes, s, e) for s, e in ranges],
+                               cost=lambda call: call.args[1] - call.args[0])
+
+    Args:
+        split: Returns a list of argument tuples, one per smaller call.
+        combine: Merges the list of partial results.
+
+    Returns:
+        Decorator returning the function itself, so it stays picklable.
+    """
+    def decorator(fn: Callable) -> Callable:
+        fn._pyasync_split = split
+        fn._pyasync_combine = combine
+        return fn
+    return decorator
+
+
+def as_call(fn: Callable) -> Call:
+    """Split a no-argument callable (usually a partial) into a Call."""
+    if type(fn) is partial:
+        return fn.func, fn.args, fn.keywords
+    return fn, (), {}
+
+
+def resolve(
+    cost: CostLike,
+    calls: Sequence[Call],
+    hint: Callable[[int], float]
+) -> Tuple[List[float], Optional[CostModel]]:
+    """
+    Work out the cost of every call.
+
+    Args:
+        cost: Per-call sequence, a function applied with hint(), a
+            CostModel, or "learned" for default_model.
+        calls: The calls to cost.
+        hint: Applies a cost function to the call at an index.
+
+    Returns:
+        The costs, and the model to record durations into (if any).
+        Calls a model knows nothing about get the average known cost.
+    """
+    model = None
+    if isinstance(cost, str):
+        if cost != "learned":
+            raise ValueError(f"Unknown cost: {cost!r}")
+        cost = default_model
+    if isinstance(cost, CostModel):
+        model = cost
+        costs: List[Optional[float]] = [model.estimate(*call) for call in calls]
+    elif callable(cost):
+        costs = [float(hint(index)) for index in range(len(calls))]
+    else:
+        costs = [float(value) for value in cost]
+        if len(costs) != len(calls):
+            raise ValueError(f"cost has {len(costs)} entries for {len(calls)} calls")
+
+    known = [value for value in costs if value is not None]
+    fallback = sum(known) / len(known) if known else 1.0
+    return [fallback if value is None else value for value in costs], model
+
+
+class Piece:
+    """One call to dispatch: a whole call, or part of a split one."""
+
+    __slots__ = ('index', 'part', 'fn', 'args', 'kwargs', 'cost')
+
+    def __init__(self, index: int, fn: Callable, args: tuple, kwargs: Dict[str, Any], cost: float):
+        self.index = index
+        # Position among the parts of a split call
+        self.part = 0
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.cost = cost
+
+
+def plan(calls: Sequence[Call], costs: Sequence[float], workers: int) -> List[Piece]:
+    """
+    Split oversized calls and order everything longest first.
+
+    A call is split (if its function is splittable) while it costs more
+    than total / workers, the best possible makespan. The sort is
+    stable, so calls of equal cost keep their order.
+    """
+    share = sum(costs) / max(1, workers)
+    pieces: List[Piece] = []
+    for index, ((fn, args, kwargs), cost) in enumerate(zip(calls, costs)):
+        parts = _split(Piece(index, fn, args, kwargs, cost), share, _MAX_SPLIT_DEPTH)
+        for part, piece in enumerate(parts):
+            piece.part = part
+        pieces.extend(parts)
+    pieces.sort(key=lambda piece: piece.cost, reverse=True)
+    return pieces
+
+
+def _split(piece: Piece, share: float, depth: int) -> List[Piece]:
+    split = getattr(piece.fn, '_pyasync_split', None)
+    if split is None or depth == 0 or piece.cost <= share:
+        return [piece]
+    parts = list(split(*piece.args, **piece.kwargs))
+    if len(parts) < 2:
+        return [piece]
+    cost = piece.cost / len(parts)
+    result = []
+    for args in parts:
+        result.extend(_split(Piece(piece.index, piece.fn, tuple(args), {}, cost), share, depth - 1))
+    return result
+
+
+class _TimedCall:
+    """Runs a call in the worker and reports how long it took."""
+
+    __slots__ = ('fn', 'args', 'kwargs')
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: Dict[str, Any]):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    @property
+    def __wrapped__(self) -> Callable:
+        return self.fn
+
+    def __call__(self) -> Tuple[Any, float]:
+        start = time.perf_counter()
+        result = self.fn(*self.args, **self.kwargs)
+        return result, time.perf_counter() - start
+
+
+def _learn(model: CostModel, piece: Piece, future: Future) -> Any:
+    result, seconds = future.result()
+    model.record(piece.fn, piece.args, piece.kwargs, seconds)
+    return result
+
+
+def dispatch(
+    pieces: List[Piece],
+    count: int,
+    submit: Callable[[Callable[[], Any]], Future],
+    model: Optional[CostModel] = None,
+    wrap: Optional[Callable[[Callable], Callable]] = None
+) -> List[Future]:
+    """
+    Submit planned pieces in order, and return one Future per original call.
+
+    Results of split calls are combined in argument order. wrap, if
+    given, is applied to each function before it is sent (e.g. to run
+    it through a DiskCache).
+    """
+    by_index: List[List[Tuple[Piece, Future]]] = [[] for _ in range(count)]
+    for piece in pieces:
+        fn = piece.fn if wrap is None else wrap(piece.fn)
+        if model is not None:
+            future = _futures.DerivedFuture(
+                submit(_TimedCall(fn, piece.args, piece.kwargs)), partial(_learn, model, piece)
+            )
+        else:
+            future = submit(partial(fn, *piece.args, **piece.kwargs))
+        by_index[piece.index].append((piece, future))
+
+    futures = []
+    for parts in by_index:
+        if len(parts) == 1:
+            futures.append(parts[0][1])
+            continue
+        parts.sort(key=lambda part: part[0].part)
+        combine = parts[0][0].fn._pyasync_combine
+        futures.append(_combined([future for _, future in parts], combine))
+    return futures
+
+
+def _combined(parts: List[Future], combine: Callable[[List[Any]], Any]) -> Future:
+    """Future for combine(results of parts), failing with the first failed part."""
+    target: Future = Future()
+    remaining = [len(parts)]
+    lock = threading.Lock()
+
+    def done(_: Future) -> None:
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        for part in parts:
+            if part.cancelled():
+                target.cancel()
+                return
+            if part.exception() is not None:
+                _futures.set_exception(target, part.exception())
+                return
+        try:
+            _futures.set_result(target, combine([part.result() for part in parts]))
+        except Exception as e:
+            _futures.set_exception(target, e)
+
+    def cancel(future: Future) -> None:
+        if future.cancelled():
+            for part in parts:
+                part.cancel()
+
+    for part in parts:
+        part.add_done_callback(done)
+    target.add_done_callback(cancel)
+    return target
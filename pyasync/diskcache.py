@@ -0,0 +1,261 @@
+"""
+PyAsync - Persistent result cache for process tasks.
+
+A DiskCache memoizes process task results in a local directory, keyed by
+a hash of the function (qualified name and bytecode) and its pickled
+arguments. Lookups and writes happen inside the worker process, so a hit
+never sends the computation through the parent and survives restarts.
+"""
+
+from functools import partial
+from types import CodeType
+from typing import Callable, Any, Dict, List, Optional, Tuple
+import hashlib
+import mmap
+import os
+import pickle
+import tempfile
+import threading
+
+from . import _util
+
+
+# Values at least this large are read through a memory map
+_MMAP_THRESHOLD = 1 << 20
+_SUFFIX = '.pkl'
+
+
+def _hash_code(code: CodeType, digest: 'hashlib._Hash') -> None:
+    """Feed the parts of a code object that define its behavior into digest."""
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _hash_code(const, digest)
+        else:
+            digest.update(repr(const).encode())
+
+
+def _hash_callable(fn: Callable, digest: 'hashlib._Hash') -> None:
+    """Feed a callable's identity and bytecode into digest."""
+    if isinstance(fn, partial):
+        _hash_callable(fn.func, digest)
+        digest.update(pickle.dumps((fn.args, sorted(fn.keywords.items())), protocol=4))
+        return
+
+    module = getattr(fn, '__module__', None) or type(fn).__module__
+    qualname = getattr(fn, '__qualname__', None) or type(fn).__qualname__
+    digest.update(f"{module}.{qualname}".encode())
+    code = getattr(fn, '__code__', None)
+    if code is not None:
+        _hash_code(code, digest)
+
+
+class DiskCache:
+    """
+    Size-bounded, content-addressed on-disk cache of process task results.
+
+    Entries are keyed by a SHA-256 of the function's qualified name and
+    bytecode plus its pickled arguments, so a result is reused only when
+    both the code and the inputs are unchanged. When the directory grows
+    past max_bytes, least recently used entries are evicted.
+
+    The cache object only holds its settings, so it is cheap to pickle and
+    every worker process opens the directory itself.
+
+    Example:
+        cache = DiskCache("/var/cache/etl", max_bytes=10 * 1024**3)
+
+        totals = cpu_parallel(
+            *[partial(aggregate, part) for part in partitions],
+            disk_cache=cache
+        )
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 1 << 30):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding the cache entries (created if needed).
+            max_bytes: Total size budget for all entries.
+        """
+        self._directory = os.path.abspath(directory)
+        self._max_bytes = max_bytes
+        os.makedirs(self._directory, exist_ok=True)
+        # Bytes on disk as last seen by this process, plus its own writes
+        # since. None until the first write walks the directory.
+        self._total: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Each process tracks the size on its own
+        return {"_directory": self._directory, "_max_bytes": self._max_bytes}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._total = None
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> str:
+        """Directory holding the cache entries."""
+        return self._directory
+
+    def key(self, fn: Callable, args: tuple = (), kwargs: Optional[Dict[str, Any]] = None) -> str:
+        """Return the cache key of calling fn(*args, **kwargs)."""
+        digest = hashlib.sha256()
+        _hash_callable(fn, digest)
+        digest.update(pickle.dumps((args, sorted((kwargs or {}).items())), protocol=4))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, key[:2], key + _SUFFIX)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a key.
+
+        Returns:
+            (True, value) on a hit, (False, None) on a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size >= _MMAP_THRESHOLD:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        value = pickle.loads(mapped)
+                else:
+                    value = pickle.loads(f.read())
+        except FileNotFoundError:
+            return False, None
+        except _util.LOAD_ERRORS:
+            # Corrupt, truncated or refers to code that no longer exists
+            return False, None
+
+        # Bump the modification time: it is the recency used for LRU eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return True, value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store a value, then evict old entries if over budget.
+
+        The size of the cache is tracked as entries are written, so the
+        directory is only walked once it may be over max_bytes. Each
+        process counts its own writes, so the directory can briefly
+        exceed the budget by what other processes wrote since.
+        """
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self._max_bytes:
+            return
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            replaced = os.stat(path).st_size
+        except FileNotFoundError:
+            replaced = 0
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            # Atomic: concurrent readers see either no entry or a complete one
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+        with self._lock:
+            if self._total is not None:
+                self._total += len(data) - replaced
+                over = self._total > self._max_bytes
+            else:
+                over = True
+        if over:
+            self.evict()
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        for root, _, files in os.walk(self._directory):
+            for name in files:
+                if not name.endswith(_SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache fits max_bytes.
+
+        Returns:
+            Number of entries removed.
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self._max_bytes:
+                break
+            try:
+                os.unlink(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        with self._lock:
+            self._total = total
+        return removed
+
+    def usage(self) -> Dict[str, int]:
+        """Return the number of entries and total bytes on disk."""
+        entries = self._entries()
+        return {"entries": len(entries), "bytes": sum(size for _, size, _ in entries)}
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        for _, _, path in self._entries():
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._total = 0
+
+    def wrap(self, fn: Callable) -> 'CachedCall':
+        """Return a picklable callable that runs fn through this cache."""
+        return CachedCall(self, fn)
+
+
+class CachedCall:
+    """
+    Picklable wrapper that memoizes a callable in a DiskCache.
+
+    Runs wherever it is called, typically inside a worker process: the key
+    is hashed, the entry read or computed and written there.
+    """
+
+    def __init__(self, cache: DiskCache, fn: Callable):
+        self.cache = cache
+        self.fn = fn
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        key = self.cache.key(self.fn, args, kwargs)
+        hit, value = self.cache.get(key)
+        if hit:
+            return value
+        value = self.fn(*args, **kwargs)
+        self.cache.put(key, value)
+        return value
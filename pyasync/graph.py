@@ -0,0 +1,319 @@
+"""
+PyAsync - Dependency-graph execution.
+
+A Graph runs a DAG of thread and process steps. Each node is dispatched as
+soon as all of its dependencies have finished, so independent branches
+never wait on each other, and intermediate results are dropped once the
+last node that consumes them has run.
+"""
+
+from concurrent.futures import Future
+from functools import partial
+from typing import Callable, Any, Dict, List, Optional, Sequence, Tuple
+import threading
+import time
+
+from .retry import Retry
+from .runtime import _get_executor, _get_cpu_executor, _submit
+
+
+def _timed(fn: Callable, args: tuple) -> Tuple[Any, float]:
+    """Run fn(*args) and measure its run time where it executes."""
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, time.perf_counter() - start
+
+
+class _Node:
+    __slots__ = ('name', 'fn', 'deps', 'backend', 'retry', 'keep', 'consumers')
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable,
+        deps: Tuple[str, ...],
+        backend: str,
+        retry: Optional[Retry],
+        keep: bool
+    ):
+        self.name = name
+        self.fn = fn
+        self.deps = deps
+        self.backend = backend
+        self.retry = retry
+        self.keep = keep
+        self.consumers: List[str] = []
+
+
+class GraphReport:
+    """
+    Outcome and timing of a Graph run.
+
+    Attributes:
+        results: Results of the output nodes (nodes nobody depends on, plus
+            nodes added with keep=True), by name.
+        durations: Run time of each node in seconds, measured where it ran.
+        timeline: (start, end) of each node in seconds since the run began,
+            from dispatch to completion as seen by the caller.
+        critical_path: Longest chain of dependent nodes by run time.
+        critical_path_time: Sum of run times along the critical path.
+        wall_time: Total seconds the run took.
+    """
+
+    def __init__(
+        self,
+        results: Dict[str, Any],
+        durations: Dict[str, float],
+        timeline: Dict[str, Tuple[float, float]],
+        critical_path: List[str],
+        critical_path_time: float,
+        wall_time: float
+    ):
+        self.results = results
+        self.durations = durations
+        self.timeline = timeline
+        self.critical_path = critical_path
+        self.critical_path_time = critical_path_time
+        self.wall_time = wall_time
+
+    def __getitem__(self, name: str) -> Any:
+        return self.results[name]
+
+    def __repr__(self) -> str:
+        return (
+            f"GraphReport(wall_time={self.wall_time:.3f}, "
+            f"critical_path={' -> '.join(self.critical_path)}, "
+            f"critical_path_time={self.critical_path_time:.3f})"
+        )
+
+
+class Graph:
+    """
+    DAG of steps, each running on the thread pool or the process pool.
+
+    Nodes receive the results of their dependencies as positional
+    arguments, in the order the dependencies were declared. A node starts
+    as soon as its own inputs are ready.
+
+    Example:
+        graph = (
+            Graph()
+            .add("orders", fetch_orders)
+            .add("users", fetch_users)
+            .add("parsed", parse_orders, deps=["orders"], backend="process")
+            .add("report", build_report, deps=["parsed", "users"], backend="process")
+        )
+
+        report = graph.run(timeout=600.0)
+        print(report["report"], report.critical_path)
+    """
+
+    def __init__(self):
+        self._nodes: Dict[str, _Node] = {}
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        deps: Sequence[str] = (),
+        backend: str = "thread",
+        retry: Optional[Retry] = None,
+        keep: bool = False
+    ) -> 'Graph':
+        """
+        Add a node.
+
+        Args:
+            name: Unique node name.
+            fn: Function called with the results of deps. Must be picklable
+                for the "process" backend.
+            deps: Names of the nodes whose results fn receives.
+            backend: "thread" or "process".
+            retry: Retry policy for failed attempts.
+            keep: Include the result in the report even if other nodes
+                consume it (by default only sink nodes are kept).
+
+        Returns:
+            This graph, for chaining.
+        """
+        if name in self._nodes:
+            raise ValueError(f"Duplicate node: {name!r}")
+        if backend not in ("thread", "process"):
+            raise ValueError(f"Unknown backend: {backend!r}")
+
+        self._nodes[name] = _Node(name, fn, tuple(deps), backend, retry, keep)
+        return self
+
+    def _order(self) -> List[str]:
+        """Return the nodes in topological order, linking consumers."""
+        for node in self._nodes.values():
+            node.consumers = []
+        for node in self._nodes.values():
+            for dep in dict.fromkeys(node.deps):
+                if dep not in self._nodes:
+                    raise ValueError(f"Node {node.name!r} depends on unknown node {dep!r}")
+                self._nodes[dep].consumers.append(node.name)
+
+        waiting = {name: len(set(node.deps)) for name, node in self._nodes.items()}
+        ready = [name for name, count in waiting.items() if count == 0]
+        order = []
+        while ready:
+            name = ready.pop()
+            order.append(name)
+            for consumer in self._nodes[name].consumers:
+                waiting[consumer] -= 1
+                if waiting[consumer] == 0:
+                    ready.append(consumer)
+
+        if len(order) != len(self._nodes):
+            cycle = sorted(name for name in self._nodes if name not in order)
+            raise ValueError(f"Graph has a cycle through: {', '.join(cycle)}")
+        return order
+
+    def run(self, timeout: Optional[float] = None) -> GraphReport:
+        """
+        Run the graph and wait for every node to finish.
+
+        Args:
+            timeout: Maximum seconds to wait. None means wait forever.
+
+        Returns:
+            GraphReport with the output results and timings.
+
+        Raises:
+            ValueError: If a dependency is unknown or the graph has a cycle.
+            TimeoutError: If timeout expires before the graph completes.
+            Exception: The first exception raised by a node. Nodes not yet
+                started are skipped.
+        """
+        order = self._order()
+        return _GraphRun(self._nodes, order).run(timeout)
+
+
+class _GraphRun:
+    """State of one Graph.run() call."""
+
+    def __init__(self, nodes: Dict[str, _Node], order: List[str]):
+        self._nodes = nodes
+        self._order = order
+        self._waiting = {name: len(set(node.deps)) for name, node in nodes.items()}
+        self._refs = {name: len(node.consumers) for name, node in nodes.items()}
+        self._values: Dict[str, Any] = {}
+        self._outputs: Dict[str, Any] = {}
+        self._durations: Dict[str, float] = {}
+        self._timeline: Dict[str, Tuple[float, float]] = {}
+        self._futures: List[Future] = []
+        self._remaining = len(nodes)
+        self._error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        self._start = 0.0
+
+    def run(self, timeout: Optional[float]) -> GraphReport:
+        self._start = time.perf_counter()
+        if not self._nodes:
+            self._finished.set()
+        for name in [name for name, count in self._waiting.items() if count == 0]:
+            self._dispatch(name)
+
+        if not self._finished.wait(timeout):
+            self._abort()
+            raise TimeoutError(f"Graph did not finish within {timeout} seconds")
+        if self._error is not None:
+            raise self._error
+
+        path, path_time = self._critical_path()
+        return GraphReport(
+            self._outputs, self._durations, self._timeline, path, path_time,
+            time.perf_counter() - self._start
+        )
+
+    def _dispatch(self, name: str) -> None:
+        node = self._nodes[name]
+        with self._lock:
+            if self._error is not None:
+                return
+            args = tuple(self._values[dep] for dep in node.deps)
+        executor = _get_executor() if node.backend == "thread" else _get_cpu_executor()
+        started = time.perf_counter() - self._start
+        try:
+            future = _submit(executor, _timed, (node.fn, args), retry=node.retry)
+        except Exception as e:
+            self._fail(e)
+            return
+        with self._lock:
+            self._futures.append(future)
+        future.add_done_callback(partial(self._on_done, name, started))
+
+    def _on_done(self, name: str, started: float, future: Future) -> None:
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is not None:
+            self._fail(exc)
+            return
+
+        value, duration = future.result()
+        node = self._nodes[name]
+        ready = []
+        with self._lock:
+            self._durations[name] = duration
+            self._timeline[name] = (started, time.perf_counter() - self._start)
+            if node.consumers:
+                self._values[name] = value
+            if node.keep or not node.consumers:
+                self._outputs[name] = value
+
+            # Drop inputs nobody else is waiting for
+            for dep in dict.fromkeys(node.deps):
+                self._refs[dep] -= 1
+                if self._refs[dep] == 0:
+                    del self._values[dep]
+
+            for consumer in node.consumers:
+                self._waiting[consumer] -= 1
+                if self._waiting[consumer] == 0:
+                    ready.append(consumer)
+
+            self._remaining -= 1
+            if self._remaining == 0:
+                self._finished.set()
+
+        for consumer in ready:
+            self._dispatch(consumer)
+
+    def _fail(self, exc: BaseException) -> None:
+        with self._lock:
+            if self._error is None:
+                self._error = exc
+        self._abort()
+        self._finished.set()
+
+    def _abort(self) -> None:
+        with self._lock:
+            if self._error is None:
+                self._error = TimeoutError("Graph run aborted")
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+
+    def _critical_path(self) -> Tuple[List[str], float]:
+        """Longest chain of dependent nodes, weighted by run time."""
+        if not self._order:
+            return [], 0.0
+
+        totals: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for name in self._order:
+            deps = self._nodes[name].deps
+            slowest = max(deps, key=totals.__getitem__, default=None)
+            previous[name] = slowest
+            totals[name] = self._durations[name] + (totals[slowest] if slowest else 0.0)
+
+        name: Optional[str] = max(totals, key=totals.__getitem__)
+        total = totals[name]
+        path = []
+        while name is not None:
+            path.append(name)
+            name = previous[name]
+        return path[::-1], total
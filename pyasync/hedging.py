@@ -0,0 +1,205 @@
+"""
+PyAsync - Hedged requests.
+
+A Hedge policy launches a duplicate of a task that has not finished after
+a delay and takes whichever attempt finishes first. This trims tail
+latency caused by a single slow call or straggler worker, at the cost of
+some duplicated work.
+"""
+
+from concurrent.futures import Future
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Union
+import bisect
+import math
+import threading
+import time
+
+from . import _futures, _timer
+
+
+class Hedge:
+    """
+    Hedging policy for pyasync calls.
+
+    The delay is either fixed (seconds) or a percentile of observed
+    latencies such as "p95". Percentile delays need min_samples completed
+    calls before hedging starts.
+
+    Attempts that lose the race are cancelled if they have not started
+    yet. A thread or process that is already running a losing attempt
+    finishes it in the background and its result is discarded.
+
+    Example:
+        hedge = Hedge(delay="p95")
+
+        results = parallel(*calls, hedge=hedge)
+        print(hedge.fired, hedge.won)
+    """
+
+    def __init__(
+        self,
+        delay: Union[float, str] = "p95",
+        max_hedges: int = 1,
+        min_samples: int = 5,
+        window: int = 1000
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            delay: Seconds to wait before hedging, or a percentile of
+                observed latencies such as "p95" or "p99".
+            max_hedges: Maximum duplicates launched per task.
+            min_samples: Completed calls required before a percentile delay
+                is used.
+            window: Number of recent latencies kept for percentiles.
+        """
+        if isinstance(delay, str):
+            if not delay.startswith("p"):
+                raise ValueError(f"Invalid hedge delay: {delay!r}")
+            self._percentile: Optional[float] = float(delay[1:])
+            if not 0 < self._percentile < 100:
+                raise ValueError(f"Invalid hedge delay: {delay!r}")
+            self._fixed_delay: Optional[float] = None
+        else:
+            self._percentile = None
+            self._fixed_delay = float(delay)
+
+        self._max_hedges = max_hedges
+        self._min_samples = min_samples
+        self._window = window
+        # Recent latencies in arrival order, and the same values sorted
+        self._latencies: Deque[float] = deque()
+        self._sorted: List[float] = []
+        self._lock = threading.Lock()
+        self._fired = 0
+        self._won = 0
+
+    @property
+    def fired(self) -> int:
+        """Number of duplicate attempts launched."""
+        return self._fired
+
+    @property
+    def won(self) -> int:
+        """Number of tasks whose result came from a duplicate attempt."""
+        return self._won
+
+    def stats(self) -> Dict[str, int]:
+        """Return hedging counters."""
+        return {"fired": self._fired, "won": self._won}
+
+    def record(self, latency: float) -> None:
+        """Record the latency of a completed call."""
+        with self._lock:
+            self._latencies.append(latency)
+            bisect.insort(self._sorted, latency)
+            if len(self._latencies) > self._window:
+                oldest = self._latencies.popleft()
+                del self._sorted[bisect.bisect_left(self._sorted, oldest)]
+
+    def delay(self) -> Optional[float]:
+        """
+        Return the current hedge delay in seconds.
+
+        Returns None while a percentile delay has too few samples.
+        """
+        if self._fixed_delay is not None:
+            return self._fixed_delay
+        with self._lock:
+            count = len(self._sorted)
+            if count < self._min_samples:
+                return None
+            index = math.ceil(count * self._percentile / 100) - 1
+            return self._sorted[max(0, index)]
+
+    def _count_fired(self) -> None:
+        with self._lock:
+            self._fired += 1
+
+    def _count_won(self) -> None:
+        with self._lock:
+            self._won += 1
+
+    def run(self, submit: Callable[[], Future]) -> Future:
+        """
+        Run a task under this policy.
+
+        Args:
+            submit: Starts one attempt of the task and returns its Future.
+
+        Returns:
+            Future resolved by the first attempt to finish.
+        """
+        return _HedgedCall(self, submit).outer
+
+
+class _HedgedCall:
+    """State of one hedged task: the caller's Future and its attempts."""
+
+    def __init__(self, policy: Hedge, submit: Callable[[], Future]):
+        self.policy = policy
+        self.submit = submit
+        self.outer: Future = Future()
+        self.attempts: List[Future] = []
+        self.timer: Optional[_timer.TimerHandle] = None
+        self.lock = threading.Lock()
+        self.settled = False
+        self.start = time.monotonic()
+
+        self.outer.add_done_callback(self._finish)
+        self._launch(hedge=False)
+        self._schedule()
+
+    def _launch(self, hedge: bool) -> None:
+        try:
+            future = self.submit()
+        except Exception as e:
+            _futures.set_exception(self.outer, e)
+            return
+        with self.lock:
+            self.attempts.append(future)
+        future.add_done_callback(lambda f: self._attempt_done(f, hedge))
+
+    def _schedule(self) -> None:
+        if self.outer.done():
+            return
+        delay = self.policy.delay()
+        if delay is not None and len(self.attempts) <= self.policy._max_hedges:
+            self.timer = _timer.call_later(delay, self._fire)
+
+    def _fire(self) -> None:
+        if self.outer.done():
+            return
+        self.policy._count_fired()
+        self._launch(hedge=True)
+        self._schedule()
+
+    def _attempt_done(self, future: Future, hedge: bool) -> None:
+        with self.lock:
+            if self.settled or self.outer.done():
+                return
+            failed = future.cancelled() or future.exception() is not None
+            # A failed or cancelled attempt only settles the task once
+            # nothing else can still succeed
+            if failed and any(not f.done() for f in self.attempts):
+                return
+            self.settled = True
+            if failed:
+                # Report an error over a cancellation
+                future = next((f for f in self.attempts if not f.cancelled()), future)
+
+        if not failed:
+            self.policy.record(time.monotonic() - self.start)
+            if hedge:
+                self.policy._count_won()
+        _futures.copy_outcome(future, self.outer)
+
+    def _finish(self, outer: Future) -> None:
+        if self.timer is not None:
+            self.timer.cancel()
+        with self.lock:
+            attempts = list(self.attempts)
+        for future in attempts:
+            future.cancel()
@@ -0,0 +1,571 @@
+"""
+PyAsync - Durable local job queue.
+
+background() and cpu_background() jobs normally live only in memory, so
+a deploy or a crash drops whatever was still queued. A JobQueue keeps
+jobs in a SQLite database (in WAL mode) on local disk until they have
+run: pass it as queue= and the job is written to the database, leased,
+run on the usual pool and removed once it completes.
+
+Writes go through a single writer thread that commits everything queued
+while the previous commit ran in one transaction (group commit), so
+enqueueing costs a list append and tens of thousands of jobs per second
+share a handful of commits.
+
+Delivery is at-least-once. A job is leased for a limited time while it
+runs, and the lease is renewed as long as the process is alive. Jobs
+that were never started, and jobs whose lease expired because their
+process died, are picked up again when a queue is opened on the same
+file. At most max_inflight jobs are leased at a time, so a backlog
+replayed on startup drains at a steady pace instead of all at once.
+
+Several processes may open queues on the same file. Each queue records
+itself as the owner of the jobs it enqueues and leases only those, plus
+jobs whose owner closed its queue or stopped renewing it (its process
+died), so a job enqueued by a live process runs there and resolves the
+Task waiting for it.
+"""
+
+from concurrent.futures import CancelledError, Future
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import atexit
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+
+from . import _futures
+from .hedging import Hedge
+from .limits import RateLike
+from .retry import Retry, BreakerLike
+
+
+_BACKENDS = ("thread", "process")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload BLOB NOT NULL,
+    -- 0 until leased; NULL once the job is dead
+    lease_until REAL DEFAULT 0,
+    deliveries INTEGER NOT NULL DEFAULT 0,
+    -- Queue that enqueued or last leased the job
+    owner TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_lease ON jobs (lease_until);
+CREATE TABLE IF NOT EXISTS owners (
+    id TEXT PRIMARY KEY,
+    alive_until REAL NOT NULL
+);
+"""
+
+# Jobs that can start: expired leases, and unleased jobs of this queue or
+# of a queue that is gone
+_LEASABLE = (
+    "SELECT id, payload, deliveries FROM jobs"
+    " WHERE (lease_until > 0 AND lease_until <= :now)"
+    " OR (lease_until = 0 AND (owner IS NULL OR owner = :owner"
+    " OR owner NOT IN (SELECT id FROM owners WHERE alive_until >= :now)))"
+    " ORDER BY id LIMIT :limit"
+)
+
+# Seconds SQLite waits for a lock held by another connection
+_BUSY_TIMEOUT = 5.0
+
+# Backoff after a failed commit (seconds), and how long commits may keep
+# failing before the queue gives up
+_RETRY_BACKOFF = 0.05
+_RETRY_MAX_BACKOFF = 2.0
+_RETRY_FOR = 60.0
+
+Runner = Callable[[Callable], Future]
+
+
+class _Job:
+    """A job in this process, from enqueue() until it completes."""
+
+    __slots__ = ('payload', 'backend', 'fn', 'run', 'future')
+
+    def __init__(
+        self,
+        payload: bytes,
+        backend: str,
+        fn: Callable,
+        run: Optional[Runner],
+        future: Optional[Future]
+    ):
+        self.payload = payload
+        self.backend = backend
+        self.fn = fn
+        self.run = run
+        # None for jobs resumed from an earlier process
+        self.future = future
+
+
+def _default_runner(
+    backend: str,
+    rate: RateLike,
+    hedge: Optional[Hedge],
+    retry: Optional[Retry],
+    breaker: BreakerLike
+) -> Runner:
+    from .runtime import _queue_runner, _rates
+    return _queue_runner(backend, _rates(rate), hedge, retry, breaker)
+
+
+_open: 'weakref.WeakSet[JobQueue]' = weakref.WeakSet()
+
+
+def _close_all() -> None:
+    # Commit what was enqueued; running jobs are delivered again later
+    for queue in list(_open):
+        queue.close(wait=False)
+
+
+# Queues must stop leasing before concurrent.futures joins the pools in
+# its threading exit hook, which runs ahead of atexit handlers: a job
+# dispatched to a pool that is shutting down fails, and would be removed
+# instead of being delivered again. threading exit hooks run in reverse
+# order of registration, so this one runs first. The hook API is private
+# to CPython, hence the fallback.
+getattr(threading, '_register_atexit', atexit.register)(_close_all)
+
+
+class JobQueue:
+    """
+    Persistent queue of background jobs, drained by pyasync's pools.
+
+    Jobs must be picklable (module-level functions, or partials of them),
+    since they may run in a later process. Only the job is stored: a job
+    resumed by a later process runs with the queue's own rate, hedge,
+    retry and breaker, not the ones it was enqueued with (they are live
+    objects of the enqueuing process), and without max_restarts.
+
+    Example:
+        jobs = pyasync.JobQueue("/var/lib/myapp/jobs.db")
+
+        # Survives a crash or a deploy: picked up by the next JobQueue on the file
+        pyasync.background(partial(send_email, user_id), queue=jobs)
+        pyasync.cpu_background(partial(render_report, report_id), queue=jobs)
+
+        jobs.flush()  # Wait until everything enqueued so far is on disk
+    """
+
+    def __init__(
+        self,
+        path: str,
+        lease: float = 60.0,
+        max_inflight: int = 64,
+        max_deliveries: int = 5,
+        fsync: bool = False,
+        on_error: Optional[Callable[[int, BaseException], None]] = None,
+        rate: RateLike = None,
+        hedge: Optional[Hedge] = None,
+        retry: Optional[Retry] = None,
+        breaker: BreakerLike = None
+    ):
+        """
+        Initialize the queue and resume the jobs left in it.
+
+        Args:
+            path: Database file (created if needed).
+            lease: Seconds a job stays leased without being renewed. Jobs
+                of a process that died are delivered again after this.
+            max_inflight: Jobs leased and running at the same time.
+            max_deliveries: Deliveries after which a job whose process
+                keeps dying is marked dead instead of retried.
+            fsync: Sync every commit to the disk. Protects against power
+                loss as well as process crashes, at the cost of slower
+                commits.
+            on_error: Called with the job id and exception when a job
+                without a waiting Task (resumed from an earlier run)
+                fails.
+            rate: Rate limit for starting resumed jobs (see parallel()).
+            hedge: Hedge policy for resumed jobs.
+            retry: Retry policy for resumed jobs.
+            breaker: Circuit breaker (or registered name) guarding
+                resumed jobs.
+        """
+        if lease <= 0:
+            raise ValueError("lease must be positive")
+        if max_inflight < 1:
+            raise ValueError("max_inflight must be at least 1")
+        self._path = os.path.abspath(path)
+        self._lease = lease
+        self._max_inflight = max_inflight
+        self._max_deliveries = max_deliveries
+        self._on_error = on_error
+        self._runners = {
+            backend: _default_runner(backend, rate, hedge, retry, breaker) for backend in _BACKENDS
+        }
+        self._poll_interval = min(1.0, lease / 3)
+        self._owner = uuid.uuid4().hex
+
+        self._db = sqlite3.connect(self._path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(f"PRAGMA synchronous={'FULL' if fsync else 'NORMAL'}")
+        self._db.execute(f"PRAGMA busy_timeout={int(_BUSY_TIMEOUT * 1000)}")
+        self._db.executescript(_SCHEMA)
+        self._migrate()
+        self._db.execute(
+            "INSERT OR REPLACE INTO owners (id, alive_until) VALUES (?, ?)",
+            (self._owner, time.time() + lease)
+        )
+
+        # Written by callers, drained by the writer thread
+        self._enqueued: List[_Job] = []
+        self._acks: List[int] = []
+        self._nacks: List[Tuple[int, Optional[_Job]]] = []
+        self._cond = threading.Condition()
+        self._sequence = 0
+        self._committed = 0
+        self._closing = False
+        self._wait_running = True
+        self._closed = False
+        # Set when the writer thread failed (e.g. the database became unusable)
+        self._error: Optional[BaseException] = None
+        # Ids of the jobs leased by this process
+        self._running: Set[int] = set()
+
+        # Owned by the writer thread: jobs enqueued here, by id
+        self._local: Dict[int, _Job] = {}
+        self._renewed = time.time()
+
+        self._writer = threading.Thread(target=self._run, name="pyasync-jobqueue", daemon=True)
+        self._writer.start()
+        _open.add(self)
+
+    def _migrate(self) -> None:
+        """Add the owner column to databases created before it existed."""
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        if "owner" in columns:
+            return
+        try:
+            self._db.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        except sqlite3.OperationalError:
+            # Another process may have added it meanwhile
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                raise
+
+    @property
+    def path(self) -> str:
+        """Database file."""
+        return self._path
+
+    def enqueue(self, fn: Callable, backend: str = "thread", run: Optional[Runner] = None) -> Future:
+        """
+        Add a job, and return a Future for its result.
+
+        Returns right away: the job is written by the next group commit
+        (see flush()).
+
+        Args:
+            fn: Picklable callable taking no arguments.
+            backend: "thread" or "process" pool to run the job on.
+            run: Submits the job when this process runs it. Defaults to
+                the shared pool of the backend, with the queue's policies.
+
+        Raises:
+            ValueError: If the backend is unknown or the queue is closed.
+            RuntimeError: If the queue stopped after an error, such as
+                the database staying locked or becoming unwritable.
+        """
+        if backend not in _BACKENDS:
+            raise ValueError(f"Unknown backend: {backend!r}")
+        payload = pickle.dumps((backend, fn), protocol=pickle.HIGHEST_PROTOCOL)
+        future: Future = Future()
+        with self._cond:
+            if self._error is not None:
+                raise RuntimeError("JobQueue stopped after an error") from self._error
+            if self._closing:
+                raise ValueError("JobQueue is closed")
+            self._enqueued.append(_Job(payload, backend, fn, run, future))
+            self._sequence += 1
+            self._cond.notify_all()
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every job enqueued so far is committed.
+
+        Returns:
+            False if the timeout expired first, or the queue stopped
+            after an error.
+        """
+        with self._cond:
+            target = self._sequence
+            committed = self._cond.wait_for(lambda: self._committed >= target or self._closed, timeout)
+            return committed and self._committed >= target
+
+    def stats(self) -> Dict[str, int]:
+        """Count of jobs waiting, leased (running) and dead in the database."""
+        now = time.time()
+        # Own connection: the writer thread's one is not shared
+        db = sqlite3.connect(self._path)
+        try:
+            row = db.execute(
+                "SELECT"
+                " COALESCE(SUM(lease_until = 0 OR lease_until < ?), 0),"
+                " COALESCE(SUM(lease_until >= ?), 0),"
+                " COALESCE(SUM(lease_until IS NULL), 0)"
+                " FROM jobs",
+                (now, now)
+            ).fetchone()
+        finally:
+            db.close()
+        return {"pending": row[0], "leased": row[1], "dead": row[2]}
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stop leasing jobs and close the database.
+
+        Jobs not started yet stay in the database for the next queue.
+
+        Args:
+            wait: Wait for running jobs to finish first. Otherwise
+                they keep running, but are delivered again after their
+                lease expires.
+        """
+        with self._cond:
+            if self._closing:
+                already = True
+            else:
+                already = False
+                self._closing = True
+                self._wait_running = wait
+                self._cond.notify_all()
+        if threading.current_thread() is not self._writer:
+            self._writer.join()
+        if not already:
+            _open.discard(self)
+
+    def __enter__(self) -> 'JobQueue':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<JobQueue {self._path}>"
+
+    # Writer thread
+
+    def _run(self) -> None:
+        failing_since: Optional[float] = None
+        backoff = _RETRY_BACKOFF
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(self._has_work, self._poll_interval)
+                    enqueued, self._enqueued = self._enqueued, []
+                    acks, self._acks = self._acks, []
+                    nacks, self._nacks = self._nacks, []
+                    sequence = self._sequence
+                    closing = self._closing
+                    done = closing and not (self._wait_running and self._running)
+                    running = list(self._running)
+                    capacity = 0 if closing else self._max_inflight - len(running)
+
+                for job_id, job in nacks:
+                    if job is not None:
+                        self._local[job_id] = job
+                try:
+                    leased, dead = self._commit(
+                        enqueued, acks, [job_id for job_id, _ in nacks], running, capacity
+                    )
+                except Exception as e:
+                    # Rolled back: put the batch back for the next attempt
+                    with self._cond:
+                        self._enqueued[:0] = enqueued
+                        self._acks[:0] = acks
+                        self._nacks[:0] = nacks
+                    # Locked past the busy timeout, and the like, may clear up
+                    now = time.monotonic()
+                    failing_since = failing_since or now
+                    if not isinstance(e, sqlite3.OperationalError) or now - failing_since >= _RETRY_FOR:
+                        raise
+                    time.sleep(backoff)
+                    backoff = min(backoff * 2, _RETRY_MAX_BACKOFF)
+                    continue
+                failing_since = None
+                backoff = _RETRY_BACKOFF
+
+                with self._cond:
+                    self._committed = sequence
+                    self._running.update(job_id for job_id, _ in leased)
+                    self._cond.notify_all()
+                for job_id, deliveries in dead:
+                    self._fail(job_id, self._local.pop(job_id, None), BrokenProcessPool(
+                        f"Job {job_id} was delivered {deliveries} times without completing"
+                    ))
+                if done:
+                    self._release_owner()
+                    return
+                self._dispatch(leased)
+        except Exception as e:
+            self._stop(e)
+        finally:
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+            self._db.close()
+
+    def _release_owner(self) -> None:
+        """Let other queues take over the jobs this one did not start."""
+        try:
+            self._db.execute("DELETE FROM owners WHERE id = ?", (self._owner,))
+        except sqlite3.Error:
+            # The entry expires on its own
+            pass
+
+    def _stop(self, error: BaseException) -> None:
+        """Give up after an error, failing the jobs waited on here."""
+        with self._cond:
+            self._closing = True
+            self._error = error
+            enqueued, self._enqueued = self._enqueued, []
+            self._cond.notify_all()
+        # Committed jobs stay in the database for the next queue on the file
+        jobs = enqueued + list(self._local.values())
+        self._local.clear()
+        for job in jobs:
+            if job.future is not None:
+                _futures.set_exception(job.future, error)
+
+    def _has_work(self) -> bool:
+        if self._enqueued or self._acks or self._nacks:
+            return True
+        if self._closing:
+            return not (self._wait_running and self._running)
+        return False
+
+    def _commit(
+        self,
+        enqueued: List[_Job],
+        acks: List[int],
+        nacks: List[int],
+        running: List[int],
+        capacity: int
+    ) -> Tuple[List[Tuple[int, bytes]], List[Tuple[int, int]]]:
+        """
+        Write one batch in a single transaction, and lease what can start.
+
+        Returns:
+            The leased jobs as (id, payload), and the jobs marked dead as
+            (id, deliveries).
+        """
+        now = time.time()
+        db = self._db
+        inserted: List[Tuple[int, _Job]] = []
+        leased: List[Tuple[int, bytes]] = []
+        dead: List[Tuple[int, int]] = []
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            for job in enqueued:
+                cursor = db.execute(
+                    "INSERT INTO jobs (payload, owner) VALUES (?, ?)", (job.payload, self._owner)
+                )
+                inserted.append((cursor.lastrowid, job))
+            if acks:
+                db.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in acks])
+            if nacks:
+                db.executemany("UPDATE jobs SET lease_until = 0 WHERE id = ?", [(job_id,) for job_id in nacks])
+
+            renew = now - self._renewed >= self._poll_interval
+            if renew:
+                db.execute(
+                    "INSERT OR REPLACE INTO owners (id, alive_until) VALUES (?, ?)",
+                    (self._owner, now + self._lease)
+                )
+                db.execute("DELETE FROM owners WHERE alive_until < ?", (now,))
+                if running:
+                    db.executemany(
+                        "UPDATE jobs SET lease_until = ? WHERE id = ?",
+                        [(now + self._lease, job_id) for job_id in running]
+                    )
+
+            if capacity > 0:
+                rows = db.execute(
+                    _LEASABLE, {"now": now, "owner": self._owner, "limit": capacity}
+                ).fetchall()
+                for job_id, payload, deliveries in rows:
+                    if deliveries >= self._max_deliveries:
+                        db.execute("UPDATE jobs SET lease_until = NULL WHERE id = ?", (job_id,))
+                        dead.append((job_id, deliveries))
+                        continue
+                    db.execute(
+                        "UPDATE jobs SET lease_until = ?, deliveries = deliveries + 1, owner = ?"
+                        " WHERE id = ?",
+                        (now + self._lease, self._owner, job_id)
+                    )
+                    leased.append((job_id, payload))
+            db.execute("COMMIT")
+        except BaseException:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            raise
+        if renew:
+            self._renewed = now
+        for job_id, job in inserted:
+            # On disk now: only a later process needs the payload again
+            job.payload = b""
+            self._local[job_id] = job
+        return leased, dead
+
+    def _dispatch(self, leased: List[Tuple[int, bytes]]) -> None:
+        for job_id, payload in leased:
+            job = self._local.pop(job_id, None)
+            if job is None:
+                # Enqueued by an earlier (or another) process
+                try:
+                    backend, fn = pickle.loads(payload)
+                except Exception as e:
+                    self._finished(job_id, None, _failed(e))
+                    continue
+                job = _Job(b"", backend, fn, None, None)
+            elif not (job.future.running() or job.future.set_running_or_notify_cancel()):
+                # Cancelled while queued (a redelivered job is already running):
+                # removed without reaching on_error, since its caller knows
+                self._finished(job_id, job, job.future)
+                continue
+            try:
+                inner = (job.run or self._runners[job.backend])(job.fn)
+            except Exception as e:
+                inner = _failed(e)
+            inner.add_done_callback(lambda f, job_id=job_id, job=job: self._finished(job_id, job, f))
+
+    def _finished(self, job_id: int, job: Optional[_Job], inner: Future) -> None:
+        error = CancelledError() if inner.cancelled() else inner.exception()
+        with self._cond:
+            self._running.discard(job_id)
+            # A dead worker never delivered the job: lease it again
+            redeliver = isinstance(error, BrokenProcessPool)
+            closing = self._closing
+            if redeliver:
+                self._nacks.append((job_id, None if closing else job))
+            else:
+                self._acks.append(job_id)
+            self._cond.notify_all()
+        if redeliver and not closing:
+            return
+        if error is not None:
+            self._fail(job_id, job, error)
+        elif job is not None and job.future is not None:
+            _futures.set_result(job.future, inner.result())
+
+    def _fail(self, job_id: int, job: Optional[_Job], error: BaseException) -> None:
+        if job is not None and job.future is not None:
+            _futures.set_exception(job.future, error)
+        elif self._on_error is not None:
+            self._on_error(job_id, error)
+
+
+def _failed(error: BaseException) -> Future:
+    future: Future = Future()
+    future.set_exception(error)
+    return future
@@ -0,0 +1,143 @@
+"""
+PyAsync - Per-key serial execution.
+
+A KeyedExecutor runs tasks that share a key one at a time, in submission
+order, while tasks for different keys run concurrently on the shared
+pool. No thread is dedicated to a key: the next task for a key is
+dispatched when the previous one completes.
+"""
+
+from collections import deque
+from concurrent.futures import Future
+from functools import partial
+from typing import Callable, Any, Deque, Dict, Hashable, Optional, Tuple, Union
+import threading
+
+from . import _futures
+from .runtime import Task, CpuTask, _get_executor, _get_cpu_executor, _submit
+
+
+_Entry = Tuple[Callable, tuple, Dict[str, Any], Future]
+
+
+class KeyedExecutor:
+    """
+    Executor with strict FIFO ordering per key and parallelism across keys.
+
+    Only keys with queued or running work are tracked, so memory is bounded
+    by the amount of outstanding work, not by the number of distinct keys
+    ever seen. A failing task does not stop the tasks queued behind it.
+
+    Example:
+        accounts = KeyedExecutor()
+
+        for event in events:
+            accounts.submit(event.account_id, apply_event, event)
+
+        accounts.wait_all()
+    """
+
+    def __init__(self, backend: str = "thread", max_pending: Optional[int] = None):
+        """
+        Initialize the executor.
+
+        Args:
+            backend: "thread" or "process" (functions must be picklable).
+            max_pending: Maximum tasks queued or running across all keys.
+                submit() blocks while the limit is reached. None means no
+                limit.
+        """
+        if backend not in ("thread", "process"):
+            raise ValueError(f"Unknown backend: {backend!r}")
+        if max_pending is not None and max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+
+        self._backend = backend
+        self._queues: Dict[Hashable, Deque[_Entry]] = {}
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._slots = threading.Semaphore(max_pending) if max_pending else None
+
+    def __len__(self) -> int:
+        """Number of keys with queued or running work."""
+        return len(self._queues)
+
+    def pending(self, key: Hashable) -> int:
+        """Return the number of tasks queued behind the running one for key."""
+        with self._lock:
+            entries = self._queues.get(key)
+            return len(entries) if entries is not None else 0
+
+    def submit(self, key: Hashable, fn: Callable, *args: Any, **kwargs: Any) -> Union[Task, CpuTask]:
+        """
+        Submit fn(*args, **kwargs) to run after earlier tasks for key.
+
+        Args:
+            key: Ordering key. Tasks with equal keys never overlap.
+            fn: Function to run.
+            *args, **kwargs: Arguments for fn.
+
+        Returns:
+            Task (thread backend) or CpuTask (process backend).
+        """
+        if self._slots is not None:
+            self._slots.acquire()
+
+        future: Future = Future()
+        entry = (fn, args, kwargs, future)
+        with self._lock:
+            entries = self._queues.get(key)
+            if entries is None:
+                self._queues[key] = deque()
+            else:
+                entries.append(entry)
+                entry = None
+
+        if entry is not None:
+            self._run(key, entry)
+        return Task(future) if self._backend == "thread" else CpuTask(future)
+
+    def wait_all(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until no key has queued or running work.
+
+        Returns:
+            True if idle, False if the timeout expired first.
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._queues, timeout)
+
+    def _run(self, key: Hashable, entry: Optional[_Entry]) -> None:
+        """Dispatch entry, then its successors for as long as they finish inline."""
+        executor = _get_executor() if self._backend == "thread" else _get_cpu_executor()
+        while entry is not None:
+            fn, args, kwargs, future = entry
+            inner = None
+            if not future.cancelled():
+                try:
+                    inner = _submit(executor, fn, args, kwargs)
+                except Exception as e:
+                    _futures.set_exception(future, e)
+                else:
+                    _futures.chain(inner, future)
+
+            if inner is not None and not inner.done():
+                inner.add_done_callback(partial(self._on_done, key))
+                return
+            entry = self._advance(key)
+
+    def _on_done(self, key: Hashable, _: Future) -> None:
+        self._run(key, self._advance(key))
+
+    def _advance(self, key: Hashable) -> Optional[_Entry]:
+        """Finish the running task for key and return the next one, if any."""
+        if self._slots is not None:
+            self._slots.release()
+        with self._lock:
+            entries = self._queues[key]
+            if entries:
+                return entries.popleft()
+            del self._queues[key]
+            if not self._queues:
+                self._idle.notify_all()
+            return None
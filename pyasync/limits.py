@@ -0,0 +1,431 @@
+"""
+PyAsync - Concurrency and rate limits.
+
+A Limiter caps how many tasks may be in flight per key (for example per
+host or per downstream service). The cap is not fixed: it adapts to latency
+and error feedback, growing while a downstream is healthy and backing off
+on its own when it degrades.
+
+A RateLimiter caps how many tasks may start per second. pyasync consults it
+before dispatching a task, so throttled tasks wait on a timer instead of
+sleeping inside a pool thread.
+"""
+
+from concurrent.futures import Future
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from functools import partial
+from typing import Callable, Any, Deque, Dict, Hashable, Iterator, Optional, Tuple, Union
+import contextvars
+import math
+import threading
+import time
+
+
+class _KeyState:
+    """Limit bookkeeping for a single key."""
+
+    __slots__ = ('limit', 'in_flight', 'waiters', 'long_rtt', 'pending')
+
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.in_flight = 0
+        # Threads blocked in acquire()
+        self.waiters = 0
+        self.long_rtt: Optional[float] = None
+        self.pending: Deque[Tuple[Callable[[], Any], Future]] = deque()
+
+
+class Limiter:
+    """
+    Per-key adaptive concurrency limiter.
+
+    Each key gets its own limit, starting at initial_limit and adjusted
+    after every completed call:
+
+    - "aimd": additive increase while calls succeed and the limit is in
+      use, multiplicative decrease (by backoff) on errors or when latency
+      exceeds latency_threshold.
+    - "gradient": compares the latest latency with a long-term average
+      and shrinks the limit when latency rises above it (tolerance allows
+      some slack), growing it by sqrt(limit) while latency is stable.
+
+    Tasks submitted over the limit are queued without occupying a pool
+    thread, and dispatched as soon as a slot for their key frees up.
+
+    Example:
+        limiter = Limiter(initial_limit=4, max_limit=16)
+
+        task = limiter.submit("api.example.com", lambda: fetch(url))
+        print(task.result())
+
+        # Or guard a block of code in the current thread
+        with limiter.slot("db"):
+            query()
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        algorithm: str = "aimd",
+        backoff: float = 0.9,
+        latency_threshold: Optional[float] = None,
+        tolerance: float = 1.5,
+        smoothing: float = 0.2,
+        max_keys: int = 10_000
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            initial_limit: Starting concurrency limit for each key.
+            min_limit: Lower bound for the limit.
+            max_limit: Upper bound for the limit.
+            algorithm: "aimd" or "gradient".
+            backoff: Factor applied to the limit on errors (and on slow
+                calls for "aimd").
+            latency_threshold: Seconds above which a call counts as a drop
+                for "aimd". None disables latency-based drops.
+            tolerance: How much latency may grow over the long-term average
+                before "gradient" starts shrinking the limit.
+            smoothing: Weight of each new "gradient" estimate (0-1).
+            max_keys: Keys whose state is kept. Beyond that, the least
+                recently used idle keys are forgotten and start over at
+                initial_limit when seen again.
+        """
+        if algorithm not in ("aimd", "gradient"):
+            raise ValueError(f"Unknown algorithm: {algorithm!r}")
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+
+        self._initial_limit = initial_limit
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._algorithm = algorithm
+        self._backoff = backoff
+        self._latency_threshold = latency_threshold
+        self._tolerance = tolerance
+        self._smoothing = smoothing
+        self._max_keys = max_keys
+        self._states: 'OrderedDict[Hashable, _KeyState]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+
+    def _state(self, key: Hashable) -> _KeyState:
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _KeyState(float(self._initial_limit))
+            if len(self._states) > self._max_keys:
+                self._evict()
+        else:
+            self._states.move_to_end(key)
+        return state
+
+    def _evict(self) -> None:
+        """Forget least recently used keys with nothing running or waiting (lock held)."""
+        excess = len(self._states) - self._max_keys
+        for key, state in list(self._states.items()):
+            if excess <= 0:
+                break
+            if not (state.in_flight or state.waiters or state.pending):
+                del self._states[key]
+                excess -= 1
+
+    def _cap(self, state: _KeyState) -> int:
+        return max(self._min_limit, int(state.limit))
+
+    def limit(self, key: Hashable = None) -> int:
+        """Return the current concurrency limit for a key."""
+        with self._lock:
+            return self._cap(self._state(key))
+
+    def in_flight(self, key: Hashable = None) -> int:
+        """Return the number of calls currently holding a slot for a key."""
+        with self._lock:
+            return self._state(key).in_flight
+
+    def acquire(self, key: Hashable = None, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a slot for key is available and take it.
+
+        Every successful acquire must be paired with release().
+
+        Args:
+            key: Key to acquire a slot for.
+            timeout: Maximum seconds to wait. None means wait forever.
+
+        Returns:
+            True if a slot was acquired, False if the timeout expired.
+        """
+        with self._available:
+            state = self._state(key)
+            state.waiters += 1
+            try:
+                acquired = self._available.wait_for(
+                    lambda: state.in_flight < self._cap(state), timeout
+                )
+            finally:
+                state.waiters -= 1
+            if acquired:
+                state.in_flight += 1
+            return acquired
+
+    def release(
+        self,
+        key: Hashable = None,
+        latency: Optional[float] = None,
+        success: bool = True
+    ) -> None:
+        """
+        Release a slot and feed the call's outcome back into the limit.
+
+        Args:
+            key: Key the slot was acquired for.
+            latency: Duration of the call in seconds. None releases the slot
+                without adjusting the limit.
+            success: False if the call failed.
+        """
+        with self._lock:
+            state = self._state(key)
+            if latency is not None:
+                self._update(state, latency, success)
+            state.in_flight -= 1
+
+            ready = []
+            while state.pending and state.in_flight < self._cap(state):
+                state.in_flight += 1
+                ready.append(state.pending.popleft())
+            self._available.notify_all()
+
+        for fn, future in ready:
+            self._dispatch(key, fn, future)
+
+    def _update(self, state: _KeyState, latency: float, success: bool) -> None:
+        """Adjust the limit of a key after a call (lock held)."""
+        limit = state.limit
+
+        if self._algorithm == "aimd":
+            threshold = self._latency_threshold
+            if not success or (threshold is not None and latency > threshold):
+                limit *= self._backoff
+            elif state.in_flight * 2 >= limit:
+                limit += 1
+        elif not success:
+            limit *= self._backoff
+        else:
+            if state.long_rtt is None:
+                state.long_rtt = latency
+            else:
+                state.long_rtt += (latency - state.long_rtt) * 0.05
+                if state.long_rtt > 2 * latency:
+                    state.long_rtt *= 0.95
+            # Only adapt while the limit is actually being exercised
+            if state.in_flight * 2 < limit:
+                return
+            gradient = max(0.5, min(1.0, self._tolerance * state.long_rtt / max(latency, 1e-9)))
+            estimate = limit * gradient + math.sqrt(limit)
+            limit += (estimate - limit) * self._smoothing
+
+        state.limit = min(float(self._max_limit), max(float(self._min_limit), limit))
+
+    @contextmanager
+    def slot(self, key: Hashable = None) -> Iterator[None]:
+        """
+        Hold a slot for key while the with-block runs.
+
+        The block's duration is used as the latency sample, and an
+        exception raised inside it counts as a failure.
+        """
+        self.acquire(key)
+        start = time.monotonic()
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            self.release(key, time.monotonic() - start, success)
+
+    def submit(self, key: Hashable, fn: Callable[[], Any]) -> 'Task':
+        """
+        Run a callable in the thread pool once a slot for key is free.
+
+        Never blocks: if the key is at its limit the callable is queued and
+        dispatched when a running call for the same key finishes.
+
+        Args:
+            key: Key to limit the call under (e.g. a host name).
+            fn: Function to run (no arguments).
+
+        Returns:
+            Task object
+        """
+        from .runtime import Task
+
+        # Queued calls are dispatched from whichever thread frees the slot
+        fn = partial(contextvars.copy_context().run, fn)
+        future: Future = Future()
+        with self._lock:
+            state = self._state(key)
+            run_now = not state.pending and state.in_flight < self._cap(state)
+            if run_now:
+                state.in_flight += 1
+            else:
+                state.pending.append((fn, future))
+
+        if run_now:
+            self._dispatch(key, fn, future)
+        return Task(future)
+
+    def _dispatch(self, key: Hashable, fn: Callable[[], Any], future: Future) -> None:
+        from .runtime import _get_executor
+        _get_executor().submit(self._call, key, fn, future)
+
+    def _call(self, key: Hashable, fn: Callable[[], Any], future: Future) -> None:
+        """Run a queued callable in a pool thread and report its outcome."""
+        if not future.set_running_or_notify_cancel():
+            self.release(key)
+            return
+
+        start = time.monotonic()
+        try:
+            result = fn()
+        except BaseException as e:
+            self.release(key, time.monotonic() - start, success=False)
+            future.set_exception(e)
+        else:
+            self.release(key, time.monotonic() - start, success=True)
+            future.set_result(result)
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter.
+
+    Tokens refill at rate per second, up to burst tokens. Accounting is
+    O(1) per call: the bucket is tracked as a single "theoretical arrival
+    time" (GCRA), so there is no refill thread.
+
+    Pass it as rate= to pyasync calls to delay dispatch until a token is
+    available. Reuse the same instance (or a name registered with
+    rate_limiter()) to share one budget across calls.
+
+    Example:
+        github = RateLimiter(rate=10, burst=20)
+
+        results = parallel(*calls, rate=github)
+        task = background(lambda: fetch(url), rate=github)
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate: Tokens added per second.
+            burst: Maximum tokens that can accumulate (bucket size).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self._rate = float(rate)
+        self._burst = int(burst)
+        self._interval = 1.0 / self._rate
+        self._tat = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Tokens added per second."""
+        return self._rate
+
+    @property
+    def burst(self) -> int:
+        """Maximum number of tokens in the bucket."""
+        return self._burst
+
+    def reserve(self, tokens: int = 1) -> float:
+        """
+        Take tokens now, possibly from the future.
+
+        Returns:
+            Seconds to wait before the reserved tokens may be used (0.0 if
+            they are available immediately).
+        """
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            self._tat = tat + tokens * self._interval
+        return max(0.0, tat - now - (self._burst - 1) * self._interval)
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """
+        Take tokens only if they are available right now.
+
+        Returns:
+            True if the tokens were taken.
+        """
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            if tat - now - (self._burst - 1) * self._interval > 0:
+                return False
+            self._tat = tat + tokens * self._interval
+        return True
+
+    def acquire(self, tokens: int = 1) -> None:
+        """Block the current thread until tokens are available and take them."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def rate_limiter(name: str, rate: Optional[float] = None, burst: int = 1) -> RateLimiter:
+    """
+    Get or create a shared RateLimiter registered under name.
+
+    The first call with a given name must provide rate; later calls return
+    the same limiter. Calls may also pass rate="name" to pyasync functions.
+
+    Example:
+        rate_limiter("github", rate=10, burst=20)
+
+        results = parallel(*calls, rate="github")
+
+    Args:
+        name: Registry key.
+        rate: Tokens per second (only used when creating the limiter).
+        burst: Bucket size (only used when creating the limiter).
+
+    Returns:
+        The shared RateLimiter.
+
+    Raises:
+        KeyError: If no limiter is registered under name and rate is None.
+    """
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(name)
+        if limiter is None:
+            if rate is None:
+                raise KeyError(f"No rate limiter named {name!r}")
+            limiter = _rate_limiters[name] = RateLimiter(rate, burst)
+        return limiter
+
+
+RateLike = Union[RateLimiter, str, float, None]
+
+
+def resolve_rate(rate: RateLike) -> Optional[RateLimiter]:
+    """Turn a rate= argument (limiter, registered name or tokens/s) into a limiter."""
+    if rate is None or isinstance(rate, RateLimiter):
+        return rate
+    if isinstance(rate, str):
+        return rate_limiter(rate)
+    return RateLimiter(rate)
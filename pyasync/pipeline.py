@@ -0,0 +1,335 @@
+"""
+PyAsync - Streaming pipelines.
+
+A Pipeline streams items through a chain of stages connected by bounded
+queues. Each stage has its own thread or process workers, so I/O and CPU
+steps overlap, and a slow stage pushes back on the ones before it instead
+of letting the whole dataset pile up in memory.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Any, Dict, Iterable, Iterator, List, Optional
+import queue
+import threading
+import time
+
+
+# Marks the end of the stream in a stage queue
+_DONE = object()
+
+# How often blocked queue operations check whether the run was stopped
+_POLL = 0.05
+
+
+class _Stage:
+    __slots__ = ('fn', 'name', 'workers', 'process', 'queue_size')
+
+    def __init__(self, fn: Callable, name: str, workers: int, process: bool, queue_size: int):
+        self.fn = fn
+        self.name = name
+        self.workers = workers
+        self.process = process
+        self.queue_size = queue_size
+
+
+class _StageStats:
+    """Counters of one stage during a run."""
+
+    def __init__(self, stage: _Stage):
+        self.stage = stage
+        self.items = 0
+        self.busy = 0.0
+        self.queue_samples = 0
+        self.queue_total = 0
+        self.queue_max = 0
+        self.lock = threading.Lock()
+
+    def record(self, busy: float) -> None:
+        with self.lock:
+            self.items += 1
+            self.busy += busy
+
+    def sample_queue(self, size: int) -> None:
+        with self.lock:
+            self.queue_samples += 1
+            self.queue_total += size
+            if size > self.queue_max:
+                self.queue_max = size
+
+    def snapshot(self, elapsed: float) -> Dict[str, Any]:
+        stage = self.stage
+        with self.lock:
+            capacity = stage.workers * elapsed
+            return {
+                "name": stage.name,
+                "workers": stage.workers,
+                "backend": "process" if stage.process else "thread",
+                "items": self.items,
+                "throughput": self.items / elapsed if elapsed > 0 else 0.0,
+                "utilization": self.busy / capacity if capacity > 0 else 0.0,
+                "queue_size": stage.queue_size,
+                "queue_mean": (
+                    self.queue_total / self.queue_samples if self.queue_samples else 0.0
+                ),
+                "queue_max": self.queue_max,
+            }
+
+
+class Pipeline:
+    """
+    Chain of stages streaming items through bounded queues.
+
+    Each stage applies its function to one item at a time, with its own
+    number of worker threads or processes. Queues between stages are
+    bounded: when a stage falls behind, its input queue fills up and the
+    stages before it wait, so memory use stays flat however many items
+    flow through.
+
+    Example:
+        pipeline = (
+            Pipeline()
+            .stage(read_file, threads=8)
+            .stage(parse, processes=16)
+            .stage(write_rows, threads=4)
+        )
+
+        for written in pipeline.run(paths):
+            ...
+
+        for stage in pipeline.stats():
+            print(stage["name"], stage["throughput"], stage["queue_mean"])
+    """
+
+    def __init__(self, queue_size: int = 64, ordered: bool = False):
+        """
+        Initialize the pipeline.
+
+        Args:
+            queue_size: Default capacity of each stage's input queue.
+            ordered: Yield results in input order. Out-of-order results
+                are held back until their predecessors arrive.
+        """
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+
+        self._queue_size = queue_size
+        self._ordered = ordered
+        self._stages: List[_Stage] = []
+        self._stats: List[_StageStats] = []
+        self._elapsed = 0.0
+        self._started: Optional[float] = None
+
+    def stage(
+        self,
+        fn: Callable[[Any], Any],
+        threads: Optional[int] = None,
+        processes: Optional[int] = None,
+        name: Optional[str] = None,
+        queue_size: Optional[int] = None
+    ) -> 'Pipeline':
+        """
+        Append a stage.
+
+        Args:
+            fn: Function applied to each item. Must be picklable for
+                process stages.
+            threads: Number of worker threads (I/O-bound stages).
+            processes: Number of worker processes (CPU-bound stages).
+                Give either threads or processes; the default is 1 thread.
+            name: Name shown in stats(). Defaults to the function name.
+            queue_size: Capacity of this stage's input queue.
+
+        Returns:
+            This pipeline, for chaining.
+        """
+        if threads is not None and processes is not None:
+            raise ValueError("Give either threads or processes, not both")
+        workers = processes if processes is not None else (threads or 1)
+        if workers < 1:
+            raise ValueError("A stage needs at least 1 worker")
+
+        name = name or getattr(fn, '__name__', None) or f"stage{len(self._stages)}"
+        self._stages.append(_Stage(
+            fn, name, workers, processes is not None, queue_size or self._queue_size
+        ))
+        return self
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Return per-stage statistics of the current or last run.
+
+        Returns:
+            One dict per stage with items processed, throughput (items
+            per second of run time), utilization (fraction of worker time
+            spent in fn), and the capacity, mean and max occupancy of its
+            input queue. A stage with high utilization and a full input
+            queue is the bottleneck.
+        """
+        elapsed = self._elapsed
+        if self._started is not None:
+            elapsed = time.perf_counter() - self._started
+        return [stats.snapshot(elapsed) for stats in self._stats]
+
+    def run(self, items: Iterable[Any]) -> Iterator[Any]:
+        """
+        Stream items through the stages.
+
+        Items are read from the iterable lazily. Stopping iteration early
+        stops the pipeline.
+
+        Args:
+            items: Input items.
+
+        Yields:
+            Results of the last stage.
+
+        Raises:
+            ValueError: If the pipeline has no stages.
+            Exception: The first exception raised by a stage function.
+        """
+        if not self._stages:
+            raise ValueError("Pipeline has no stages")
+
+        self._stats = [_StageStats(stage) for stage in self._stages]
+        self._started = time.perf_counter()
+        run = _PipelineRun(self._stages, self._stats, self._queue_size)
+        try:
+            run.start(items)
+            if self._ordered:
+                yield from _in_order(run.results())
+            else:
+                for _, result in run.results():
+                    yield result
+        finally:
+            run.stop()
+            self._elapsed = time.perf_counter() - self._started
+            self._started = None
+
+
+def _in_order(results: Iterator[tuple]) -> Iterator[Any]:
+    """Re-sequence (index, result) pairs by index."""
+    pending: Dict[int, Any] = {}
+    expected = 0
+    for index, result in results:
+        pending[index] = result
+        while expected in pending:
+            yield pending.pop(expected)
+            expected += 1
+
+
+class _PipelineRun:
+    """Queues and workers of one Pipeline.run() call."""
+
+    def __init__(self, stages: List[_Stage], stats: List[_StageStats], queue_size: int):
+        self._stages = stages
+        self._stats = stats
+        # queues[i] feeds stage i; the last one holds the pipeline output
+        self._queues = [queue.Queue(stage.queue_size) for stage in stages]
+        self._queues.append(queue.Queue(queue_size))
+        self._pools: List[Optional[ProcessPoolExecutor]] = [
+            ProcessPoolExecutor(max_workers=stage.workers) if stage.process else None
+            for stage in stages
+        ]
+        self._remaining = [stage.workers for stage in stages]
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._threads: List[threading.Thread] = []
+
+    def start(self, items: Iterable[Any]) -> None:
+        self._spawn(self._feed, items, name="pyasync-pipeline-feed")
+        for index, stage in enumerate(self._stages):
+            for _ in range(stage.workers):
+                self._spawn(self._work, index, name=f"pyasync-pipeline-{stage.name}")
+
+    def _spawn(self, target: Callable, *args: Any, name: str) -> None:
+        thread = threading.Thread(target=target, args=args, name=name, daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def _put(self, index: int, entry: Any) -> bool:
+        """Put into queue index, waiting for room. Returns False if stopped."""
+        target = self._queues[index]
+        while not self._stopped.is_set():
+            try:
+                target.put(entry, timeout=_POLL)
+            except queue.Full:
+                continue
+            if index < len(self._stats):
+                self._stats[index].sample_queue(target.qsize())
+            return True
+        return False
+
+    def _get(self, index: int) -> Any:
+        """Get from queue index, waiting for an entry. Returns _DONE if stopped."""
+        source = self._queues[index]
+        while not self._stopped.is_set():
+            try:
+                return source.get(timeout=_POLL)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _feed(self, items: Iterable[Any]) -> None:
+        try:
+            for entry in enumerate(items):
+                if not self._put(0, entry):
+                    return
+        except BaseException as e:
+            self._fail(e)
+            return
+        self._put(0, _DONE)
+
+    def _work(self, index: int) -> None:
+        stage = self._stages[index]
+        stats = self._stats[index]
+        pool = self._pools[index]
+        while True:
+            entry = self._get(index)
+            if entry is _DONE:
+                # Let the other workers of this stage see the end too
+                self._put(index, _DONE)
+                break
+
+            position, item = entry
+            start = time.perf_counter()
+            try:
+                if pool is not None:
+                    result = pool.submit(stage.fn, item).result()
+                else:
+                    result = stage.fn(item)
+            except BaseException as e:
+                self._fail(e)
+                return
+            stats.record(time.perf_counter() - start)
+
+            if not self._put(index + 1, (position, result)):
+                return
+
+        with self._lock:
+            self._remaining[index] -= 1
+            last = self._remaining[index] == 0
+        if last:
+            self._put(index + 1, _DONE)
+
+    def _fail(self, exc: BaseException) -> None:
+        with self._lock:
+            if self._error is None:
+                self._error = exc
+        self._stopped.set()
+
+    def results(self) -> Iterator[tuple]:
+        """Yield (index, result) pairs from the last stage."""
+        while True:
+            entry = self._get(len(self._stages))
+            if entry is _DONE:
+                break
+            yield entry
+        if self._error is not None:
+            raise self._error
+
+    def stop(self) -> None:
+        self._stopped.set()
+        for pool in self._pools:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
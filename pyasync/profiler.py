@@ -0,0 +1,347 @@
+"""
+PyAsync - Sampling profiler for pool threads and worker processes.
+
+Inside profiling(), every task dispatched to a thread or process pool
+runs under a sampling profiler: a background thread in the process that
+runs the task records the task's stack every few milliseconds. Worker
+processes send their samples back with the result, and everything is
+merged into one report that can be printed, saved as pstats or exported
+as collapsed stacks for flame graphs.
+
+Sampling instead of cProfile keeps the overhead low and works with many
+tasks running at once in the same process (only one cProfile can be
+active per interpreter on Python 3.12+).
+"""
+
+from collections import Counter
+from concurrent.futures import Executor, Future
+from functools import partial
+from types import CodeType, FrameType
+from typing import Callable, Any, Dict, List, Optional, Tuple
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+
+from . import _futures
+
+
+# Function key as used by pstats: (filename, first line, name)
+FunctionKey = Tuple[str, int, str]
+Stack = Tuple[FunctionKey, ...]
+
+
+class _Sampler:
+    """Background thread sampling the stacks of registered threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Thread ident -> (interval, samples: stack -> [count, seconds])
+        self.targets: Dict[int, Tuple[float, Dict[Stack, List]]] = {}
+        self.thread: Optional[threading.Thread] = None
+        self.keys: Dict[CodeType, FunctionKey] = {}
+
+    def add(self, ident: int, interval: float, samples: Dict[Stack, List]) -> None:
+        with self.lock:
+            self.targets[ident] = (interval, samples)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._loop, name="pyasync-profiler", daemon=True)
+                self.thread.start()
+
+    def remove(self, ident: int) -> None:
+        with self.lock:
+            self.targets.pop(ident, None)
+
+    def _key(self, code: CodeType) -> FunctionKey:
+        key = self.keys.get(code)
+        if key is None:
+            name = getattr(code, 'co_qualname', code.co_name)
+            key = self.keys[code] = (code.co_filename, code.co_firstlineno, name)
+        return key
+
+    def _stack(self, frame: Optional[FrameType]) -> Stack:
+        """Return the task's stack, root first, cut at the profiling wrapper."""
+        keys = []
+        while frame is not None and frame.f_code is not _BOUNDARY:
+            keys.append(self._key(frame.f_code))
+            frame = frame.f_back
+        keys.reverse()
+        return tuple(keys)
+
+    def _loop(self) -> None:
+        last = time.perf_counter()
+        while True:
+            with self.lock:
+                if not self.targets:
+                    self.thread = None
+                    return
+                interval = min(interval for interval, _ in self.targets.values())
+            time.sleep(interval)
+
+            with self.lock:
+                # Weight by elapsed time: a busy GIL may delay the sampler
+                now = time.perf_counter()
+                elapsed, last = now - last, now
+                frames = sys._current_frames()
+                for ident, (_, samples) in self.targets.items():
+                    stack = self._stack(frames.get(ident))
+                    if not stack:
+                        continue
+                    entry = samples.get(stack)
+                    if entry is None:
+                        samples[stack] = [1, elapsed]
+                    else:
+                        entry[0] += 1
+                        entry[1] += elapsed
+
+
+_sampler = _Sampler()
+
+
+def _reset_after_fork() -> None:
+    global _sampler
+    _sampler = _Sampler()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class _ProfiledCall:
+    """Picklable wrapper sampling a task wherever it runs."""
+
+    __slots__ = ('fn', 'args', 'kwargs', 'interval')
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: Dict[str, Any], interval: float):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.interval = interval
+
+    @property
+    def __wrapped__(self) -> Callable:
+        return self.fn
+
+    def __getstate__(self) -> tuple:
+        return (self.fn, self.args, self.kwargs, self.interval)
+
+    def __setstate__(self, state: tuple) -> None:
+        self.fn, self.args, self.kwargs, self.interval = state
+
+    def __call__(self) -> tuple:
+        ident = threading.get_ident()
+        samples: Dict[Stack, List] = {}
+        sampler = _sampler
+        sampler.add(ident, self.interval, samples)
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except BaseException as e:
+            sampler.remove(ident)
+            e._pyasync_profile = samples
+            raise
+        sampler.remove(ident)
+        return result, samples
+
+
+# Stacks are cut at the wrapper, so reports only show the task's own frames
+_BOUNDARY = _ProfiledCall.__call__.__code__
+
+
+class Profile:
+    """
+    Merged samples of the tasks run inside a profiling() block.
+
+    Each sample is one observation of a task's stack. For the pstats
+    view, times are estimated from the samples (tottime: time at the top
+    of the stack, cumtime: time anywhere on it) and the ncalls column
+    counts samples, not calls.
+    """
+
+    def __init__(self, interval: float, report: bool):
+        self.interval = interval
+        self._report = report
+        self._lock = threading.Lock()
+        self._samples: Dict[Stack, List] = {}
+        self._tasks = 0
+
+    def __enter__(self) -> 'Profile':
+        global _sessions
+        with _sessions_lock:
+            _sessions = _sessions + (self,)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        global _sessions
+        with _sessions_lock:
+            _sessions = tuple(session for session in _sessions if session is not self)
+        if self._report:
+            self.print_stats()
+        return False
+
+    def _merge(self, samples: Dict[Stack, List]) -> None:
+        with self._lock:
+            self._tasks += 1
+            for stack, (count, seconds) in samples.items():
+                entry = self._samples.get(stack)
+                if entry is None:
+                    self._samples[stack] = [count, seconds]
+                else:
+                    entry[0] += count
+                    entry[1] += seconds
+
+    @property
+    def tasks(self) -> int:
+        """Number of profiled tasks that have finished."""
+        return self._tasks
+
+    @property
+    def samples(self) -> int:
+        """Number of stack samples collected."""
+        with self._lock:
+            return sum(count for count, _ in self._samples.values())
+
+    def collapsed(self) -> str:
+        """
+        Return the samples as collapsed stacks ("a;b;c <count>" lines).
+
+        This is the input format of flamegraph.pl, speedscope and most
+        other flame graph tools.
+        """
+        counts: Counter = Counter()
+        with self._lock:
+            for stack, (count, _) in self._samples.items():
+                line = ';'.join(
+                    f"{name} ({os.path.basename(filename)}:{line})"
+                    for filename, line, name in stack
+                )
+                counts[line] += count
+        return ''.join(f"{line} {count}\n" for line, count in sorted(counts.items()))
+
+    def write_collapsed(self, path: str) -> None:
+        """Write collapsed stacks to a file."""
+        with open(path, 'w') as f:
+            f.write(self.collapsed())
+
+    def _pstats_dict(self) -> Dict[FunctionKey, tuple]:
+        functions: Dict[FunctionKey, list] = {}
+        with self._lock:
+            stacks = [(stack, count, seconds) for stack, (count, seconds) in self._samples.items()]
+
+        for stack, count, seconds in stacks:
+            seen = set()
+            for depth, key in enumerate(stack):
+                entry = functions.setdefault(key, [0, 0, 0.0, 0.0, {}])
+                leaf = depth == len(stack) - 1
+                if leaf:
+                    entry[2] += seconds
+                # Recursive frames count once towards cumulative time
+                if key not in seen:
+                    seen.add(key)
+                    entry[0] += count
+                    entry[1] += count
+                    entry[3] += seconds
+                if depth:
+                    caller = entry[4].setdefault(stack[depth - 1], [0, 0, 0.0, 0.0])
+                    caller[0] += count
+                    caller[1] += count
+                    caller[2] += seconds if leaf else 0.0
+                    caller[3] += seconds
+
+        return {
+            key: (cc, nc, tt, ct, {caller: tuple(values) for caller, values in callers.items()})
+            for key, (cc, nc, tt, ct, callers) in functions.items()
+        }
+
+    def stats(self) -> pstats.Stats:
+        """Return the samples as a pstats.Stats object."""
+        return pstats.Stats(_StatsSource(self._pstats_dict()))
+
+    def dump_stats(self, path: str) -> None:
+        """Save the report in the pstats file format (e.g. for snakeviz)."""
+        with open(path, 'wb') as f:
+            marshal.dump(self._pstats_dict(), f)
+
+    def print_stats(self, limit: int = 20, sort: str = "cumulative") -> None:
+        """Print the top functions, like cProfile's report."""
+        if not self._samples:
+            print(f"No samples collected from {self._tasks} tasks")
+            return
+        self.stats().sort_stats(sort).print_stats(limit)
+
+
+class _StatsSource:
+    """Adapter handing a stats dict to pstats.Stats."""
+
+    def __init__(self, stats: Dict[FunctionKey, tuple]):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+_sessions: Tuple[Profile, ...] = ()
+_sessions_lock = threading.Lock()
+
+
+def profiling(interval: float = 0.001, report: bool = False) -> Profile:
+    """
+    Profile every pool task started inside the block.
+
+    Tasks run in the shared thread pool, process pools (cpu_parallel,
+    cpu_background, CpuExecutor, ...) and their samples are merged into
+    one report. Coroutine functions on the event loop are not sampled.
+
+    Example:
+        with pyasync.profiling() as profile:
+            pyasync.cpu_parallel(*jobs)
+
+        profile.print_stats(limit=15)
+        profile.dump_stats("job.pstats")          # snakeviz job.pstats
+        profile.write_collapsed("job.folded")     # flamegraph.pl job.folded
+
+    Args:
+        interval: Seconds between samples. Tasks shorter than this may
+            not be sampled at all.
+        report: Print the report when the block exits.
+
+    Returns:
+        Profile collecting the merged samples.
+    """
+    if interval <= 0:
+        raise ValueError("interval must be positive")
+    return Profile(interval, report)
+
+
+def active() -> bool:
+    """Return True if a profiling() block is open."""
+    return bool(_sessions)
+
+
+def _collect(sessions: Tuple[Profile, ...], inner: Future) -> Any:
+    """Merge a task's samples into the sessions and return its result."""
+    exc = inner.exception()
+    if exc is not None:
+        samples = getattr(exc, '_pyasync_profile', {})
+    else:
+        result, samples = inner.result()
+    for session in sessions:
+        session._merge(samples)
+    if exc is not None:
+        raise exc
+    return result
+
+
+def submit(
+    executor: Executor,
+    fn: Callable,
+    args: tuple,
+    kwargs: Dict[str, Any],
+    dispatch: Callable[[Executor, Callable, tuple, Dict[str, Any]], Future]
+) -> Future:
+    """Dispatch a task under the sampling profiler of the open sessions."""
+    sessions = _sessions
+    interval = min(session.interval for session in sessions)
+    call = _ProfiledCall(fn, args, kwargs, interval)
+    return _futures.DerivedFuture(dispatch(executor, call, (), {}), partial(_collect, sessions))
@@ -0,0 +1,744 @@
+"""
+PyAsync - Remote worker daemons for CPU-bound tasks.
+
+`pyasync-worker` runs a daemon that executes tasks in a local process
+pool. RemoteCpuExecutor connects to a set of daemons over TCP and sends
+them tasks, so a map can use the cores of several machines.
+
+Tasks and results are pickled one by one, so a result that cannot be
+sent or loaded fails only its own task. Functions are pickled by reference:
+the worker hosts need the same code installed. Connections are
+authenticated with a shared key, but anyone holding the key can run
+arbitrary code on the workers, so daemons listen on 127.0.0.1 unless
+told otherwise; only expose them on trusted networks.
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Callable, Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import argparse
+import collections
+import itertools
+import logging
+import os
+import pickle
+import queue
+import signal
+import socket
+import sys
+import threading
+import time
+
+from . import _futures
+from .runtime import CpuTask, _run_chunk
+
+
+Address = Union[str, Tuple[str, int]]
+
+DEFAULT_PORT = 8765
+
+_logger = logging.getLogger(__name__)
+
+# Loopback only: listening on other interfaces must be asked for
+DEFAULT_HOST = "127.0.0.1"
+
+
+def _parse_address(address: Address) -> Tuple[str, int]:
+    """Accept ("host", port), "host:port" or "host"."""
+    if isinstance(address, tuple):
+        return address
+    host, _, port = address.rpartition(':')
+    if not host:
+        return address, DEFAULT_PORT
+    return host, int(port)
+
+
+def _resolve_authkey(authkey: Optional[Union[str, bytes]]) -> bytes:
+    if authkey is None:
+        authkey = os.environ.get("PYASYNC_AUTHKEY")
+    if not authkey:
+        raise ValueError("An authkey is required (argument or PYASYNC_AUTHKEY)")
+    return authkey.encode() if isinstance(authkey, str) else authkey
+
+
+def _shutdown(conn: Connection) -> None:
+    """Shut a connection's socket down, waking any thread blocked on it."""
+    try:
+        sock = socket.socket(fileno=os.dup(conn.fileno()))
+    except OSError:
+        return
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    finally:
+        sock.close()
+
+
+def _noop() -> None:
+    pass
+
+
+def _encode(task_id: int, ok: bool, value: Any) -> Tuple[int, bool, bytes]:
+    """Pickle one result on its own, turning an unpicklable one into an error."""
+    try:
+        return task_id, ok, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        error = RuntimeError(f"Could not send result: {e!r}")
+        return task_id, False, pickle.dumps(error, pickle.HIGHEST_PROTOCOL)
+
+
+def _decode(ok: bool, payload: bytes) -> Tuple[bool, Any]:
+    """Load one result, turning one that cannot be loaded here into an error."""
+    try:
+        return ok, pickle.loads(payload)
+    except Exception as e:
+        # E.g. a class that only exists on the worker host
+        error = RuntimeError(f"Could not load result: {e!r}")
+        error.__cause__ = e
+        return False, error
+
+
+class _Session:
+    """One client connection to a worker daemon."""
+
+    def __init__(self, server: 'WorkerServer', conn: Connection):
+        self.server = server
+        self.conn = conn
+        self.outbox: queue.Queue = queue.Queue()
+        self.futures: Dict[int, Future] = {}
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def run(self) -> None:
+        try:
+            kind, heartbeat = self.conn.recv()
+            if kind != "hello":
+                return
+            self.conn.send(("hello", self.server.slots))
+            sender = threading.Thread(
+                target=self._send_loop, args=(heartbeat,), name="pyasync-worker-send", daemon=True
+            )
+            sender.start()
+            while True:
+                message = self.conn.recv()
+                if message[0] == "tasks":
+                    for task_id, payload in message[1]:
+                        self._start(task_id, payload)
+                elif message[0] == "close":
+                    break
+        except (EOFError, OSError):
+            pass
+        finally:
+            self.close()
+
+    def _start(self, task_id: int, payload: bytes) -> None:
+        try:
+            # Unpickled per task, so e.g. a missing module fails only that task
+            fn, args, kwargs = pickle.loads(payload)
+            future = self.server.submit(fn, args, kwargs)
+        except Exception as e:
+            self.outbox.put(_encode(task_id, False, e))
+            return
+        with self.lock:
+            self.futures[task_id] = future
+        future.add_done_callback(lambda f: self._finished(task_id, f))
+
+    def _finished(self, task_id: int, future: Future) -> None:
+        with self.lock:
+            self.futures.pop(task_id, None)
+        if future.cancelled():
+            return
+        exc = future.exception()
+        if exc is None:
+            self.outbox.put(_encode(task_id, True, future.result()))
+        else:
+            self.outbox.put(_encode(task_id, False, exc))
+
+    def _send_loop(self, heartbeat: float) -> None:
+        """Send finished results in batches, or a heartbeat when idle."""
+        while not self.closed:
+            try:
+                batch = [self.outbox.get(timeout=heartbeat)]
+            except queue.Empty:
+                message = ("heartbeat",)
+            else:
+                while True:
+                    try:
+                        batch.append(self.outbox.get_nowait())
+                    except queue.Empty:
+                        break
+                message = ("results", batch)
+            try:
+                self.conn.send(message)
+            except (EOFError, OSError):
+                break
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        with self.lock:
+            futures = list(self.futures.values())
+        for future in futures:
+            future.cancel()
+        _shutdown(self.conn)
+        self.conn.close()
+        self.server._forget(self)
+
+
+class WorkerServer:
+    """
+    A worker daemon serving tasks from RemoteCpuExecutor clients.
+
+    Example:
+        # Listen on all interfaces (the default is 127.0.0.1)
+        server = WorkerServer(("0.0.0.0", 8765), authkey=b"secret", slots=8)
+        server.serve_forever()
+
+    Usually started with the `pyasync-worker` command instead.
+    """
+
+    def __init__(
+        self,
+        address: Address = (DEFAULT_HOST, DEFAULT_PORT),
+        authkey: Optional[Union[str, bytes]] = None,
+        slots: Optional[int] = None
+    ):
+        """
+        Initialize the daemon and bind its listening socket.
+
+        Args:
+            address: ("host", port) or "host:port" to listen on. Port 0
+                picks a free port (see .address). Defaults to port 8765
+                on 127.0.0.1; use "0.0.0.0" to accept remote clients.
+            authkey: Shared key clients must present. Defaults to the
+                PYASYNC_AUTHKEY environment variable.
+            slots: Number of worker processes. Defaults to CPU count.
+        """
+        self.slots = slots or (os.cpu_count() or 1)
+        self._authkey = _resolve_authkey(authkey)
+        self._lock = threading.Lock()
+        self._sessions: List[_Session] = []
+        self._closed = False
+        self._pool = self._new_pool()
+        self._listener = Listener(_parse_address(address), authkey=self._authkey)
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        pool = ProcessPoolExecutor(max_workers=self.slots)
+        # Start the workers now, so they do not inherit client sockets
+        # (a dead daemon's connections must close with it)
+        wait([pool.submit(_noop) for _ in range(self.slots)])
+        return pool
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Address the daemon is listening on."""
+        return self._listener.address
+
+    def submit(self, fn: Callable, args: tuple, kwargs: Dict[str, Any]) -> Future:
+        """Run a task in the local pool, replacing the pool if a worker crashed."""
+        with self._lock:
+            try:
+                return self._pool.submit(fn, *args, **kwargs)
+            except BrokenProcessPool:
+                self._pool.shutdown(wait=False)
+                self._pool = self._new_pool()
+                return self._pool.submit(fn, *args, **kwargs)
+
+    def serve_forever(self) -> None:
+        """Accept clients until close() is called."""
+        try:
+            while not self._closed:
+                try:
+                    conn = self._listener.accept()
+                except (OSError, EOFError, AuthenticationError):
+                    if self._closed:
+                        break
+                    # Failed handshake (e.g. wrong authkey)
+                    continue
+                if self._closed:
+                    conn.close()
+                    break
+                session = _Session(self, conn)
+                with self._lock:
+                    self._sessions.append(session)
+                threading.Thread(target=session.run, name="pyasync-worker-session", daemon=True).start()
+        finally:
+            self.close()
+
+    def _forget(self, session: _Session) -> None:
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+
+    def close(self) -> None:
+        """Stop accepting clients, drop connections and stop the pool."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            sessions = list(self._sessions)
+        for session in sessions:
+            session.close()
+        # Wake serve_forever() up from accept()
+        host, port = self.address
+        host = {"0.0.0.0": "127.0.0.1", "::": "::1"}.get(host, host)
+        try:
+            socket.create_connection((host, port), timeout=1.0).close()
+        except OSError:
+            pass
+        self._listener.close()
+        # Stop running tasks too (their clients resubmit them elsewhere):
+        # otherwise exiting waits for them, and a forked daemon can hang
+        with self._lock:
+            pool = self._pool
+        processes = list((pool._processes or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+        pool.shutdown(wait=True)
+
+
+def serve(
+    address: Address = (DEFAULT_HOST, DEFAULT_PORT),
+    authkey: Optional[Union[str, bytes]] = None,
+    slots: Optional[int] = None
+) -> None:
+    """Run a worker daemon in this process until it is terminated."""
+    server = WorkerServer(address, authkey, slots)
+    if threading.current_thread() is threading.main_thread():
+        # Close connections on SIGTERM, so clients resubmit right away
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    server.serve_forever()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Entry point of the pyasync-worker command."""
+    parser = argparse.ArgumentParser(
+        prog="pyasync-worker", description="Run a pyasync worker daemon for RemoteCpuExecutor."
+    )
+    parser.add_argument(
+        "--host", default=DEFAULT_HOST,
+        help=f"Interface to listen on (default: {DEFAULT_HOST}; 0.0.0.0 for all)."
+    )
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on.")
+    parser.add_argument("--slots", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--authkey", default=None, help="Shared key (default: $PYASYNC_AUTHKEY).")
+    args = parser.parse_args(argv)
+
+    try:
+        server = WorkerServer((args.host, args.port), args.authkey, args.slots)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"pyasync-worker listening on {server.address[0]}:{server.address[1]} "
+          f"with {server.slots} slots", flush=True)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
+
+
+class _RemoteCall:
+    """A task waiting for, or running on, a remote worker."""
+
+    __slots__ = ('id', 'payload', 'future', 'attempts')
+
+    def __init__(self, id: int, payload: bytes):
+        self.id = id
+        # Pickled once, so resubmitting to another worker is cheap
+        self.payload = payload
+        self.future: Future = Future()
+        self.attempts = 0
+
+
+class _Worker:
+    """Client side of a connection to one worker daemon."""
+
+    def __init__(self, address: Tuple[str, int], conn: Connection, slots: int, prefetch: int):
+        self.address = address
+        self.conn = conn
+        self.slots = slots
+        self.capacity = slots * prefetch
+        self.inflight: Dict[int, _RemoteCall] = {}
+        self.send_lock = threading.Lock()
+        self.alive = True
+
+    @property
+    def free(self) -> int:
+        return self.capacity - len(self.inflight)
+
+
+class RemoteCpuExecutor:
+    """
+    Run CPU-bound tasks on remote worker daemons.
+
+    Same surface as CpuExecutor: submit(), map() and wait_all(). Each
+    worker gets tasks in proportion to its free slots, several tasks
+    travel in one message, and tasks of a worker that dies (or stops
+    sending heartbeats) are resubmitted to the others.
+
+    Start a daemon on each host with:
+
+        PYASYNC_AUTHKEY=secret pyasync-worker --host 0.0.0.0 --port 8765
+
+    A lost worker is reconnected in the background, backing off
+    exponentially between attempts, and gets tasks again once it is back.
+
+    Example:
+        workers = ["node1:8765", "node2:8765"]
+        with RemoteCpuExecutor(workers, authkey="secret") as executor:
+            results = list(executor.map(heavy_compute, range(1000)))
+    """
+
+    def __init__(
+        self,
+        workers: Sequence[Address],
+        authkey: Optional[Union[str, bytes]] = None,
+        timeout: Optional[float] = None,
+        prefetch: int = 2,
+        heartbeat: float = 1.0,
+        max_resubmits: int = 3,
+        max_backoff: Optional[float] = 30.0
+    ):
+        """
+        Initialize the remote executor.
+
+        Args:
+            workers: Worker addresses, as "host:port" or ("host", port).
+            authkey: Shared key of the workers. Defaults to the
+                PYASYNC_AUTHKEY environment variable.
+            timeout: Default timeout for map() and wait_all().
+            prefetch: Tasks sent per worker slot ahead of time, so a
+                worker does not idle while its next batch is in transit.
+            heartbeat: Seconds between worker heartbeats. A worker that
+                is silent for three heartbeats is considered dead.
+            max_resubmits: How many times a task is resubmitted after
+                workers died while running it, before it fails.
+            max_backoff: Longest wait in seconds between attempts to
+                reconnect to a lost worker, starting from heartbeat and
+                doubling. None disables reconnecting.
+        """
+        if not workers:
+            raise ValueError("At least one worker address is required")
+        if prefetch < 1:
+            raise ValueError("prefetch must be at least 1")
+
+        self._addresses = [_parse_address(address) for address in workers]
+        self._authkey = _resolve_authkey(authkey)
+        self._default_timeout = timeout
+        self._prefetch = prefetch
+        self._heartbeat = heartbeat
+        self._max_resubmits = max_resubmits
+        self._max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._pending: Deque[_RemoteCall] = collections.deque()
+        self._workers: List[_Worker] = []
+        # Lost workers that were reconnected, closed on exit with the others
+        self._retired: List[_Worker] = []
+        self._readers: List[threading.Thread] = []
+        self._ids = itertools.count()
+        self._tasks: List[CpuTask] = []
+        self._entered = False
+        self._closing = False
+
+    def __enter__(self) -> 'RemoteCpuExecutor':
+        errors = []
+        for address in self._addresses:
+            try:
+                worker = self._connect(address)
+            except (OSError, EOFError, AuthenticationError) as e:
+                errors.append(f"{address[0]}:{address[1]}: {e}")
+                continue
+            self._workers.append(worker)
+        if not self._workers:
+            raise ConnectionError("No worker reachable: " + "; ".join(errors))
+
+        self._entered = True
+        self._stopped.clear()
+        for worker in self._workers:
+            self._start_reader(worker)
+        return self
+
+    def _connect(self, address: Tuple[str, int]) -> _Worker:
+        conn = Client(address, authkey=self._authkey)
+        try:
+            conn.send(("hello", self._heartbeat))
+            kind, slots = conn.recv()
+        except BaseException:
+            conn.close()
+            raise
+        return _Worker(address, conn, slots, self._prefetch)
+
+    def _start_reader(self, worker: _Worker) -> None:
+        reader = threading.Thread(
+            target=self._read_loop, args=(worker,), name="pyasync-remote", daemon=True
+        )
+        reader.start()
+        self._readers.append(reader)
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        futures = [task._future for task in self._tasks]
+        if exc_type is not None:
+            for future in futures:
+                future.cancel()
+        else:
+            wait(futures)
+
+        with self._lock:
+            self._closing = True
+            workers = list(self._workers)
+            retired = list(self._retired)
+            readers = list(self._readers)
+        self._stopped.set()
+        for worker in workers:
+            try:
+                with worker.send_lock:
+                    worker.conn.send(("close",))
+            except (OSError, EOFError):
+                pass
+            _shutdown(worker.conn)
+        for reader in readers:
+            reader.join()
+        for worker in workers + retired:
+            worker.conn.close()
+        self._entered = False
+        return False
+
+    @property
+    def workers(self) -> List[Dict[str, Any]]:
+        """Return address, slots, tasks in flight and liveness of each worker."""
+        with self._lock:
+            return [
+                {
+                    "address": f"{worker.address[0]}:{worker.address[1]}",
+                    "slots": worker.slots,
+                    "inflight": len(worker.inflight),
+                    "alive": worker.alive,
+                }
+                for worker in self._workers
+            ]
+
+    def submit(self, fn: Callable, *args, **kwargs) -> CpuTask:
+        """
+        Submit a callable to run on a remote worker.
+
+        Args:
+            fn: Function to execute (must be picklable and importable on
+                the workers).
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            CpuTask for monitoring and result retrieval.
+        """
+        if not self._entered:
+            raise RuntimeError("RemoteCpuExecutor not entered. Use 'with' statement.")
+
+        call = self._enqueue([(fn, args, kwargs)])[0]
+        task = CpuTask(call.future)
+        self._tasks.append(task)
+        return task
+
+    def map(
+        self,
+        fn: Callable,
+        *iterables,
+        timeout: Optional[float] = None,
+        chunksize: int = 1
+    ) -> Iterator[Any]:
+        """
+        Map a function over iterables on the remote workers.
+
+        Args:
+            fn: Function to apply to each element.
+            *iterables: Iterables of arguments.
+            timeout: Maximum seconds for entire operation.
+            chunksize: Number of items run per remote task. Larger chunks
+                cut per-task overhead for very small functions.
+
+        Returns:
+            Iterator of results in order.
+
+        Raises:
+            TimeoutError: If timeout expires.
+        """
+        if not self._entered:
+            raise RuntimeError("RemoteCpuExecutor not entered. Use 'with' statement.")
+        if chunksize < 1:
+            raise ValueError("chunksize must be at least 1")
+
+        effective_timeout = timeout or self._default_timeout
+        items = list(zip(*iterables))
+        if chunksize == 1:
+            calls = self._enqueue([(fn, args, {}) for args in items])
+        else:
+            chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+            calls = self._enqueue([(_run_chunk, (fn, chunk), {}) for chunk in chunks])
+
+        def results() -> Iterator[Any]:
+            deadline = None if effective_timeout is None else time.monotonic() + effective_timeout
+            try:
+                for call in calls:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if chunksize == 1:
+                        yield call.future.result(timeout=remaining)
+                    else:
+                        yield from call.future.result(timeout=remaining)
+            finally:
+                for call in calls:
+                    call.future.cancel()
+
+        return results()
+
+    @property
+    def tasks(self) -> List[CpuTask]:
+        """Return list of all submitted tasks."""
+        return self._tasks.copy()
+
+    def wait_all(self, timeout: Optional[float] = None) -> List[Any]:
+        """
+        Wait for all submitted tasks and return their results.
+
+        Args:
+            timeout: Maximum seconds to wait for all tasks.
+
+        Returns:
+            List of results in submission order.
+
+        Raises:
+            TimeoutError: If timeout expires.
+        """
+        effective_timeout = timeout or self._default_timeout
+        return [task.result(timeout=effective_timeout) for task in self._tasks]
+
+    def _enqueue(self, entries: List[Tuple[Callable, tuple, Dict[str, Any]]]) -> List[_RemoteCall]:
+        calls = [
+            _RemoteCall(next(self._ids), pickle.dumps(entry, pickle.HIGHEST_PROTOCOL))
+            for entry in entries
+        ]
+        with self._lock:
+            if not any(worker.alive for worker in self._workers):
+                raise ConnectionError("No live workers")
+            self._pending.extend(calls)
+        self._pump()
+        return calls
+
+    def _pump(self) -> None:
+        """Send pending tasks to the workers with the most free slots."""
+        while True:
+            with self._lock:
+                if self._closing or not self._pending:
+                    return
+                live = [worker for worker in self._workers if worker.alive and worker.free > 0]
+                if not live:
+                    return
+                worker = max(live, key=lambda w: w.free)
+                batch = []
+                while self._pending and len(batch) < worker.free:
+                    call = self._pending.popleft()
+                    if call.attempts == 0 and not call.future.set_running_or_notify_cancel():
+                        continue
+                    if call.future.done():
+                        continue
+                    call.attempts += 1
+                    batch.append(call)
+                for call in batch:
+                    worker.inflight[call.id] = call
+            if batch:
+                self._send(worker, batch)
+
+    def _send(self, worker: _Worker, batch: List[_RemoteCall]) -> None:
+        try:
+            with worker.send_lock:
+                worker.conn.send(("tasks", [(call.id, call.payload) for call in batch]))
+        except (OSError, EOFError):
+            self._worker_died(worker)
+
+    def _read_loop(self, worker: _Worker) -> None:
+        silence = self._heartbeat * 3
+        try:
+            while True:
+                if not worker.conn.poll(silence):
+                    break
+                message = worker.conn.recv()
+                if message[0] != "results":
+                    continue
+                with self._lock:
+                    calls = [(worker.inflight.pop(task_id, None), ok, payload)
+                             for task_id, ok, payload in message[1]]
+                for call, ok, payload in calls:
+                    if call is None:
+                        continue
+                    ok, value = _decode(ok, payload)
+                    if ok:
+                        _futures.set_result(call.future, value)
+                    else:
+                        _futures.set_exception(call.future, value)
+                self._pump()
+        except (OSError, EOFError):
+            pass
+        except Exception:
+            _logger.exception("Lost worker %s:%s", *worker.address)
+        self._worker_died(worker)
+
+    def _worker_died(self, worker: _Worker) -> None:
+        """Resubmit a lost worker's tasks to the others."""
+        with self._lock:
+            if not worker.alive:
+                return
+            worker.alive = False
+            if self._closing:
+                return
+            index = self._workers.index(worker)
+            lost = sorted(worker.inflight.values(), key=lambda call: call.id)
+            worker.inflight.clear()
+            address = f"{worker.address[0]}:{worker.address[1]}"
+            retry = [call for call in lost if call.attempts <= self._max_resubmits]
+            lost = [call for call in lost if call.attempts > self._max_resubmits]
+            for call in reversed(retry):
+                self._pending.appendleft(call)
+            stranded: List[_RemoteCall] = []
+            if not any(w.alive for w in self._workers):
+                stranded = list(self._pending)
+                self._pending.clear()
+        _shutdown(worker.conn)
+        for call in lost:
+            _futures.set_exception(call.future, ConnectionError(f"Worker {address} died running the task"))
+        for call in stranded:
+            _futures.set_exception(call.future, ConnectionError("No live workers"))
+        if self._max_backoff is not None:
+            threading.Thread(
+                target=self._reconnect, args=(index, worker.address),
+                name="pyasync-remote-reconnect", daemon=True
+            ).start()
+        self._pump()
+
+    def _reconnect(self, index: int, address: Tuple[str, int]) -> None:
+        """Reconnect to a lost worker, doubling the wait after each failed attempt."""
+        delay = self._heartbeat
+        while not self._stopped.wait(delay):
+            try:
+                worker = self._connect(address)
+            except (OSError, EOFError, AuthenticationError):
+                delay = min(delay * 2, self._max_backoff)
+                continue
+            with self._lock:
+                closing = self._closing
+                if not closing:
+                    self._retired.append(self._workers[index])
+                    self._workers[index] = worker
+                    self._start_reader(worker)
+            if closing:
+                worker.conn.close()
+                return
+            self._pump()
+            return
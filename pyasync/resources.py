@@ -0,0 +1,257 @@
+"""
+PyAsync - Resource-aware task admission.
+
+A ResourcePool holds a budget of named resources (cpus, mem, gpus, ...).
+Each task declares what it needs, and is dispatched only once its needs
+fit in what is left, so a pool can mix tasks needing 100 MB with tasks
+needing 8 GB without over-committing the machine.
+
+Waiting tasks start in submission order, except that smaller tasks are
+backfilled around a large one that does not fit yet. To keep the large
+task from starving, resources released while it waits are held for it;
+backfilled tasks only use resources that were already free.
+"""
+
+from concurrent.futures import CancelledError, Future
+from typing import Callable, Any, Dict, List, Mapping, Optional, Union
+import os
+import re
+import threading
+
+from . import _futures
+
+
+# Resources a task needs when it does not say
+DEFAULT_COST = {"cpus": 1.0}
+
+_SIZE = re.compile(r"^\s*([0-9]*\.?[0-9]+)\s*([kmgtp]?)(i?b?)\s*$", re.IGNORECASE)
+_UNITS = {"": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3, "t": 1024 ** 4, "p": 1024 ** 5}
+
+ResourceSpec = Mapping[str, Union[int, float, str]]
+
+
+def parse_amount(value: Union[int, float, str]) -> float:
+    """
+    Parse a resource amount: a number, or a size such as "512M" or "8G".
+
+    Size suffixes (K, M, G, T, P, optionally followed by "B" or "iB")
+    are binary: "1K" is 1024.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        amount = float(value)
+    else:
+        match = _SIZE.match(str(value))
+        if match is None:
+            raise ValueError(f"Invalid resource amount: {value!r}")
+        amount = float(match.group(1)) * _UNITS[match.group(2).lower()]
+    if amount < 0:
+        raise ValueError(f"Invalid resource amount: {value!r}")
+    return amount
+
+
+def parse_resources(spec: ResourceSpec) -> Dict[str, float]:
+    """Parse a mapping of resource names to amounts."""
+    return {name: parse_amount(value) for name, value in spec.items()}
+
+
+def _physical_memory() -> Optional[float]:
+    try:
+        return float(os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE"))
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def default_budget(max_workers: int) -> Dict[str, float]:
+    """One cpu per worker, and the machine's physical memory (if known)."""
+    budget = {"cpus": float(max_workers)}
+    memory = _physical_memory()
+    if memory is not None:
+        budget["mem"] = memory
+    return budget
+
+
+class _Request:
+    __slots__ = ('cost', 'start', 'future')
+
+    def __init__(self, cost: Dict[str, float], start: Callable[[], Future], future: Future):
+        self.cost = cost
+        self.start = start
+        self.future = future
+
+
+class ResourcePool:
+    """
+    Budget of named resources shared by the tasks admitted against it.
+
+    Pass it (or a plain budget dict) as resources= to CpuExecutor. One
+    ResourcePool can be shared by several executors to cap them together.
+
+    Example:
+        pool = ResourcePool({"cpus": 16, "mem": "64G"})
+
+        with CpuExecutor(max_workers=16, resources=pool) as executor:
+            big = executor.submit_with(train, (dataset,), resources={"mem": "24G", "cpus": 4})
+            small = [executor.submit_with(score, (part,), resources={"mem": "200M"}) for part in parts]
+    """
+
+    def __init__(self, budget: ResourceSpec):
+        """
+        Initialize the pool.
+
+        Args:
+            budget: Total amount of each resource, e.g.
+                {"cpus": 8, "mem": "32G", "gpus": 2}. Tasks may only
+                request resources named here.
+        """
+        self._budget = parse_resources(budget)
+        if not self._budget:
+            raise ValueError("budget must name at least one resource")
+        self._available = dict(self._budget)
+        # Released resources held back for the oldest waiting task
+        self._held = dict.fromkeys(self._budget, 0.0)
+        self._held_for: Optional[_Request] = None
+        self._pending: List[_Request] = []
+        self._lock = threading.Lock()
+
+    @property
+    def budget(self) -> Dict[str, float]:
+        """Total amount of each resource."""
+        return dict(self._budget)
+
+    @property
+    def available(self) -> Dict[str, float]:
+        """Amount of each resource not taken by running tasks."""
+        with self._lock:
+            return dict(self._available)
+
+    @property
+    def pending(self) -> int:
+        """Number of tasks waiting for resources."""
+        with self._lock:
+            return sum(1 for request in self._pending if not request.future.done())
+
+    def cost(self, resources: Optional[ResourceSpec]) -> Dict[str, float]:
+        """
+        Resolve what a task needs, checking it against the budget.
+
+        Raises:
+            ValueError: If a resource is not in the budget, or the task
+                needs more than the whole budget (it could never start).
+        """
+        cost = dict(DEFAULT_COST) if "cpus" in self._budget else {}
+        if resources:
+            cost.update(parse_resources(resources))
+        for name, amount in cost.items():
+            if name not in self._budget:
+                raise ValueError(f"Unknown resource: {name!r}")
+            if amount > self._budget[name]:
+                raise ValueError(
+                    f"Task needs {amount:g} {name} but the budget is {self._budget[name]:g}"
+                )
+        return cost
+
+    def submit(self, cost: Dict[str, float], start: Callable[[], Future]) -> Future:
+        """
+        Call start() once cost fits, and return a Future for its outcome.
+
+        Never blocks: a task that does not fit is queued and started
+        when running tasks release enough resources.
+        """
+        future: Future = Future()
+        request = _Request(cost, start, future)
+        with self._lock:
+            # Start right away if nobody is waiting, or as a backfill
+            if self._fits(cost, held=bool(self._pending)):
+                self._take(cost)
+                ready = [request]
+            else:
+                self._pending.append(request)
+                ready = []
+        self._start(ready)
+        return future
+
+    def _fits(self, cost: Dict[str, float], held: bool) -> bool:
+        for name, amount in cost.items():
+            free = self._available[name] - (self._held[name] if held else 0.0)
+            if amount > free + 1e-9:
+                return False
+        return True
+
+    def _take(self, cost: Dict[str, float]) -> None:
+        for name, amount in cost.items():
+            self._available[name] -= amount
+
+    def _admit(self) -> List[_Request]:
+        """Pick the waiting tasks that can start now (lock held)."""
+        ready = []
+        self._pending = [request for request in self._pending if not request.future.done()]
+        while self._pending and self._fits(self._pending[0].cost, held=False):
+            # The oldest task fits: it gets the held resources back
+            request = self._pending.pop(0)
+            self._take(request.cost)
+            ready.append(request)
+            self._held = dict.fromkeys(self._budget, 0.0)
+            self._held_for = None
+        # Backfill around a blocked head with resources nobody is waiting for
+        for request in self._pending[1:]:
+            if not any(self._available[name] - self._held[name] > 1e-9 for name in self._budget):
+                break
+            if self._fits(request.cost, held=True):
+                self._take(request.cost)
+                ready.append(request)
+        if ready:
+            ready_ids = {id(request) for request in ready}
+            self._pending = [request for request in self._pending if id(request) not in ready_ids]
+        return ready
+
+    def _start(self, ready: List[_Request]) -> None:
+        for request in ready:
+            if not request.future.set_running_or_notify_cancel():
+                self._release(request.cost)
+                continue
+            try:
+                inner = request.start()
+            except BaseException as e:
+                self._release(request.cost)
+                request.future.set_exception(e)
+                continue
+            inner.add_done_callback(lambda f, request=request: self._finish(request, f))
+
+    def _finish(self, request: _Request, inner: Future) -> None:
+        self._release(request.cost)
+        if inner.cancelled():
+            _futures.set_exception(request.future, CancelledError())
+        else:
+            _futures.copy_outcome(inner, request.future)
+
+    def _release(self, cost: Dict[str, float]) -> None:
+        with self._lock:
+            for name, amount in cost.items():
+                self._available[name] = min(self._budget[name], self._available[name] + amount)
+            head = next((r for r in self._pending if not r.future.done()), None)
+            if head is not None and not self._fits(head.cost, held=False):
+                if head is not self._held_for:
+                    self._held = dict.fromkeys(self._budget, 0.0)
+                    self._held_for = head
+                # Hold what the head still lacks, so backfill cannot take it
+                for name, amount in cost.items():
+                    need = head.cost.get(name, 0.0)
+                    self._held[name] = min(need, self._held[name] + amount)
+            ready = self._admit()
+        self._start(ready)
+
+    def usage(self) -> Dict[str, Any]:
+        """Snapshot of the budget, free amounts and waiting tasks."""
+        with self._lock:
+            return {
+                "budget": dict(self._budget),
+                "available": dict(self._available),
+                "pending": sum(1 for request in self._pending if not request.future.done()),
+            }
+
+
+def resolve_pool(resources: Union[ResourcePool, ResourceSpec, None]) -> Optional[ResourcePool]:
+    """Turn a resources= argument into a ResourcePool."""
+    if resources is None or isinstance(resources, ResourcePool):
+        return resources
+    return ResourcePool(resources)
@@ -0,0 +1,333 @@
+"""
+PyAsync - Retries and circuit breaking.
+
+A Retry policy re-dispatches failed tasks with exponential backoff and
+jitter. The backoff wait happens on pyasync's timer thread, so a task that
+is waiting to be retried does not hold a pool worker.
+
+A CircuitBreaker stops dispatching calls to a dependency that keeps
+failing: once open, calls fail fast with CircuitOpenError until a recovery
+timeout has passed and a trial call succeeds.
+"""
+
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Tuple, Type, Union
+import random
+import threading
+import time
+
+from . import _futures, _timer
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of running a call while its circuit breaker is open."""
+
+
+class Retry:
+    """
+    Retry policy with exponential backoff and jitter.
+
+    The wait before attempt n+1 is backoff * multiplier**(n-1), capped at
+    max_backoff, then jittered:
+
+    - "full": uniform between 0 and the computed wait
+    - "equal": half the wait plus uniform jitter over the other half
+    - None: no jitter
+
+    Example:
+        policy = Retry(max_attempts=5, backoff=0.2, retry_on=(ConnectionError,))
+
+        data = run(lambda: fetch(url), retry=policy)
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff: float = 0.1,
+        multiplier: float = 2.0,
+        max_backoff: float = 10.0,
+        jitter: Optional[str] = "full",
+        retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+        retry_if: Optional[Callable[[BaseException], bool]] = None
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts: Total attempts, including the first one.
+            backoff: Wait in seconds before the first retry.
+            multiplier: Growth factor of the wait between retries.
+            max_backoff: Upper bound for the wait in seconds.
+            jitter: "full", "equal" or None.
+            retry_on: Exception types that are retried.
+            retry_if: Optional predicate further filtering retryable
+                exceptions.
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if jitter not in ("full", "equal", None):
+            raise ValueError(f"Unknown jitter: {jitter!r}")
+
+        self._max_attempts = max_attempts
+        self._backoff = backoff
+        self._multiplier = multiplier
+        self._max_backoff = max_backoff
+        self._jitter = jitter
+        self._retry_on = retry_on
+        self._retry_if = retry_if
+
+    def delay(self, attempt: int) -> float:
+        """Return the wait in seconds after the given failed attempt (1-based)."""
+        wait = min(self._max_backoff, self._backoff * self._multiplier ** (attempt - 1))
+        if self._jitter == "full":
+            return random.uniform(0, wait)
+        if self._jitter == "equal":
+            return wait / 2 + random.uniform(0, wait / 2)
+        return wait
+
+    def should_retry(self, exc: BaseException, attempt: int) -> bool:
+        """Return True if a failed attempt should be retried."""
+        if attempt >= self._max_attempts:
+            return False
+        # An open circuit is meant to fail fast, not be hammered with retries
+        if isinstance(exc, CircuitOpenError) or not isinstance(exc, self._retry_on):
+            return False
+        return self._retry_if is None or self._retry_if(exc)
+
+    def run(self, submit: Callable[[], Future]) -> Future:
+        """
+        Run a task under this policy.
+
+        Args:
+            submit: Starts one attempt of the task and returns its Future.
+
+        Returns:
+            Future resolved by the first successful attempt, or failed with
+            the last attempt's exception.
+        """
+        return _RetriedCall(self, submit).outer
+
+
+class _RetriedCall:
+    """State of one retried task: the caller's Future and the current attempt."""
+
+    def __init__(self, policy: Retry, submit: Callable[[], Future]):
+        self.policy = policy
+        self.submit = submit
+        self.outer: Future = Future()
+        self.attempt = 0
+        self.current: Optional[Future] = None
+        self.timer: Optional[_timer.TimerHandle] = None
+
+        self.outer.add_done_callback(self._finish)
+        self._launch()
+
+    def _launch(self) -> None:
+        if self.outer.done():
+            return
+        self.attempt += 1
+        try:
+            self.current = self.submit()
+        except Exception as e:
+            _futures.set_exception(self.outer, e)
+            return
+        self.current.add_done_callback(self._attempt_done)
+
+    def _attempt_done(self, future: Future) -> None:
+        if future.cancelled():
+            self.outer.cancel()
+            return
+        exc = future.exception()
+        if exc is not None and self.policy.should_retry(exc, self.attempt):
+            self.timer = _timer.call_later(self.policy.delay(self.attempt), self._launch)
+            return
+        _futures.copy_outcome(future, self.outer)
+
+    def _finish(self, outer: Future) -> None:
+        if not outer.cancelled():
+            return
+        if self.timer is not None:
+            self.timer.cancel()
+        if self.current is not None:
+            self.current.cancel()
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker guarding calls to one dependency.
+
+    - closed: calls run normally; consecutive failures are counted.
+    - open: after failure_threshold consecutive failures, calls fail fast
+      with CircuitOpenError without being dispatched.
+    - half-open: after recovery_timeout, up to half_open_max_calls trial
+      calls are let through. A success closes the circuit, a failure opens
+      it again.
+
+    Use one breaker per dependency, for example per host. Passing a name
+    as breaker= uses the breaker registered under that name by
+    circuit_breaker(), creating it with default settings if needed.
+
+    Example:
+        payments = CircuitBreaker(failure_threshold=5, recovery_timeout=30.0)
+
+        try:
+            run(lambda: charge(order), breaker=payments)
+        except CircuitOpenError:
+            queue_for_later(order)
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        failure_on: Tuple[Type[BaseException], ...] = (Exception,),
+        name: Optional[str] = None
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            recovery_timeout: Seconds the circuit stays open before trial
+                calls are allowed.
+            half_open_max_calls: Trial calls allowed while half-open.
+            failure_on: Exception types that count as failures. Other
+                exceptions neither count as failures nor close the circuit.
+            name: Name used in CircuitOpenError messages.
+        """
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._half_open_max_calls = half_open_max_calls
+        self._failure_on = failure_on
+        self._name = name
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_calls = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half-open"."""
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self) -> None:
+        """Move from open to half-open once the recovery timeout passed (lock held)."""
+        if self._state == "open" and time.monotonic() - self._opened_at >= self._recovery_timeout:
+            self._state = "half-open"
+            self._trial_calls = 0
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may be dispatched, reserving a trial slot
+        when half-open. Every allowed call must be followed by
+        record_success() or record_failure().
+        """
+        with self._lock:
+            self._refresh()
+            if self._state == "closed":
+                return True
+            if self._state == "half-open" and self._trial_calls < self._half_open_max_calls:
+                self._trial_calls += 1
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        with self._lock:
+            self._failures = 0
+            self._state = "closed"
+
+    def record_failure(self) -> None:
+        """Record a failed call."""
+        with self._lock:
+            self._failures += 1
+            if self._state == "half-open" or self._failures >= self._failure_threshold:
+                self._state = "open"
+                self._opened_at = time.monotonic()
+
+    def reset(self) -> None:
+        """Force the circuit closed."""
+        self.record_success()
+
+    def run(self, submit: Callable[[], Future]) -> Future:
+        """
+        Dispatch a call through the breaker.
+
+        Args:
+            submit: Starts the call and returns its Future.
+
+        Returns:
+            The call's Future, or a Future already failed with
+            CircuitOpenError if the circuit is open.
+        """
+        if not self.allow():
+            future: Future = Future()
+            label = f" {self._name!r}" if self._name else ""
+            future.set_exception(CircuitOpenError(f"Circuit{label} is open"))
+            return future
+
+        future = submit()
+        future.add_done_callback(self._record)
+        return future
+
+    def _record(self, future: Future) -> None:
+        exc = None if future.cancelled() else future.exception()
+        if exc is None and not future.cancelled():
+            self.record_success()
+        elif exc is not None and isinstance(exc, self._failure_on):
+            self.record_failure()
+        else:
+            # Cancelled, or an error that says nothing about the
+            # dependency: neutral, but it frees its trial slot
+            with self._lock:
+                if self._state == "half-open":
+                    self._trial_calls -= 1
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def circuit_breaker(
+    name: str,
+    failure_threshold: int = 5,
+    recovery_timeout: float = 30.0,
+    half_open_max_calls: int = 1,
+    failure_on: Tuple[Type[BaseException], ...] = (Exception,)
+) -> CircuitBreaker:
+    """
+    Get or create a shared CircuitBreaker registered under name.
+
+    Settings are only used when the breaker is created. Calls may also pass
+    breaker="name" to pyasync functions, which gives one breaker per key.
+
+    Example:
+        for host, url in targets:
+            background(lambda u=url: fetch(u), breaker=host)
+
+        print(circuit_breaker("api.example.com").state)
+
+    Returns:
+        The shared CircuitBreaker.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(
+                failure_threshold, recovery_timeout, half_open_max_calls, failure_on, name
+            )
+        return breaker
+
+
+BreakerLike = Union[CircuitBreaker, str, None]
+
+
+def resolve_breaker(breaker: BreakerLike) -> Optional[CircuitBreaker]:
+    """Turn a breaker= argument (breaker or registered name) into a breaker."""
+    if isinstance(breaker, str):
+        return circuit_breaker(breaker)
+    return breaker
@@ -5,11 +5,35 @@ Simple, explicit API for running tasks in parallel using threads and processes.
 Threads for I/O-bound tasks, processes for CPU-bound tasks.
 """
 
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future
-from typing import Callable, Any, List, Optional, Iterator
+from concurrent.futures import (
+    CancelledError, Executor, ThreadPoolExecutor, ProcessPoolExecutor, Future, FIRST_COMPLETED, wait
+)
+from typing import (
+    Callable, Any, Dict, Hashable, Iterable, List, Optional, Iterator, Sequence, Union
+)
+from contextvars import Context, copy_context
+from functools import partial
+import asyncio
+import itertools
+import logging
 import threading
 import multiprocessing
 import os
+import time
+
+from . import (
+    _futures, _loop, _timer, checkpoints, contention, costs, metrics, profiler, streaming, tracing
+)
+from .cache import ResultCache, default_cache, scoped_key
+from .checkpoints import CheckpointStore
+from .costs import CostLike
+from .diskcache import DiskCache
+from .hedging import Hedge
+from .jobqueue import JobQueue
+from .limits import Limiter, RateLimiter, RateLike, resolve_rate
+from .retry import Retry, BreakerLike, resolve_breaker
+from .resources import ResourcePool, ResourceSpec, default_budget, resolve_pool
+from .streaming import CpuStream
 
 
 # Global thread pool
@@ -24,16 +48,158 @@ def _get_executor() -> ThreadPoolExecutor:
         with _executor_lock:
             if _executor is None:
                 _executor = ThreadPoolExecutor(max_workers=32)
+                metrics.register("thread", _executor, "thread")
     return _executor
 
 
-def parallel(*callables: Callable[[], Any]) -> List[Any]:
+def _executor_for(fn: Callable) -> Executor:
+    """Pick the thread pool, or the shared event loop for coroutine functions."""
+    return _loop.get_executor() if _loop.is_async(fn) else _get_executor()
+
+
+def _dispatch(
+    executor: Executor,
+    fn: Callable,
+    args: tuple,
+    kwargs: Dict[str, Any],
+    context: Optional[Context] = None
+) -> Future:
+    """Hand a call to its executor, with tracing, profiling and metrics."""
+    if isinstance(executor, ThreadPoolExecutor):
+        backend = "thread"
+        if contention.active():
+            redirected = contention.redirect(fn, args, kwargs)
+            if redirected is not None:
+                executor, backend = _get_cpu_executor(), "process"
+                fn, args, kwargs = redirected, (), {}
+            else:
+                fn, args, kwargs = contention.wrap(fn, args, kwargs), (), {}
+    elif isinstance(executor, ProcessPoolExecutor):
+        backend = "process"
+    else:
+        return metrics.submit(executor, fn, args, kwargs)
+    
+    if profiler.active():
+        return profiler.submit(
+            executor, fn, args, kwargs,
+            lambda executor, fn, args, kwargs: tracing.submit(
+                executor, fn, args, kwargs, backend, metrics.submit, context
+            )
+        )
+    return tracing.submit(executor, fn, args, kwargs, backend, metrics.submit, context)
+
+
+def _submit(
+    executor: Executor,
+    fn: Callable,
+    args: tuple = (),
+    kwargs: Optional[Dict[str, Any]] = None,
+    rates: Sequence[RateLimiter] = (),
+    hedge: Optional[Hedge] = None,
+    retry: Optional[Retry] = None,
+    breaker: BreakerLike = None,
+    context: Optional[Context] = None
+) -> Future:
+    """
+    Submit a callable to an executor, honoring the call's policies.
+    
+    Policies are layered outermost first: retry, circuit breaker, hedge,
+    rate limit. Every retry attempt goes through the breaker, and every
+    hedged attempt waits for its own rate limit token.
+    
+    The caller's contextvars are captured here, before any policy, so
+    attempts started later from the timer thread or a finished future's
+    callback (and their on_submit hooks) still see them. Pass context to
+    use one captured earlier, as then() and catch() do.
+    
+    When a rate limiter has no token available, dispatch is deferred on the
+    timer thread and a placeholder Future is returned right away, so no pool
+    worker sits idle waiting for the token. Retry backoff waits on the same
+    timer thread.
+    """
+    if context is None and (rates or retry or breaker or hedge):
+        context = copy_context()
+    if retry is not None:
+        return retry.run(
+            partial(_submit, executor, fn, args, kwargs, rates, hedge, None, breaker, context)
+        )
+    if breaker is not None:
+        return resolve_breaker(breaker).run(
+            partial(_submit, executor, fn, args, kwargs, rates, hedge, None, None, context)
+        )
+    if hedge is not None:
+        return hedge.run(
+            partial(_submit, executor, fn, args, kwargs, rates, None, None, None, context)
+        )
+    
+    kwargs = kwargs or {}
+    delay = max((rate.reserve() for rate in rates), default=0.0)
+    if delay <= 0:
+        return _dispatch(executor, fn, args, kwargs, context)
+    
+    future: Future = Future()
+    _timer.call_later(delay, _submit_deferred, executor, future, fn, args, kwargs, context)
+    return future
+
+
+def _submit_deferred(
+    executor: Executor,
+    future: Future,
+    fn: Callable,
+    args: tuple,
+    kwargs: Dict[str, Any],
+    context: Context
+) -> None:
+    """Dispatch a rate-limited call once its token is due (timer thread)."""
+    if future.cancelled():
+        return
+    try:
+        _futures.chain(_dispatch(executor, fn, args, kwargs, context), future)
+    except Exception as e:
+        _futures.set_exception(future, e)
+
+
+def _submit_cached(
+    key: Optional[Hashable],
+    cache: Optional[ResultCache],
+    submit: Callable[[], Future],
+    fn: Callable
+) -> Future:
+    """
+    Run submit() through a result cache when the call has a key.
+    
+    Keys in the shared default_cache are scoped to fn (see scoped_key()).
+    """
+    if key is None:
+        return submit()
+    if cache is None:
+        cache, key = default_cache, scoped_key(fn, key)
+    return cache.get_or_submit(key, submit)
+
+
+def _rates(*rates: RateLike) -> List[RateLimiter]:
+    """Resolve rate= arguments, dropping the ones that are not set."""
+    return [limiter for limiter in map(resolve_rate, rates) if limiter is not None]
+
+
+def parallel(
+    *callables: Callable[[], Any],
+    rate: RateLike = None,
+    hedge: Optional[Hedge] = None,
+    retry: Optional[Retry] = None,
+    breaker: BreakerLike = None,
+    profile: bool = False
+) -> List[Any]:
     """
     Run multiple callables in parallel threads.
     
     Each callable runs in its own thread. Results are returned
     in the same order as the input callables.
     
+    Coroutine functions (async def) are accepted too. They run on a shared
+    background event loop instead of taking a thread each, so thousands of
+    network calls can be in flight at once.
+    
     Example:
         results = parallel(
             lambda: requests.get("https://api1.com"),
@@ -41,9 +207,20 @@ def parallel(*callables: Callable[[], Any]) -> List[Any]:
             lambda: requests.get("https://api3.com")
         )
         # All 3 requests run in parallel!
+        
+        results = parallel(*[partial(fetch_async, url) for url in urls])
     
     Args:
-        *callables: Functions to run in parallel (no arguments)
+        *callables: Functions or coroutine functions to run in parallel
+            (no arguments)
+        rate: Rate limit for starting the callables: a RateLimiter, the
+            name of one registered with rate_limiter(), or tokens per second.
+        hedge: Hedge policy launching a duplicate of slow callables.
+        retry: Retry policy for failed attempts.
+        breaker: Circuit breaker (or registered name) that fails fast
+            while the dependency is down.
+        profile: Sample the callables while they run and print a profile
+            report when done (see profiling()).
     
     Returns:
         List of results in order
@@ -51,8 +228,15 @@ def parallel(*callables: Callable[[], Any]) -> List[Any]:
     if not callables:
         return []
     
-    executor = _get_executor()
-    futures = [executor.submit(fn) for fn in callables]
+    if profile:
+        with profiler.profiling(report=True):
+            return parallel(*callables, rate=rate, hedge=hedge, retry=retry, breaker=breaker)
+    
+    rates = _rates(rate)
+    futures = [
+        _submit(_executor_for(fn), fn, rates=rates, hedge=hedge, retry=retry, breaker=breaker)
+        for fn in callables
+    ]
     
     results = []
     exceptions = []
@@ -69,16 +253,244 @@ def parallel(*callables: Callable[[], Any]) -> List[Any]:
     return results
 
 
-class Task:
+def parallel_map(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    key: Optional[Callable[[Any], Hashable]] = None,
+    limiter: Optional[Limiter] = None
+) -> List[Any]:
+    """
+    Apply a function to each item in parallel threads.
+    
+    With key, items are grouped (e.g. by host) and each group gets its own
+    adaptive concurrency limit, so one slow downstream cannot take over
+    the whole thread pool. Items over the limit wait in a queue, not in a
+    pool thread.
+    
+    Example:
+        from urllib.parse import urlparse
+        
+        pages = parallel_map(
+            scrape_url,
+            urls,
+            key=lambda url: urlparse(url).netloc
+        )
+    
+    Args:
+        fn: Function called with each item.
+        items: Items to process.
+        key: Function returning the limiter key for an item.
+        limiter: Limiter to enforce (shared across calls if reused).
+            Defaults to a new Limiter when key is given.
+    
+    Returns:
+        List of results in order
+    """
+    items = list(items)
+    if not items:
+        return []
+    
+    if key is None and limiter is None:
+        return parallel(*[partial(fn, item) for item in items])
+    
+    limiter = limiter or Limiter()
+    tasks = [
+        limiter.submit(key(item) if key else None, partial(fn, item))
+        for item in items
+    ]
+    
+    results = []
+    exceptions = []
+    
+    for task in tasks:
+        try:
+            results.append(task.result())
+        except Exception as e:
+            exceptions.append(e)
+    
+    if exceptions:
+        raise exceptions[0]
+    
+    return results
+
+
+def _resolve(target: Future, inner: Future) -> None:
+    """Resolve target from inner, unwrapping a returned Task or CpuTask."""
+    if not inner.cancelled() and inner.exception() is None:
+        value = inner.result()
+        if isinstance(value, _TaskBase):
+            _futures.chain(value._future, target)
+            return
+    _futures.copy_outcome(inner, target)
+
+
+def _continue(
+    executor: Executor,
+    fn: Callable,
+    context: Context,
+    value: Any,
+    target: Future
+) -> None:
+    """Run fn(value) on executor, in context, and resolve target with its outcome."""
+    if target.cancelled():
+        return
+    try:
+        inner = _submit(executor, fn, (value,), context=context)
+    except Exception as e:
+        _futures.set_exception(target, e)
+        return
+    inner.add_done_callback(partial(_resolve, target))
+    target.add_done_callback(lambda f: f.cancelled() and inner.cancel())
+
+
+def _then_callback(
+    executor: Executor,
+    fn: Callable,
+    context: Context,
+    target: Future,
+    source: Future
+) -> None:
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        _futures.set_exception(target, source.exception())
+    else:
+        _continue(executor, fn, context, source.result(), target)
+
+
+def _catch_callback(
+    executor: Executor,
+    fn: Callable,
+    exceptions: tuple,
+    context: Context,
+    target: Future,
+    source: Future
+) -> None:
+    if source.cancelled():
+        target.cancel()
+        return
+    exc = source.exception()
+    if exc is None:
+        _futures.set_result(target, source.result())
+    elif isinstance(exc, exceptions):
+        _continue(executor, fn, context, exc, target)
+    else:
+        _futures.set_exception(target, exc)
+
+
+class _TaskBase:
+    """Awaiting and continuations shared by Task and CpuTask."""
+    
+    __slots__ = ('_future', '__weakref__')
+    
+    # Backend continuations run on unless another one is requested
+    _backend = "thread"
+    
+    def __init__(self, future: Future):
+        self._future = future
+    
+    def __await__(self):
+        return asyncio.wrap_future(self._future).__await__()
+    
+    def _chained(self, backend: Optional[str], fn: Callable) -> tuple:
+        backend = backend or self._backend
+        if backend == "thread":
+            return _executor_for(fn), Task
+        if backend == "process":
+            return _get_cpu_executor(), CpuTask
+        raise ValueError(f"Unknown backend: {backend!r}")
+    
+    def then(self, fn: Callable[[Any], Any], backend: Optional[str] = None) -> '_TaskBase':
+        """
+        Schedule fn(result) to run once this task succeeds.
+        
+        No thread waits in the meantime: fn is submitted when the result
+        arrives, with the contextvars of the thread calling then().
+        Failures and cancellation skip fn and propagate. If fn returns a
+        Task or CpuTask, the new task resolves with its result.
+        
+        Example:
+            task = background(fetch_page).then(parse).then(store)
+        
+        Args:
+            fn: Function called with the result.
+            backend: "thread" or "process". Defaults to this task's backend.
+        
+        Returns:
+            Task (thread backend) or CpuTask (process backend) for fn's result.
+        """
+        executor, task_type = self._chained(backend, fn)
+        future: Future = Future()
+        self._future.add_done_callback(
+            partial(_then_callback, executor, fn, copy_context(), future)
+        )
+        return task_type(future)
+    
+    def map(self, fn: Callable[[Any], Any]) -> '_TaskBase':
+        """
+        Transform the result with fn once this task succeeds.
+        
+        Unlike then(), fn is not submitted to a pool: it runs in the
+        thread that completes this task, so keep it cheap (unpacking a
+        field, converting a type). Failures and cancellation skip fn and
+        propagate; cancelling the new task cancels this one.
+        
+        Example:
+            status = background(fetch_response).map(lambda response: response.status)
+        
+        Args:
+            fn: Function called with the result.
+        
+        Returns:
+            Task of the same type as this one, for fn's result.
+        """
+        return type(self)(_futures.DerivedFuture(self._future, lambda source: fn(source.result())))
+    
+    def catch(
+        self,
+        fn: Callable[[BaseException], Any],
+        exceptions: Any = Exception,
+        backend: Optional[str] = None
+    ) -> '_TaskBase':
+        """
+        Schedule fn(exception) to run if this task fails.
+        
+        The new task resolves with fn's return value on failure, or with
+        this task's result on success. Exceptions not matching exceptions
+        propagate unchanged.
+        
+        Example:
+            task = background(fetch_price).catch(lambda e: cached_price(), ConnectionError)
+        
+        Args:
+            fn: Function called with the exception.
+            exceptions: Exception type (or tuple of types) to handle.
+            backend: "thread" or "process". Defaults to this task's backend.
+        
+        Returns:
+            Task (thread backend) or CpuTask (process backend).
+        """
+        if not isinstance(exceptions, tuple):
+            exceptions = (exceptions,)
+        executor, task_type = self._chained(backend, fn)
+        future: Future = Future()
+        self._future.add_done_callback(
+            partial(_catch_callback, executor, fn, exceptions, copy_context(), future)
+        )
+        return task_type(future)
+
+
+class Task(_TaskBase):
     """
     A task running in the background.
     
     Use .result() to wait for and get the result.
     Use .done to check if the task has completed.
+    Use .then(), .map() and .catch() to chain follow-up work without blocking.
+    Inside a coroutine, await the task instead of calling .result().
     """
     
-    def __init__(self, future: Future):
-        self._future = future
+    __slots__ = ()
     
     @property
     def done(self) -> bool:
@@ -94,7 +506,16 @@ class Task:
         return self._future.cancel()
 
 
-def background(fn: Callable[[], Any]) -> Task:
+def background(
+    fn: Callable[[], Any],
+    rate: RateLike = None,
+    hedge: Optional[Hedge] = None,
+    retry: Optional[Retry] = None,
+    breaker: BreakerLike = None,
+    key: Optional[Hashable] = None,
+    cache: Optional[ResultCache] = None,
+    queue: Optional[JobQueue] = None
+) -> Task:
     """
     Start a callable running in the background.
     
@@ -106,17 +527,43 @@ def background(fn: Callable[[], Any]) -> Task:
         result = task.result()  # Wait for completion
     
     Args:
-        fn: Function to run in background (no arguments)
+        fn: Function or coroutine function to run in background (no arguments)
+        rate: Rate limit to wait for before starting (see parallel()).
+        hedge: Hedge policy launching a duplicate if the call is slow.
+        retry: Retry policy for failed attempts.
+        breaker: Circuit breaker (or registered name) that fails fast
+            while the dependency is down.
+        key: Cache key. Concurrent calls with the same key share one
+            computation, and its result is cached (see ResultCache).
+        cache: ResultCache to use with key. Defaults to default_cache.
+        queue: JobQueue persisting the job until it has run, so it
+            survives a crash or restart. fn must then be picklable. If
+            another process resumes the job, the resuming queue's
+            policies apply instead of rate, hedge, retry and breaker.
     
     Returns:
         Task object
     """
-    executor = _get_executor()
-    future = executor.submit(fn)
-    return Task(future)
+    if queue is not None:
+        submit = partial(
+            queue.enqueue, fn, "thread", _queue_runner("thread", _rates(rate), hedge, retry, breaker)
+        )
+    else:
+        submit = partial(
+            _submit, _executor_for(fn), fn, rates=_rates(rate), hedge=hedge, retry=retry, breaker=breaker
+        )
+    return Task(_submit_cached(key, cache, submit, fn))
 
 
-def run(fn: Callable[[], Any]) -> Any:
+def run(
+    fn: Callable[[], Any],
+    rate: RateLike = None,
+    hedge: Optional[Hedge] = None,
+    retry: Optional[Retry] = None,
+    breaker: BreakerLike = None,
+    key: Optional[Hashable] = None,
+    cache: Optional[ResultCache] = None
+) -> Any:
     """
     Run a callable in the thread pool and wait for result.
     
@@ -127,13 +574,24 @@ def run(fn: Callable[[], Any]) -> Any:
         result = run(lambda: requests.get("https://api.com"))
     
     Args:
-        fn: Function to run (no arguments)
+        fn: Function or coroutine function to run (no arguments)
+        rate: Rate limit to wait for before starting (see parallel()).
+        hedge: Hedge policy launching a duplicate if the call is slow.
+        retry: Retry policy for failed attempts.
+        breaker: Circuit breaker (or registered name) that fails fast
+            while the dependency is down.
+        key: Cache key. Concurrent calls with the same key share one
+            computation, and its result is cached (see ResultCache).
+        cache: ResultCache to use with key. Defaults to default_cache.
     
     Returns:
         Result of the callable
     """
-    executor = _get_executor()
-    return executor.submit(fn).result()
+    executor = _executor_for(fn)
+    future = _submit_cached(key, cache, partial(
+        _submit, executor, fn, rates=_rates(rate), hedge=hedge, retry=retry, breaker=breaker
+    ), fn)
+    return future.result()
 
 
 # =============================================================================
@@ -153,10 +611,79 @@ def _get_cpu_executor(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
             if _cpu_executor is None:
                 workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
                 _cpu_executor = ProcessPoolExecutor(max_workers=workers)
+                metrics.register("process", _cpu_executor, "process")
     return _cpu_executor
 
 
-class CpuTask:
+def _replace_broken_cpu_executor() -> None:
+    """Drop the global process pool if a worker died, so the next task gets a new one."""
+    global _cpu_executor
+    with _cpu_executor_lock:
+        executor = _cpu_executor
+        if executor is None or not executor._broken:
+            return
+        # The broken pool shuts itself down (see CpuExecutor._replace_broken_pool)
+        _cpu_executor = None
+    metrics.unregister(executor)
+
+
+def _submit_cpu(
+    fn: Callable,
+    rates: Sequence[RateLimiter],
+    hedge: Optional[Hedge],
+    retry: Optional[Retry],
+    breaker: BreakerLike,
+    max_restarts: int
+) -> Future:
+    """Submit to the global process pool, restarting tasks whose worker died."""
+    def submit() -> Future:
+        # Looked up per attempt: a restart runs on a fresh pool
+        return _submit(_get_cpu_executor(), fn, rates=rates, hedge=hedge, retry=retry, breaker=breaker)
+    
+    if not max_restarts:
+        return submit()
+    return checkpoints.restart_on_crash(submit, max_restarts, _replace_broken_cpu_executor)
+
+
+def _queue_runner(
+    backend: str,
+    rates: Sequence[RateLimiter] = (),
+    hedge: Optional[Hedge] = None,
+    retry: Optional[Retry] = None,
+    breaker: BreakerLike = None,
+    max_restarts: int = 0
+) -> Callable[[Callable], Future]:
+    """How a JobQueue runs the jobs it leases, on the shared pool of their backend."""
+    if backend == "process":
+        def run(fn: Callable) -> Future:
+            # A job delivered again after a crash needs a working pool
+            _replace_broken_cpu_executor()
+            return _submit_cpu(fn, rates, hedge, retry, breaker, max_restarts)
+    else:
+        def run(fn: Callable) -> Future:
+            return _submit(_executor_for(fn), fn, rates=rates, hedge=hedge, retry=retry, breaker=breaker)
+    return run
+
+
+def _checkpointed(
+    fn: Callable,
+    task_id: Optional[str],
+    store: Optional[CheckpointStore]
+) -> Callable:
+    if task_id is None:
+        return fn
+    return (store or checkpoints.default_store()).wrap(fn, task_id)
+
+
+# Logger Future uses for failing done-callbacks
+_callback_logger = logging.getLogger("concurrent.futures")
+
+# Marks CpuTask._callbacks once the callbacks have been run
+_FIRED: List[Callable] = []
+_callbacks_lock = threading.Lock()
+
+
+class CpuTask(_TaskBase):
     """
     A CPU-bound task running in a separate process.
     
@@ -174,10 +701,18 @@ class CpuTask:
             result = task.result(timeout=10.0)
         except TimeoutError:
             task.cancel()
+        
+        # Inside a coroutine, await without blocking the event loop
+        result = await cpu_background(partial(heavy_compute, 1000000))
     """
     
+    __slots__ = ('_callbacks',)
+    
+    _backend = "process"
+    
     def __init__(self, future: Future):
-        self._future = future
+        super().__init__(future)
+        self._callbacks: Optional[List[Callable[['CpuTask'], None]]] = None
     
     @property
     def done(self) -> bool:
@@ -244,7 +779,233 @@ class CpuTask:
         Args:
             fn: Callback function that receives this CpuTask.
         """
-        self._future.add_done_callback(lambda f: fn(self))
+        # One future callback fans out to all of ours, instead of wrapping
+        # every fn in a closure of its own
+        with _callbacks_lock:
+            callbacks = self._callbacks
+            if callbacks is None:
+                self._callbacks = [fn]
+            elif callbacks is not _FIRED:
+                callbacks.append(fn)
+        
+        if callbacks is None:
+            self._future.add_done_callback(self._run_callbacks)
+        elif callbacks is _FIRED:
+            self._invoke(fn)
+    
+    def _run_callbacks(self, future: Future) -> None:
+        with _callbacks_lock:
+            callbacks, self._callbacks = self._callbacks, _FIRED
+        for fn in callbacks:
+            self._invoke(fn)
+    
+    def _invoke(self, fn: Callable[['CpuTask'], None]) -> None:
+        try:
+            fn(self)
+        except Exception:
+            # Reported like a failing Future callback
+            _callback_logger.exception('exception calling callback for %r', self)
+
+
+# Item states of a TaskBatch
+_PENDING, _OK, _FAILED, _CANCELLED = 0, 1, 2, 3
+
+
+def _run_batch_chunk(fn: Callable, items: Sequence) -> tuple:
+    """Apply fn to each item of a chunk, catching failures per item (runs in a worker)."""
+    results = []
+    errors = None
+    for index, item in enumerate(items):
+        try:
+            results.append(fn(item))
+        except Exception as e:
+            results.append(None)
+            if errors is None:
+                errors = []
+            errors.append((index, e))
+    return results, errors
+
+
+class TaskBatch:
+    """
+    Handle for many tasks submitted together with submit_many().
+    
+    Items run in chunks, one pool task per chunk, and their results and
+    states are kept in flat arrays instead of a Future and a task object
+    per item.
+    
+    Example:
+        batch = pyasync.submit_many(resize, paths, backend="process")
+        
+        print(f"{batch.completed}/{len(batch)} done")
+        thumbnails = batch.results()
+    """
+    
+    __slots__ = (
+        '_values', '_status', '_errors', '_futures', '_chunksize', '_remaining', '_cond', '_callbacks'
+    )
+    
+    def __init__(self, size: int, chunksize: int):
+        self._values: List[Any] = [None] * size
+        self._status = bytearray(size)
+        self._errors: Dict[int, BaseException] = {}
+        self._futures: List[Future] = []
+        self._chunksize = chunksize
+        self._remaining = 0
+        self._cond = threading.Condition()
+        self._callbacks: List[Callable[[], None]] = []
+    
+    def _add(self, start: int, future: Future) -> None:
+        with self._cond:
+            self._remaining += 1
+        self._futures.append(future)
+        future.add_done_callback(partial(self._chunk_done, start))
+    
+    def _chunk_done(self, start: int, future: Future) -> None:
+        end = min(start + self._chunksize, len(self._status))
+        if future.cancelled():
+            state, values, errors = _CANCELLED, None, ()
+        elif future.exception() is not None:
+            # The chunk as a whole failed (e.g. a worker process died)
+            exc = future.exception()
+            state, values, errors = _FAILED, None, [(i, exc) for i in range(end - start)]
+        else:
+            state = _OK
+            values, errors = future.result()
+        
+        with self._cond:
+            if values is not None:
+                self._values[start:end] = values
+            self._status[start:end] = bytes((state,)) * (end - start)
+            for index, exc in errors or ():
+                self._status[start + index] = _FAILED
+                self._errors[start + index] = exc
+            self._remaining -= 1
+            self._cond.notify_all()
+            callbacks = self._callbacks if self._remaining == 0 else ()
+        for callback in callbacks:
+            callback()
+    
+    def _add_done_callback(self, fn: Callable[[], None]) -> None:
+        with self._cond:
+            if self._remaining:
+                self._callbacks.append(fn)
+                return
+        fn()
+    
+    def __len__(self) -> int:
+        return len(self._status)
+    
+    def __repr__(self) -> str:
+        return f"<TaskBatch {self.completed}/{len(self)} completed>"
+    
+    @property
+    def done(self) -> bool:
+        """Check if every item has completed (successfully or not)."""
+        return self._remaining == 0
+    
+    @property
+    def completed(self) -> int:
+        """Number of items that have completed."""
+        return len(self._status) - self._status.count(_PENDING)
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for every item. Returns False if the timeout expired first."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._remaining == 0, timeout)
+    
+    def _wait_item(self, index: int, timeout: Optional[float]) -> int:
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._status[index] != _PENDING, timeout):
+                raise TimeoutError()
+            return self._status[index]
+    
+    def result(self, index: int, timeout: Optional[float] = None) -> Any:
+        """
+        Wait for and return the result of one item.
+        
+        Raises:
+            TimeoutError: If timeout expires first.
+            CancelledError: If the item was cancelled.
+            Exception: Any exception raised for this item.
+        """
+        state = self._wait_item(index, timeout)
+        if state == _CANCELLED:
+            raise CancelledError()
+        if state == _FAILED:
+            raise self._errors[index]
+        return self._values[index]
+    
+    def exception(self, index: int, timeout: Optional[float] = None) -> Optional[BaseException]:
+        """Wait for one item and return its exception, or None if it succeeded."""
+        state = self._wait_item(index, timeout)
+        if state == _CANCELLED:
+            raise CancelledError()
+        return self._errors.get(index)
+    
+    def exceptions(self) -> Dict[int, BaseException]:
+        """Return the exceptions of the items that failed so far, by index."""
+        with self._cond:
+            return dict(self._errors)
+    
+    def results(self, timeout: Optional[float] = None, return_exceptions: bool = False) -> List[Any]:
+        """
+        Wait for every item and return the results in submission order.
+        
+        Args:
+            timeout: Maximum seconds to wait.
+            return_exceptions: Put exceptions in the list instead of
+                raising the first one.
+        
+        Raises:
+            TimeoutError: If timeout expires first.
+            CancelledError: If items were cancelled.
+            Exception: The exception of the first failed item, unless
+                return_exceptions is set.
+        """
+        if not self.wait(timeout):
+            raise TimeoutError()
+        if _CANCELLED in self._status:
+            raise CancelledError()
+        results = list(self._values)
+        if self._errors:
+            if not return_exceptions:
+                raise self._errors[min(self._errors)]
+            for index, exc in self._errors.items():
+                results[index] = exc
+        return results
+    
+    def cancel(self) -> bool:
+        """Cancel the items that have not started. Returns True if any were."""
+        return any([future.cancel() for future in self._futures])
+
+
+def _submit_many(
+    executor: Executor,
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    chunksize: Optional[int],
+    workers: int,
+    rates: Sequence[RateLimiter] = (),
+    retry: Optional[Retry] = None,
+    breaker: BreakerLike = None
+) -> TaskBatch:
+    if not isinstance(items, Sequence):
+        items = list(items)
+    if chunksize is None:
+        # A few chunks per worker balances the load without per-item tasks
+        chunksize = max(1, -(-len(items) // (workers * 4)))
+    elif chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    
+    batch = TaskBatch(len(items), chunksize)
+    for start in range(0, len(items), chunksize):
+        chunk = items[start:start + chunksize]
+        future = _submit(
+            executor, _run_batch_chunk, (fn, chunk), rates=rates, retry=retry, breaker=breaker
+        )
+        batch._add(start, future)
+    return batch
 
 
 class CpuExecutor:
@@ -268,7 +1029,14 @@ class CpuExecutor:
         max_workers: Optional[int] = None,
         timeout: Optional[float] = None,
         initializer: Optional[Callable[[], None]] = None,
-        initargs: tuple = ()
+        initargs: tuple = (),
+        rate: RateLike = None,
+        retry: Optional[Retry] = None,
+        breaker: BreakerLike = None,
+        retain_tasks: bool = True,
+        resources: Union[ResourcePool, ResourceSpec, None] = None,
+        checkpoints: Optional[CheckpointStore] = None,
+        max_restarts: int = 3
     ):
         """
         Initialize the CPU executor.
@@ -278,26 +1046,79 @@ class CpuExecutor:
             timeout: Default timeout for all tasks (can be overridden per-task).
             initializer: Function called at the start of each worker process.
             initargs: Arguments to pass to the initializer.
+            rate: Rate limit applied to every task started by this executor:
+                a RateLimiter, a registered name, or tokens per second.
+            retry: Retry policy applied to every task (submit and map).
+            breaker: Circuit breaker (or registered name) guarding every task.
+            retain_tasks: Keep every submitted task for tasks and
+                wait_all(). When False, tasks and batches are dropped as
+                soon as they finish, so long-running producers submitting
+                millions of tasks hold memory only for the ones in flight.
+            resources: Resource budget for tasks started with submit_with(),
+                e.g. {"cpus": 8, "mem": "32G"}, or a ResourcePool shared
+                with other executors. Tasks wait until what they declare
+                fits in what is left. Defaults to one cpu per worker and
+                the machine's memory once a task declares resources.
+            checkpoints: CheckpointStore for tasks submitted with a
+                task_id (see submit_with()). Defaults to
+                checkpoints.default_store().
+            max_restarts: How many times a task with a task_id is
+                resubmitted, on a fresh pool, when its worker dies.
         """
         self._max_workers = max_workers or (os.cpu_count() or 1)
         self._default_timeout = timeout
         self._initializer = initializer
         self._initargs = initargs
+        self._rates = _rates(rate)
+        self._retry = retry
+        self._breaker = breaker
         self._executor: Optional[ProcessPoolExecutor] = None
-        self._tasks: List[CpuTask] = []
+        self._retain_tasks = retain_tasks
+        self._resources = resolve_pool(resources)
+        self._checkpoints = checkpoints
+        self._max_restarts = max_restarts
+        self._restartable = False
+        # Submitted tasks and batches by submission number
+        self._tasks: Dict[int, CpuTask] = {}
+        self._batches: Dict[int, TaskBatch] = {}
+        self._counter = itertools.count()
     
     def __enter__(self) -> 'CpuExecutor':
-        self._executor = ProcessPoolExecutor(
+        self._executor = self._new_pool()
+        return self
+    
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
             max_workers=self._max_workers,
             initializer=self._initializer,
             initargs=self._initargs
         )
-        return self
+    
+    def _replace_broken_pool(self) -> None:
+        """Swap in a new pool after a worker died, so restarted tasks can run."""
+        with _cpu_executor_lock:
+            executor = self._executor
+            if executor is None or not executor._broken:
+                return
+            # The broken pool shuts itself down; calling shutdown() here,
+            # from its own crash handler, would deadlock
+            self._executor = self._new_pool()
     
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         if self._executor:
             # Cancel pending tasks on exception
             cancel_futures = exc_type is not None
+            if self._rates or self._retry or self._resources or self._restartable:
+                # Tasks may still be waiting for a rate limit token, a retry,
+                # resources or a restart
+                futures = [task._future for task in list(self._tasks.values())]
+                for batch in list(self._batches.values()):
+                    futures.extend(batch._futures)
+                if cancel_futures:
+                    for future in futures:
+                        future.cancel()
+                else:
+                    wait(futures)
             self._executor.shutdown(wait=True, cancel_futures=cancel_futures)
             self._executor = None
         return False
@@ -314,20 +1135,176 @@ class CpuExecutor:
         Returns:
             CpuTask for monitoring and result retrieval.
         """
+        return self.submit_with(fn, args, kwargs)
+    
+    def submit_with(
+        self,
+        fn: Callable,
+        args: tuple = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+        resources: Optional[ResourceSpec] = None,
+        task_id: Optional[str] = None
+    ) -> CpuTask:
+        """
+        Submit a callable with per-task options.
+        
+        Like submit(), but the function's arguments are passed as a tuple
+        and a dict, so the options cannot clash with its keyword arguments.
+        
+        Example:
+            task = executor.submit_with(train, (dataset,), resources={"mem": "24G", "cpus": 4})
+        
+        Args:
+            fn: Function to execute (must be picklable).
+            args: Positional arguments for the function.
+            kwargs: Keyword arguments for the function.
+            resources: What the task needs from the executor's resource
+                budget, e.g. {"mem": "8G", "cpus": 2}. Sizes accept K, M,
+                G and T suffixes. Tasks that declare nothing take one cpu.
+            task_id: Identifies the task for checkpoint() and restore().
+                The task resumes from its last checkpoint when it is
+                restarted after a worker crash or resubmitted later.
+        
+        Returns:
+            CpuTask for monitoring and result retrieval.
+        
+        Raises:
+            ValueError: If resources names a resource missing from the
+                budget, or more than the whole budget.
+        """
         if self._executor is None:
             raise RuntimeError("CpuExecutor not entered. Use 'with' statement.")
         
-        future = self._executor.submit(fn, *args, **kwargs)
+        if resources is not None and self._resources is None:
+            self._resources = self._default_resources()
+        fn = _checkpointed(fn, task_id, self._checkpoints)
+        kwargs = kwargs or {}
+        
+        def start() -> Future:
+            # Looked up per attempt: a restart runs on a fresh pool
+            return _submit(
+                self._executor, fn, args, kwargs, self._rates,
+                retry=self._retry, breaker=self._breaker
+            )
+        
+        if task_id is not None and self._max_restarts:
+            self._restartable = True
+            start = partial(
+                checkpoints.restart_on_crash, start, self._max_restarts, self._replace_broken_pool
+            )
+        if self._resources is not None:
+            future = self._resources.submit(self._resources.cost(resources), start)
+        else:
+            future = start()
         task = CpuTask(future)
-        self._tasks.append(task)
+        key = next(self._counter)
+        self._tasks[key] = task
+        if not self._retain_tasks:
+            future.add_done_callback(partial(self._forget, self._tasks, key))
         return task
     
+    def _default_resources(self) -> ResourcePool:
+        """Create the default budget, charging the tasks already in flight to it."""
+        pool = ResourcePool(default_budget(self._max_workers))
+        cost = pool.cost(None)
+        for task in list(self._tasks.values()):
+            if not task._future.done():
+                # Released when the task finishes, like a task admitted by the pool
+                pool.submit(cost, lambda future=task._future: future)
+        return pool
+    
+    def submit_many(
+        self,
+        fn: Callable[[Any], Any],
+        items: Iterable[Any],
+        chunksize: Optional[int] = None
+    ) -> TaskBatch:
+        """
+        Submit fn(item) for every item, with one handle for the whole batch.
+        
+        Items are sent to the workers in chunks and tracked in a
+        TaskBatch, which costs a few bytes per item instead of a Future
+        and a CpuTask each. The executor's rate limit, retry and breaker
+        apply per chunk.
+        
+        Example:
+            with CpuExecutor(max_workers=8, retain_tasks=False) as executor:
+                batch = executor.submit_many(score, documents)
+                scores = batch.results()
+        
+        Args:
+            fn: Function taking one item (must be picklable).
+            items: Items to process.
+            chunksize: Items per worker task. Defaults to enough to give
+                each worker about four chunks.
+        
+        Returns:
+            TaskBatch with per-item results and states.
+        """
+        if self._executor is None:
+            raise RuntimeError("CpuExecutor not entered. Use 'with' statement.")
+        
+        batch = _submit_many(
+            self._executor, fn, items, chunksize, self._max_workers,
+            self._rates, self._retry, self._breaker
+        )
+        key = next(self._counter)
+        self._batches[key] = batch
+        if not self._retain_tasks:
+            batch._add_done_callback(partial(self._forget, self._batches, key))
+        return batch
+    
+    def submit_stream(
+        self,
+        fn: Callable[..., Iterator[Any]],
+        *args,
+        chunksize: int = 256,
+        window: int = 4,
+        **kwargs
+    ) -> CpuStream:
+        """
+        Run a generator function in a worker and stream its items back.
+        
+        Items are sent in chunks as they are produced, so the parent can
+        start consuming before the generator finishes, and neither side
+        holds the whole output. The executor's rate limit and breaker
+        apply; retry does not, since items may already have been consumed.
+        
+        Example:
+            with CpuExecutor(max_workers=4) as executor:
+                for row in executor.submit_stream(parse_csv, "big.csv"):
+                    store(row)
+        
+        Args:
+            fn: Generator function (must be picklable).
+            *args: Positional arguments for the function.
+            chunksize: Items per message from the worker.
+            window: Chunks the worker may send ahead of the consumer.
+            **kwargs: Keyword arguments for the function.
+        
+        Returns:
+            CpuStream iterating over the items. Leaving the loop early or
+            calling close() stops the generator in the worker.
+        """
+        if self._executor is None:
+            raise RuntimeError("CpuExecutor not entered. Use 'with' statement.")
+        
+        submit = partial(_submit, self._executor, rates=self._rates, breaker=self._breaker)
+        return streaming.open_stream(submit, fn, args, kwargs, chunksize, window)
+    
+    @staticmethod
+    def _forget(registry: Dict[int, Any], key: int, _: Any = None) -> None:
+        registry.pop(key, None)
+    
     def map(
         self,
         fn: Callable,
         *iterables,
         timeout: Optional[float] = None,
-        chunksize: int = 1
+        chunksize: int = 1,
+        hedge: Optional[Hedge] = None,
+        disk_cache: Optional[DiskCache] = None,
+        cost: CostLike = None
     ) -> Iterator[Any]:
         """
         Map a function over iterables in parallel processes.
@@ -337,6 +1314,15 @@ class CpuExecutor:
             *iterables: Iterables of arguments.
             timeout: Maximum seconds for entire operation.
             chunksize: Number of items per process batch.
+            hedge: Hedge policy for stragglers. Once workers start going
+                idle near the end of the map, chunks running longer than
+                the hedge delay are re-executed on the idle workers.
+            disk_cache: DiskCache memoizing each item's result. Workers
+                look up and store entries themselves.
+            cost: Dispatch the most expensive items first. A list with
+                one cost per item, a function called with each item's
+                arguments, a CostModel, or "learned" (see cpu_parallel()).
+                Items are sent one by one, so chunksize is ignored.
         
         Returns:
             Iterator of results in order.
@@ -348,12 +1334,100 @@ class CpuExecutor:
             raise RuntimeError("CpuExecutor not entered. Use 'with' statement.")
         
         effective_timeout = timeout or self._default_timeout
+        if cost is not None:
+            if hedge is not None:
+                raise ValueError("cost and hedge cannot be combined")
+            return self._cost_map(fn, iterables, effective_timeout, disk_cache, cost)
+        if disk_cache is not None:
+            fn = disk_cache.wrap(fn)
+        if hedge is not None:
+            return self._hedged_map(fn, iterables, effective_timeout, chunksize, hedge)
+        if self._rates or self._retry or self._breaker or profiler.active():
+            return self._submit_map(fn, iterables, effective_timeout)
         return self._executor.map(fn, *iterables, timeout=effective_timeout, chunksize=chunksize)
     
+    def _submit_map(
+        self,
+        fn: Callable,
+        iterables: tuple,
+        timeout: Optional[float]
+    ) -> Iterator[Any]:
+        """Submit map items one by one so each goes through the pool policies."""
+        futures = [
+            _submit(
+                self._executor, fn, args, rates=self._rates,
+                retry=self._retry, breaker=self._breaker
+            )
+            for args in zip(*iterables)
+        ]
+        return _ordered_results(futures, timeout)
+    
+    def _cost_map(
+        self,
+        fn: Callable,
+        iterables: tuple,
+        timeout: Optional[float],
+        disk_cache: Optional[DiskCache],
+        cost: CostLike
+    ) -> Iterator[Any]:
+        """Submit map items longest first, splitting oversized ones."""
+        items = list(zip(*iterables))
+        calls = [(fn, args, {}) for args in items]
+        estimates, model = costs.resolve(cost, calls, lambda index: cost(*items[index]))
+        submit = partial(
+            _submit, self._executor, rates=self._rates, retry=self._retry, breaker=self._breaker
+        )
+        futures = costs.dispatch(
+            costs.plan(calls, estimates, self._max_workers), len(items), submit, model,
+            disk_cache.wrap if disk_cache is not None else None
+        )
+        return _ordered_results(futures, timeout)
+    
+    def _hedged_map(
+        self,
+        fn: Callable,
+        iterables: tuple,
+        timeout: Optional[float],
+        chunksize: int,
+        hedge: Hedge
+    ) -> Iterator[Any]:
+        """Map in chunks, re-executing straggling chunks near the tail."""
+        items = list(zip(*iterables))
+        chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+        attempts = [
+            [_submit(self._executor, _run_chunk, (fn, chunk), rates=self._rates)]
+            for chunk in chunks
+        ]
+        monitor = _StragglerMonitor(self, fn, chunks, attempts, hedge)
+        
+        def results() -> Iterator[Any]:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            try:
+                for index in range(len(chunks)):
+                    while (winner := _winning_attempt(attempts[index])) is None:
+                        remaining = None if deadline is None else deadline - time.monotonic()
+                        if remaining is not None and remaining <= 0:
+                            raise TimeoutError()
+                        poll = _HEDGE_POLL if remaining is None else min(_HEDGE_POLL, remaining)
+                        wait(attempts[index], timeout=poll, return_when=FIRST_COMPLETED)
+                        monitor.check()
+                    yield from winner.result()
+            finally:
+                for futures in attempts:
+                    for future in futures:
+                        future.cancel()
+        
+        return results()
+    
+    @property
+    def resources(self) -> Optional[ResourcePool]:
+        """Resource budget that submit() admits tasks against, if any."""
+        return self._resources
+    
     @property
     def tasks(self) -> List[CpuTask]:
-        """Return list of all submitted tasks."""
-        return self._tasks.copy()
+        """Return list of submitted tasks (only unfinished ones without retain_tasks)."""
+        return list(self._tasks.values())
     
     def wait_all(self, timeout: Optional[float] = None) -> List[Any]:
         """
@@ -369,13 +1443,119 @@ class CpuExecutor:
             TimeoutError: If timeout expires.
         """
         effective_timeout = timeout or self._default_timeout
-        return [task.result(timeout=effective_timeout) for task in self._tasks]
+        return [task.result(timeout=effective_timeout) for task in list(self._tasks.values())]
+
+
+def _ordered_results(futures: List[Future], timeout: Optional[float]) -> Iterator[Any]:
+    """Yield results in order within an overall timeout, cancelling the rest when stopped."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        for future in futures:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            yield future.result(timeout=remaining)
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+# How often CpuExecutor.map looks for stragglers to hedge (seconds)
+_HEDGE_POLL = 0.02
+
+
+def _run_chunk(fn: Callable, chunk: List[tuple]) -> List[Any]:
+    """Apply fn to each argument tuple of a chunk (runs in a worker)."""
+    return [fn(*args) for args in chunk]
+
+
+def _winning_attempt(futures: List[Future]) -> Optional[Future]:
+    """
+    Return the attempt that settles a hedged chunk, if any.
+    
+    The first successful attempt wins. A failure only settles the chunk
+    once every attempt has finished.
+    """
+    failed = None
+    for future in futures:
+        if not future.done():
+            continue
+        if future.cancelled() or future.exception() is not None:
+            failed = failed or future
+        else:
+            return future
+    if failed is not None and all(future.done() for future in futures):
+        return failed
+    return None
+
+
+class _StragglerMonitor:
+    """Tracks chunk runtimes of a hedged map and hedges slow chunks."""
+    
+    def __init__(
+        self,
+        executor: CpuExecutor,
+        fn: Callable,
+        chunks: List[List[tuple]],
+        attempts: List[List[Future]],
+        hedge: Hedge
+    ):
+        self._executor = executor
+        self._fn = fn
+        self._chunks = chunks
+        self._attempts = attempts
+        self._hedge = hedge
+        self._pending = set(range(len(chunks)))
+        self._running_since: Dict[int, float] = {}
+    
+    def check(self) -> None:
+        """Record finished chunks and hedge stragglers on idle workers."""
+        now = time.monotonic()
+        busy = 0
+        
+        for index in list(self._pending):
+            futures = self._attempts[index]
+            winner = _winning_attempt(futures)
+            if winner is not None:
+                self._pending.discard(index)
+                started = self._running_since.pop(index, None)
+                if winner.exception() is None:
+                    if started is not None:
+                        self._hedge.record(now - started)
+                    if winner is not futures[0]:
+                        self._hedge._count_won()
+                continue
+            if index not in self._running_since and any(f.running() for f in futures):
+                self._running_since[index] = now
+            busy += sum(1 for f in futures if not f.done())
+        
+        idle = self._executor._max_workers - busy
+        delay = self._hedge.delay()
+        if idle <= 0 or delay is None:
+            return
+        
+        stragglers = sorted(
+            (started, index) for index, started in self._running_since.items()
+            if now - started >= delay
+            and len(self._attempts[index]) <= self._hedge._max_hedges
+        )
+        for _, index in stragglers[:idle]:
+            self._hedge._count_fired()
+            self._attempts[index].append(_submit(
+                self._executor._executor, _run_chunk, (self._fn, self._chunks[index]),
+                rates=self._executor._rates
+            ))
 
 
 def cpu_parallel(
     *callables: Callable[[], Any],
     timeout: Optional[float] = None,
-    max_workers: Optional[int] = None
+    max_workers: Optional[int] = None,
+    rate: RateLike = None,
+    hedge: Optional[Hedge] = None,
+    retry: Optional[Retry] = None,
+    breaker: BreakerLike = None,
+    disk_cache: Optional[DiskCache] = None,
+    profile: bool = False,
+    cost: CostLike = None
 ) -> List[Any]:
     """
     Run multiple callables in parallel processes.
@@ -403,6 +1583,22 @@ def cpu_parallel(
         *callables: Functions to run in parallel (no arguments).
         timeout: Maximum seconds to wait. None means wait forever.
         max_workers: Maximum processes to use. Defaults to CPU count.
+        rate: Rate limit for starting the callables (see parallel()).
+        hedge: Hedge policy launching a duplicate of slow callables.
+        retry: Retry policy for failed attempts.
+        breaker: Circuit breaker (or registered name) that fails fast
+            while the dependency is down.
+        disk_cache: DiskCache memoizing results across runs. Workers look
+            up and store entries themselves.
+        profile: Sample the callables inside the worker processes and
+            print the merged profile report when done (see profiling()).
+        cost: Dispatch the most expensive callables first, so the
+            biggest job does not run alone at the end. Either a list with
+            one cost per callable, a function called with each callable,
+            a CostModel learning runtimes from earlier runs, or "learned"
+            for the shared model. Calls of functions marked with
+            splittable() that exceed an even share of the total cost are
+            split into smaller calls.
     
     Returns:
         List of results in order.
@@ -413,10 +1609,34 @@ def cpu_parallel(
     if not callables:
         return []
     
-    workers = max_workers or min(len(callables), os.cpu_count() or 1)
+    if profile:
+        with profiler.profiling(report=True):
+            return cpu_parallel(
+                *callables, timeout=timeout, max_workers=max_workers, rate=rate,
+                hedge=hedge, retry=retry, breaker=breaker, disk_cache=disk_cache, cost=cost
+            )
+    
+    rates = _rates(rate)
+    pieces: List[costs.Piece] = []
+    if cost is not None:
+        calls = [costs.as_call(fn) for fn in callables]
+        estimates, model = costs.resolve(cost, calls, lambda index: cost(callables[index]))
+        pieces = costs.plan(calls, estimates, max_workers or (os.cpu_count() or 1))
+        workers = max_workers or min(len(pieces), os.cpu_count() or 1)
+    else:
+        workers = max_workers or min(len(callables), os.cpu_count() or 1)
+        if disk_cache is not None:
+            callables = tuple(map(disk_cache.wrap, callables))
     
     with ProcessPoolExecutor(max_workers=workers) as executor:
-        futures = [executor.submit(fn) for fn in callables]
+        submit = partial(_submit, executor, rates=rates, hedge=hedge, retry=retry, breaker=breaker)
+        if cost is not None:
+            futures = costs.dispatch(
+                pieces, len(callables), submit, model,
+                disk_cache.wrap if disk_cache is not None else None
+            )
+        else:
+            futures = [submit(fn) for fn in callables]
         
         results = []
         exceptions = []
@@ -428,12 +1648,27 @@ def cpu_parallel(
                 exceptions.append(e)
         
         if exceptions:
+            for future in futures:
+                future.cancel()
             raise exceptions[0]
         
         return results
 
 
-def cpu_background(fn: Callable[[], Any]) -> CpuTask:
+def cpu_background(
+    fn: Callable[[], Any],
+    rate: RateLike = None,
+    hedge: Optional[Hedge] = None,
+    retry: Optional[Retry] = None,
+    breaker: BreakerLike = None,
+    key: Optional[Hashable] = None,
+    cache: Optional[ResultCache] = None,
+    disk_cache: Optional[DiskCache] = None,
+    task_id: Optional[str] = None,
+    checkpoints: Optional[CheckpointStore] = None,
+    max_restarts: int = 3,
+    queue: Optional[JobQueue] = None
+) -> CpuTask:
     """
     Start a callable running in a background process.
     
@@ -462,16 +1697,57 @@ def cpu_background(fn: Callable[[], Any]) -> CpuTask:
     
     Args:
         fn: Function to run in background process (no arguments).
+        rate: Rate limit to wait for before starting (see parallel()).
+        hedge: Hedge policy launching a duplicate if the task is slow.
+        retry: Retry policy for failed attempts.
+        breaker: Circuit breaker (or registered name) that fails fast
+            while the dependency is down.
+        key: Cache key. Concurrent calls with the same key share one
+            computation, and its result is cached (see ResultCache).
+        cache: ResultCache to use with key. Defaults to default_cache.
+        disk_cache: DiskCache memoizing the result across runs. The
+            worker looks up and stores the entry itself.
+        task_id: Identifies the task for checkpoint() and restore().
+            Resubmitting the same id resumes from the last checkpoint.
+        checkpoints: CheckpointStore to use with task_id. Defaults to
+            checkpoints.default_store().
+        max_restarts: With a task_id, how many times to resubmit the task
+            (resuming from its checkpoint) when its worker process dies.
+        queue: JobQueue persisting the task until it has run, so it
+            survives a crash or restart. If another process resumes the
+            task, the resuming queue's policies apply instead of rate,
+            hedge, retry and breaker, and it is not restarted.
     
     Returns:
         CpuTask object for monitoring and control.
     """
-    executor = _get_cpu_executor()
-    future = executor.submit(fn)
-    return CpuTask(future)
+    call = disk_cache.wrap(fn) if disk_cache is not None else fn
+    call = _checkpointed(call, task_id, checkpoints)
+    max_restarts = max_restarts if task_id is not None else 0
+    if queue is not None:
+        submit = partial(
+            queue.enqueue, call, "process",
+            _queue_runner("process", _rates(rate), hedge, retry, breaker, max_restarts)
+        )
+    else:
+        submit = partial(_submit_cpu, call, _rates(rate), hedge, retry, breaker, max_restarts)
+    return CpuTask(_submit_cached(key, cache, submit, fn))
 
 
-def cpu_run(fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+def cpu_run(
+    fn: Callable[[], Any],
+    timeout: Optional[float] = None,
+    rate: RateLike = None,
+    hedge: Optional[Hedge] = None,
+    retry: Optional[Retry] = None,
+    breaker: BreakerLike = None,
+    key: Optional[Hashable] = None,
+    cache: Optional[ResultCache] = None,
+    disk_cache: Optional[DiskCache] = None,
+    task_id: Optional[str] = None,
+    checkpoints: Optional[CheckpointStore] = None,
+    max_restarts: int = 3
+) -> Any:
     """
     Run a callable in a separate process and wait for result.
     
@@ -495,7 +1771,24 @@ def cpu_run(fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
     
     Args:
         fn: Function to run (no arguments).
-        timeout: Maximum seconds to wait. None means wait forever.
+        timeout: Maximum seconds to wait, including any wait for a rate
+            limit token. None means wait forever.
+        rate: Rate limit to wait for before starting (see parallel()).
+        hedge: Hedge policy launching a duplicate if the task is slow.
+        retry: Retry policy for failed attempts.
+        breaker: Circuit breaker (or registered name) that fails fast
+            while the dependency is down.
+        key: Cache key. Concurrent calls with the same key share one
+            computation, and its result is cached (see ResultCache).
+        cache: ResultCache to use with key. Defaults to default_cache.
+        disk_cache: DiskCache memoizing the result across runs. The
+            worker looks up and stores the entry itself.
+        task_id: Identifies the task for checkpoint() and restore().
+            Resubmitting the same id resumes from the last checkpoint.
+        checkpoints: CheckpointStore to use with task_id. Defaults to
+            checkpoints.default_store().
+        max_restarts: With a task_id, how many times to resubmit the task
+            (resuming from its checkpoint) when its worker process dies.
     
     Returns:
         Result of the callable.
@@ -503,6 +1796,93 @@ def cpu_run(fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
     Raises:
         TimeoutError: If timeout expires before completion.
     """
-    executor = _get_cpu_executor()
-    return executor.submit(fn).result(timeout=timeout)
+    call = disk_cache.wrap(fn) if disk_cache is not None else fn
+    future = _submit_cached(key, cache, partial(
+        _submit_cpu, _checkpointed(call, task_id, checkpoints), _rates(rate), hedge, retry, breaker,
+        max_restarts if task_id is not None else 0
+    ), fn)
+    return future.result(timeout=timeout)
 
+
+def cpu_stream(
+    fn: Callable[..., Iterator[Any]],
+    *args,
+    chunksize: int = 256,
+    window: int = 4,
+    **kwargs
+) -> CpuStream:
+    """
+    Run a generator function in a separate process and stream its items.
+    
+    Use this instead of cpu_run() when a task produces a large output.
+    Items arrive in chunks while the generator runs, the first ones after
+    at most a few milliseconds, and the worker pauses once it is window
+    chunks ahead of the consumer. An open stream occupies a pool worker
+    until it is exhausted or closed.
+    
+    Example:
+        def parse(path):
+            with open(path) as f:
+                for line in f:
+                    yield expensive_parse(line)
+        
+        for record in cpu_stream(parse, "huge.log"):
+            if record.bad:
+                break  # Stops the generator in the worker
+    
+    Args:
+        fn: Generator function (must be picklable).
+        *args: Positional arguments for the function.
+        chunksize: Items per message from the worker.
+        window: Chunks the worker may send ahead of the consumer.
+        **kwargs: Keyword arguments for the function.
+    
+    Returns:
+        CpuStream iterating over the items. It raises the generator's
+        exception, if any, after the items sent before it.
+    """
+    submit = partial(_submit, _get_cpu_executor())
+    return streaming.open_stream(submit, fn, args, kwargs, chunksize, window)
+
+
+def submit_many(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    backend: str = "thread",
+    chunksize: Optional[int] = None
+) -> TaskBatch:
+    """
+    Submit fn(item) for every item on the shared pools, without waiting.
+    
+    Unlike calling background() or cpu_background() in a loop, items are
+    dispatched in chunks and tracked by a single TaskBatch holding flat
+    arrays of results and states, so submitting a million small tasks
+    does not allocate a million Futures and task objects.
+    
+    Example:
+        batch = pyasync.submit_many(fetch_thumbnail, urls, chunksize=16)
+        
+        while not batch.wait(timeout=1.0):
+            print(f"{batch.completed}/{len(batch)}")
+        
+        thumbnails = batch.results(return_exceptions=True)
+    
+    Args:
+        fn: Function taking one item. Must be picklable for "process".
+        items: Items to process.
+        backend: "thread" or "process".
+        chunksize: Items per pool task. Defaults to enough to give each
+            worker about four chunks.
+    
+    Returns:
+        TaskBatch with per-item results and states.
+    """
+    if backend == "thread":
+        if _loop.is_async(fn):
+            raise ValueError("submit_many() does not accept coroutine functions")
+        executor = _get_executor()
+    elif backend == "process":
+        executor = _get_cpu_executor()
+    else:
+        raise ValueError(f"Unknown backend: {backend!r}")
+    return _submit_many(executor, fn, items, chunksize, executor._max_workers)
@@ -0,0 +1,349 @@
+"""
+PyAsync - Delayed and periodic jobs.
+
+schedule(), every() and cron() run jobs off the shared timer wheel thread.
+Waiting costs no pool thread: a job only takes a thread (or a process)
+while it actually runs.
+"""
+
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from typing import Callable, Any, Dict, Optional, Set, Union
+import logging
+import threading
+import time
+
+from . import _futures, _timer
+from .runtime import Task, CpuTask, _get_cpu_executor, _executor_for, _submit
+
+
+_logger = logging.getLogger(__name__)
+
+
+def _executor(backend: str, fn: Callable):
+    if backend == "thread":
+        return _executor_for(fn)
+    if backend == "process":
+        return _get_cpu_executor()
+    raise ValueError(f"Unknown backend: {backend!r}")
+
+
+def schedule(
+    fn: Callable[[], Any],
+    delay: float = 0.0,
+    backend: str = "thread"
+) -> Union[Task, CpuTask]:
+    """
+    Run a callable once after a delay.
+
+    Example:
+        reminder = schedule(send_reminder, delay=3600.0)
+        ...
+        reminder.cancel()  # Before it fires, nothing runs
+
+    Args:
+        fn: Function to run (no arguments).
+        delay: Seconds to wait before running.
+        backend: "thread" or "process".
+
+    Returns:
+        Task (thread backend) or CpuTask (process backend). Cancelling it
+        before the delay expires removes the timer.
+    """
+    executor = _executor(backend, fn)
+    future: Future = Future()
+
+    def fire() -> None:
+        if future.cancelled():
+            return
+        try:
+            _futures.chain(_submit(executor, fn), future)
+        except Exception as e:
+            _futures.set_exception(future, e)
+
+    handle = _timer.call_later(delay, fire)
+    future.add_done_callback(lambda f: f.cancelled() and handle.cancel())
+    return Task(future) if backend == "thread" else CpuTask(future)
+
+
+class ScheduledJob:
+    """
+    A periodic job. Returned by every() and cron().
+
+    When a run is due while the previous one is still going, the due run
+    is either skipped (overlap="skip") or coalesced (overlap="coalesce"):
+    all runs missed meanwhile collapse into one that starts as soon as
+    the previous run finishes.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[], Any],
+        next_time: Callable[[float], float],
+        first: float,
+        backend: str,
+        overlap: str
+    ):
+        if overlap not in ("skip", "coalesce"):
+            raise ValueError(f"Unknown overlap policy: {overlap!r}")
+
+        self._fn = fn
+        self._next_time = next_time
+        self._executor = _executor(backend, fn)
+        self._overlap = overlap
+        self._lock = threading.Lock()
+        self._running = False
+        self._pending = False
+        self._cancelled = False
+        self._runs = 0
+        self._skipped = 0
+        self._failures = 0
+        self._last_exception: Optional[BaseException] = None
+        self._due = first
+        self._handle = _timer.call_later(first - time.monotonic(), self._fire)
+
+    @property
+    def cancelled(self) -> bool:
+        """Check if the job was cancelled."""
+        return self._cancelled
+
+    @property
+    def next_run(self) -> Optional[float]:
+        """Seconds until the next scheduled run, or None if cancelled."""
+        if self._cancelled:
+            return None
+        return max(0.0, self._due - time.monotonic())
+
+    @property
+    def last_exception(self) -> Optional[BaseException]:
+        """Exception raised by the most recent failed run, if any."""
+        return self._last_exception
+
+    def stats(self) -> Dict[str, int]:
+        """Return counts of runs started, runs skipped or coalesced, and failures."""
+        with self._lock:
+            return {"runs": self._runs, "skipped": self._skipped, "failures": self._failures}
+
+    def cancel(self) -> None:
+        """Stop scheduling runs. A run in progress is not interrupted."""
+        with self._lock:
+            self._cancelled = True
+            self._pending = False
+        self._handle.cancel()
+
+    def _fire(self) -> None:
+        """Timer callback: start a run and schedule the next one."""
+        with self._lock:
+            if self._cancelled:
+                return
+            now = time.monotonic()
+            due = self._next_time(self._due)
+            # Fell behind (e.g. a long pause): runs between are missed
+            while due <= now:
+                self._skipped += 1
+                due = self._next_time(due)
+            self._due = due
+            self._handle = _timer.call_later(due - now, self._fire)
+
+            if self._running:
+                self._skipped += 1
+                if self._overlap == "coalesce":
+                    self._pending = True
+                return
+            self._running = True
+            self._runs += 1
+        self._start()
+
+    def _start(self) -> None:
+        try:
+            future = _submit(self._executor, self._fn)
+        except Exception as e:
+            future = Future()
+            future.set_exception(e)
+        future.add_done_callback(self._on_done)
+
+    def _on_done(self, future: Future) -> None:
+        exc = None if future.cancelled() else future.exception()
+        with self._lock:
+            if exc is not None:
+                self._failures += 1
+                self._last_exception = exc
+            if self._pending and not self._cancelled:
+                self._pending = False
+                self._runs += 1
+                again = True
+            else:
+                self._running = False
+                again = False
+        if exc is not None:
+            _logger.error("Scheduled job %r failed", self._fn, exc_info=exc)
+        if again:
+            self._start()
+
+
+def every(
+    interval: float,
+    fn: Callable[[], Any],
+    delay: Optional[float] = None,
+    backend: str = "thread",
+    overlap: str = "skip"
+) -> ScheduledJob:
+    """
+    Run a callable periodically.
+
+    Runs are scheduled on a fixed-rate grid (start, start + interval, ...),
+    so the schedule does not drift with run time.
+
+    Example:
+        job = every(30.0, refresh_token)
+        ...
+        job.cancel()
+
+    Args:
+        interval: Seconds between runs.
+        fn: Function to run (no arguments).
+        delay: Seconds until the first run. Defaults to interval.
+        backend: "thread" or "process".
+        overlap: What to do when a run is due while the previous one is
+            still going: "skip" it, or "coalesce" missed runs into one.
+
+    Returns:
+        ScheduledJob for monitoring and cancellation.
+    """
+    if interval <= 0:
+        raise ValueError("interval must be positive")
+
+    first = time.monotonic() + (interval if delay is None else delay)
+    return ScheduledJob(fn, lambda due: due + interval, first, backend, overlap)
+
+
+_CRON_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 7),
+)
+
+_CRON_NAMES = {
+    "month": ["jan", "feb", "mar", "apr", "may", "jun",
+              "jul", "aug", "sep", "oct", "nov", "dec"],
+    "weekday": ["sun", "mon", "tue", "wed", "thu", "fri", "sat"],
+}
+
+
+def _parse_cron_field(field: str, name: str, low: int, high: int) -> Set[int]:
+    """Parse one cron field (e.g. "*/15", "1-5", "mon,wed") into its values."""
+    names = _CRON_NAMES.get(name, [])
+    offset = 1 if name == "month" else 0
+
+    def value(text: str) -> int:
+        text = text.lower()
+        if text in names:
+            return names.index(text) + offset
+        return int(text)
+
+    values: Set[int] = set()
+    for part in field.split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            step = int(step_text)
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start_text, end_text = part.split('-', 1)
+            start, end = value(start_text), value(end_text)
+        else:
+            start = value(part)
+            end = high if step > 1 else start
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"Invalid cron {name} field: {field!r}")
+        values.update(range(start, end + 1, step))
+    if name == "weekday":
+        # Both 0 and 7 mean Sunday
+        values = {weekday % 7 for weekday in values}
+    return values
+
+
+class _CronSpec:
+    """Parsed five-field cron expression."""
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        parsed = [
+            _parse_cron_field(field, name, low, high)
+            for field, (name, low, high) in zip(fields, _CRON_FIELDS)
+        ]
+        self.minutes, self.hours, self.days, self.months, self.weekdays = parsed
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        # As in cron: when both fields are restricted, either may match
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Return the first matching minute strictly after moment."""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                month = candidate.month % 12 + 1
+                year = candidate.year + (candidate.month == 12)
+                candidate = candidate.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError("Cron expression never matches")
+
+
+def cron(
+    expression: str,
+    fn: Callable[[], Any],
+    backend: str = "thread",
+    overlap: str = "skip"
+) -> ScheduledJob:
+    """
+    Run a callable on a cron schedule (local time).
+
+    Supports the standard five fields (minute hour day month weekday) with
+    "*", lists, ranges, steps and month/weekday names.
+
+    Example:
+        cron("*/15 * * * *", sync_inventory)       # Every 15 minutes
+        cron("0 3 * * mon-fri", nightly_report)    # 03:00 on weekdays
+
+    Args:
+        expression: Cron expression.
+        fn: Function to run (no arguments).
+        backend: "thread" or "process".
+        overlap: "skip" or "coalesce" runs due while one is still going.
+
+    Returns:
+        ScheduledJob for monitoring and cancellation.
+
+    Raises:
+        ValueError: If the expression is invalid.
+    """
+    spec = _CronSpec(expression)
+
+    def next_time(due: float) -> float:
+        # Translate between the monotonic clock and local wall time
+        offset = time.monotonic() - time.time()
+        moment = datetime.fromtimestamp(max(due - offset, time.time()))
+        return spec.next_after(moment).timestamp() + offset
+
+    first = next_time(time.monotonic())
+    return ScheduledJob(fn, next_time, first, backend, overlap)
@@ -0,0 +1,252 @@
+"""
+PyAsync - Streaming generator results out of worker processes.
+
+A generator function runs in a pool worker and sends its items to the
+parent over a pipe in chunks, instead of building the whole result in
+the worker and pickling it as one blob. Flow control is credit based:
+the worker may have at most `window` chunks in flight, and the parent
+grants a new credit for each chunk it receives, so a slow consumer
+pauses the producer rather than filling memory. Closing the stream
+tells the worker to close the generator and stop.
+"""
+
+from concurrent.futures import Future
+from multiprocessing.connection import Connection
+from typing import Callable, Any, Dict, Iterator, List, Optional
+import atexit
+import multiprocessing
+import threading
+import time
+import weakref
+
+
+# Longest a partial chunk waits in the worker before it is sent (seconds)
+_FLUSH_INTERVAL = 0.05
+
+# How often the parent checks for a failed producer while waiting (seconds)
+_POLL = 0.05
+
+
+# Open streams, closed at interpreter exit so producers blocked on flow
+# control do not keep the process pools from shutting down
+_open: 'weakref.WeakSet[CpuStream]' = weakref.WeakSet()
+
+
+def _close_all() -> None:
+    for stream in list(_open):
+        stream.close()
+
+
+# The pools are joined by concurrent.futures in a threading exit hook,
+# which runs before atexit handlers: a stream closed only from atexit
+# would leave that join waiting on a producer blocked on flow control.
+# threading exit hooks run in reverse order of registration, so this one
+# runs first. The hook API is private to CPython, hence the fallback.
+getattr(threading, '_register_atexit', atexit.register)(_close_all)
+
+
+class _Stopped(Exception):
+    """The consumer closed the stream."""
+
+
+class _StreamCall:
+    """Worker side: run the generator and send its items in chunks."""
+
+    __slots__ = ('fn', 'args', 'kwargs', 'data', 'control', 'chunksize', 'window')
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: Dict[str, Any],
+                 data: Connection, control: Connection, chunksize: int, window: int):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.data = data
+        self.control = control
+        self.chunksize = chunksize
+        self.window = window
+
+    @property
+    def __wrapped__(self) -> Callable:
+        return self.fn
+
+    def __call__(self) -> int:
+        """Stream every item; returns the number of items sent."""
+        credits = self.window
+        sent = 0
+        chunk: List[Any] = []
+        items: Optional[Iterator[Any]] = None
+        try:
+            items = iter(self.fn(*self.args, **self.kwargs))
+            flush_at = time.monotonic() + _FLUSH_INTERVAL
+            try:
+                for item in items:
+                    chunk.append(item)
+                    if len(chunk) >= self.chunksize or time.monotonic() >= flush_at:
+                        credits = self._send(chunk, credits)
+                        sent += len(chunk)
+                        chunk = []
+                        flush_at = time.monotonic() + _FLUSH_INTERVAL
+            except _Stopped:
+                raise
+            except Exception:
+                # Deliver the items produced before the failure first
+                if chunk:
+                    self._send(chunk, credits)
+                raise
+            if chunk:
+                credits = self._send(chunk, credits)
+                sent += len(chunk)
+            self.data.send(("end", sent))
+        except (_Stopped, BrokenPipeError, EOFError):
+            pass
+        finally:
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+            self.data.close()
+            self.control.close()
+        return sent
+
+    def _send(self, chunk: List[Any], credits: int) -> int:
+        # Pick up credits and stop requests without blocking, then wait
+        # for a credit if the window is full
+        while credits == 0 or self.control.poll():
+            message = self.control.recv()
+            if message[0] == "stop":
+                raise _Stopped()
+            credits += 1
+        self.data.send(("items", chunk))
+        return credits - 1
+
+
+class CpuStream:
+    """
+    Iterator over the items a generator yields in a worker process.
+
+    Created by cpu_stream() and CpuExecutor.submit_stream(). Calling
+    close(), exiting its with block or dropping the stream before it is
+    exhausted stops the producer.
+
+    Example:
+        with pyasync.cpu_stream(parse_records, "huge.log") as records:
+            for record in records:
+                if record.level == "ERROR":
+                    print(record)
+    """
+
+    def __init__(self, data: Connection, control: Connection, future: Future):
+        self._data = data
+        self._control = control
+        self._future = future
+        self._chunk: List[Any] = []
+        self._position = 0
+        self._finished = False
+        self._received = 0
+
+    def __enter__(self) -> 'CpuStream':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+        return False
+
+    def __del__(self) -> None:
+        # A stream dropped mid-iteration (e.g. a for loop left with break)
+        if not getattr(self, '_finished', True):
+            self.close()
+
+    def __iter__(self) -> 'CpuStream':
+        return self
+
+    def __next__(self) -> Any:
+        while self._position >= len(self._chunk):
+            try:
+                more = self._next_chunk()
+            except BaseException:
+                self.close()
+                raise
+            if not more:
+                raise StopIteration
+        item = self._chunk[self._position]
+        self._position += 1
+        return item
+
+    @property
+    def done(self) -> bool:
+        """Check if the stream ended (exhausted, failed or closed)."""
+        return self._finished
+
+    @property
+    def received(self) -> int:
+        """Number of items received from the worker so far."""
+        return self._received
+
+    def _next_chunk(self) -> bool:
+        """Receive the next chunk. Returns False at the end of the stream."""
+        if self._finished:
+            return False
+        while True:
+            if self._data.poll(_POLL):
+                try:
+                    message = self._data.recv()
+                except EOFError:
+                    message = ("end", self._received)
+                if message[0] == "items":
+                    self._signal("credit")
+                    self._chunk = message[1]
+                    self._position = 0
+                    self._received += len(self._chunk)
+                    return True
+                self._finish()
+                # Surface a failure of the task itself (e.g. a dead worker)
+                self._future.result()
+                return False
+            if self._future.done() and not self._data.poll(0):
+                self._finish()
+                exception = self._future.exception()
+                if exception is not None:
+                    raise exception
+                return False
+
+    def _signal(self, message: str) -> None:
+        try:
+            self._control.send((message,))
+        except OSError:
+            # The producer already finished
+            pass
+
+    def _finish(self) -> None:
+        self._finished = True
+        self._chunk = []
+        self._data.close()
+        self._control.close()
+
+    def close(self) -> None:
+        """Stop the producer and discard items not yet consumed."""
+        if self._finished:
+            return
+        self._signal("stop")
+        self._future.cancel()
+        self._finish()
+
+
+def open_stream(
+    submit: Callable[[Callable[[], Any]], Future],
+    fn: Callable[..., Iterator[Any]],
+    args: tuple,
+    kwargs: Dict[str, Any],
+    chunksize: int,
+    window: int
+) -> CpuStream:
+    """Start streaming fn(*args, **kwargs) through a submit function."""
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    data, worker_data = multiprocessing.Pipe(duplex=False)
+    worker_control, control = multiprocessing.Pipe(duplex=False)
+    future = submit(_StreamCall(fn, args, kwargs, worker_data, worker_control, chunksize, window))
+    # The worker gets its own duplicates of these ends when the call is unpickled
+    future.add_done_callback(lambda _: (worker_data.close(), worker_control.close()))
+    stream = CpuStream(data, control, future)
+    _open.add(stream)
+    return stream
@@ -0,0 +1,308 @@
+"""
+PyAsync - Task lifecycle hooks and context propagation.
+
+Hooks registered with add_hook() see every task submitted to the thread
+and process pools: when it is submitted, when it starts and when it
+finishes, with timing and identity. contextvars are always carried into
+thread tasks. For process tasks, a serializable context dict (for trace
+headers) and the values of variables registered with propagate() are
+sent along with the task.
+
+With no hook and no propagated variable, process tasks are dispatched
+unchanged and thread tasks only pay for copying the current context.
+"""
+
+from concurrent.futures import Executor, Future
+from contextvars import Context, ContextVar, copy_context
+from functools import partial
+from typing import Callable, Any, Dict, Optional, Tuple
+import itertools
+import logging
+import os
+import threading
+import time
+
+from . import _futures
+
+
+class TaskInfo:
+    """
+    Identity and timing of a task, passed to hooks.
+
+    Attributes:
+        id: Unique task id within this process.
+        name: Qualified name of the task function.
+        backend: "thread" or "process".
+        submitted: Wall-clock time (time.time()) of submission.
+        started: Wall-clock time the task started, or None.
+        finished: Wall-clock time the task finished, or None.
+        worker: Thread name or "pid:<n>" of the process that ran it.
+        exception: Exception raised by the task, or None.
+        context: Serializable dict carried into the task. on_submit hooks
+            may add entries (e.g. a traceparent header); the task reads
+            them with current_context().
+    """
+
+    __slots__ = (
+        'id', 'name', 'backend', 'submitted', 'started', 'finished', 'worker',
+        'exception', 'context'
+    )
+
+    def __init__(self, id: int, name: str, backend: str):
+        self.id = id
+        self.name = name
+        self.backend = backend
+        self.submitted = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.worker: Optional[str] = None
+        self.exception: Optional[BaseException] = None
+        self.context: Dict[str, Any] = {}
+
+    @property
+    def wait(self) -> Optional[float]:
+        """Seconds between submission and start (queueing delay)."""
+        return None if self.started is None else self.started - self.submitted
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Seconds the task ran."""
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+    def __repr__(self) -> str:
+        return f"TaskInfo(id={self.id}, name={self.name!r}, backend={self.backend!r})"
+
+
+class Hook:
+    """A set of lifecycle callbacks. Returned by add_hook()."""
+
+    def __init__(
+        self,
+        on_submit: Optional[Callable[[TaskInfo], None]],
+        on_start: Optional[Callable[[TaskInfo], None]],
+        on_finish: Optional[Callable[[TaskInfo], None]]
+    ):
+        self.on_submit = on_submit
+        self.on_start = on_start
+        self.on_finish = on_finish
+
+    def remove(self) -> None:
+        """Stop calling this hook."""
+        global _hooks
+        with _lock:
+            _hooks = tuple(hook for hook in _hooks if hook is not self)
+
+    def __enter__(self) -> 'Hook':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.remove()
+        return False
+
+
+# Replaced as a whole on change, so dispatch reads it without a lock
+_hooks: Tuple[Hook, ...] = ()
+_propagated: Dict[str, ContextVar] = {}
+_lock = threading.Lock()
+_ids = itertools.count(1)
+_MISSING = object()
+_logger = logging.getLogger(__name__)
+
+# Context dict of the task running in this thread or worker
+_task_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+    'pyasync_task_context', default=None
+)
+
+
+def add_hook(
+    on_submit: Optional[Callable[[TaskInfo], None]] = None,
+    on_start: Optional[Callable[[TaskInfo], None]] = None,
+    on_finish: Optional[Callable[[TaskInfo], None]] = None
+) -> Hook:
+    """
+    Register task lifecycle callbacks.
+
+    on_submit runs in the submitting thread, so it sees the caller's
+    context (e.g. the active span). For thread tasks, on_start and
+    on_finish run in the pool thread around the task. For process tasks
+    they run in the parent when the result arrives, with the start and
+    finish times measured in the worker.
+
+    Exceptions raised by hooks are logged to the pyasync.tracing logger and
+    otherwise ignored.
+
+    Example:
+        def on_submit(info):
+            info.context["traceparent"] = tracer.current_traceparent()
+
+        def on_finish(info):
+            tracer.record_span(info.name, info.started, info.finished,
+                               queued=info.wait, error=info.exception)
+
+        with pyasync.add_hook(on_submit=on_submit, on_finish=on_finish):
+            pyasync.parallel(fetch_a, fetch_b)
+
+    Returns:
+        Hook; call .remove() (or use it as a context manager) to unregister.
+    """
+    global _hooks
+    hook = Hook(on_submit, on_start, on_finish)
+    with _lock:
+        _hooks = _hooks + (hook,)
+    return hook
+
+
+def propagate(var: ContextVar) -> None:
+    """
+    Carry a context variable's value into process tasks.
+
+    The value must be picklable. Variables are matched by name, so call
+    this at module level next to the variable's definition: worker
+    processes then register it too when they import the module.
+
+    Example:
+        request_id = ContextVar("request_id", default=None)
+        pyasync.propagate(request_id)
+    """
+    with _lock:
+        _propagated[var.name] = var
+
+
+def current_context() -> Dict[str, Any]:
+    """Return the context dict of the task running here (empty outside tasks)."""
+    return _task_context.get() or {}
+
+
+def active() -> bool:
+    """Return True if any hook or propagated variable is registered."""
+    return bool(_hooks or _propagated)
+
+
+def _name(fn: Callable) -> str:
+    # Look through partials and wrappers (bounded, in case of odd __getattr__)
+    for _ in range(16):
+        if isinstance(fn, partial):
+            fn = fn.func
+        elif hasattr(fn, '__wrapped__'):
+            fn = fn.__wrapped__
+        else:
+            break
+    return getattr(fn, '__qualname__', None) or type(fn).__qualname__
+
+
+def _emit(event: str, info: TaskInfo, hooks: Tuple[Hook, ...]) -> None:
+    for hook in hooks:
+        callback = getattr(hook, event)
+        if callback is None:
+            continue
+        try:
+            callback(info)
+        except Exception:
+            _logger.exception("Hook %s failed for %r", event, info)
+
+
+def _run_thread(info: TaskInfo, hooks: Tuple[Hook, ...], fn: Callable, args: tuple,
+                kwargs: Dict[str, Any]) -> Any:
+    """Run a traced thread task (inside the copied context)."""
+    _task_context.set(info.context)
+    info.worker = threading.current_thread().name
+    info.started = time.time()
+    _emit('on_start', info, hooks)
+    try:
+        return fn(*args, **kwargs)
+    except BaseException as e:
+        info.exception = e
+        raise
+    finally:
+        info.finished = time.time()
+        _emit('on_finish', info, hooks)
+
+
+class _ProcessCall:
+    """Picklable wrapper restoring trace context inside a worker process."""
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: Dict[str, Any],
+                 context: Dict[str, Any], values: Dict[str, Any]):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.context = context
+        self.values = values
+
+    def __call__(self) -> tuple:
+        return copy_context().run(self._run)
+
+    def _run(self) -> tuple:
+        for name, value in self.values.items():
+            var = _propagated.get(name)
+            if var is not None:
+                var.set(value)
+        _task_context.set(self.context)
+
+        started = time.time()
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except BaseException as e:
+            e._pyasync_trace = (started, time.time(), os.getpid())
+            raise
+        return result, started, time.time(), os.getpid()
+
+
+def _finish_process(info: TaskInfo, hooks: Tuple[Hook, ...], inner: Future) -> Any:
+    """Fill in the worker's timings, run the hooks and return the result."""
+    exc = inner.exception()
+    if exc is not None:
+        info.started, info.finished, pid = getattr(exc, '_pyasync_trace', (None, None, None))
+        info.exception = exc
+    else:
+        result, info.started, info.finished, pid = inner.result()
+    info.worker = f"pid:{pid}" if pid is not None else None
+    _emit('on_start', info, hooks)
+    _emit('on_finish', info, hooks)
+    if exc is not None:
+        raise exc
+    return result
+
+
+def submit(
+    executor: Executor,
+    fn: Callable,
+    args: tuple,
+    kwargs: Dict[str, Any],
+    backend: str,
+    dispatch: Callable[[Executor, Callable, tuple, Dict[str, Any]], Future],
+    context: Optional[Context] = None
+) -> Future:
+    """
+    Dispatch a task with hooks and context propagation (when active).
+
+    context is the caller's context when it was captured earlier (for a
+    throttled, retried or chained call); it defaults to the current one.
+    The task and the on_submit hooks run in a copy of it, since hedged
+    attempts of one call may run at the same time.
+    """
+    hooks = _hooks
+    if backend == "thread":
+        context = copy_context() if context is None else context.run(copy_context)
+        if not hooks:
+            return dispatch(executor, context.run, (fn,) + args, kwargs)
+        info = TaskInfo(next(_ids), _name(fn), backend)
+        context.run(_emit, 'on_submit', info, hooks)
+        return dispatch(executor, context.run, (_run_thread, info, hooks, fn, args, kwargs), {})
+
+    if not hooks and not _propagated:
+        return dispatch(executor, fn, args, kwargs)
+    context = copy_context() if context is None else context.run(copy_context)
+    info = TaskInfo(next(_ids), _name(fn), backend)
+    context.run(_emit, 'on_submit', info, hooks)
+    values = {}
+    for name, var in _propagated.items():
+        value = context.run(var.get, _MISSING)
+        if value is not _MISSING:
+            values[name] = value
+    call = _ProcessCall(fn, args, kwargs, info.context, values)
+    return _futures.DerivedFuture(
+        dispatch(executor, call, (), {}), partial(_finish_process, info, hooks)
+    )
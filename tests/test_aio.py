@@ -0,0 +1,164 @@
+"""Unit tests for pyasync.aio module and awaitable tasks."""
+
+import unittest
+import asyncio
+import threading
+import time
+
+
+def _square(n):
+    """Module-level function for process tests."""
+    return n * n
+
+
+def _fail():
+    raise ValueError("boom")
+
+
+class TestAwaitableTasks(unittest.TestCase):
+    """Tests for awaiting Task and CpuTask."""
+
+    def test_await_task(self):
+        """Test awaiting a thread Task."""
+        from pyasync import background
+
+        async def main():
+            return await background(lambda: "done")
+
+        self.assertEqual(asyncio.run(main()), "done")
+
+    def test_await_cpu_task(self):
+        """Test awaiting a CpuTask."""
+        from pyasync import cpu_background
+        from functools import partial
+
+        async def main():
+            return await cpu_background(partial(_square, 9))
+
+        self.assertEqual(asyncio.run(main()), 81)
+
+    def test_await_does_not_block_loop(self):
+        """Test that other coroutines run while a task is awaited."""
+        from pyasync import background
+
+        ticks = []
+
+        async def ticker():
+            for _ in range(3):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        async def main():
+            await asyncio.gather(background(lambda: time.sleep(0.1)), ticker())
+
+        asyncio.run(main())
+        self.assertEqual(len(ticks), 3)
+
+
+class TestAparallel(unittest.TestCase):
+    """Tests for aparallel() and arun()."""
+
+    def test_mixed_callables(self):
+        """Test plain and coroutine functions together, in order."""
+        from pyasync import aparallel
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return "async"
+
+        async def main():
+            return await aparallel(lambda: "thread", fetch)
+
+        self.assertEqual(asyncio.run(main()), ["thread", "async"])
+
+    def test_coroutines_run_on_caller_loop(self):
+        """Test that coroutine functions run on the calling event loop."""
+        from pyasync import aparallel
+
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        async def main():
+            loops = await aparallel(current_loop, current_loop)
+            return loops, asyncio.get_running_loop()
+
+        loops, caller = asyncio.run(main())
+        self.assertEqual(loops, [caller, caller])
+
+    def test_exception(self):
+        """Test that the first exception is raised."""
+        from pyasync import aparallel
+
+        async def main():
+            await aparallel(lambda: 1, _fail)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(main())
+
+    def test_arun(self):
+        """Test arun with a blocking callable."""
+        from pyasync import arun
+
+        async def main():
+            return await arun(lambda: threading.current_thread().name)
+
+        self.assertNotEqual(asyncio.run(main()), threading.current_thread().name)
+
+
+class TestAcpuParallel(unittest.TestCase):
+    """Tests for acpu_parallel()."""
+
+    def test_results_in_order(self):
+        """Test running process tasks from a coroutine."""
+        from pyasync import acpu_parallel
+        from functools import partial
+
+        async def main():
+            return await acpu_parallel(*[partial(_square, n) for n in range(5)])
+
+        self.assertEqual(asyncio.run(main()), [0, 1, 4, 9, 16])
+
+    def test_timeout(self):
+        """Test that the timeout raises TimeoutError."""
+        from pyasync import acpu_parallel
+        from functools import partial
+
+        async def main():
+            await acpu_parallel(partial(time.sleep, 1.0), timeout=0.05)
+
+        with self.assertRaises(TimeoutError):
+            asyncio.run(main())
+
+
+class TestParallelCoroutines(unittest.TestCase):
+    """Tests for coroutine functions in the synchronous API."""
+
+    def test_parallel_coroutines(self):
+        """Test that many coroutines share the background loop."""
+        from pyasync import parallel
+        from functools import partial
+
+        async def fetch(n):
+            await asyncio.sleep(0.05)
+            return (n, threading.current_thread().name)
+
+        start = time.monotonic()
+        results = parallel(*[partial(fetch, n) for n in range(500)])
+
+        self.assertLess(time.monotonic() - start, 2.0)
+        self.assertEqual([n for n, _ in results], list(range(500)))
+        self.assertEqual({name for _, name in results}, {"pyasync-loop"})
+
+    def test_run_coroutine(self):
+        """Test run() and background() with a coroutine function."""
+        from pyasync import run, background
+
+        async def answer():
+            return 42
+
+        self.assertEqual(run(answer), 42)
+        self.assertEqual(background(answer).result(), 42)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""Unit tests for pyasync.batching module."""
+
+import unittest
+import threading
+import time
+
+
+def _bulk_double(items):
+    """Module-level batch function for process tests."""
+    return [item * 2 for item in items]
+
+
+class _RecordingBatchFn:
+    """Batch function that records the batches it receives."""
+
+    def __init__(self):
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def __call__(self, items):
+        with self.lock:
+            self.batches.append(list(items))
+        return [item * 10 for item in items]
+
+
+class TestBatcher(unittest.TestCase):
+    """Tests for Batcher class."""
+
+    def test_coalesces_items(self):
+        """Test that items submitted together share one batch call."""
+        from pyasync import Batcher
+
+        batch_fn = _RecordingBatchFn()
+        batcher = Batcher(batch_fn, max_batch=100, max_wait=0.05)
+
+        tasks = [batcher.submit(i) for i in range(10)]
+
+        self.assertEqual([t.result() for t in tasks], [i * 10 for i in range(10)])
+        self.assertEqual(batch_fn.batches, [list(range(10))])
+        self.assertEqual(batcher.stats()["mean_batch_size"], 10.0)
+
+    def test_max_batch(self):
+        """Test that full batches are dispatched immediately."""
+        from pyasync import Batcher
+
+        batch_fn = _RecordingBatchFn()
+        batcher = Batcher(batch_fn, max_batch=4, max_wait=10.0)
+
+        tasks = [batcher.submit(i) for i in range(8)]
+
+        self.assertEqual([t.result(timeout=1.0) for t in tasks], [i * 10 for i in range(8)])
+        self.assertEqual(sorted(map(len, batch_fn.batches)), [4, 4])
+
+    def test_max_wait(self):
+        """Test that a partial batch is flushed after max_wait."""
+        from pyasync import Batcher
+
+        batcher = Batcher(_RecordingBatchFn(), max_batch=100, max_wait=0.02)
+
+        start = time.monotonic()
+        self.assertEqual(batcher.submit(1).result(timeout=1.0), 10)
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_flush_on_exit(self):
+        """Test that leaving the context dispatches pending items."""
+        from pyasync import Batcher
+
+        batch_fn = _RecordingBatchFn()
+        with Batcher(batch_fn, max_wait=10.0) as batcher:
+            task = batcher.submit(3)
+
+        self.assertEqual(task.result(timeout=1.0), 30)
+
+    def test_batch_exception(self):
+        """Test that a failing batch fails every item."""
+        from pyasync import Batcher
+
+        def failing(items):
+            raise ConnectionError("backend down")
+
+        batcher = Batcher(failing, max_wait=0.01)
+        tasks = [batcher.submit(i) for i in range(3)]
+
+        for task in tasks:
+            with self.assertRaises(ConnectionError):
+                task.result()
+
+    def test_per_item_exception(self):
+        """Test that exception results fail only their item."""
+        from pyasync import Batcher
+
+        def lookup(ids):
+            return [KeyError(i) if i < 0 else i for i in ids]
+
+        batcher = Batcher(lookup, max_wait=0.01)
+        ok, missing = batcher.submit(1), batcher.submit(-1)
+
+        self.assertEqual(ok.result(), 1)
+        with self.assertRaises(KeyError):
+            missing.result()
+
+    def test_result_count_mismatch(self):
+        """Test that a wrong number of results is reported."""
+        from pyasync import Batcher
+
+        batcher = Batcher(lambda items: items[:1], max_wait=0.01)
+        tasks = [batcher.submit(i) for i in range(2)]
+
+        with self.assertRaises(ValueError):
+            tasks[1].result()
+
+    def test_process_backend(self):
+        """Test batching on the process pool."""
+        from pyasync import Batcher
+
+        batcher = Batcher(_bulk_double, max_wait=0.01, backend="process")
+        tasks = [batcher.submit(i) for i in range(5)]
+
+        self.assertEqual([t.result() for t in tasks], [0, 2, 4, 6, 8])
+
+
+if __name__ == '__main__':
+    unittest.main()
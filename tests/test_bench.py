@@ -0,0 +1,88 @@
+"""Unit tests for pyasync.bench module."""
+
+import unittest
+
+
+class TestBench(unittest.TestCase):
+    """Tests for the benchmark suite."""
+
+    def test_cases_cover_apis_and_baselines(self):
+        """Test that every API is benchmarked against its baselines."""
+        from pyasync.bench import cases
+
+        keys = {(case.name, case.impl) for case in cases()}
+        for name in ("parallel", "run", "cpu_parallel", "cpu_run", "CpuExecutor.map"):
+            self.assertIn((name, "pyasync"), keys)
+            self.assertIn((name, "futures"), keys)
+        self.assertIn(("background", "pyasync"), keys)
+        self.assertIn(("parallel", "sequential"), keys)
+        self.assertIn(("cpu_parallel", "sequential"), keys)
+        self.assertEqual(len({case.key for case in cases()}), len(cases()))
+
+    def test_run_selected(self):
+        """Test running a subset of the suite."""
+        import json
+        from pyasync.bench import run_benchmarks
+
+        seen = []
+        results = run_benchmarks(repeat=1, select=["run/pyasync[payload=0,tasks=200,work=0]"],
+                                 progress=seen.append)
+        self.assertEqual(len(results["results"]), 1)
+        self.assertEqual(seen, results["results"])
+        result = results["results"][0]
+        self.assertEqual(result["name"], "run")
+        self.assertGreater(result["median"], 0)
+        self.assertGreater(result["tasks_per_sec"], 0)
+        self.assertIn("python", results["environment"])
+        json.dumps(results)
+
+    def test_compare(self):
+        """Test flagging regressions between runs."""
+        from pyasync.bench import compare
+
+        old = {"results": [
+            {"key": "a", "median": 1.0},
+            {"key": "b", "median": 1.0},
+            {"key": "gone", "median": 1.0},
+        ]}
+        new = {"results": [
+            {"key": "a", "median": 1.1},
+            {"key": "b", "median": 2.0},
+            {"key": "added", "median": 1.0},
+        ]}
+        diff = {entry["key"]: entry for entry in compare(old, new, threshold=0.25)}
+        self.assertEqual(set(diff), {"a", "b"})
+        self.assertFalse(diff["a"]["regression"])
+        self.assertTrue(diff["b"]["regression"])
+        self.assertAlmostEqual(diff["b"]["ratio"], 2.0)
+
+    def test_cli(self):
+        """Test the CLI writing JSON and exiting non-zero on regressions."""
+        import contextlib
+        import io
+        import json
+        import os
+        import tempfile
+        from pyasync.bench import main
+
+        select = "run/pyasync[payload=0,tasks=200,work=0]"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "results.json")
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(main(["--repeat", "1", "-k", select, "-o", path]), 0)
+            with open(path) as f:
+                saved = json.load(f)
+            self.assertEqual(saved["results"][0]["key"], select)
+
+            # An implausibly fast baseline makes this run a regression
+            saved["results"][0]["median"] = 1e-9
+            with open(path, "w") as f:
+                json.dump(saved, f)
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                self.assertEqual(main(["--repeat", "1", "-k", select, "--compare", path, "--quiet"]), 1)
+            self.assertIn("REGRESSION", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
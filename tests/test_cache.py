@@ -0,0 +1,217 @@
+"""Unit tests for pyasync.cache module."""
+
+import unittest
+import os
+import threading
+import time
+
+from pyasync import cached
+
+
+class _Counter:
+    """Callable that counts invocations and sleeps a little."""
+
+    def __init__(self, delay=0.0, result="value"):
+        self.calls = 0
+        self.delay = delay
+        self.result = result
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return self.result
+
+
+def _worker_pid(n):
+    """Process helper returning the worker's pid."""
+    return (n, os.getpid())
+
+
+@cached(backend="process")
+def _cached_square(n):
+    """Decorated process-backed function (resolved by reference in workers)."""
+    return n * n
+
+
+class TestResultCache(unittest.TestCase):
+    """Tests for ResultCache class."""
+
+    def test_single_flight(self):
+        """Test that concurrent calls with the same key share one run."""
+        from pyasync import background, ResultCache
+
+        cache = ResultCache()
+        fn = _Counter(delay=0.1)
+
+        tasks = [background(fn, key="report", cache=cache) for _ in range(5)]
+
+        self.assertEqual([t.result() for t in tasks], ["value"] * 5)
+        self.assertEqual(fn.calls, 1)
+        stats = cache.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["joined"], 4)
+
+    def test_hit_after_completion(self):
+        """Test that completed results are served from the cache."""
+        from pyasync import run, ResultCache
+
+        cache = ResultCache()
+        fn = _Counter()
+
+        run(fn, key="k", cache=cache)
+        run(fn, key="k", cache=cache)
+
+        self.assertEqual(fn.calls, 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_ttl_expiry(self):
+        """Test that results expire after the TTL."""
+        from pyasync import run, ResultCache
+
+        cache = ResultCache(ttl=0.05)
+        fn = _Counter()
+
+        run(fn, key="k", cache=cache)
+        time.sleep(0.06)
+        run(fn, key="k", cache=cache)
+
+        self.assertEqual(fn.calls, 2)
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        from pyasync import run, ResultCache
+
+        cache = ResultCache(maxsize=2)
+
+        run(lambda: 1, key="a", cache=cache)
+        run(lambda: 2, key="b", cache=cache)
+        run(lambda: 1, key="a", cache=cache)  # "a" is now most recent
+        run(lambda: 3, key="c", cache=cache)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual(run(lambda: "recomputed", key="a", cache=cache), 1)
+        self.assertEqual(run(lambda: "recomputed", key="b", cache=cache), "recomputed")
+
+    def test_failures_not_cached(self):
+        """Test that exceptions are shared but not stored."""
+        from pyasync import run, ResultCache
+
+        cache = ResultCache()
+
+        def failing():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            run(failing, key="k", cache=cache)
+        self.assertEqual(run(lambda: "ok", key="k", cache=cache), "ok")
+
+    def test_cancel_is_per_caller(self):
+        """Test that cancelling one caller's task does not affect others."""
+        from pyasync import background, ResultCache
+
+        cache = ResultCache()
+        release = threading.Event()
+
+        first = background(lambda: release.wait() and "done", key="k", cache=cache)
+        second = background(lambda: "unused", key="k", cache=cache)
+
+        self.assertTrue(second.cancel())
+        release.set()
+        self.assertEqual(first.result(timeout=1.0), "done")
+
+    def test_default_cache(self):
+        """Test that key= without cache= uses the default cache."""
+        from pyasync import run, default_cache
+        from pyasync.cache import scoped_key
+
+        fn = _Counter()
+        run(fn, key=("test_default_cache", 1))
+        run(fn, key=("test_default_cache", 1))
+
+        self.assertEqual(fn.calls, 1)
+        default_cache.invalidate(scoped_key(fn, ("test_default_cache", 1)))
+
+    def test_default_cache_scoped_by_function(self):
+        """Test that two functions passing the same key do not share a result."""
+        from pyasync import run
+
+        self.assertEqual(run(lambda: "first", key="test_scoped"), "first")
+        self.assertEqual(run(lambda: "second", key="test_scoped"), "second")
+
+    def test_cpu_run_key(self):
+        """Test that cpu_run results are cached by key."""
+        from pyasync import cpu_run, ResultCache
+        from functools import partial
+
+        cache = ResultCache()
+
+        first = cpu_run(partial(_worker_pid, 1), key=1, cache=cache)
+        second = cpu_run(partial(_worker_pid, 1), key=1, cache=cache)
+
+        self.assertEqual(first, second)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+
+class TestCached(unittest.TestCase):
+    """Tests for cached() decorator."""
+
+    def test_thread_backend(self):
+        """Test caching a function on the thread pool."""
+        calls = []
+
+        @cached(maxsize=8)
+        def lookup(user_id):
+            calls.append(user_id)
+            return f"user-{user_id}"
+
+        self.assertEqual(lookup(1), "user-1")
+        self.assertEqual(lookup(1), "user-1")
+        self.assertEqual(lookup(2), "user-2")
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(lookup.cache.stats()["hits"], 1)
+
+    def test_custom_key(self):
+        """Test a custom key function."""
+        calls = []
+
+        @cached(key=lambda path, verbose=False: path)
+        def load(path, verbose=False):
+            calls.append(path)
+            return path.upper()
+
+        load("a", verbose=True)
+        load("a")
+
+        self.assertEqual(calls, ["a"])
+
+    def test_submit_returns_task(self):
+        """Test the non-blocking submit helper."""
+        from pyasync import Task
+
+        @cached
+        def double(n):
+            return n * 2
+
+        task = double.submit(21)
+
+        self.assertIsInstance(task, Task)
+        self.assertEqual(task.result(), 42)
+
+    def test_process_backend(self):
+        """Test a decorated function running in the process pool."""
+        self.assertEqual(_cached_square(7), 49)
+        self.assertEqual(_cached_square(7), 49)
+        self.assertEqual(_cached_square.cache.stats()["hits"], 1)
+
+    def test_invalid_backend(self):
+        """Test that unknown backends are rejected."""
+        with self.assertRaises(ValueError):
+            cached(lambda: None, backend="gpu")
+
+
+if __name__ == '__main__':
+    unittest.main()
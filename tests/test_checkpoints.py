@@ -0,0 +1,162 @@
+"""Unit tests for pyasync.checkpoints module."""
+
+import os
+import tempfile
+import unittest
+
+
+def _count_to(n, crash_at=None, fail_at=None):
+    """Process helper counting with a checkpoint per step."""
+    import pyasync
+
+    state = pyasync.restore(default={"i": 0, "starts": 0})
+    state["starts"] += 1
+    while state["i"] < n:
+        state["i"] += 1
+        pyasync.checkpoint(state)
+        if state["i"] == crash_at and state["starts"] == 1:
+            os._exit(1)
+        if state["i"] == fail_at and state["starts"] == 1:
+            raise RuntimeError("failed")
+    return state
+
+
+class TestCheckpointStore(unittest.TestCase):
+    """Tests for CheckpointStore."""
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+
+    def test_save_load_clear(self):
+        """Test saving, replacing, loading and clearing state."""
+        from pyasync import CheckpointStore
+
+        store = CheckpointStore(self._dir.name)
+        self.assertEqual(store.load("job", default=0), 0)
+        store.save("job", {"step": 1})
+        store.save("job", {"step": 2})
+        self.assertTrue(store.exists("job"))
+        self.assertEqual(store.load("job"), {"step": 2})
+        store.clear("job")
+        self.assertFalse(store.exists("job"))
+        self.assertEqual(os.listdir(self._dir.name), [])
+
+    def test_corrupt_checkpoint_ignored(self):
+        """Test that an unreadable checkpoint loads as the default."""
+        from pyasync import CheckpointStore
+
+        store = CheckpointStore(self._dir.name)
+        store.save("job", 1)
+        with open(store._path("job"), 'wb') as f:
+            f.write(b"\x80\x05K")  # Truncated pickle
+        self.assertEqual(store.load("job", default=0), 0)
+        with open(store._path("job"), 'wb') as f:
+            f.write(b"not a pickle")
+        self.assertEqual(store.load("job", default=0), 0)
+
+    def test_stale_tmp_removed(self):
+        """Test that old temporary files of crashed saves are deleted."""
+        from pyasync import CheckpointStore
+
+        stale = os.path.join(self._dir.name, "stale.tmp")
+        fresh = os.path.join(self._dir.name, "fresh.tmp")
+        for path in (stale, fresh):
+            open(path, 'wb').close()
+        os.utime(stale, (0, 0))
+        CheckpointStore(self._dir.name)
+        self.assertEqual(os.listdir(self._dir.name), ["fresh.tmp"])
+
+    def test_outside_task(self):
+        """Test that checkpoint() and restore() need a task id."""
+        import pyasync
+
+        with self.assertRaises(RuntimeError):
+            pyasync.checkpoint(1)
+        with self.assertRaises(RuntimeError):
+            pyasync.restore()
+
+    def test_wrap_in_thread(self):
+        """Test a wrapped call resuming in the same process."""
+        from pyasync import CheckpointStore
+
+        store = CheckpointStore(self._dir.name)
+        call = store.wrap(_count_to, "count")
+        with self.assertRaises(RuntimeError):
+            call(5, fail_at=3)
+        self.assertEqual(store.load("count")["i"], 3)
+        self.assertEqual(call(5), {"i": 5, "starts": 2})
+        # Cleared on success
+        self.assertFalse(store.exists("count"))
+
+
+class TestCheckpointedTasks(unittest.TestCase):
+    """Tests for task_id= on process tasks."""
+
+    def setUp(self):
+        from pyasync import CheckpointStore
+
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+        self.store = CheckpointStore(self._dir.name)
+
+    def test_resume_after_failure(self):
+        """Test that resubmitting a failed task resumes from its checkpoint."""
+        from functools import partial
+        from pyasync import cpu_run
+
+        fn = partial(_count_to, 6, fail_at=4)
+        with self.assertRaises(RuntimeError):
+            cpu_run(fn, task_id="resume", checkpoints=self.store)
+        self.assertEqual(cpu_run(fn, task_id="resume", checkpoints=self.store), {"i": 6, "starts": 2})
+        self.assertFalse(self.store.exists("resume"))
+
+    def test_restart_shared_pool(self):
+        """Test that a crashed cpu_background() task restarts on a new shared pool."""
+        from functools import partial
+        from pyasync import cpu_background
+
+        task = cpu_background(partial(_count_to, 4, crash_at=3), task_id="shared", checkpoints=self.store)
+        self.assertEqual(task.result(timeout=30), {"i": 4, "starts": 2})
+
+    def test_restart_after_crash(self):
+        """Test that a task whose worker dies is restarted from its checkpoint."""
+        from pyasync import CpuExecutor
+
+        with CpuExecutor(max_workers=1, checkpoints=self.store) as executor:
+            task = executor.submit_with(_count_to, (5,), {"crash_at": 2}, task_id="crash")
+            self.assertEqual(task.result(timeout=30), {"i": 5, "starts": 2})
+            # The pool was replaced and keeps working
+            self.assertEqual(executor.submit_with(_count_to, (1,), task_id="after").result(timeout=30)["i"], 1)
+
+    def test_failing_crash_handler(self):
+        """Test that an error replacing the pool fails the task."""
+        from concurrent.futures import Future
+        from concurrent.futures.process import BrokenProcessPool
+        from pyasync.checkpoints import restart_on_crash
+
+        def crash():
+            future = Future()
+            future.set_exception(BrokenProcessPool("died"))
+            return future
+
+        def on_crash():
+            raise OSError("no more processes")
+
+        target = restart_on_crash(crash, 3, on_crash)
+        with self.assertRaises(OSError):
+            target.result(timeout=5)
+
+    def test_crash_without_restarts(self):
+        """Test that max_restarts=0 reports the crash."""
+        from concurrent.futures.process import BrokenProcessPool
+        from pyasync import CpuExecutor
+
+        with CpuExecutor(max_workers=1, checkpoints=self.store, max_restarts=0) as executor:
+            task = executor.submit_with(_count_to, (5,), {"crash_at": 2}, task_id="no-restart")
+            with self.assertRaises(BrokenProcessPool):
+                task.result(timeout=30)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,250 @@
+"""Unit tests for task continuations and pyasync.compose module."""
+
+import unittest
+import threading
+import time
+
+
+def _double(n):
+    """Module-level function for process continuations."""
+    return n * 2
+
+
+def _fail_process(n):
+    raise ValueError(f"bad {n}")
+
+
+class TestContinuations(unittest.TestCase):
+    """Tests for Task.then() and Task.catch()."""
+
+    def test_then_chain(self):
+        """Test chaining continuations."""
+        from pyasync import background
+
+        task = background(lambda: 2).then(lambda n: n + 1).then(lambda n: n * 10)
+
+        self.assertEqual(task.result(timeout=1.0), 30)
+
+    def test_then_skipped_on_failure(self):
+        """Test that failures skip then() and propagate."""
+        from pyasync import background
+
+        calls = []
+
+        def failing():
+            raise KeyError("missing")
+
+        task = background(failing).then(calls.append)
+
+        with self.assertRaises(KeyError):
+            task.result(timeout=1.0)
+        self.assertEqual(calls, [])
+
+    def test_map(self):
+        """Test transforming a result without dispatching to a pool."""
+        from pyasync import background, Task
+
+        release = threading.Event()
+        task = background(lambda: release.wait(1.0) and {"status": 200})
+        mapped = task.map(lambda response: response["status"])
+        failed = background(lambda: {}["missing"]).map(lambda value: value)
+
+        self.assertIsInstance(mapped, Task)
+        release.set()
+        self.assertEqual(mapped.result(timeout=1.0), 200)
+        with self.assertRaises(KeyError):
+            failed.result(timeout=1.0)
+
+    def test_catch(self):
+        """Test recovering from a failure."""
+        from pyasync import background
+
+        def failing():
+            raise ConnectionError("down")
+
+        recovered = background(failing).catch(lambda e: "fallback", ConnectionError)
+        passed = background(lambda: "ok").catch(lambda e: "fallback")
+
+        self.assertEqual(recovered.result(timeout=1.0), "fallback")
+        self.assertEqual(passed.result(timeout=1.0), "ok")
+
+    def test_catch_unmatched(self):
+        """Test that unmatched exceptions propagate."""
+        from pyasync import background
+
+        def failing():
+            raise ValueError("bad")
+
+        task = background(failing).catch(lambda e: "fallback", ConnectionError)
+
+        with self.assertRaises(ValueError):
+            task.result(timeout=1.0)
+
+    def test_then_flattens_tasks(self):
+        """Test that a continuation returning a Task is unwrapped."""
+        from pyasync import background
+
+        task = background(lambda: 5).then(lambda n: background(lambda: n + 1))
+
+        self.assertEqual(task.result(timeout=1.0), 6)
+
+    def test_no_thread_waits(self):
+        """Test that pending continuations do not occupy pool threads."""
+        from pyasync import background
+
+        release = threading.Event()
+        source = background(release.wait)
+        before = threading.active_count()
+
+        chained = [source.then(lambda _: "next") for _ in range(50)]
+
+        self.assertLessEqual(threading.active_count(), before + 1)
+        release.set()
+        self.assertEqual([t.result(timeout=1.0) for t in chained], ["next"] * 50)
+
+    def test_cpu_task_then(self):
+        """Test continuations on the process pool and the thread pool."""
+        from pyasync import cpu_background, CpuTask, Task
+        from functools import partial
+
+        process = cpu_background(partial(_double, 4)).then(_double)
+        thread = cpu_background(partial(_double, 4)).then(lambda n: n + 1, backend="thread")
+
+        self.assertIsInstance(process, CpuTask)
+        self.assertIsInstance(thread, Task)
+        self.assertEqual(process.result(), 16)
+        self.assertEqual(thread.result(), 9)
+
+    def test_cpu_task_catch(self):
+        """Test catch on a CpuTask."""
+        from pyasync import cpu_background
+        from functools import partial
+
+        task = cpu_background(partial(_fail_process, 1)).catch(str, backend="thread")
+
+        self.assertEqual(task.result(), "bad 1")
+
+
+class TestAddDoneCallback(unittest.TestCase):
+    """Tests for CpuTask.add_done_callback()."""
+
+    def test_callbacks_run_in_order(self):
+        """Test that all callbacks run with the task, in order."""
+        from pyasync import CpuTask
+        from concurrent.futures import Future
+
+        future = Future()
+        task = CpuTask(future)
+        seen = []
+
+        task.add_done_callback(lambda t: seen.append(("a", t)))
+        task.add_done_callback(lambda t: seen.append(("b", t)))
+        future.set_result(1)
+
+        self.assertEqual(seen, [("a", task), ("b", task)])
+
+    def test_callback_after_completion(self):
+        """Test that callbacks added after completion run immediately."""
+        from pyasync import CpuTask
+        from concurrent.futures import Future
+
+        future = Future()
+        future.set_result(1)
+        task = CpuTask(future)
+        seen = []
+
+        task.add_done_callback(seen.append)
+        task.add_done_callback(seen.append)
+
+        self.assertEqual(seen, [task, task])
+
+    def test_failing_callback_logged(self):
+        """Test that a failing callback is logged and the others still run."""
+        from pyasync import CpuTask
+        from concurrent.futures import Future
+
+        future = Future()
+        task = CpuTask(future)
+        seen = []
+
+        task.add_done_callback(lambda t: 1 / 0)
+        task.add_done_callback(seen.append)
+        with self.assertLogs("concurrent.futures", level="ERROR") as logs:
+            future.set_result(1)
+
+        self.assertEqual(seen, [task])
+        self.assertIn("ZeroDivisionError", logs.output[0])
+
+
+class TestCombinators(unittest.TestCase):
+    """Tests for all_of() and any_of()."""
+
+    def test_all_of(self):
+        """Test combining results in order."""
+        from pyasync import all_of, background, cpu_background
+        from functools import partial
+
+        combined = all_of(
+            background(lambda: (time.sleep(0.05), "slow")[1]),
+            cpu_background(partial(_double, 3)),
+            background(lambda: "fast")
+        )
+
+        self.assertEqual(combined.result(timeout=5.0), ["slow", 6, "fast"])
+
+    def test_all_of_fails_fast(self):
+        """Test that all_of fails without waiting for the other tasks."""
+        from pyasync import all_of, background
+
+        release = threading.Event()
+
+        def failing():
+            raise ValueError("bad")
+
+        combined = all_of(background(release.wait), background(failing))
+
+        with self.assertRaises(ValueError):
+            combined.result(timeout=1.0)
+        release.set()
+
+    def test_all_of_empty(self):
+        """Test all_of with no tasks."""
+        from pyasync import all_of
+
+        self.assertEqual(all_of().result(), [])
+
+    def test_any_of(self):
+        """Test that the first success wins."""
+        from pyasync import any_of, background
+
+        def failing():
+            raise ValueError("bad")
+
+        combined = any_of(
+            background(failing),
+            background(lambda: (time.sleep(0.2), "slow")[1]),
+            background(lambda: (time.sleep(0.02), "fast")[1])
+        )
+
+        self.assertEqual(combined.result(timeout=1.0), "fast")
+
+    def test_any_of_all_fail(self):
+        """Test that any_of fails when every task fails."""
+        from pyasync import any_of, background
+
+        def failing():
+            raise ValueError("bad")
+
+        with self.assertRaises(ValueError):
+            any_of(background(failing), background(failing)).result(timeout=1.0)
+
+    def test_any_of_empty(self):
+        """Test that any_of needs at least one task."""
+        from pyasync import any_of
+
+        with self.assertRaises(ValueError):
+            any_of()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""Unit tests for pyasync.contention module."""
+
+import os
+import time
+import unittest
+import warnings
+
+
+def _crunch(seconds=0.03):
+    """CPU-bound helper; returns the pid it ran in."""
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+    return os.getpid()
+
+
+def _sleepy():
+    time.sleep(0.03)
+    return os.getpid()
+
+
+class _CountedPickles:
+    """Argument counting how often it is pickled in this process."""
+
+    pickled = 0
+
+    def __reduce__(self):
+        type(self).pickled += 1
+        return (float, (0.03,))
+
+
+class TestDetectCpuBound(unittest.TestCase):
+    """Tests for detect_cpu_bound()."""
+
+    def test_flags_cpu_bound_only(self):
+        """Test that CPU-bound callables are reported and I/O-bound ones are not."""
+        from pyasync import detect_cpu_bound, run, parallel
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            with detect_cpu_bound(threshold=0.5, min_calls=3, min_cpu=0.05) as detector:
+                for _ in range(3):
+                    run(_crunch)
+                parallel(_sleepy, _sleepy, _sleepy)
+
+        report = detector.report()
+        self.assertEqual([entry["name"] for entry in report], [f"{__name__}._crunch"])
+        entry = report[0]
+        self.assertEqual(entry["calls"], 3)
+        self.assertGreaterEqual(entry["cpu"], 0.08)
+        self.assertGreater(entry["cpu_share"], 0.5)
+        self.assertEqual(entry["redirected"], 0)
+
+        sleepy = next(e for e in detector.usage() if e["name"].endswith("_sleepy"))
+        self.assertLess(sleepy["cpu_share"], 0.5)
+        self.assertEqual(sum("_crunch is CPU-bound" in str(w.message) for w in caught), 1)
+
+    def test_lambdas_told_apart(self):
+        """Test that different lambdas are accounted separately."""
+        from pyasync import detect_cpu_bound, run
+
+        with detect_cpu_bound(warn=False) as detector:
+            run(lambda: _crunch(0.01))
+            run(lambda: None)
+        self.assertEqual(len(detector.usage()), 2)
+
+    def test_stop(self):
+        """Test that tasks after stop() are not measured."""
+        from pyasync import detect_cpu_bound, run
+
+        detector = detect_cpu_bound(warn=False)
+        run(_sleepy)
+        detector.stop()
+        run(_sleepy)
+        self.assertEqual(detector.usage()[0]["calls"], 1)
+
+    def test_redirect_to_process_pool(self):
+        """Test that repeat offenders move to the process pool."""
+        from pyasync import detect_cpu_bound, run
+
+        with detect_cpu_bound(min_calls=2, min_cpu=0.01, redirect=True, warn=False) as detector:
+            first = [run(_crunch) for _ in range(2)]
+            redirected = run(_crunch)
+
+        self.assertEqual(first, [os.getpid()] * 2)
+        self.assertNotEqual(redirected, os.getpid())
+        self.assertEqual(detector.report()[0]["redirected"], 1)
+
+    def test_redirect_pickles_once(self):
+        """Test that a redirected call is pickled once, not once more on submit."""
+        from functools import partial
+        from pyasync import detect_cpu_bound, run
+
+        with detect_cpu_bound(min_calls=1, min_cpu=0.01, redirect=True, warn=False):
+            run(partial(_crunch, 0.03))
+            _CountedPickles.pickled = 0
+            pid = run(partial(_crunch, _CountedPickles()))
+
+        self.assertNotEqual(pid, os.getpid())
+        self.assertEqual(_CountedPickles.pickled, 1)
+
+    def test_unpicklable_stays_on_threads(self):
+        """Test that calls which cannot be pickled keep running on threads."""
+        from pyasync import detect_cpu_bound, run
+
+        crunch = lambda: _crunch(0.02)  # noqa: E731
+        with detect_cpu_bound(min_calls=1, min_cpu=0.01, redirect=True, warn=False) as detector:
+            pids = [run(crunch) for _ in range(3)]
+
+        self.assertEqual(pids, [os.getpid()] * 3)
+        self.assertEqual(detector.report()[0]["redirected"], 0)
+
+    def test_invalid_threshold(self):
+        """Test that thresholds outside (0, 1] are rejected."""
+        from pyasync import detect_cpu_bound
+
+        with self.assertRaises(ValueError):
+            detect_cpu_bound(threshold=0)
+        with self.assertRaises(ValueError):
+            detect_cpu_bound(threshold=1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
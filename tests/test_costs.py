@@ -0,0 +1,172 @@
+"""Unit tests for pyasync.costs module."""
+
+import unittest
+from functools import partial
+
+import pyasync
+
+
+def _halves(start, end):
+    middle = (start + end) // 2
+    return [(start, middle), (middle, end)]
+
+
+@pyasync.splittable(split=_halves, combine=sum)
+def _count(start, end):
+    """Splittable process helper."""
+    return end - start
+
+
+def _square(n):
+    return n * n
+
+
+def _submit_now(order, fn):
+    """Synchronous submit recording dispatch order."""
+    from concurrent.futures import Future
+
+    order.append(fn)
+    future = Future()
+    future.set_result(fn())
+    return future
+
+
+class TestPlan(unittest.TestCase):
+    """Tests for cost resolution and planning."""
+
+    def test_longest_first(self):
+        """Test that calls are dispatched by decreasing cost, ties in order."""
+        from pyasync.costs import plan
+
+        calls = [(_square, (n,), {}) for n in range(4)]
+        pieces = plan(calls, [1, 5, 1, 3], workers=8)
+        self.assertEqual([piece.index for piece in pieces], [1, 3, 0, 2])
+
+    def test_split_oversized(self):
+        """Test that a splittable call over the per-worker share is split."""
+        from pyasync.costs import plan
+
+        calls = [(_count, (0, 100), {}), (_count, (0, 10), {}), (_count, (0, 10), {})]
+        pieces = plan(calls, [100, 10, 10], workers=4)
+        big = [piece for piece in pieces if piece.index == 0]
+        self.assertEqual(len(big), 4)
+        self.assertEqual(sorted(piece.args for piece in big), [(0, 25), (25, 50), (50, 75), (75, 100)])
+        # Small calls stay whole
+        self.assertEqual(sum(1 for piece in pieces if piece.index != 0), 2)
+
+    def test_unsplittable_left_whole(self):
+        """Test that plain functions are never split."""
+        from pyasync.costs import plan
+
+        pieces = plan([(_square, (3,), {}), (_square, (1,), {})], [100, 1], workers=4)
+        self.assertEqual(len(pieces), 2)
+
+    def test_dispatch_combines_in_order(self):
+        """Test that split results are combined and returned per original call."""
+        from pyasync.costs import plan, dispatch
+
+        combined = []
+
+        def join(parts):
+            combined.append(parts)
+            return "".join(parts)
+
+        def split(text):
+            return [(text[:len(text) // 2],), (text[len(text) // 2:],)]
+
+        @pyasync.splittable(split=split, combine=join)
+        def echo(text):
+            return text
+
+        calls = [(echo, ("abcdefgh",), {}), (echo, ("x",), {})]
+        order = []
+        futures = dispatch(plan(calls, [8, 1], workers=4), 2, partial(_submit_now, order))
+        self.assertEqual([future.result() for future in futures], ["abcdefgh", "x"])
+        self.assertEqual(combined, [["ab", "cd", "ef", "gh"]])
+        self.assertEqual(len(order), 5)
+
+    def test_resolve_errors(self):
+        """Test mismatched cost lists and unknown cost names."""
+        from pyasync.costs import resolve
+
+        calls = [(_square, (1,), {})]
+        with self.assertRaises(ValueError):
+            resolve([1, 2], calls, None)
+        with self.assertRaises(ValueError):
+            resolve("fastest", calls, None)
+
+
+class TestCostModel(unittest.TestCase):
+    """Tests for learned estimates."""
+
+    def test_estimates(self):
+        """Test per-argument estimates with a per-function fallback."""
+        from pyasync import CostModel
+
+        model = CostModel(smoothing=0.5)
+        self.assertIsNone(model.estimate(_square, (1,)))
+        model.record(_square, (1,), {}, 1.0)
+        model.record(_square, (2,), {}, 3.0)
+        model.record(_square, (2,), {}, 5.0)
+        self.assertEqual(model.estimate(_square, (1,)), 1.0)
+        self.assertEqual(model.estimate(_square, (2,)), 4.0)
+        self.assertEqual(model.estimate(_square, (9,)), 3.0)
+
+    def test_unhashable_arguments(self):
+        """Test that unhashable arguments only feed the function average."""
+        from pyasync import CostModel
+
+        model = CostModel()
+        model.record(_square, ([1],), {}, 2.0)
+        self.assertEqual(model.estimate(_square, ([1],)), 2.0)
+
+    def test_bounded(self):
+        """Test that old per-argument entries are evicted."""
+        from pyasync import CostModel
+
+        model = CostModel(max_entries=2)
+        for n in range(3):
+            model.record(_square, (n,), {}, float(n))
+        self.assertEqual(len(model._calls), 2)
+
+
+class TestCostHintedDispatch(unittest.TestCase):
+    """Tests for cost= on cpu_parallel() and CpuExecutor.map()."""
+
+    def test_cpu_parallel_order_preserved(self):
+        """Test that results keep argument order, including split calls."""
+        from pyasync import cpu_parallel
+
+        calls = [partial(_count, 0, 10), partial(_count, 0, 1000), partial(_square, 7)]
+        results = cpu_parallel(*calls, cost=[10, 1000, 1], max_workers=2)
+        self.assertEqual(results, [10, 1000, 49])
+
+    def test_cpu_parallel_cost_function(self):
+        """Test a cost function receiving each callable."""
+        from pyasync import cpu_parallel
+
+        calls = [partial(_count, 0, n) for n in (5, 500, 50)]
+        results = cpu_parallel(*calls, cost=lambda call: call.args[1], max_workers=2)
+        self.assertEqual(results, [5, 500, 50])
+
+    def test_learned(self):
+        """Test that a model learns from a run."""
+        from pyasync import cpu_parallel, CostModel
+
+        model = CostModel()
+        self.assertEqual(cpu_parallel(partial(_square, 2), partial(_square, 3), cost=model), [4, 9])
+        self.assertIsNotNone(model.estimate(_square, (2,)))
+
+    def test_executor_map(self):
+        """Test CpuExecutor.map with a cost function over item arguments."""
+        from pyasync import CpuExecutor
+
+        with CpuExecutor(max_workers=2) as executor:
+            results = list(executor.map(_count, [0, 0, 0], [30, 3000, 300], cost=lambda s, e: e - s))
+            self.assertEqual(results, [30, 3000, 300])
+            with self.assertRaises(ValueError):
+                executor.map(_square, [1], cost=[1], hedge=pyasync.Hedge(delay=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+"""Unit tests for pyasync.diskcache module."""
+
+import unittest
+import os
+import tempfile
+import time
+
+
+def _counted_square(log_path, n):
+    """Process helper that logs every real execution."""
+    with open(log_path, "a") as f:
+        f.write(f"{n}\n")
+    return n * n
+
+
+def _cube(n):
+    return n * n * n
+
+
+def _executions(log_path):
+    if not os.path.exists(log_path):
+        return []
+    with open(log_path) as f:
+        return [int(line) for line in f]
+
+
+class TestDiskCache(unittest.TestCase):
+    """Tests for DiskCache class."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self._tmp.name, "cache")
+        self.log_path = os.path.join(self._tmp.name, "executions.log")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_key_depends_on_function_and_args(self):
+        """Test that keys change with the function and its arguments."""
+        from pyasync import DiskCache
+        from functools import partial
+
+        cache = DiskCache(self.directory)
+
+        self.assertEqual(cache.key(_cube, (2,)), cache.key(_cube, (2,)))
+        self.assertNotEqual(cache.key(_cube, (2,)), cache.key(_cube, (3,)))
+        self.assertNotEqual(cache.key(_cube, (2,)), cache.key(_executions, (2,)))
+        self.assertEqual(cache.key(partial(_cube, 2)), cache.key(partial(_cube, 2)))
+
+    def test_put_get(self):
+        """Test storing and loading a value."""
+        from pyasync import DiskCache
+
+        cache = DiskCache(self.directory)
+
+        self.assertEqual(cache.get("ab" * 32), (False, None))
+        cache.put("ab" * 32, {"rows": [1, 2, 3]})
+        self.assertEqual(cache.get("ab" * 32), (True, {"rows": [1, 2, 3]}))
+
+    def test_large_value(self):
+        """Test values large enough to be memory-mapped."""
+        from pyasync import DiskCache
+
+        cache = DiskCache(self.directory, max_bytes=10 * 1024 * 1024)
+        blob = os.urandom(2 * 1024 * 1024)
+
+        cache.put("cd" * 32, blob)
+
+        self.assertEqual(cache.get("cd" * 32), (True, blob))
+
+    def test_lru_eviction(self):
+        """Test that least recently used entries are evicted over budget."""
+        from pyasync import DiskCache
+
+        cache = DiskCache(self.directory, max_bytes=2500)
+        payload = b"x" * 1000
+
+        cache.put("01" * 32, payload)
+        time.sleep(0.01)
+        cache.put("02" * 32, payload)
+        time.sleep(0.01)
+        cache.get("01" * 32)  # Now the most recently used
+        time.sleep(0.01)
+        cache.put("03" * 32, payload)
+
+        self.assertTrue(cache.get("01" * 32)[0])
+        self.assertFalse(cache.get("02" * 32)[0])
+        self.assertTrue(cache.get("03" * 32)[0])
+        self.assertLessEqual(cache.usage()["bytes"], 2500)
+
+    def test_walks_only_when_over_budget(self):
+        """Test that writes under budget do not scan the directory."""
+        from unittest import mock
+        from pyasync import DiskCache
+
+        cache = DiskCache(self.directory, max_bytes=10_000)
+        cache.put("01" * 32, b"x" * 100)
+        with mock.patch.object(DiskCache, "_entries", wraps=cache._entries) as entries:
+            for n in range(2, 10):
+                cache.put(f"{n:02d}" * 32, b"x" * 100)
+            self.assertEqual(entries.call_count, 0)
+            cache.put("99" * 32, b"x" * 9_500)
+            self.assertEqual(entries.call_count, 1)
+        self.assertLessEqual(cache.usage()["bytes"], 10_000)
+
+    def test_corrupt_entry_is_a_miss(self):
+        """Test that unreadable entries are treated as misses."""
+        import pickle
+        from pyasync import DiskCache
+
+        cache = DiskCache(self.directory)
+        cache.put("aa" * 32, 1)
+        cache.put("bb" * 32, 2)
+        with open(cache._path("aa" * 32), "wb") as f:
+            f.write(b"garbage")
+        with open(cache._path("bb" * 32), "wb") as f:
+            # Refers to a module that does not exist
+            f.write(pickle.dumps(1, protocol=2).replace(b"K\x01", b"cno_such_module\nthing\n"))
+
+        self.assertEqual(cache.get("aa" * 32), (False, None))
+        self.assertEqual(cache.get("bb" * 32), (False, None))
+
+    def test_cpu_run_persists_across_instances(self):
+        """Test that results survive a new DiskCache on the same directory."""
+        from pyasync import cpu_run, DiskCache
+        from functools import partial
+
+        call = partial(_counted_square, self.log_path, 6)
+
+        self.assertEqual(cpu_run(call, disk_cache=DiskCache(self.directory)), 36)
+        self.assertEqual(cpu_run(call, disk_cache=DiskCache(self.directory)), 36)
+
+        self.assertEqual(_executions(self.log_path), [6])
+
+    def test_cpu_parallel(self):
+        """Test disk_cache on cpu_parallel."""
+        from pyasync import cpu_parallel, DiskCache
+        from functools import partial
+
+        cache = DiskCache(self.directory)
+        calls = [partial(_counted_square, self.log_path, n) for n in (1, 2, 3)]
+
+        self.assertEqual(cpu_parallel(*calls, disk_cache=cache), [1, 4, 9])
+        self.assertEqual(cpu_parallel(*calls, disk_cache=cache), [1, 4, 9])
+
+        self.assertEqual(sorted(_executions(self.log_path)), [1, 2, 3])
+
+    def test_executor_map(self):
+        """Test disk_cache on CpuExecutor.map."""
+        from pyasync import CpuExecutor, DiskCache
+
+        cache = DiskCache(self.directory)
+
+        with CpuExecutor(max_workers=2) as executor:
+            first = list(executor.map(_counted_square, [self.log_path] * 3, [4, 5, 4],
+                                      disk_cache=cache))
+            second = list(executor.map(_counted_square, [self.log_path] * 2, [4, 5],
+                                       disk_cache=cache))
+
+        self.assertEqual(first, [16, 25, 16])
+        self.assertEqual(second, [16, 25])
+        self.assertEqual(cache.usage()["entries"], 2)
+        self.assertLessEqual(len(_executions(self.log_path)), 3)
+
+    def test_clear(self):
+        """Test removing every entry."""
+        from pyasync import DiskCache
+
+        cache = DiskCache(self.directory)
+        cache.put("ef" * 32, 1)
+        cache.clear()
+
+        self.assertEqual(cache.usage(), {"entries": 0, "bytes": 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
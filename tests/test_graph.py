@@ -0,0 +1,152 @@
+"""Unit tests for pyasync.graph module."""
+
+import unittest
+import threading
+import time
+
+
+def _total(values):
+    """Module-level node function for process tests."""
+    return sum(values)
+
+
+def _scale(values):
+    return [v * 10 for v in values]
+
+
+class TestGraph(unittest.TestCase):
+    """Tests for Graph class."""
+
+    def test_dependencies(self):
+        """Test that nodes receive dependency results in declared order."""
+        from pyasync import Graph
+
+        report = (
+            Graph()
+            .add("a", lambda: 2)
+            .add("b", lambda: 3)
+            .add("sum", lambda x, y: (x, y), deps=["b", "a"])
+            .run()
+        )
+
+        self.assertEqual(report["sum"], (3, 2))
+        self.assertEqual(set(report.results), {"sum"})
+
+    def test_mixed_backends(self):
+        """Test thread and process nodes in one graph."""
+        from pyasync import Graph
+
+        report = (
+            Graph()
+            .add("fetch", lambda: [1, 2, 3])
+            .add("scaled", _scale, deps=["fetch"], backend="process")
+            .add("total", _total, deps=["scaled"], backend="process")
+            .add("count", len, deps=["fetch"])
+            .run(timeout=10.0)
+        )
+
+        self.assertEqual(report.results, {"total": 60, "count": 3})
+
+    def test_independent_branches(self):
+        """Test that a branch starts without waiting for a slow sibling."""
+        from pyasync import Graph
+
+        fast_done = threading.Event()
+
+        report = (
+            Graph()
+            .add("slow", lambda: time.sleep(0.2))
+            .add("fast", lambda: "x")
+            .add("after_fast", lambda x: fast_done.set() or x, deps=["fast"])
+            .add("after_slow", lambda _: fast_done.is_set(), deps=["slow"])
+            .run(timeout=5.0)
+        )
+
+        self.assertTrue(report["after_slow"])
+
+    def test_releases_intermediate_results(self):
+        """Test that consumed results are not kept."""
+        from pyasync import Graph
+
+        report = (
+            Graph()
+            .add("raw", lambda: "big")
+            .add("parsed", str.upper, deps=["raw"], keep=True)
+            .add("out", len, deps=["parsed"])
+            .run()
+        )
+
+        self.assertEqual(report.results, {"parsed": "BIG", "out": 3})
+
+    def test_critical_path(self):
+        """Test critical-path timing."""
+        from pyasync import Graph
+
+        report = (
+            Graph()
+            .add("slow", lambda: time.sleep(0.1))
+            .add("fast", lambda: None)
+            .add("join", lambda a, b: None, deps=["slow", "fast"])
+            .run()
+        )
+
+        self.assertEqual(report.critical_path, ["slow", "join"])
+        self.assertGreaterEqual(report.critical_path_time, 0.1)
+        self.assertGreaterEqual(report.wall_time, report.critical_path_time * 0.9)
+        self.assertEqual(set(report.timeline), {"slow", "fast", "join"})
+
+    def test_failure_skips_dependents(self):
+        """Test that a failing node stops the run."""
+        from pyasync import Graph
+
+        calls = []
+
+        def failing():
+            raise ValueError("bad input")
+
+        graph = (
+            Graph()
+            .add("load", failing)
+            .add("use", calls.append, deps=["load"])
+        )
+
+        with self.assertRaises(ValueError):
+            graph.run()
+        self.assertEqual(calls, [])
+
+    def test_timeout(self):
+        """Test that the timeout raises TimeoutError."""
+        from pyasync import Graph
+
+        release = threading.Event()
+        graph = Graph().add("wait", release.wait)
+
+        with self.assertRaises(TimeoutError):
+            graph.run(timeout=0.05)
+        release.set()
+
+    def test_invalid_graphs(self):
+        """Test validation of nodes and dependencies."""
+        from pyasync import Graph
+
+        with self.assertRaises(ValueError):
+            Graph().add("a", len).add("a", len)
+        with self.assertRaises(ValueError):
+            Graph().add("a", len, backend="gpu")
+        with self.assertRaises(ValueError):
+            Graph().add("a", len, deps=["missing"]).run()
+        with self.assertRaises(ValueError):
+            Graph().add("a", len, deps=["b"]).add("b", len, deps=["a"]).run()
+
+    def test_rerun(self):
+        """Test that a graph can be run more than once."""
+        from pyasync import Graph
+
+        graph = Graph().add("a", lambda: 1).add("b", lambda x: x + 1, deps=["a"])
+
+        self.assertEqual(graph.run()["b"], 2)
+        self.assertEqual(graph.run()["b"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+"""Unit tests for pyasync.hedging module."""
+
+import unittest
+import os
+import tempfile
+import threading
+import time
+
+
+class _FirstCallSlow:
+    """Callable whose first invocation is slow and later ones are fast."""
+
+    def __init__(self, slow=1.0, fail_first=False):
+        self.calls = 0
+        self.slow = slow
+        self.fail_first = fail_first
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+            call = self.calls
+        if call == 1:
+            time.sleep(self.slow)
+            if self.fail_first:
+                raise ValueError("first attempt failed")
+            return "primary"
+        time.sleep(0.01)
+        return "hedge"
+
+
+def _straggler(marker_dir, n):
+    """Process helper: the first attempt for n == 3 is very slow."""
+    if n == 3:
+        marker = os.path.join(marker_dir, "started")
+        if not os.path.exists(marker):
+            open(marker, "w").close()
+            time.sleep(1.0)
+    return n * 10
+
+
+class TestHedge(unittest.TestCase):
+    """Tests for Hedge policy."""
+
+    def test_fixed_delay_hedges_slow_call(self):
+        """Test that a slow call is hedged and the duplicate wins."""
+        from pyasync import run, Hedge
+
+        hedge = Hedge(delay=0.05)
+        fn = _FirstCallSlow()
+
+        start = time.monotonic()
+        result = run(fn, hedge=hedge)
+
+        self.assertEqual(result, "hedge")
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(hedge.stats(), {"fired": 1, "won": 1})
+
+    def test_fast_call_not_hedged(self):
+        """Test that calls finishing before the delay are not duplicated."""
+        from pyasync import parallel, Hedge
+
+        hedge = Hedge(delay=0.5)
+
+        results = parallel(lambda: 1, lambda: 2, hedge=hedge)
+
+        self.assertEqual(results, [1, 2])
+        self.assertEqual(hedge.fired, 0)
+
+    def test_failure_waits_for_hedge(self):
+        """Test that a failed attempt does not win while a hedge is running."""
+        from pyasync import background, Hedge
+
+        hedge = Hedge(delay=0.02)
+        fn = _FirstCallSlow(slow=0.05, fail_first=True)
+
+        task = background(fn, hedge=hedge)
+
+        self.assertEqual(task.result(), "hedge")
+
+    def test_all_attempts_fail(self):
+        """Test that the exception propagates when every attempt fails."""
+        from pyasync import run, Hedge
+
+        def failing():
+            time.sleep(0.05)
+            raise RuntimeError("down")
+
+        with self.assertRaises(RuntimeError):
+            run(failing, hedge=Hedge(delay=0.01))
+
+    def test_percentile_delay(self):
+        """Test percentile delays need min_samples observations."""
+        from pyasync import Hedge
+
+        hedge = Hedge(delay="p95", min_samples=5)
+        self.assertIsNone(hedge.delay())
+
+        for latency in [0.01, 0.02, 0.03, 0.04, 0.05, 0.06, 0.07, 0.08, 0.09, 1.0]:
+            hedge.record(latency)
+
+        self.assertEqual(hedge.delay(), 1.0)
+
+    def test_percentile_window(self):
+        """Test that latencies older than the window are dropped."""
+        from pyasync import Hedge
+
+        hedge = Hedge(delay="p50", min_samples=1, window=3)
+        for latency in [5.0, 1.0, 2.0, 3.0]:
+            hedge.record(latency)
+
+        self.assertEqual(hedge.delay(), 2.0)
+
+    def test_cancelled_attempt_settles(self):
+        """Test that cancelling the only attempt settles the task."""
+        from concurrent.futures import CancelledError, Future
+        from pyasync import Hedge
+
+        attempt = Future()
+        outer = Hedge(delay=60).run(lambda: attempt)
+        attempt.cancel()
+
+        with self.assertRaises(CancelledError):
+            outer.result(timeout=1)
+
+    def test_invalid_delay(self):
+        """Test that malformed percentile delays are rejected."""
+        from pyasync import Hedge
+
+        with self.assertRaises(ValueError):
+            Hedge(delay="fast")
+
+
+class TestHedgedMap(unittest.TestCase):
+    """Tests for CpuExecutor.map with hedge."""
+
+    def test_straggler_reexecuted(self):
+        """Test that a straggling chunk is re-executed on an idle worker."""
+        from pyasync import CpuExecutor, Hedge
+
+        hedge = Hedge(delay=0.1)
+
+        with tempfile.TemporaryDirectory() as marker_dir:
+            with CpuExecutor(max_workers=2) as executor:
+                start = time.monotonic()
+                results = list(executor.map(
+                    _straggler, [marker_dir] * 4, [0, 1, 2, 3], hedge=hedge
+                ))
+                elapsed = time.monotonic() - start
+
+        self.assertEqual(results, [0, 10, 20, 30])
+        self.assertLess(elapsed, 0.9)
+        self.assertGreaterEqual(hedge.fired, 1)
+        self.assertGreaterEqual(hedge.won, 1)
+
+    def test_chunksize(self):
+        """Test hedged map with chunks larger than one item."""
+        from pyasync import CpuExecutor, Hedge
+
+        with tempfile.TemporaryDirectory() as marker_dir:
+            with CpuExecutor(max_workers=2) as executor:
+                results = list(executor.map(
+                    _straggler, [marker_dir] * 5, [0, 1, 2, 4, 5],
+                    chunksize=2, hedge=Hedge(delay=1.0)
+                ))
+
+        self.assertEqual(results, [0, 10, 20, 40, 50])
+
+
+if __name__ == '__main__':
+    unittest.main()
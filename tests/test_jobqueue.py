@@ -0,0 +1,257 @@
+"""Unit tests for pyasync.jobqueue module."""
+
+import os
+import tempfile
+import time
+import unittest
+
+
+def _append(path, line):
+    """Job helper recording that it ran."""
+    with open(path, "a") as f:
+        f.write(line + "\n")
+    return line
+
+
+def _crash_once(marker):
+    """Process helper killing its worker the first time it runs."""
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return "recovered"
+
+
+def _crash_always():
+    os._exit(1)
+
+
+def _fail_once(marker):
+    """Job helper failing the first time it runs."""
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        raise OSError("transient")
+    return "ok"
+
+
+def _never_done(fn):
+    """Runner holding a lease forever, like a process that died mid-job."""
+    from concurrent.futures import Future
+
+    return Future()
+
+
+class TestJobQueue(unittest.TestCase):
+    """Tests for JobQueue."""
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+        self.db = os.path.join(self._dir.name, "jobs.db")
+        self.log = os.path.join(self._dir.name, "ran.log")
+
+    def _lines(self):
+        if not os.path.exists(self.log):
+            return []
+        with open(self.log) as f:
+            return sorted(f.read().split())
+
+    def _drain(self, queue, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            queue.flush()
+            stats = queue.stats()
+            if stats["pending"] == 0 and stats["leased"] == 0:
+                return stats
+            time.sleep(0.05)
+        self.fail(f"Queue not drained: {queue.stats()}")
+
+    def test_results_and_ack(self):
+        """Test that jobs run, return results and leave the database."""
+        from functools import partial
+        from pyasync import JobQueue, background
+
+        with JobQueue(self.db) as queue:
+            futures = [queue.enqueue(partial(_append, self.log, str(i))) for i in range(100)]
+            task = background(partial(_append, self.log, "task"), queue=queue)
+            self.assertTrue(queue.flush(timeout=10))
+            self.assertEqual([f.result(timeout=10) for f in futures], [str(i) for i in range(100)])
+            self.assertEqual(task.result(timeout=10), "task")
+            self.assertEqual(self._drain(queue), {"pending": 0, "leased": 0, "dead": 0})
+        self.assertEqual(len(self._lines()), 101)
+
+    def test_resume_on_startup(self):
+        """Test that unstarted jobs and expired leases are delivered by the next queue."""
+        from functools import partial
+        from pyasync import JobQueue
+
+        first = JobQueue(self.db, lease=0.3, max_inflight=1)
+        for name in ("a", "b", "c"):
+            first.enqueue(partial(_append, self.log, name), run=_never_done)
+        first.flush()
+        first.close(wait=False)
+        self.assertEqual(self._lines(), [])
+
+        errors = []
+        with JobQueue(self.db, on_error=lambda job_id, e: errors.append(e)) as second:
+            self._drain(second)
+        self.assertEqual(self._lines(), ["a", "b", "c"])
+        self.assertEqual(errors, [])
+
+    def test_replay_uses_queue_policies(self):
+        """Test that resumed jobs get the policies of the queue, not the enqueuer's."""
+        from concurrent.futures import Future
+        from functools import partial
+        from pyasync import JobQueue, Retry, background
+
+        marker = os.path.join(self._dir.name, "failed")
+        first = JobQueue(self.db, lease=0.3, max_inflight=1)
+        first.enqueue(partial(_append, self.log, "a"), run=lambda fn: Future())
+        background(partial(_fail_once, marker), queue=first, retry=Retry(max_attempts=3, backoff=0))
+        first.flush()
+        first.close(wait=False)
+
+        # Without a policy the enqueuer's retry is lost
+        errors = []
+        with JobQueue(self.db, on_error=lambda job_id, e: errors.append(e)) as second:
+            self._drain(second)
+        self.assertEqual([type(e) for e in errors], [OSError])
+
+        os.unlink(marker)
+        first = JobQueue(self.db, lease=0.3, max_inflight=1)
+        first.enqueue(partial(_append, self.log, "b"), run=lambda fn: Future())
+        first.enqueue(partial(_fail_once, marker))
+        first.flush()
+        first.close(wait=False)
+
+        errors = []
+        retry = Retry(max_attempts=3, backoff=0)
+        with JobQueue(self.db, retry=retry, on_error=lambda job_id, e: errors.append(e)) as second:
+            self._drain(second)
+        self.assertEqual(errors, [])
+
+    def test_queues_sharing_a_file(self):
+        """Test that live queues on one file run their own jobs."""
+        from functools import partial
+        from pyasync import JobQueue
+
+        with JobQueue(self.db) as first, JobQueue(self.db) as second:
+            futures = [
+                queue.enqueue(partial(_append, self.log, f"{name}{i}"))
+                for i in range(20)
+                for name, queue in (("a", first), ("b", second))
+            ]
+            results = [future.result(timeout=10) for future in futures]
+        self.assertEqual(sorted(results), self._lines())
+        self.assertEqual(len(results), 40)
+
+    def test_cancelled_job_not_reported(self):
+        """Test that a job cancelled while queued is removed without on_error."""
+        from concurrent.futures import Future
+        from functools import partial
+        from pyasync import JobQueue
+
+        gate = Future()
+        errors = []
+        with JobQueue(self.db, max_inflight=1, on_error=lambda job_id, e: errors.append(e)) as queue:
+            first = queue.enqueue(partial(_append, self.log, "a"), run=lambda fn: gate)
+            second = queue.enqueue(partial(_append, self.log, "b"))
+            queue.flush()
+            self.assertTrue(second.cancel())
+            gate.set_result("a")
+            self.assertEqual(first.result(timeout=10), "a")
+            self._drain(queue)
+        self.assertEqual(errors, [])
+        self.assertEqual(self._lines(), [])
+
+    def test_retries_locked_database(self):
+        """Test that commits blocked by another writer are retried."""
+        import sqlite3
+        from functools import partial
+        from unittest import mock
+        from pyasync import JobQueue
+
+        with mock.patch("pyasync.jobqueue._BUSY_TIMEOUT", 0.05):
+            queue = JobQueue(self.db)
+        self.addCleanup(queue.close)
+        blocker = sqlite3.connect(self.db, isolation_level=None)
+        blocker.execute("BEGIN EXCLUSIVE")
+        future = queue.enqueue(partial(_append, self.log, "a"))
+        self.assertFalse(queue.flush(timeout=0.5))
+        blocker.execute("ROLLBACK")
+        blocker.close()
+        self.assertEqual(future.result(timeout=10), "a")
+        self.assertEqual(self._drain(queue), {"pending": 0, "leased": 0, "dead": 0})
+
+    def test_stops_after_persistent_errors(self):
+        """Test that a queue that cannot commit fails its jobs and refuses new ones."""
+        import sqlite3
+        from functools import partial
+        from unittest import mock
+        from pyasync import JobQueue
+
+        with mock.patch("pyasync.jobqueue._BUSY_TIMEOUT", 0.05), \
+                mock.patch("pyasync.jobqueue._RETRY_FOR", 0.3):
+            queue = JobQueue(self.db)
+            blocker = sqlite3.connect(self.db, isolation_level=None)
+            self.addCleanup(blocker.close)
+            blocker.execute("BEGIN EXCLUSIVE")
+            future = queue.enqueue(partial(_append, self.log, "a"))
+            with self.assertRaises(sqlite3.OperationalError):
+                future.result(timeout=10)
+        self.assertFalse(queue.flush(timeout=1))
+        with self.assertRaises(RuntimeError):
+            queue.enqueue(partial(_append, self.log, "b"))
+        queue.close()
+        blocker.execute("ROLLBACK")
+
+    def test_max_inflight(self):
+        """Test that no more than max_inflight jobs are leased at once."""
+        from functools import partial
+        from pyasync import JobQueue
+
+        with JobQueue(self.db, max_inflight=2) as queue:
+            for i in range(5):
+                queue.enqueue(partial(_append, self.log, str(i)), run=_never_done)
+            queue.flush()
+            time.sleep(0.1)
+            self.assertEqual(queue.stats(), {"pending": 3, "leased": 2, "dead": 0})
+            queue.close(wait=False)
+
+    def test_redelivered_after_worker_crash(self):
+        """Test that a job whose worker died is delivered again."""
+        from functools import partial
+        from pyasync import JobQueue, cpu_background
+
+        marker = os.path.join(self._dir.name, "crashed")
+        with JobQueue(self.db) as queue:
+            task = cpu_background(partial(_crash_once, marker), queue=queue)
+            self.assertEqual(task.result(timeout=30), "recovered")
+
+    def test_dead_after_max_deliveries(self):
+        """Test that a job that keeps killing its worker is marked dead."""
+        from concurrent.futures.process import BrokenProcessPool
+        from pyasync import JobQueue
+
+        with JobQueue(self.db, max_deliveries=2) as queue:
+            future = queue.enqueue(_crash_always, backend="process")
+            with self.assertRaises(BrokenProcessPool):
+                future.result(timeout=30)
+            self.assertEqual(queue.stats()["dead"], 1)
+
+    def test_invalid_jobs(self):
+        """Test unknown backends, unpicklable jobs and closed queues."""
+        import pickle
+        from pyasync import JobQueue
+
+        queue = JobQueue(self.db)
+        with self.assertRaises(ValueError):
+            queue.enqueue(_crash_always, backend="gpu")
+        with self.assertRaises((pickle.PicklingError, AttributeError)):
+            queue.enqueue(lambda: None)
+        queue.close()
+        with self.assertRaises(ValueError):
+            queue.enqueue(_crash_always)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+"""Unit tests for pyasync.keyed module."""
+
+import unittest
+import threading
+import time
+
+
+def _identity(n):
+    """Module-level function for process tests."""
+    return n
+
+
+class TestKeyedExecutor(unittest.TestCase):
+    """Tests for KeyedExecutor class."""
+
+    def test_fifo_per_key(self):
+        """Test that tasks for one key run in order, one at a time."""
+        from pyasync import KeyedExecutor
+
+        executor = KeyedExecutor()
+        applied = {"a": [], "b": []}
+        running = {"a": 0, "b": 0}
+        overlaps = []
+
+        def apply(key, n):
+            running[key] += 1
+            if running[key] > 1:
+                overlaps.append(key)
+            time.sleep(0.001)
+            applied[key].append(n)
+            running[key] -= 1
+
+        for n in range(30):
+            executor.submit("a", apply, "a", n)
+            executor.submit("b", apply, "b", n)
+
+        self.assertTrue(executor.wait_all(timeout=5.0))
+        self.assertEqual(applied, {"a": list(range(30)), "b": list(range(30))})
+        self.assertEqual(overlaps, [])
+
+    def test_keys_run_concurrently(self):
+        """Test that different keys do not wait for each other."""
+        from pyasync import KeyedExecutor
+
+        executor = KeyedExecutor()
+        release = threading.Event()
+
+        blocked = executor.submit("slow", release.wait)
+        other = executor.submit("fast", lambda: "done")
+
+        self.assertEqual(other.result(timeout=1.0), "done")
+        release.set()
+        blocked.result(timeout=1.0)
+
+    def test_failure_does_not_block_key(self):
+        """Test that tasks after a failure still run."""
+        from pyasync import KeyedExecutor
+
+        executor = KeyedExecutor()
+
+        def failing():
+            raise ValueError("bad event")
+
+        first = executor.submit("k", failing)
+        second = executor.submit("k", lambda: "next")
+
+        with self.assertRaises(ValueError):
+            first.result(timeout=1.0)
+        self.assertEqual(second.result(timeout=1.0), "next")
+
+    def test_idle_keys_released(self):
+        """Test that memory is only held for keys with outstanding work."""
+        from pyasync import KeyedExecutor
+
+        executor = KeyedExecutor()
+        release = threading.Event()
+
+        executor.submit("busy", release.wait)
+        executor.submit("busy", lambda: None)
+        for key in range(1000):
+            executor.submit(key, lambda: None)
+
+        time.sleep(0.1)
+        self.assertEqual(len(executor), 1)
+        self.assertEqual(executor.pending("busy"), 1)
+        release.set()
+        self.assertTrue(executor.wait_all(timeout=5.0))
+        self.assertEqual(len(executor), 0)
+
+    def test_cancel_queued(self):
+        """Test that a cancelled queued task is skipped."""
+        from pyasync import KeyedExecutor
+
+        executor = KeyedExecutor()
+        release = threading.Event()
+        calls = []
+
+        executor.submit("k", release.wait)
+        skipped = executor.submit("k", lambda: calls.append("skipped"))
+        after = executor.submit("k", lambda: calls.append("after"))
+
+        self.assertTrue(skipped.cancel())
+        release.set()
+        after.result(timeout=1.0)
+        self.assertEqual(calls, ["after"])
+
+    def test_max_pending(self):
+        """Test that submit blocks at the pending limit."""
+        from pyasync import KeyedExecutor
+
+        executor = KeyedExecutor(max_pending=2)
+        release = threading.Event()
+        executor.submit("a", release.wait)
+        executor.submit("b", release.wait)
+
+        submitted = threading.Event()
+        threading.Thread(
+            target=lambda: executor.submit("c", lambda: None) and submitted.set()
+        ).start()
+
+        self.assertFalse(submitted.wait(0.1))
+        release.set()
+        self.assertTrue(submitted.wait(1.0))
+
+    def test_process_backend(self):
+        """Test ordering on the process pool."""
+        from pyasync import KeyedExecutor, CpuTask
+
+        executor = KeyedExecutor(backend="process")
+        tasks = [executor.submit("k", _identity, n) for n in range(5)]
+
+        self.assertIsInstance(tasks[0], CpuTask)
+        self.assertEqual([t.result() for t in tasks], list(range(5)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,338 @@
+"""Unit tests for pyasync.limits module."""
+
+import unittest
+import time
+import threading
+
+
+class _ConcurrencyProbe:
+    """Tracks the peak number of concurrent calls."""
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def call(self, delay=0.05, result=None):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+        time.sleep(delay)
+        with self.lock:
+            self.current -= 1
+        return result
+
+
+class TestLimiter(unittest.TestCase):
+    """Tests for Limiter class."""
+
+    def test_submit_respects_limit(self):
+        """Test that submit never exceeds the key's limit."""
+        from pyasync import Limiter
+
+        limiter = Limiter(initial_limit=2, max_limit=2)
+        probe = _ConcurrencyProbe()
+
+        tasks = [limiter.submit("host", lambda i=i: probe.call(result=i)) for i in range(6)]
+
+        self.assertEqual([t.result() for t in tasks], list(range(6)))
+        self.assertEqual(probe.peak, 2)
+        self.assertEqual(limiter.in_flight("host"), 0)
+
+    def test_keys_are_independent(self):
+        """Test that a saturated key does not delay other keys."""
+        from pyasync import Limiter
+
+        limiter = Limiter(initial_limit=1, max_limit=1)
+        release = threading.Event()
+
+        slow = limiter.submit("slow", release.wait)
+        queued = limiter.submit("slow", lambda: "queued")
+        fast = limiter.submit("fast", lambda: "fast")
+
+        self.assertEqual(fast.result(timeout=1.0), "fast")
+        self.assertFalse(queued.done)
+
+        release.set()
+        slow.result(timeout=1.0)
+        self.assertEqual(queued.result(timeout=1.0), "queued")
+
+    def test_exception_propagation(self):
+        """Test that exceptions are propagated and the slot is released."""
+        from pyasync import Limiter
+
+        limiter = Limiter(initial_limit=1, max_limit=1)
+
+        def failing():
+            raise ValueError("downstream error")
+
+        with self.assertRaises(ValueError):
+            limiter.submit("k", failing).result()
+        self.assertEqual(limiter.submit("k", lambda: 1).result(), 1)
+
+    def test_aimd_feedback(self):
+        """Test additive increase on success and backoff on failure."""
+        from pyasync import Limiter
+
+        limiter = Limiter(initial_limit=4, max_limit=10, backoff=0.5)
+
+        for _ in range(4):
+            limiter.acquire("k")
+        limiter.release("k", latency=0.01, success=True)
+        self.assertEqual(limiter.limit("k"), 5)
+
+        limiter.release("k", latency=0.01, success=False)
+        self.assertEqual(limiter.limit("k"), 2)
+
+    def test_aimd_latency_threshold(self):
+        """Test that slow calls count as drops with a latency threshold."""
+        from pyasync import Limiter
+
+        limiter = Limiter(initial_limit=8, latency_threshold=0.1, backoff=0.5)
+
+        limiter.acquire("k")
+        limiter.release("k", latency=1.0, success=True)
+
+        self.assertEqual(limiter.limit("k"), 4)
+
+    def test_gradient_backs_off_on_latency(self):
+        """Test that the gradient algorithm grows then shrinks with latency."""
+        from pyasync import Limiter
+
+        limiter = Limiter(initial_limit=4, max_limit=64, algorithm="gradient")
+
+        def sample(latency):
+            # Keep the limit saturated so every sample is applied
+            while limiter.in_flight("k") < limiter.limit("k"):
+                limiter.acquire("k")
+            limiter.release("k", latency=latency)
+
+        for _ in range(20):
+            sample(0.01)
+        peak = limiter.limit("k")
+        self.assertGreater(peak, 4)
+
+        for _ in range(20):
+            sample(0.2)
+        self.assertLess(limiter.limit("k"), peak)
+
+    def test_acquire_timeout(self):
+        """Test acquire returns False when no slot frees up in time."""
+        from pyasync import Limiter
+
+        limiter = Limiter(initial_limit=1, max_limit=1)
+
+        self.assertTrue(limiter.acquire("k"))
+        self.assertFalse(limiter.acquire("k", timeout=0.05))
+        limiter.release("k")
+        self.assertTrue(limiter.acquire("k", timeout=0.05))
+
+    def test_slot(self):
+        """Test slot context manager holds and releases a slot."""
+        from pyasync import Limiter
+
+        limiter = Limiter()
+
+        with limiter.slot("db"):
+            self.assertEqual(limiter.in_flight("db"), 1)
+        self.assertEqual(limiter.in_flight("db"), 0)
+
+    def test_idle_keys_evicted(self):
+        """Test that only idle keys are forgotten past max_keys."""
+        from pyasync import Limiter
+
+        limiter = Limiter(initial_limit=1, max_limit=4, max_keys=2)
+
+        limiter.acquire("busy")
+        for key in range(10):
+            limiter.acquire(key)
+            limiter.release(key)
+        self.assertEqual(len(limiter._states), 2)
+        self.assertIn("busy", limiter._states)
+        self.assertEqual(limiter.in_flight("busy"), 1)
+        limiter.release("busy")
+
+    def test_invalid_algorithm(self):
+        """Test that unknown algorithms are rejected."""
+        from pyasync import Limiter
+
+        with self.assertRaises(ValueError):
+            Limiter(algorithm="vegas")
+
+
+class TestParallelMap(unittest.TestCase):
+    """Tests for parallel_map() function."""
+
+    def test_empty(self):
+        """Test parallel_map with no items."""
+        from pyasync import parallel_map
+
+        self.assertEqual(parallel_map(lambda x: x, []), [])
+
+    def test_preserves_order(self):
+        """Test that parallel_map preserves result order."""
+        from pyasync import parallel_map
+
+        def task(n):
+            time.sleep(0.05 * (3 - n))
+            return n * 10
+
+        self.assertEqual(parallel_map(task, [1, 2, 3]), [10, 20, 30])
+
+    def test_per_key_limit(self):
+        """Test that items sharing a key respect the limiter."""
+        from pyasync import parallel_map, Limiter
+
+        probes = {"a": _ConcurrencyProbe(), "b": _ConcurrencyProbe()}
+        limiter = Limiter(initial_limit=2, max_limit=2)
+        items = [("a", i) for i in range(5)] + [("b", i) for i in range(5)]
+
+        results = parallel_map(
+            lambda item: probes[item[0]].call(result=item[1]),
+            items,
+            key=lambda item: item[0],
+            limiter=limiter
+        )
+
+        self.assertEqual(results, [i for _, i in items])
+        self.assertEqual(probes["a"].peak, 2)
+        self.assertEqual(probes["b"].peak, 2)
+
+    def test_exception_propagation(self):
+        """Test that exceptions are propagated."""
+        from pyasync import parallel_map
+
+        def task(n):
+            if n == 2:
+                raise ValueError("bad item")
+            return n
+
+        with self.assertRaises(ValueError):
+            parallel_map(task, [1, 2, 3], key=lambda n: n % 2)
+
+
+def _square(n):
+    """Module-level helper for process tests."""
+    return n * n
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Tests for RateLimiter class."""
+
+    def test_burst_then_spacing(self):
+        """Test that a full bucket allows burst calls, then spaces them."""
+        from pyasync import RateLimiter
+
+        limiter = RateLimiter(rate=10, burst=3)
+
+        delays = [limiter.reserve() for _ in range(5)]
+
+        self.assertEqual(delays[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(delays[3], 0.1, delta=0.02)
+        self.assertAlmostEqual(delays[4], 0.2, delta=0.02)
+
+    def test_try_acquire(self):
+        """Test try_acquire only takes tokens that are available."""
+        from pyasync import RateLimiter
+
+        limiter = RateLimiter(rate=100, burst=1)
+
+        self.assertTrue(limiter.try_acquire())
+        self.assertFalse(limiter.try_acquire())
+        time.sleep(0.02)
+        self.assertTrue(limiter.try_acquire())
+
+    def test_invalid_rate(self):
+        """Test that non-positive rates are rejected."""
+        from pyasync import RateLimiter
+
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=0)
+
+    def test_named_registry(self):
+        """Test rate_limiter returns one shared limiter per name."""
+        from pyasync import rate_limiter
+
+        limiter = rate_limiter("test-registry", rate=5, burst=2)
+
+        self.assertIs(rate_limiter("test-registry"), limiter)
+        with self.assertRaises(KeyError):
+            rate_limiter("test-registry-missing")
+
+
+class TestRateLimitedCalls(unittest.TestCase):
+    """Tests for rate= on pyasync calls."""
+
+    def test_parallel_rate(self):
+        """Test that parallel spaces out task starts."""
+        from pyasync import parallel
+
+        starts = []
+        start = time.monotonic()
+        parallel(*[lambda: starts.append(time.monotonic() - start) for _ in range(5)], rate=20)
+
+        self.assertGreaterEqual(max(starts), 0.18)
+
+    def test_background_does_not_block(self):
+        """Test that background returns before its token is available."""
+        from pyasync import background, RateLimiter
+
+        limiter = RateLimiter(rate=5)
+        limiter.reserve()
+
+        start = time.monotonic()
+        task = background(lambda: 42, rate=limiter)
+        self.assertLess(time.monotonic() - start, 0.05)
+        self.assertFalse(task.done)
+        self.assertEqual(task.result(), 42)
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+    def test_cancel_waiting_task(self):
+        """Test that a task waiting for a token can be cancelled."""
+        from pyasync import background, RateLimiter
+
+        calls = []
+        limiter = RateLimiter(rate=10)
+        limiter.reserve()
+
+        task = background(lambda: calls.append(1), rate=limiter)
+        self.assertTrue(task.cancel())
+        time.sleep(0.2)
+
+        self.assertEqual(calls, [])
+
+    def test_shared_by_name(self):
+        """Test that calls sharing a named limiter share its budget."""
+        from pyasync import run, rate_limiter
+
+        rate_limiter("test-shared", rate=20)
+
+        start = time.monotonic()
+        for _ in range(4):
+            run(lambda: None, rate="test-shared")
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.13)
+
+    def test_cpu_run_rate(self):
+        """Test rate= on cpu_run."""
+        from pyasync import cpu_run
+        from functools import partial
+
+        self.assertEqual(cpu_run(partial(_square, 7), rate=100), 49)
+
+    def test_cpu_executor_rate(self):
+        """Test pool-level rate on CpuExecutor submit and map."""
+        from pyasync import CpuExecutor
+
+        start = time.monotonic()
+        with CpuExecutor(max_workers=2, rate=20) as executor:
+            task = executor.submit(_square, 3)
+            results = list(executor.map(_square, [1, 2, 3]))
+
+        self.assertEqual(task.result(), 9)
+        self.assertEqual(results, [1, 4, 9])
+        self.assertGreaterEqual(time.monotonic() - start, 0.13)
+
+
+if __name__ == '__main__':
+    unittest.main()
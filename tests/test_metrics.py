@@ -0,0 +1,195 @@
+"""Unit tests for pyasync.metrics module."""
+
+import unittest
+import threading
+import time
+
+
+def _sleep_then_return(n):
+    """Process helper."""
+    time.sleep(0.01)
+    return n
+
+
+def _fail_process():
+    raise ValueError("bad")
+
+
+class TestHistogram(unittest.TestCase):
+    """Tests for Histogram class."""
+
+    def test_quantiles(self):
+        """Test that quantiles are within the bucket precision."""
+        from pyasync.metrics import Histogram
+
+        histogram = Histogram()
+        for value in range(1, 1001):
+            histogram.record(value * 1000)  # 1us .. 1ms
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["count"], 1000)
+        self.assertAlmostEqual(snapshot["mean"], 500.5e-6, delta=1e-9)
+        self.assertAlmostEqual(snapshot["p50"], 500e-6, delta=500e-6 * 0.125)
+        self.assertAlmostEqual(snapshot["p99"], 990e-6, delta=990e-6 * 0.125)
+        self.assertAlmostEqual(snapshot["max"], 1e-3, delta=1e-3 * 0.125)
+
+    def test_merge(self):
+        """Test combining histograms."""
+        from pyasync.metrics import Histogram
+
+        a, b = Histogram(), Histogram()
+        a.record(10)
+        b.record(10 ** 9)
+        a.merge(b)
+
+        self.assertEqual(a.count, 2)
+        self.assertGreaterEqual(a.max, 10 ** 9)
+
+
+class TestPoolStats(unittest.TestCase):
+    """Tests for per-thread shards."""
+
+    def test_batches_folded(self):
+        """Test that buffered and folded samples are both counted."""
+        from concurrent.futures import ThreadPoolExecutor
+        from pyasync.metrics import _PoolStats, _FOLD_AT
+
+        pool = _PoolStats("test", ThreadPoolExecutor(1), "thread")
+        for i in range(_FOLD_AT + 10):
+            pool.record(1000, 2000, i % 2 == 0)
+
+        merged = pool.merged()
+        self.assertEqual(merged.completed + merged.failed, _FOLD_AT + 10)
+        self.assertEqual(merged.failed, (_FOLD_AT + 10) // 2)
+        self.assertEqual(merged.run.count, _FOLD_AT + 10)
+        self.assertEqual(merged.wait.total, 1000 * (_FOLD_AT + 10))
+
+    def test_exited_threads_merged(self):
+        """Test that shards of exited threads are folded into one."""
+        from concurrent.futures import ThreadPoolExecutor
+        from pyasync.metrics import _PoolStats
+
+        pool = _PoolStats("test", ThreadPoolExecutor(1), "thread")
+        for _ in range(50):
+            thread = threading.Thread(target=pool.record, args=(1000, 2000, True))
+            thread.start()
+            thread.join()
+
+        self.assertLess(len(pool.shards), 16)
+        self.assertEqual(pool.merged().completed, 50)
+        self.assertEqual(pool.shards, [])
+
+
+class TestStats(unittest.TestCase):
+    """Tests for stats() and prometheus()."""
+
+    def setUp(self):
+        import pyasync
+        pyasync.enable_metrics()
+
+    def tearDown(self):
+        import pyasync
+        pyasync.enable_metrics(False)
+
+    def test_disabled(self):
+        """Test that tasks are only counted while metrics are enabled."""
+        import pyasync
+
+        pyasync.enable_metrics(False)
+        pyasync.run(lambda: None)
+        before = pyasync.stats()["thread"]
+        pyasync.parallel(lambda: None, lambda: None)
+        after = pyasync.stats()["thread"]
+
+        self.assertEqual(after["submitted"], before["submitted"])
+        self.assertEqual(after["run"]["count"], before["run"]["count"])
+        self.assertEqual(after["workers"], 32)
+
+    def test_thread_pool(self):
+        """Test counts and histograms of the thread pool."""
+        import pyasync
+
+        pyasync.run(lambda: None)
+        before = pyasync.stats()["thread"]
+
+        pyasync.parallel(*[lambda: time.sleep(0.01) for _ in range(5)])
+
+        def failing():
+            raise ValueError("bad")
+
+        with self.assertRaises(ValueError):
+            pyasync.run(failing)
+
+        after = pyasync.stats()["thread"]
+        self.assertEqual(after["submitted"] - before["submitted"], 6)
+        self.assertEqual(after["completed"] - before["completed"], 5)
+        self.assertEqual(after["failed"] - before["failed"], 1)
+        self.assertEqual(after["workers"], 32)
+        self.assertGreaterEqual(after["run"]["max"], 0.01)
+        self.assertEqual(after["run"]["count"] - before["run"]["count"], 6)
+
+    def test_active_and_queue_depth(self):
+        """Test active workers while tasks are running."""
+        import pyasync
+
+        release = threading.Event()
+        started = threading.Barrier(3)
+
+        def blocked():
+            started.wait()
+            release.wait()
+
+        tasks = [pyasync.background(blocked) for _ in range(2)]
+        started.wait()
+        snapshot = pyasync.stats()["thread"]
+        release.set()
+        for task in tasks:
+            task.result()
+
+        self.assertGreaterEqual(snapshot["active"], 2)
+
+    def test_process_pool(self):
+        """Test timings measured in the worker processes."""
+        import pyasync
+        from functools import partial
+
+        pyasync.cpu_run(partial(_sleep_then_return, 0))
+        before = pyasync.stats()["process"]
+
+        task = pyasync.cpu_background(partial(_sleep_then_return, 7))
+        self.assertEqual(task.result(), 7)
+        with self.assertRaises(ValueError):
+            pyasync.cpu_run(_fail_process)
+
+        after = pyasync.stats()["process"]
+        self.assertEqual(after["completed"] - before["completed"], 1)
+        self.assertEqual(after["failed"] - before["failed"], 1)
+        self.assertGreaterEqual(after["run"]["max"], 0.01)
+
+    def test_cpu_task_state(self):
+        """Test that measured process tasks keep CpuTask semantics."""
+        import pyasync
+        from functools import partial
+
+        task = pyasync.cpu_background(partial(_sleep_then_return, 1))
+        task.result()
+
+        self.assertTrue(task.done)
+        self.assertFalse(task.running)
+        self.assertFalse(task.cancel())
+
+    def test_prometheus(self):
+        """Test the Prometheus text exposition."""
+        import pyasync
+
+        pyasync.run(lambda: None)
+        text = pyasync.prometheus()
+
+        self.assertIn('# TYPE pyasync_tasks_submitted_total counter', text)
+        self.assertIn('pyasync_workers{pool="thread"} 32', text)
+        self.assertIn('pyasync_task_run_seconds_bucket{pool="thread",le="+Inf"}', text)
+        self.assertTrue(text.endswith("\n"))
+
+
+if __name__ == '__main__':
+    unittest.main()
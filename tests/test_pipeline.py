@@ -0,0 +1,125 @@
+"""Unit tests for pyasync.pipeline module."""
+
+import unittest
+import threading
+import time
+
+
+def _square(n):
+    """Module-level stage function for process stages."""
+    return n * n
+
+
+class TestPipeline(unittest.TestCase):
+    """Tests for Pipeline class."""
+
+    def test_stages(self):
+        """Test items flowing through thread and process stages."""
+        from pyasync import Pipeline
+
+        pipeline = (
+            Pipeline()
+            .stage(lambda n: n + 1, threads=4)
+            .stage(_square, processes=2)
+            .stage(str, threads=2)
+        )
+
+        results = list(pipeline.run(range(20)))
+
+        self.assertEqual(sorted(results, key=int), [str((n + 1) ** 2) for n in range(20)])
+
+    def test_ordered(self):
+        """Test that ordered pipelines keep input order."""
+        from pyasync import Pipeline
+
+        def jitter(n):
+            time.sleep(0.001 * (n % 3))
+            return n
+
+        pipeline = Pipeline(ordered=True).stage(jitter, threads=4)
+
+        self.assertEqual(list(pipeline.run(range(30))), list(range(30)))
+
+    def test_backpressure(self):
+        """Test that a slow stage bounds the items read ahead."""
+        from pyasync import Pipeline
+
+        read = []
+
+        def source():
+            for n in range(100):
+                read.append(n)
+                yield n
+
+        pipeline = (
+            Pipeline(queue_size=2)
+            .stage(lambda n: n, threads=1)
+            .stage(lambda n: time.sleep(0.01) or n, threads=1)
+        )
+        results = pipeline.run(source())
+        next(results)
+        time.sleep(0.1)
+
+        # Two queues of 2, the output queue and a few items in hand
+        self.assertLess(len(read), 15)
+        results.close()
+
+    def test_stats(self):
+        """Test per-stage throughput and queue statistics."""
+        from pyasync import Pipeline
+
+        pipeline = (
+            Pipeline(queue_size=4)
+            .stage(lambda n: n, threads=2, name="fast")
+            .stage(lambda n: time.sleep(0.005) or n, threads=1, name="slow")
+        )
+        list(pipeline.run(range(20)))
+
+        fast, slow = pipeline.stats()
+        self.assertEqual((fast["name"], slow["name"]), ("fast", "slow"))
+        self.assertEqual(fast["items"], 20)
+        self.assertEqual(slow["items"], 20)
+        self.assertGreater(slow["utilization"], fast["utilization"])
+        self.assertGreater(slow["queue_mean"], fast["queue_mean"])
+        self.assertLessEqual(slow["queue_max"], 4)
+
+    def test_exception(self):
+        """Test that a failing stage stops the pipeline."""
+        from pyasync import Pipeline
+
+        def failing(n):
+            if n == 5:
+                raise ValueError("bad item")
+            return n
+
+        pipeline = Pipeline().stage(failing, threads=2)
+
+        with self.assertRaises(ValueError):
+            list(pipeline.run(range(100)))
+
+    def test_early_stop(self):
+        """Test that closing the iterator stops the workers."""
+        from pyasync import Pipeline
+
+        before = threading.active_count()
+        pipeline = Pipeline().stage(lambda n: n, threads=3)
+
+        for result in pipeline.run(range(10_000)):
+            if result >= 0:
+                break
+
+        time.sleep(0.2)
+        self.assertLessEqual(threading.active_count(), before)
+
+    def test_invalid_stages(self):
+        """Test stage validation."""
+        from pyasync import Pipeline
+
+        with self.assertRaises(ValueError):
+            Pipeline().stage(len, threads=2, processes=2)
+        with self.assertRaises(ValueError):
+            list(Pipeline().run([1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""Unit tests for pyasync.profiler module."""
+
+import unittest
+import time
+
+
+def _spin(seconds):
+    """Burn CPU in a recognizable function."""
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += 1
+    return total
+
+
+def _busy_process():
+    """Process helper."""
+    _spin(0.2)
+    return "done"
+
+
+def _failing_process():
+    _spin(0.1)
+    raise ValueError("bad")
+
+
+class TestProfiling(unittest.TestCase):
+    """Tests for the profiling() context manager."""
+
+    def test_thread_tasks_sampled(self):
+        """Test that thread tasks are sampled into the report."""
+        from pyasync import profiling, parallel
+
+        with profiling() as profile:
+            results = parallel(lambda: _spin(0.2), lambda: _spin(0.2))
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(profile.tasks, 2)
+        self.assertGreater(profile.samples, 0)
+        self.assertIn("_spin (test_profiler.py:", profile.collapsed())
+
+    def test_process_samples_merged(self):
+        """Test that samples from worker processes are shipped back."""
+        from functools import partial
+        from pyasync import profiling, cpu_parallel
+
+        with profiling() as profile:
+            results = cpu_parallel(_busy_process, partial(_spin, 0.2))
+
+        self.assertEqual(results[0], "done")
+        self.assertEqual(profile.tasks, 2)
+        lines = profile.collapsed().splitlines()
+        self.assertTrue(any(line.startswith("_busy_process (") and "_spin" in line for line in lines))
+
+    def test_failed_tasks_sampled(self):
+        """Test that a failing task still contributes samples."""
+        from pyasync import profiling, cpu_run
+
+        with profiling() as profile:
+            with self.assertRaises(ValueError):
+                cpu_run(_failing_process)
+        self.assertEqual(profile.tasks, 1)
+        self.assertIn("_failing_process", profile.collapsed())
+
+    def test_pstats_export(self):
+        """Test the pstats view and file export."""
+        import os
+        import pstats
+        import tempfile
+        from pyasync import profiling, run
+
+        with profiling() as profile:
+            run(lambda: _spin(0.2))
+
+        names = {name for _, _, name in profile.stats().stats}
+        self.assertIn("_spin", names)
+        spin = next(key for key in profile.stats().stats if key[2] == "_spin")
+        cc, nc, tottime, cumtime, callers = profile.stats().stats[spin]
+        self.assertGreater(cumtime, 0.05)
+        self.assertLessEqual(tottime, cumtime + 1e-9)
+        self.assertTrue(callers)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "out.pstats")
+            profile.dump_stats(path)
+            loaded = pstats.Stats(path)
+            self.assertIn(spin, loaded.stats)
+
+            folded = os.path.join(tmpdir, "out.folded")
+            profile.write_collapsed(folded)
+            with open(folded) as f:
+                self.assertEqual(f.read(), profile.collapsed())
+
+    def test_cpu_executor_map(self):
+        """Test that CpuExecutor.map tasks are profiled."""
+        from pyasync import profiling, CpuExecutor
+
+        with CpuExecutor(max_workers=2) as executor:
+            with profiling() as profile:
+                self.assertEqual(len(list(executor.map(_spin, [0.1, 0.1]))), 2)
+        self.assertEqual(profile.tasks, 2)
+
+    def test_not_active_outside_block(self):
+        """Test that tasks after the block are not profiled."""
+        from pyasync import profiling, run
+
+        with profiling() as profile:
+            pass
+        run(lambda: _spin(0.05))
+        self.assertEqual(profile.tasks, 0)
+
+    def test_profile_flag_prints_report(self):
+        """Test parallel(profile=True) printing a report."""
+        import contextlib
+        import io
+        from pyasync import parallel
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(len(parallel(lambda: _spin(0.1), profile=True)), 1)
+        self.assertIn("_spin", out.getvalue())
+
+    def test_invalid_interval(self):
+        """Test that a non-positive interval is rejected."""
+        from pyasync import profiling
+
+        with self.assertRaises(ValueError):
+            profiling(interval=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,267 @@
+"""Unit tests for pyasync.remote module."""
+
+import multiprocessing
+import os
+import signal
+import sys
+import time
+import unittest
+
+
+AUTHKEY = b"test-key"
+
+
+def _serve(addresses, slots, port=0):
+    """Worker daemon process: report the bound address, then serve."""
+    from pyasync.remote import WorkerServer
+
+    server = WorkerServer(("127.0.0.1", port), authkey=AUTHKEY, slots=slots)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    addresses.put((os.getpid(), server.address))
+    server.serve_forever()
+
+
+def _square(x):
+    return x * x
+
+
+def _daemon_pid(x):
+    """Return which daemon ran the task (the parent of its pool process)."""
+    time.sleep(0.05)
+    return os.getppid()
+
+
+def _slow_daemon_pid(x):
+    time.sleep(0.3)
+    return os.getppid()
+
+
+def _fail(x):
+    raise ValueError(f"bad {x}")
+
+
+def _refuse():
+    raise ImportError("only on the worker host")
+
+
+class _Unloadable:
+    """Result that pickles fine but cannot be loaded, like a worker-only class."""
+
+    def __reduce__(self):
+        return (_refuse, ())
+
+
+def _unloadable():
+    return _Unloadable()
+
+
+class _Daemons:
+    """Start worker daemons on localhost for a test."""
+
+    def __init__(self, count, slots=2):
+        # Spawned: a forked daemon inherits the test process's pools and threads
+        self.context = multiprocessing.get_context("spawn")
+        self.slots = slots
+        addresses = self.context.Queue()
+        self.processes = []
+        for _ in range(count):
+            process = self.context.Process(target=_serve, args=(addresses, slots))
+            process.start()
+            self.processes.append(process)
+        # Daemons report in any order
+        reported = dict(addresses.get(timeout=30) for _ in range(count))
+        self.addresses = [reported[process.pid] for process in self.processes]
+
+    def restart(self, index):
+        """Start a new daemon on a stopped one's port."""
+        addresses = self.context.Queue()
+        process = self.context.Process(
+            target=_serve, args=(addresses, self.slots, self.addresses[index][1])
+        )
+        process.start()
+        self.processes[index] = process
+        addresses.get(timeout=30)
+
+    def stop(self, *indexes):
+        for index in indexes:
+            self.processes[index].terminate()
+        for index in indexes:
+            self.processes[index].join(10)
+
+    def close(self):
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+            process.join(10)
+
+
+class TestRemoteCpuExecutor(unittest.TestCase):
+    """Tests for RemoteCpuExecutor class."""
+
+    def setUp(self):
+        self.daemons = _Daemons(2)
+        self.addCleanup(self.daemons.close)
+
+    def test_submit_and_wait_all(self):
+        """Test submitting tasks to remote workers."""
+        from pyasync import RemoteCpuExecutor
+
+        with RemoteCpuExecutor(self.daemons.addresses, authkey=AUTHKEY) as executor:
+            tasks = [executor.submit(_square, i) for i in range(10)]
+            self.assertEqual(tasks[3].result(timeout=10), 9)
+            self.assertEqual(executor.wait_all(timeout=10), [i * i for i in range(10)])
+
+    def test_map_ordered(self):
+        """Test that map returns results in order, with and without chunks."""
+        from pyasync import RemoteCpuExecutor
+
+        with RemoteCpuExecutor(self.daemons.addresses, authkey=AUTHKEY) as executor:
+            self.assertEqual(list(executor.map(_square, range(50))), [i * i for i in range(50)])
+            self.assertEqual(
+                list(executor.map(_square, range(50), chunksize=7)), [i * i for i in range(50)]
+            )
+
+    def test_load_balanced_across_workers(self):
+        """Test that tasks run on every worker."""
+        from pyasync import RemoteCpuExecutor
+
+        with RemoteCpuExecutor(self.daemons.addresses, authkey=AUTHKEY, prefetch=1) as executor:
+            daemons = set(executor.map(_daemon_pid, range(8)))
+        self.assertEqual(daemons, {process.pid for process in self.daemons.processes})
+
+    def test_exceptions_propagate(self):
+        """Test that a task's exception is raised by its result."""
+        from pyasync import RemoteCpuExecutor
+
+        with RemoteCpuExecutor(self.daemons.addresses, authkey=AUTHKEY) as executor:
+            task = executor.submit(_fail, 1)
+            with self.assertRaises(ValueError) as ctx:
+                task.result(timeout=10)
+            self.assertEqual(str(ctx.exception), "bad 1")
+            self.assertEqual(executor.submit(_square, 3).result(timeout=10), 9)
+
+    def test_unpicklable_task(self):
+        """Test that an unpicklable task fails at submit."""
+        from pyasync import RemoteCpuExecutor
+
+        with RemoteCpuExecutor(self.daemons.addresses, authkey=AUTHKEY) as executor:
+            with self.assertRaises(Exception):
+                executor.submit(lambda: 1)
+
+    def test_resubmits_from_dead_worker(self):
+        """Test that tasks of a worker that dies run on the others."""
+        from pyasync import RemoteCpuExecutor
+
+        with RemoteCpuExecutor(
+            self.daemons.addresses, authkey=AUTHKEY, prefetch=1, heartbeat=0.2
+        ) as executor:
+            tasks = [executor.submit(_slow_daemon_pid, i) for i in range(8)]
+            time.sleep(0.1)
+            self.daemons.stop(0)
+            results = executor.wait_all(timeout=30)
+            alive = [worker["alive"] for worker in executor.workers]
+
+        survivor = self.daemons.processes[1].pid
+        self.assertEqual(len(results), 8)
+        self.assertIn(survivor, results)
+        self.assertEqual(alive, [False, True])
+        self.assertTrue(all(task.done for task in tasks))
+
+    def test_all_workers_dead(self):
+        """Test that tasks fail once no worker is left."""
+        from pyasync import RemoteCpuExecutor
+
+        with RemoteCpuExecutor(
+            self.daemons.addresses, authkey=AUTHKEY, prefetch=1, heartbeat=0.2, max_resubmits=0
+        ) as executor:
+            tasks = [executor.submit(_slow_daemon_pid, i) for i in range(8)]
+            time.sleep(0.1)
+            self.daemons.stop(0, 1)
+            for task in tasks:
+                with self.assertRaises(ConnectionError):
+                    task.result(timeout=30)
+            with self.assertRaises(ConnectionError):
+                executor.submit(_square, 2)
+
+    def test_reconnects_lost_worker(self):
+        """Test that a worker that comes back gets tasks again."""
+        from pyasync import RemoteCpuExecutor
+
+        with RemoteCpuExecutor(
+            self.daemons.addresses, authkey=AUTHKEY, heartbeat=0.2, max_backoff=0.5
+        ) as executor:
+            self.daemons.stop(0)
+            deadline = time.monotonic() + 30
+            while executor.workers[0]["alive"] and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.assertFalse(executor.workers[0]["alive"])
+
+            self.daemons.restart(0)
+            while not executor.workers[0]["alive"] and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.assertTrue(executor.workers[0]["alive"])
+
+            results = list(executor.map(_daemon_pid, range(8), timeout=30))
+
+        self.assertIn(self.daemons.processes[0].pid, results)
+
+    def test_unloadable_result(self):
+        """Test that a result the client cannot load fails only its task."""
+        from pyasync import RemoteCpuExecutor
+
+        with RemoteCpuExecutor(self.daemons.addresses, authkey=AUTHKEY) as executor:
+            task = executor.submit(_unloadable)
+            with self.assertRaises(RuntimeError):
+                task.result(timeout=10)
+            self.assertEqual(executor.submit(_square, 3).result(timeout=10), 9)
+            self.assertEqual([worker["alive"] for worker in executor.workers], [True, True])
+
+
+class TestConnection(unittest.TestCase):
+    """Tests for connecting to workers."""
+
+    def test_wrong_authkey(self):
+        """Test that a wrong key is rejected."""
+        from pyasync import RemoteCpuExecutor
+
+        daemons = _Daemons(1, slots=1)
+        self.addCleanup(daemons.close)
+        with self.assertRaises(ConnectionError):
+            with RemoteCpuExecutor(daemons.addresses, authkey=b"wrong"):
+                pass
+
+        # The daemon keeps serving other clients
+        with RemoteCpuExecutor(daemons.addresses, authkey=AUTHKEY) as executor:
+            self.assertEqual(executor.submit(_square, 4).result(timeout=10), 16)
+
+    def test_unreachable(self):
+        """Test that no reachable worker raises ConnectionError."""
+        import socket
+        from pyasync import RemoteCpuExecutor
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        with self.assertRaises(ConnectionError):
+            with RemoteCpuExecutor([f"127.0.0.1:{port}"], authkey=AUTHKEY):
+                pass
+
+    def test_validation(self):
+        """Test argument validation."""
+        from pyasync import RemoteCpuExecutor
+
+        with self.assertRaises(ValueError):
+            RemoteCpuExecutor([], authkey=AUTHKEY)
+        with self.assertRaises(ValueError):
+            RemoteCpuExecutor(["localhost:1"], authkey=AUTHKEY, prefetch=0)
+
+    def test_submit_requires_with(self):
+        """Test that submit outside the with block raises."""
+        from pyasync import RemoteCpuExecutor
+
+        with self.assertRaises(RuntimeError):
+            RemoteCpuExecutor(["localhost:1"], authkey=AUTHKEY).submit(_square, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
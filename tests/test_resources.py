@@ -0,0 +1,166 @@
+"""Unit tests for pyasync.resources module."""
+
+import time
+import unittest
+
+
+def _span(seconds):
+    """Process helper returning when it started and finished."""
+    start = time.time()
+    time.sleep(seconds)
+    return start, time.time()
+
+
+def _overlap(a, b):
+    return a[0] < b[1] and b[0] < a[1]
+
+
+class TestParsing(unittest.TestCase):
+    """Tests for resource amounts."""
+
+    def test_sizes(self):
+        """Test numbers and binary size suffixes."""
+        from pyasync.resources import parse_amount
+
+        self.assertEqual(parse_amount(2), 2.0)
+        self.assertEqual(parse_amount(0.5), 0.5)
+        self.assertEqual(parse_amount("512"), 512.0)
+        self.assertEqual(parse_amount("1K"), 1024.0)
+        self.assertEqual(parse_amount("8G"), 8 * 1024 ** 3)
+        self.assertEqual(parse_amount("8GiB"), 8 * 1024 ** 3)
+        self.assertEqual(parse_amount("1.5 mb"), 1.5 * 1024 ** 2)
+
+    def test_invalid(self):
+        """Test that malformed and negative amounts are rejected."""
+        from pyasync.resources import parse_amount
+
+        for value in ("lots", "8X", -1, "1G2"):
+            with self.assertRaises(ValueError):
+                parse_amount(value)
+
+
+class TestResourcePool(unittest.TestCase):
+    """Tests for ResourcePool admission."""
+
+    def test_cost_validation(self):
+        """Test default cost and budget checks."""
+        from pyasync import ResourcePool
+
+        pool = ResourcePool({"cpus": 4, "mem": "1G"})
+        self.assertEqual(pool.cost(None), {"cpus": 1.0})
+        self.assertEqual(pool.cost({"mem": "1M"}), {"cpus": 1.0, "mem": 1024.0 ** 2})
+        with self.assertRaises(ValueError):
+            pool.cost({"gpus": 1})
+        with self.assertRaises(ValueError):
+            pool.cost({"mem": "2G"})
+
+    def test_backfill_without_starving_head(self):
+        """Test that small tasks backfill, but released resources wait for the big one."""
+        from concurrent.futures import Future
+        from pyasync import ResourcePool
+
+        pool = ResourcePool({"cpus": 4})
+        started = []
+        inner = {}
+
+        def start(name):
+            started.append(name)
+            inner[name] = Future()
+            return inner[name]
+
+        pool.submit({"cpus": 2}, lambda: start("a"))
+        pool.submit({"cpus": 1}, lambda: start("b"))
+        big = pool.submit({"cpus": 3}, lambda: start("big"))
+        pool.submit({"cpus": 1}, lambda: start("c"))
+        self.assertEqual(started, ["a", "b", "c"])
+        self.assertEqual(pool.pending, 1)
+
+        # Freed cpus are held for the big task instead of backfilling "d"
+        pool.submit({"cpus": 1}, lambda: start("d"))
+        inner["a"].set_result("a")
+        self.assertEqual(started, ["a", "b", "c"])
+        inner["b"].set_result("b")
+        self.assertEqual(started, ["a", "b", "c", "big"])
+        inner["c"].set_result("c")
+        self.assertEqual(started, ["a", "b", "c", "big", "d"])
+
+        inner["big"].set_result(42)
+        self.assertEqual(big.result(), 42)
+
+    def test_cancel_waiting(self):
+        """Test that a cancelled waiting task never starts."""
+        from concurrent.futures import Future
+        from pyasync import ResourcePool
+
+        pool = ResourcePool({"cpus": 1})
+        first = Future()
+        started = []
+        pool.submit({"cpus": 1}, lambda: first)
+        waiting = pool.submit({"cpus": 1}, lambda: started.append(True) or Future())
+        self.assertTrue(waiting.cancel())
+        first.set_result(None)
+        self.assertEqual(started, [])
+        self.assertEqual(pool.available, {"cpus": 1.0})
+
+
+class TestCpuExecutorResources(unittest.TestCase):
+    """Tests for CpuExecutor(resources=...)."""
+
+    def test_memory_budget_serializes_big_tasks(self):
+        """Test that tasks exceeding the memory budget together never overlap."""
+        from pyasync import CpuExecutor
+
+        with CpuExecutor(max_workers=3, resources={"cpus": 3, "mem": "1G"}) as executor:
+            big = [executor.submit_with(_span, (0.2,), resources={"mem": "600M"}) for _ in range(2)]
+            small = executor.submit_with(_span, (0.05,), resources={"mem": "100M"})
+            spans = [task.result() for task in big]
+            small_span = small.result()
+            self.assertEqual(executor.resources.available, {"cpus": 3.0, "mem": 1024.0 ** 3})
+
+        self.assertFalse(_overlap(spans[0], spans[1]))
+        # The small task fits next to a big one
+        self.assertTrue(_overlap(small_span, spans[0]))
+
+    def test_default_budget(self):
+        """Test that declaring resources without a budget uses the worker count."""
+        from pyasync import CpuExecutor
+
+        with CpuExecutor(max_workers=2) as executor:
+            tasks = [executor.submit_with(_span, (0.1,), resources={"cpus": 2}) for _ in range(2)]
+            spans = [task.result() for task in tasks]
+            self.assertEqual(executor.resources.budget["cpus"], 2.0)
+
+        self.assertFalse(_overlap(spans[0], spans[1]))
+
+    def test_default_budget_counts_running_tasks(self):
+        """Test that tasks started before the default budget existed are charged to it."""
+        from pyasync import CpuExecutor
+
+        with CpuExecutor(max_workers=2) as executor:
+            first = executor.submit(_span, 0.3)
+            time.sleep(0.1)
+            second = executor.submit_with(_span, (0.1,), resources={"cpus": 2})
+            spans = [first.result(), second.result()]
+
+        self.assertFalse(_overlap(spans[0], spans[1]))
+
+    def test_function_keywords_not_shadowed(self):
+        """Test that submit() passes a resources keyword through to the function."""
+        from pyasync import CpuExecutor
+
+        with CpuExecutor(max_workers=1) as executor:
+            task = executor.submit(dict, resources="gpu")
+            self.assertEqual(task.result(), {"resources": "gpu"})
+            self.assertIsNone(executor.resources)
+
+    def test_impossible_task_rejected(self):
+        """Test that a task bigger than the whole budget fails at submit_with()."""
+        from pyasync import CpuExecutor
+
+        with CpuExecutor(max_workers=1, resources={"cpus": 1}) as executor:
+            with self.assertRaises(ValueError):
+                executor.submit_with(_span, (0,), resources={"cpus": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
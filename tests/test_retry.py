@@ -0,0 +1,232 @@
+"""Unit tests for pyasync.retry module."""
+
+import unittest
+import os
+import tempfile
+import threading
+import time
+
+
+class _Flaky:
+    """Callable that fails a given number of times before succeeding."""
+
+    def __init__(self, failures, exc_type=ConnectionError):
+        self.failures = failures
+        self.exc_type = exc_type
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+            call = self.calls
+        if call <= self.failures:
+            raise self.exc_type(f"failure {call}")
+        return "ok"
+
+
+def _fail_once(marker_dir):
+    """Process helper: fails on the first call, succeeds afterwards."""
+    marker = os.path.join(marker_dir, "attempted")
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        raise ConnectionError("first attempt")
+    return "recovered"
+
+
+def _raise_key_error():
+    raise KeyError("not a dependency failure")
+
+
+class TestRetry(unittest.TestCase):
+    """Tests for Retry policy."""
+
+    def test_retries_until_success(self):
+        """Test that failed attempts are retried."""
+        from pyasync import run, Retry
+
+        fn = _Flaky(failures=2)
+
+        result = run(fn, retry=Retry(max_attempts=3, backoff=0.01))
+
+        self.assertEqual(result, "ok")
+        self.assertEqual(fn.calls, 3)
+
+    def test_gives_up_after_max_attempts(self):
+        """Test that the last exception propagates once attempts run out."""
+        from pyasync import background, Retry
+
+        fn = _Flaky(failures=5)
+        task = background(fn, retry=Retry(max_attempts=3, backoff=0.01))
+
+        with self.assertRaisesRegex(ConnectionError, "failure 3"):
+            task.result()
+        self.assertEqual(fn.calls, 3)
+
+    def test_non_retryable_exception(self):
+        """Test that exceptions outside retry_on are not retried."""
+        from pyasync import run, Retry
+
+        fn = _Flaky(failures=1, exc_type=KeyError)
+
+        with self.assertRaises(KeyError):
+            run(fn, retry=Retry(backoff=0.01, retry_on=(ConnectionError,)))
+        self.assertEqual(fn.calls, 1)
+
+    def test_retry_if(self):
+        """Test the retry_if predicate filters exceptions."""
+        from pyasync import run, Retry
+
+        fn = _Flaky(failures=1)
+        policy = Retry(backoff=0.01, retry_if=lambda e: "retry me" in str(e))
+
+        with self.assertRaises(ConnectionError):
+            run(fn, retry=policy)
+        self.assertEqual(fn.calls, 1)
+
+    def test_backoff_schedule(self):
+        """Test exponential backoff without jitter."""
+        from pyasync import Retry
+
+        policy = Retry(backoff=0.1, multiplier=2.0, max_backoff=0.3, jitter=None)
+
+        self.assertEqual([policy.delay(n) for n in (1, 2, 3)], [0.1, 0.2, 0.3])
+
+    def test_jitter_bounds(self):
+        """Test that jittered delays stay within the computed wait."""
+        from pyasync import Retry
+
+        full = Retry(backoff=1.0, jitter="full")
+        equal = Retry(backoff=1.0, jitter="equal")
+
+        for _ in range(50):
+            self.assertTrue(0.0 <= full.delay(1) <= 1.0)
+            self.assertTrue(0.5 <= equal.delay(1) <= 1.0)
+
+    def test_parallel_retry(self):
+        """Test retry on parallel."""
+        from pyasync import parallel, Retry
+
+        flaky = _Flaky(failures=1)
+
+        results = parallel(flaky, lambda: "stable", retry=Retry(backoff=0.01))
+
+        self.assertEqual(results, ["ok", "stable"])
+
+    def test_cpu_run_retry(self):
+        """Test retry on cpu_run."""
+        from pyasync import cpu_run, Retry
+        from functools import partial
+
+        with tempfile.TemporaryDirectory() as marker_dir:
+            result = cpu_run(partial(_fail_once, marker_dir), retry=Retry(backoff=0.01))
+
+        self.assertEqual(result, "recovered")
+
+    def test_cpu_executor_retry(self):
+        """Test executor-level retry on CpuExecutor."""
+        from pyasync import CpuExecutor, Retry
+
+        with tempfile.TemporaryDirectory() as marker_dir:
+            with CpuExecutor(max_workers=1, retry=Retry(backoff=0.01)) as executor:
+                task = executor.submit(_fail_once, marker_dir)
+            self.assertEqual(task.result(), "recovered")
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Tests for CircuitBreaker class."""
+
+    def test_opens_after_threshold(self):
+        """Test that the circuit opens and fails fast."""
+        from pyasync import run, CircuitBreaker, CircuitOpenError
+
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60.0)
+        fn = _Flaky(failures=10)
+
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                run(fn, breaker=breaker)
+
+        self.assertEqual(breaker.state, "open")
+        with self.assertRaises(CircuitOpenError):
+            run(fn, breaker=breaker)
+        self.assertEqual(fn.calls, 2)
+
+    def test_half_open_recovery(self):
+        """Test that a trial call after the timeout closes the circuit."""
+        from pyasync import run, CircuitBreaker
+
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+        fn = _Flaky(failures=1)
+
+        with self.assertRaises(ConnectionError):
+            run(fn, breaker=breaker)
+        self.assertEqual(breaker.state, "open")
+
+        time.sleep(0.06)
+        self.assertEqual(breaker.state, "half-open")
+        self.assertEqual(run(fn, breaker=breaker), "ok")
+        self.assertEqual(breaker.state, "closed")
+
+    def test_half_open_failure_reopens(self):
+        """Test that a failed trial call opens the circuit again."""
+        from pyasync import CircuitBreaker
+
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=0.01)
+        for _ in range(3):
+            breaker.record_failure()
+
+        time.sleep(0.02)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_failure()
+
+        self.assertEqual(breaker.state, "open")
+
+    def test_unrelated_errors_are_neutral(self):
+        """Test that errors outside failure_on neither count nor close the circuit."""
+        from pyasync import run, CircuitBreaker
+
+        breaker = CircuitBreaker(
+            failure_threshold=2, recovery_timeout=0.01, failure_on=(ConnectionError,)
+        )
+        breaker.record_failure()
+        with self.assertRaises(KeyError):
+            run(_raise_key_error, breaker=breaker)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+
+        time.sleep(0.02)
+        with self.assertRaises(KeyError):
+            run(_raise_key_error, breaker=breaker)
+        self.assertEqual(breaker.state, "half-open")
+        # The neutral call gave its trial slot back
+        self.assertTrue(breaker.allow())
+
+    def test_named_breakers_are_per_key(self):
+        """Test that breaker names give independent circuits."""
+        from pyasync import run, circuit_breaker, CircuitOpenError
+
+        circuit_breaker("test-host-a", failure_threshold=1)
+
+        with self.assertRaises(ConnectionError):
+            run(_Flaky(failures=1), breaker="test-host-a")
+
+        with self.assertRaises(CircuitOpenError):
+            run(lambda: "unreachable", breaker="test-host-a")
+        self.assertEqual(run(lambda: "ok", breaker="test-host-b"), "ok")
+
+    def test_retry_does_not_hammer_open_circuit(self):
+        """Test that retries stop as soon as the circuit opens."""
+        from pyasync import run, Retry, CircuitBreaker, CircuitOpenError
+
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60.0)
+        fn = _Flaky(failures=10)
+
+        with self.assertRaises(CircuitOpenError):
+            run(fn, retry=Retry(max_attempts=5, backoff=0.01), breaker=breaker)
+        self.assertEqual(fn.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
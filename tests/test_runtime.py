@@ -170,6 +170,11 @@ def _cpu_return_dict(n):
     return {"sum": sum(range(n)), "count": n}
 
 
+def _cpu_reciprocal(n):
+    """Fails for zero."""
+    return 1 / n
+
+
 class TestCpuParallel(unittest.TestCase):
     """Tests for cpu_parallel() function."""
     
@@ -418,6 +423,121 @@ class TestCpuExecutor(unittest.TestCase):
         
         with self.assertRaises(RuntimeError):
             executor.submit(_cpu_compute, 100)
+    
+    def test_submit_many(self):
+        """Test submit_many on the executor."""
+        from pyasync import CpuExecutor
+        
+        with CpuExecutor(max_workers=2) as executor:
+            batch = executor.submit_many(_cpu_compute, range(50), chunksize=8)
+            results = batch.results()
+        
+        self.assertEqual(results, [_cpu_compute(n) for n in range(50)])
+        self.assertEqual(len(batch), 50)
+        self.assertTrue(batch.done)
+    
+    def test_retain_tasks_false(self):
+        """Test that finished tasks and batches are dropped without retain_tasks."""
+        from pyasync import CpuExecutor
+        
+        with CpuExecutor(max_workers=2, retain_tasks=False) as executor:
+            tasks = [executor.submit(_cpu_compute, n) for n in range(10)]
+            batch = executor.submit_many(_cpu_compute, range(10))
+            self.assertEqual([task.result() for task in tasks][-1], _cpu_compute(9))
+            batch.wait()
+            
+            self.assertEqual(executor.tasks, [])
+            self.assertEqual(executor._batches, {})
+
+
+class TestSubmitMany(unittest.TestCase):
+    """Tests for submit_many() and TaskBatch."""
+    
+    def test_thread_results_in_order(self):
+        """Test that results come back in item order."""
+        from pyasync import submit_many
+        
+        batch = submit_many(lambda n: n * 2, range(1000), chunksize=7)
+        
+        self.assertEqual(batch.results(timeout=10), [n * 2 for n in range(1000)])
+        self.assertEqual(batch.completed, 1000)
+        self.assertEqual(batch.result(999), 1998)
+    
+    def test_process_backend(self):
+        """Test submit_many on the process pool."""
+        from pyasync import submit_many
+        
+        batch = submit_many(_cpu_compute, [10, 20, 30], backend="process")
+        self.assertEqual(batch.results(), [_cpu_compute(n) for n in (10, 20, 30)])
+    
+    def test_per_item_failures(self):
+        """Test that a failing item does not fail the rest of its chunk."""
+        from pyasync import submit_many
+        
+        batch = submit_many(_cpu_reciprocal, [1, 0, 2, 0], backend="process", chunksize=4)
+        
+        self.assertEqual(batch.result(2), 0.5)
+        self.assertIsInstance(batch.exception(1), ZeroDivisionError)
+        self.assertIsNone(batch.exception(0))
+        self.assertEqual(sorted(batch.exceptions()), [1, 3])
+        with self.assertRaises(ZeroDivisionError):
+            batch.result(3)
+        with self.assertRaises(ZeroDivisionError):
+            batch.results()
+        results = batch.results(return_exceptions=True)
+        self.assertEqual(results[0], 1.0)
+        self.assertIsInstance(results[1], ZeroDivisionError)
+    
+    def test_wait_timeout(self):
+        """Test waiting on an unfinished batch."""
+        from pyasync import submit_many
+        
+        release = threading.Event()
+        batch = submit_many(lambda n: release.wait(5), range(4), chunksize=2)
+        
+        self.assertFalse(batch.wait(timeout=0.05))
+        with self.assertRaises(TimeoutError):
+            batch.result(0, timeout=0.05)
+        release.set()
+        self.assertTrue(batch.wait(timeout=5))
+        self.assertEqual(batch.results(), [True] * 4)
+    
+    def test_cancel(self):
+        """Test that queued chunks can be cancelled."""
+        from concurrent.futures import CancelledError
+        from functools import partial
+        from pyasync import CpuExecutor
+        
+        with CpuExecutor(max_workers=1) as executor:
+            batch = executor.submit_many(partial(_cpu_slow_task, 0.2), range(20), chunksize=1)
+            self.assertTrue(batch.cancel())
+            batch.wait(timeout=10)
+        
+        self.assertTrue(batch.done)
+        with self.assertRaises(CancelledError):
+            batch.results()
+    
+    def test_empty(self):
+        """Test an empty batch."""
+        from pyasync import submit_many
+        
+        batch = submit_many(str, [])
+        self.assertTrue(batch.done)
+        self.assertEqual(batch.results(), [])
+    
+    def test_invalid_arguments(self):
+        """Test unknown backends and coroutine functions."""
+        from pyasync import submit_many
+        
+        async def coro(item):
+            return item
+        
+        with self.assertRaises(ValueError):
+            submit_many(str, [1], backend="gpu")
+        with self.assertRaises(ValueError):
+            submit_many(coro, [1])
+        with self.assertRaises(ValueError):
+            submit_many(str, [1], chunksize=0)
 
 
 if __name__ == '__main__':
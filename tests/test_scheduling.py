@@ -0,0 +1,235 @@
+"""Unit tests for pyasync.scheduling module and the timer wheel."""
+
+import unittest
+import threading
+import time
+from datetime import datetime
+
+
+class TestTimerWheel(unittest.TestCase):
+    """Tests for the internal timer wheel."""
+
+    def test_fires_in_deadline_order(self):
+        """Test that timers fire in order, never early."""
+        from pyasync import _timer
+
+        fired = []
+        done = threading.Event()
+        start = time.monotonic()
+
+        for delay in (0.08, 0.02, 0.05, 0.0):
+            _timer.call_later(delay, lambda d=delay: fired.append((d, time.monotonic() - start)))
+        _timer.call_later(0.1, done.set)
+
+        self.assertTrue(done.wait(2.0))
+        self.assertEqual([d for d, _ in fired], [0.0, 0.02, 0.05, 0.08])
+        for delay, elapsed in fired:
+            self.assertGreaterEqual(elapsed, delay)
+
+    def test_cancel(self):
+        """Test that cancelled timers do not fire."""
+        from pyasync import _timer
+
+        fired = []
+        done = threading.Event()
+
+        _timer.call_later(0.01, fired.append, "cancelled").cancel()
+        _timer.call_later(0.02, done.set)
+
+        self.assertTrue(done.wait(1.0))
+        self.assertEqual(fired, [])
+
+    def test_wheel_levels(self):
+        """Test timers spanning several wheel levels and the overflow list."""
+        from pyasync._timer import _Wheel, TimerHandle
+
+        wheel = _Wheel(0.0)
+        ticks = [0, 1, 63, 64, 65, 4095, 4096, 300_000, 20_000_000]
+        for tick in ticks:
+            wheel.add(TimerHandle(0.0, tick, None, (tick,)))
+
+        fired = {}
+        while True:
+            due = wheel.next_due()
+            if due is None:
+                break
+            for handle in wheel.advance(due):
+                fired[handle.args[0]] = due
+
+        self.assertEqual(fired, {tick: tick for tick in ticks})
+
+
+class TestSchedule(unittest.TestCase):
+    """Tests for schedule()."""
+
+    def test_delay(self):
+        """Test running once after a delay."""
+        from pyasync import schedule
+
+        start = time.monotonic()
+        task = schedule(lambda: time.monotonic() - start, delay=0.05)
+
+        self.assertGreaterEqual(task.result(timeout=1.0), 0.05)
+
+    def test_cancel_before_firing(self):
+        """Test that cancelling the task prevents the run."""
+        from pyasync import schedule
+
+        calls = []
+        task = schedule(lambda: calls.append(1), delay=0.05)
+
+        self.assertTrue(task.cancel())
+        time.sleep(0.1)
+        self.assertEqual(calls, [])
+
+
+class TestEvery(unittest.TestCase):
+    """Tests for every() and ScheduledJob."""
+
+    def test_periodic_runs(self):
+        """Test that a job runs repeatedly until cancelled."""
+        from pyasync import every
+
+        calls = []
+        job = every(0.02, lambda: calls.append(time.monotonic()))
+
+        time.sleep(0.15)
+        job.cancel()
+        count = len(calls)
+        time.sleep(0.05)
+
+        self.assertGreaterEqual(count, 4)
+        self.assertEqual(len(calls), count)
+        self.assertIsNone(job.next_run)
+
+    def test_waiting_uses_no_threads(self):
+        """Test that many idle schedules do not occupy threads."""
+        from pyasync import every
+
+        before = threading.active_count()
+        jobs = [every(60.0, lambda: None) for _ in range(200)]
+
+        self.assertLessEqual(threading.active_count(), before + 1)
+        for job in jobs:
+            job.cancel()
+
+    def test_skip_overlapping(self):
+        """Test that runs due during a slow run are skipped."""
+        from pyasync import every
+
+        running = []
+        overlaps = []
+
+        def slow():
+            if running:
+                overlaps.append(1)
+            running.append(1)
+            time.sleep(0.05)
+            running.pop()
+
+        job = every(0.01, slow, delay=0.0)
+        time.sleep(0.2)
+        job.cancel()
+
+        self.assertEqual(overlaps, [])
+        self.assertGreater(job.stats()["skipped"], 0)
+
+    def test_coalesce(self):
+        """Test that missed runs collapse into one immediate run."""
+        from pyasync import every
+
+        release = threading.Event()
+        calls = []
+
+        def first_blocks():
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                release.wait()
+
+        job = every(0.01, first_blocks, delay=0.0, overlap="coalesce")
+        time.sleep(0.1)
+        release.set()
+        time.sleep(0.005)
+        job.cancel()
+
+        # The blocked run plus one coalesced run, not one per missed tick
+        self.assertLessEqual(len(calls), 3)
+        self.assertGreaterEqual(len(calls), 2)
+
+    def test_failures_do_not_stop_job(self):
+        """Test that a failing run does not cancel the job."""
+        from pyasync import every
+
+        def failing():
+            raise ValueError("flaky")
+
+        with self.assertLogs("pyasync.scheduling", level="ERROR"):
+            job = every(0.02, failing, delay=0.0)
+            time.sleep(0.1)
+            job.cancel()
+            time.sleep(0.02)
+
+        self.assertGreaterEqual(job.stats()["failures"], 2)
+        self.assertIsInstance(job.last_exception, ValueError)
+
+    def test_invalid_arguments(self):
+        """Test argument validation."""
+        from pyasync import every
+
+        with self.assertRaises(ValueError):
+            every(0, lambda: None)
+        with self.assertRaises(ValueError):
+            every(1.0, lambda: None, overlap="queue")
+
+
+class TestCron(unittest.TestCase):
+    """Tests for cron expressions."""
+
+    def test_next_after(self):
+        """Test computing the next matching minute."""
+        from pyasync.scheduling import _CronSpec
+
+        moment = datetime(2024, 1, 5, 10, 7, 30)  # Friday
+
+        self.assertEqual(_CronSpec("*/15 * * * *").next_after(moment),
+                         datetime(2024, 1, 5, 10, 15))
+        self.assertEqual(_CronSpec("0 3 * * *").next_after(moment),
+                         datetime(2024, 1, 6, 3, 0))
+        self.assertEqual(_CronSpec("30 9 * * mon-fri").next_after(moment),
+                         datetime(2024, 1, 8, 9, 30))
+        self.assertEqual(_CronSpec("0 0 1 feb *").next_after(moment),
+                         datetime(2024, 2, 1, 0, 0))
+        self.assertEqual(_CronSpec("0 12 29 2 *").next_after(moment),
+                         datetime(2024, 2, 29, 12, 0))
+        self.assertEqual(_CronSpec("0 0 * * 7").next_after(moment),
+                         datetime(2024, 1, 7, 0, 0))
+
+    def test_day_or_weekday(self):
+        """Test that restricted day and weekday fields match either."""
+        from pyasync.scheduling import _CronSpec
+
+        moment = datetime(2024, 1, 5, 10, 7)  # Friday the 5th
+
+        self.assertEqual(_CronSpec("0 0 15 * sat").next_after(moment),
+                         datetime(2024, 1, 6, 0, 0))
+
+    def test_invalid_expressions(self):
+        """Test that invalid expressions are rejected."""
+        from pyasync import cron
+
+        for expression in ("* * * *", "60 * * * *", "* * 0 * *", "*/0 * * * *"):
+            with self.assertRaises(ValueError):
+                cron(expression, lambda: None)
+
+    def test_schedules_job(self):
+        """Test that cron() schedules the next matching minute."""
+        from pyasync import cron
+
+        job = cron("* * * * *", lambda: None)
+
+        self.assertLessEqual(job.next_run, 60.0)
+        job.cancel()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""Unit tests for pyasync.streaming module."""
+
+import os
+import tempfile
+import time
+import unittest
+
+
+def _count(n):
+    """Generator helper."""
+    for i in range(n):
+        yield i
+
+
+def _tracked(path, n=None):
+    """Generator recording how many items it produced, and whether it was closed."""
+    i = 0
+    try:
+        while n is None or i < n:
+            with open(path, "w") as f:
+                f.write(str(i))
+            yield i
+            i += 1
+    finally:
+        with open(path, "a") as f:
+            f.write(" closed")
+
+
+def _failing(n):
+    yield from range(n)
+    raise ValueError("bad record")
+
+
+def _read(path, timeout=10.0):
+    """Wait for the producer to write its state file."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if os.path.exists(path):
+            with open(path) as f:
+                content = f.read()
+            if content:
+                return content
+        time.sleep(0.01)
+    return ""
+
+
+class TestCpuStream(unittest.TestCase):
+    """Tests for cpu_stream() and CpuExecutor.submit_stream()."""
+
+    def _wait_closed(self, path):
+        deadline = time.monotonic() + 10
+        while not _read(path).endswith("closed") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(_read(path).endswith("closed"))
+
+    def test_items_in_order(self):
+        """Test that every item arrives, in order."""
+        from pyasync import cpu_stream
+
+        stream = cpu_stream(_count, 10_000, chunksize=128)
+        self.assertEqual(list(stream), list(range(10_000)))
+        self.assertTrue(stream.done)
+        self.assertEqual(stream.received, 10_000)
+
+    def test_flow_control(self):
+        """Test that the producer waits for a slow consumer."""
+        from pyasync import cpu_stream
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "state")
+            with cpu_stream(_tracked, path, chunksize=10, window=2) as stream:
+                self.assertEqual(next(stream), 0)
+                time.sleep(0.3)
+                produced = int(_read(path).split()[0])
+                # The chunk being consumed, two in flight and one being filled
+                self.assertLess(produced, 50)
+            self._wait_closed(path)
+
+    def test_close_stops_producer(self):
+        """Test that closing the stream closes the generator in the worker."""
+        from pyasync import cpu_stream
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "state")
+            stream = cpu_stream(_tracked, path, chunksize=4, window=1)
+            for item in stream:
+                if item == 5:
+                    break
+            stream.close()
+            self._wait_closed(path)
+            self.assertTrue(stream.done)
+            self.assertEqual(list(stream), [])
+
+    def test_exception_after_items(self):
+        """Test that the generator's exception follows the items sent before it."""
+        from pyasync import cpu_stream
+
+        items = []
+        with self.assertRaises(ValueError):
+            for item in cpu_stream(_failing, 5, chunksize=2):
+                items.append(item)
+        self.assertEqual(items, [0, 1, 2, 3, 4])
+
+    def test_executor_submit_stream(self):
+        """Test CpuExecutor.submit_stream()."""
+        from pyasync import CpuExecutor
+
+        with CpuExecutor(max_workers=2) as executor:
+            first = executor.submit_stream(_count, 100)
+            second = executor.submit_stream(_count, n=50)
+            self.assertEqual(sum(first), sum(range(100)))
+            self.assertEqual(list(second), list(range(50)))
+
+    def test_invalid_arguments(self):
+        """Test that a non-positive chunksize or window is rejected."""
+        from pyasync import cpu_stream
+
+        with self.assertRaises(ValueError):
+            cpu_stream(_count, 10, chunksize=0)
+        with self.assertRaises(ValueError):
+            cpu_stream(_count, 10, window=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
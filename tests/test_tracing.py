@@ -0,0 +1,200 @@
+"""Unit tests for pyasync.tracing module."""
+
+import contextvars
+import os
+import unittest
+
+import pyasync
+
+
+request_id = contextvars.ContextVar('test_request_id', default=None)
+pyasync.propagate(request_id)
+
+
+def _read_trace():
+    """Process helper."""
+    from pyasync import current_context
+    return current_context().get("trace_id"), request_id.get(), os.getpid()
+
+
+def _fail_process():
+    raise ValueError("bad")
+
+
+class TestThreadTracing(unittest.TestCase):
+    """Tests for tracing thread tasks."""
+
+    def test_contextvars_propagate_without_hooks(self):
+        """Test that thread tasks see the caller's context variables."""
+        from pyasync import run, parallel
+
+        token = request_id.set("req-1")
+        try:
+            self.assertEqual(run(request_id.get), "req-1")
+            self.assertEqual(parallel(request_id.get, request_id.get), ["req-1", "req-1"])
+        finally:
+            request_id.reset(token)
+
+    def test_task_changes_do_not_leak(self):
+        """Test that a task setting a variable does not affect the caller."""
+        from pyasync import run
+
+        run(lambda: request_id.set("inside"))
+        self.assertIsNone(request_id.get())
+
+    def test_context_captured_at_call(self):
+        """Test that throttled, retried, hedged and chained tasks see the caller's context."""
+        import threading
+        import time
+        from pyasync import background, add_hook, Hedge, RateLimiter, Retry
+
+        attempts = []
+        slow_first = threading.Event()
+
+        def flaky():
+            attempts.append(request_id.get())
+            if len(attempts) == 1:
+                raise ConnectionError("retry me")
+            return request_id.get()
+
+        def straggler():
+            if not slow_first.is_set():
+                slow_first.set()
+                time.sleep(0.5)
+            return request_id.get()
+
+        submitted = []
+        limiter = RateLimiter(10, burst=1)
+        token = request_id.set("req-2")
+        try:
+            with add_hook(on_submit=lambda info: submitted.append(request_id.get())):
+                background(lambda: None, rate=limiter).result()
+                throttled = background(request_id.get, rate=limiter)
+                retried = background(flaky, retry=Retry(backoff=0.01, jitter=None))
+                hedged = background(straggler, hedge=Hedge(delay=0.05))
+                chained = background(lambda: time.sleep(0.05)).then(lambda _: request_id.get())
+                request_id.set("changed")
+                results = [task.result() for task in (throttled, retried, hedged, chained)]
+        finally:
+            request_id.reset(token)
+
+        self.assertEqual(results, ["req-2"] * 4)
+        self.assertEqual(attempts, ["req-2", "req-2"])
+        self.assertEqual(set(submitted), {"req-2"})
+
+    def test_hooks_receive_lifecycle(self):
+        """Test on_submit, on_start and on_finish with timing and identity."""
+        from pyasync import run, add_hook
+
+        events = []
+
+        def work():
+            return 42
+
+        with add_hook(
+            on_submit=lambda info: events.append(("submit", info)),
+            on_start=lambda info: events.append(("start", info)),
+            on_finish=lambda info: events.append(("finish", info)),
+        ):
+            self.assertEqual(run(work), 42)
+
+        self.assertEqual([event for event, _ in events], ["submit", "start", "finish"])
+        info = events[0][1]
+        self.assertIs(events[2][1], info)
+        self.assertEqual(info.backend, "thread")
+        self.assertTrue(info.name.endswith("work"))
+        self.assertGreaterEqual(info.wait, 0.0)
+        self.assertGreaterEqual(info.duration, 0.0)
+        self.assertIsNone(info.exception)
+        self.assertTrue(info.worker)
+
+    def test_trace_context_from_on_submit(self):
+        """Test that entries added in on_submit are visible to the task."""
+        from pyasync import run, add_hook, current_context
+
+        def on_submit(info):
+            info.context["trace_id"] = "abc"
+
+        with add_hook(on_submit=on_submit):
+            self.assertEqual(run(lambda: current_context().get("trace_id")), "abc")
+        self.assertEqual(current_context(), {})
+
+    def test_exception_recorded(self):
+        """Test that on_finish sees the task's exception."""
+        from pyasync import run, add_hook
+
+        finished = []
+
+        def boom():
+            raise KeyError("x")
+
+        with add_hook(on_finish=finished.append):
+            with self.assertRaises(KeyError):
+                run(boom)
+        self.assertIsInstance(finished[0].exception, KeyError)
+
+    def test_hook_errors_do_not_break_tasks(self):
+        """Test that a failing hook does not fail the task."""
+        from pyasync import run, add_hook
+
+        def bad_hook(info):
+            raise RuntimeError("hook")
+
+        with self.assertLogs("pyasync.tracing", level="ERROR") as logs:
+            with add_hook(on_submit=bad_hook, on_start=bad_hook, on_finish=bad_hook):
+                self.assertEqual(run(lambda: 1), 1)
+        self.assertEqual(len(logs.records), 3)
+
+    def test_remove(self):
+        """Test that removed hooks are no longer called."""
+        from pyasync import run, add_hook
+
+        calls = []
+        hook = add_hook(on_submit=calls.append)
+        run(lambda: None)
+        hook.remove()
+        run(lambda: None)
+        self.assertEqual(len(calls), 1)
+
+
+class TestProcessTracing(unittest.TestCase):
+    """Tests for tracing process tasks."""
+
+    def test_context_serialized_to_worker(self):
+        """Test that trace context and propagated variables reach the worker."""
+        from pyasync import cpu_run, add_hook
+
+        finished = []
+
+        def on_submit(info):
+            info.context["trace_id"] = "xyz"
+
+        token = request_id.set("req-2")
+        try:
+            with add_hook(on_submit=on_submit, on_finish=finished.append):
+                trace_id, value, pid = cpu_run(_read_trace)
+        finally:
+            request_id.reset(token)
+
+        self.assertEqual(trace_id, "xyz")
+        self.assertEqual(value, "req-2")
+        self.assertNotEqual(pid, os.getpid())
+        info = finished[0]
+        self.assertEqual(info.backend, "process")
+        self.assertEqual(info.worker, f"pid:{pid}")
+        self.assertGreaterEqual(info.duration, 0.0)
+
+    def test_process_exception(self):
+        """Test that process failures reach on_finish and the caller."""
+        from pyasync import cpu_run, add_hook
+
+        finished = []
+        with add_hook(on_finish=finished.append):
+            with self.assertRaises(ValueError):
+                cpu_run(_fail_process)
+        self.assertIsInstance(finished[0].exception, ValueError)
+        self.assertIsNotNone(finished[0].started)
+
+
+if __name__ == "__main__":
+    unittest.main()